@@ -265,7 +265,19 @@ pdbx.set_structure(cif_file, tc5b)
 # single model.
 # If you would like to have an :class:`AtomArray` instead, you have to
 # specifiy the :obj:`model` parameter.
-# 
+#
+# The same functions can also be used with a :class:`BinaryCIFFile`,
+# which represents a file in the compact binary variant of the
+# PDBx/mmCIF format.
+# Its usage is equivalent to :class:`PDBxFile`, but the columns of
+# a category are returned with their respective data type, e.g. the
+# coordinates as floating point numbers.
+
+bcif_file = pdbx.BinaryCIFFile()
+pdbx.set_structure(bcif_file, tc5b, data_block="1L2Y")
+print(bcif_file["atom_site"]["Cartn_x"].dtype)
+
+########################################################################
 # .. currentmodule:: biotite.structure.io.mmtf
 #
 # If you want to parse a large batch of structure files or you have to
@@ -308,6 +320,8 @@ mmtf.set_structure(mmtf_file, array)
 # The implementation of :class:`MMTFFile` decodes the encoded fields
 # only when you need them, so no computation time is wasted on fields
 # you are not interested in.
+# The decoded arrays are cached, so that accessing a field again is
+# cheap.
 
 # Field is not encoded
 print(mmtf_file["title"])
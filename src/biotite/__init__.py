@@ -16,4 +16,19 @@ __author__ = "Patrick Kunzmann"
 from .file import *
 from .temp import *
 from .copyable import * 
-from .visualize import * 
+from .visualize import *
+
+
+# The subpackages are not imported with the package,
+# but when they are accessed for the first time (PEP 562),
+# as importing them is comparatively expensive
+_SUBPACKAGES = ["application", "database", "sequence", "structure"]
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        import importlib
+        return importlib.import_module(f"biotite.{name}")
+    raise AttributeError(
+        f"module 'biotite' has no attribute '{name}'"
+    )
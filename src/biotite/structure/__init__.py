@@ -103,6 +103,7 @@ The universal length unit in this package is Å.
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
 
+from .assembly import *
 from .atoms import *
 from .bonds import *
 from .box import *
@@ -116,6 +117,7 @@ from .filter import *
 from .geometry import *
 from .hbond import *
 from .integrity import *
+from .interface import *
 from .mechanics import *
 from .molecules import *
 from .pseudoknots import *
@@ -128,3 +130,18 @@ from .superimpose import *
 from .transform import *
 from .basepairs import *
 # util and resutil are used internally
+
+
+# The subpackages are not imported with the package,
+# but when they are accessed for the first time (PEP 562),
+# as importing them is comparatively expensive
+_SUBPACKAGES = ["graphics", "info", "io"]
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        import importlib
+        return importlib.import_module(f"biotite.structure.{name}")
+    raise AttributeError(
+        f"module 'biotite.structure' has no attribute '{name}'"
+    )
@@ -0,0 +1,370 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides a lazy representation of biological assemblies.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["VirtualAssembly"]
+
+import numpy as np
+from .atoms import AtomArray, AtomArrayStack
+from .bonds import BondList
+from .celllist import CellList
+from .util import matrix_rotate
+
+
+class VirtualAssembly:
+    """
+    A biological assembly that stores the asymmetric unit only once,
+    together with the transformations that create the copies of the
+    assembly.
+
+    In contrast to a materialized assembly, the coordinates of a copy
+    are only computed, when they are requested, e.g. via
+    :meth:`get_coord()`.
+    Hence, large assemblies (e.g. virus capsids) can be analyzed
+    without holding an :class:`AtomArray` for the entire assembly in
+    memory.
+    The full :class:`AtomArray` or :class:`AtomArrayStack` is only
+    created, when :meth:`materialize()` is called.
+
+    Parameters
+    ----------
+    atoms : AtomArray or AtomArrayStack
+        The asymmetric unit, the copies are created from.
+
+    Attributes
+    ----------
+    atoms : AtomArray or AtomArrayStack
+        The asymmetric unit.
+
+    Notes
+    -----
+    Each copy consists of a subset of the atoms in the asymmetric unit
+    and a sequence of transformation steps.
+    Each step is a rotation followed by a translation.
+    The steps are applied in the given order.
+
+    Examples
+    --------
+
+    Create a dimer from a single chain:
+
+    >>> assembly = VirtualAssembly(atom_array)
+    >>> assembly.add_copy(None, [(np.identity(3), np.zeros(3))])
+    >>> assembly.add_copy(None, [(np.identity(3), np.array([30, 0, 0]))])
+    >>> print(assembly.copy_count())
+    2
+    >>> print(assembly.array_length())
+    608
+    >>> print(assembly.get_coord(1)[0])
+    [21.099  4.127 -0.555]
+    >>> dimer = assembly.materialize()
+    >>> print(dimer.array_length())
+    608
+    """
+
+    def __init__(self, atoms):
+        if not isinstance(atoms, (AtomArray, AtomArrayStack)):
+            raise TypeError(
+                f"Expected 'AtomArray' or 'AtomArrayStack', "
+                f"but got {type(atoms).__name__}"
+            )
+        self._atoms = atoms
+        # Each entry is a tuple of the indices of affected atoms
+        # (or 'None' for all atoms) and the transformation steps
+        self._copies = []
+
+    @property
+    def atoms(self):
+        return self._atoms
+
+    def add_copy(self, selection, transformations):
+        """
+        Add a copy of (a part of) the asymmetric unit to the assembly.
+
+        Parameters
+        ----------
+        selection : ndarray, dtype=bool or dtype=int, shape=(n,), optional
+            A boolean mask or index array that selects the atoms of the
+            asymmetric unit, this copy consists of.
+            By default, all atoms are selected.
+            The selected atoms keep the order of the asymmetric unit.
+        transformations : iterable object of tuple(ndarray, ndarray)
+            The transformation steps that are applied to the selected
+            atoms.
+            Each step is a tuple of a *(3,3)* rotation matrix and a
+            *(3,)* translation vector.
+            The steps are applied in the given order.
+        """
+        if selection is not None:
+            selection = np.asarray(selection)
+            if selection.dtype == bool:
+                if len(selection) != self._atoms.array_length():
+                    raise IndexError(
+                        f"Mask has length {len(selection)}, but the "
+                        f"asymmetric unit has "
+                        f"{self._atoms.array_length()} atoms"
+                    )
+                selection = np.nonzero(selection)[0]
+            else:
+                selection = np.unique(selection.astype(np.int64, copy=False))
+                if len(selection) > 0 and (
+                    selection[0] < 0
+                    or selection[-1] >= self._atoms.array_length()
+                ):
+                    raise IndexError(
+                        "Selection contains indices that are out of range"
+                    )
+        steps = []
+        for rotation, translation in transformations:
+            rotation = np.asarray(rotation, dtype=float)
+            translation = np.asarray(translation, dtype=float)
+            if rotation.shape != (3, 3):
+                raise IndexError(
+                    f"Expected a (3,3) rotation matrix, "
+                    f"but got shape {rotation.shape}"
+                )
+            if translation.shape != (3,):
+                raise IndexError(
+                    f"Expected a (3,) translation vector, "
+                    f"but got shape {translation.shape}"
+                )
+            steps.append((rotation, translation))
+        self._copies.append((selection, steps))
+
+    def copy_count(self):
+        """
+        Get the number of copies in the assembly.
+
+        Returns
+        -------
+        count : int
+            The number of copies.
+        """
+        return len(self._copies)
+
+    def array_length(self):
+        """
+        Get the number of atoms in the materialized assembly.
+
+        Returns
+        -------
+        length : int
+            The number of atoms.
+        """
+        return sum(
+            self._copy_length(i) for i in range(len(self._copies))
+        )
+
+    def get_indices(self, index):
+        """
+        Get the indices of the atoms in the asymmetric unit, the given
+        copy consists of.
+
+        Parameters
+        ----------
+        index : int
+            The index of the copy.
+
+        Returns
+        -------
+        indices : ndarray, dtype=int
+            The atom indices.
+        """
+        selection, _ = self._copies[index]
+        if selection is None:
+            return np.arange(self._atoms.array_length())
+        else:
+            return selection.copy()
+
+    def get_coord(self, index):
+        """
+        Compute the coordinates of the given copy.
+
+        Parameters
+        ----------
+        index : int
+            The index of the copy.
+
+        Returns
+        -------
+        coord : ndarray, dtype=float32, shape=(n,3) or shape=(m,n,3)
+            The transformed coordinates of the atoms in the copy.
+        """
+        selection, steps = self._copies[index]
+        if selection is None:
+            coord = self._atoms.coord
+        else:
+            coord = self._atoms.coord[..., selection, :]
+        for rotation, translation in steps:
+            coord = matrix_rotate(coord, rotation)
+            coord += translation
+        return coord.astype(np.float32)
+
+    def get_copy(self, index):
+        """
+        Create an :class:`AtomArray` or :class:`AtomArrayStack` for a
+        single copy.
+
+        Parameters
+        ----------
+        index : int
+            The index of the copy.
+
+        Returns
+        -------
+        copy : AtomArray or AtomArrayStack
+            The copy.
+        """
+        selection, _ = self._copies[index]
+        if selection is None:
+            copy = self._atoms.copy()
+        else:
+            copy = self._atoms[..., selection]
+        copy.coord = self.get_coord(index)
+        return copy
+
+    def materialize(self):
+        """
+        Create the complete assembly as :class:`AtomArray` or
+        :class:`AtomArrayStack`.
+
+        The copies appear in the order they were added.
+
+        Returns
+        -------
+        assembly : AtomArray or AtomArrayStack
+            The assembly.
+        """
+        atoms = self._atoms
+        length = self.array_length()
+        if isinstance(atoms, AtomArray):
+            assembly = AtomArray(length)
+        else:
+            assembly = AtomArrayStack(atoms.stack_depth(), length)
+
+        if len(self._copies) == 0:
+            for category in atoms.get_annotation_categories():
+                assembly.add_annotation(
+                    category, atoms.get_annotation(category).dtype
+                )
+            if atoms.bonds is not None:
+                assembly.bonds = BondList(0)
+            if atoms.box is not None:
+                assembly.box = atoms.box.copy()
+            return assembly
+
+        # Gather all annotations with a single index operation
+        indices = np.concatenate(
+            [self.get_indices(i) for i in range(len(self._copies))]
+        )
+        for category in atoms.get_annotation_categories():
+            assembly.set_annotation(
+                category, atoms.get_annotation(category)[indices]
+            )
+
+        start = 0
+        for i in range(len(self._copies)):
+            stop = start + self._copy_length(i)
+            assembly.coord[..., start:stop, :] = self.get_coord(i)
+            start = stop
+
+        if atoms.bonds is not None:
+            bonds = BondList(0)
+            for selection, _ in self._copies:
+                if selection is None:
+                    bonds += atoms.bonds
+                else:
+                    bonds += atoms.bonds[selection]
+            assembly.bonds = bonds
+        if atoms.box is not None:
+            assembly.box = atoms.box.copy()
+
+        return assembly
+
+    def find_contacts(self, cutoff):
+        """
+        Find all pairs of atoms from different copies that are within
+        the given cutoff distance.
+
+        All copies are searched in a single :class:`CellList` pass,
+        without creating the annotation arrays of the assembly.
+
+        Parameters
+        ----------
+        cutoff : float
+            The distance cutoff.
+
+        Returns
+        -------
+        contacts : ndarray, dtype=int, shape=(p,4)
+            Each row describes a contact:
+            The first and third column contain the indices of the two
+            copies, the second and fourth column contain the
+            corresponding atom indices in the asymmetric unit
+            (:attr:`atoms`).
+            The first copy index is always smaller than the second one.
+
+        Examples
+        --------
+
+        >>> assembly = VirtualAssembly(atom_array)
+        >>> assembly.add_copy(None, [(np.identity(3), np.zeros(3))])
+        >>> assembly.add_copy(None, [(np.identity(3), np.array([20, 0, 0]))])
+        >>> contacts = assembly.find_contacts(3.0)
+        >>> print(len(contacts))
+        60
+        >>> print(np.all(contacts[:, 0] < contacts[:, 2]))
+        True
+        """
+        if not isinstance(self._atoms, AtomArray):
+            raise TypeError(
+                "Contacts can only be found for assemblies "
+                "based on an 'AtomArray'"
+            )
+        if len(self._copies) == 0:
+            return np.zeros((0, 4), dtype=np.int64)
+
+        coord = np.concatenate(
+            [self.get_coord(i) for i in range(len(self._copies))]
+        )
+        copy_indices = np.concatenate([
+            np.full(self._copy_length(i), i, dtype=np.int64)
+            for i in range(len(self._copies))
+        ])
+        atom_indices = np.concatenate(
+            [self.get_indices(i) for i in range(len(self._copies))]
+        )
+
+        cell_list = CellList(coord, max(cutoff, 1.0))
+        adjacent = cell_list.get_atoms(coord, cutoff)
+        first = np.repeat(np.arange(len(coord)), adjacent.shape[1])
+        second = adjacent.flatten()
+        # Remove padding values and report each contact only once
+        # between atoms from different copies
+        valid = second != -1
+        first = first[valid]
+        second = second[valid]
+        mask = copy_indices[first] < copy_indices[second]
+        first = first[mask]
+        second = second[mask]
+
+        return np.stack([
+            copy_indices[first], atom_indices[first],
+            copy_indices[second], atom_indices[second],
+        ], axis=-1)
+
+    def _copy_length(self, index):
+        selection, _ = self._copies[index]
+        if selection is None:
+            return self._atoms.array_length()
+        else:
+            return len(selection)
+
+    def __len__(self):
+        return self.array_length()
@@ -9,7 +9,7 @@ This module contains the main types of the ``structure`` subpackage:
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
-__all__ = ["Atom", "AtomArray", "AtomArrayStack",
+__all__ = ["Atom", "AtomArray", "AtomArrayStack", "SelectionView",
            "array", "stack", "repeat", "from_template", "coord"]
 
 import numbers
@@ -26,6 +26,10 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
     It implements functionality for annotation arrays and also
     rudimentarily for coordinates.
     """
+
+    # Class-level default for objects that were pickled before the
+    # segment cache was introduced and hence lack this attribute
+    _segment_cache = None
     
     def __init__(self, length):
         """
@@ -36,6 +40,8 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         self._coord = None
         self._bonds = None
         self._box = None
+        # None, if segment caching is disabled
+        self._segment_cache = None
         self.add_annotation("chain_id", dtype="U4")
         self.add_annotation("res_id", dtype=int)
         self.add_annotation("ins_code", dtype="U1")
@@ -107,6 +113,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         """
         if category in self._annot:
             del self._annot[str(category)]
+            self._invalidate_segment_cache(category)
             
     def get_annotation(self, category):
         """
@@ -153,6 +160,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
             )
         else:
             self._annot[category] = np.asarray(array)
+        self._invalidate_segment_cache(category)
         
     def get_annotation_categories(self):
         """
@@ -164,6 +172,97 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
             The list containing the names of each annotation array.
         """
         return list(self._annot.keys())
+    
+    def enable_segment_cache(self):
+        """
+        Cache the segment starts, i.e. the residue and chain starts,
+        for this object.
+
+        Functions such as :func:`get_residue_starts()` and
+        :func:`get_chain_starts()` store their result in this object,
+        so that subsequent calls on the same object are nearly free.
+        The cache entries are discarded automatically, when the
+        annotation arrays they depend on are set via
+        :func:`set_annotation()` or attribute assignment, when an
+        annotation category is removed or when atoms are set or
+        deleted.
+        Objects derived from this object by indexing or copying keep
+        the segment cache enabled.
+
+        See also
+        --------
+        disable_segment_cache
+        clear_segment_cache
+
+        Notes
+        -----
+        In-place modifications of annotation arrays, e.g.
+        ``array.res_id[0] = 42``, cannot be detected.
+        In this case :func:`clear_segment_cache()` must be called
+        afterwards.
+        """
+        if self._segment_cache is None:
+            self._segment_cache = {}
+    
+    def disable_segment_cache(self):
+        """
+        Stop caching the segment starts and discard all cached segment
+        starts.
+
+        See also
+        --------
+        enable_segment_cache
+        """
+        self._segment_cache = None
+    
+    def clear_segment_cache(self):
+        """
+        Discard all cached segment starts, if the segment cache is
+        enabled.
+
+        See also
+        --------
+        enable_segment_cache
+        """
+        if self._segment_cache is not None:
+            self._segment_cache.clear()
+    
+    def _get_cached_segment_starts(self, key):
+        """
+        Get the cached segment starts (including the exclusive stop)
+        for the given segment type or ``None``, if not cached.
+        """
+        if self._segment_cache is None or key not in self._segment_cache:
+            return None
+        _, starts = self._segment_cache[key]
+        # Copy to protect the cached array against modification
+        return starts.copy()
+    
+    def _set_cached_segment_starts(self, key, categories, starts):
+        """
+        Cache the segment starts (including the exclusive stop) for the
+        given segment type, if the segment cache is enabled.
+        The cache entry is invalidated, when one of the given annotation
+        `categories` changes.
+        """
+        if self._segment_cache is not None:
+            self._segment_cache[key] = (frozenset(categories), starts.copy())
+    
+    def _invalidate_segment_cache(self, category=None):
+        """
+        Remove cache entries that depend on the given annotation
+        category or all entries, if no category is given.
+        """
+        if not self._segment_cache:
+            return
+        if category is None:
+            self._segment_cache.clear()
+        else:
+            for key in [
+                key for key, (categories, _) in self._segment_cache.items()
+                if category in categories
+            ]:
+                del self._segment_cache[key]
             
     def _subarray(self, index):
         # Index is one dimensional (boolean mask, index array)
@@ -182,6 +281,9 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         for annotation in self._annot:
             new_object._annot[annotation] = (self._annot[annotation]
                                              .__getitem__(index))
+        if self._segment_cache is not None:
+            # The segments of the subarray are different
+            new_object._segment_cache = {}
         return new_object
         
     def _set_element(self, index, atom):
@@ -189,6 +291,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
             if isinstance(index, (numbers.Integral, np.ndarray)):
                 for name in self._annot:
                     self._annot[name][index] = atom._annot[name]
+                self._invalidate_segment_cache()
                 self._coord[..., index, :] = atom.coord
             else:
                 raise TypeError(
@@ -201,6 +304,7 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
         if isinstance(index, numbers.Integral):
             for name in self._annot:
                 self._annot[name] = np.delete(self._annot[name], index, axis=0)
+            self._invalidate_segment_cache()
             self._coord = np.delete(self._coord, index, axis=-2)
             self._array_length = self._coord.shape[-2]
             if self._bonds is not None:
@@ -433,6 +537,10 @@ class _AtomArrayBase(Copyable, metaclass=abc.ABCMeta):
     def _copy_annotations(self, clone):
         for name in self._annot:
             clone._annot[name] = np.copy(self._annot[name])
+        if self._segment_cache is not None:
+            # The annotations are equal
+            # -> the cached segment starts are still valid
+            clone._segment_cache = dict(self._segment_cache)
         if self._box is not None:
             clone._box = np.copy(self._box)
         if self._bonds is not None:
@@ -963,6 +1071,8 @@ class AtomArrayStack(_AtomArrayBase):
         array = AtomArray(self.array_length())
         for name in self._annot:
             array._annot[name] = self._annot[name]
+        if self._segment_cache is not None:
+            array._segment_cache = dict(self._segment_cache)
         array._coord = self._coord[index]
         if self._bonds is not None:
             array._bonds = self._bonds.copy()
@@ -1163,6 +1273,215 @@ class AtomArrayStack(_AtomArrayBase):
         return AtomArrayStack(self.stack_depth(), self.array_length())
 
 
+class SelectionView:
+    """
+    A lazy view on a selection of atoms from an :class:`AtomArray` or
+    :class:`AtomArrayStack`.
+
+    Indexing an :class:`AtomArray` or :class:`AtomArrayStack` copies
+    all annotation arrays, the coordinates and the :class:`BondList`.
+    In contrast, indexing a :class:`SelectionView` only composes the
+    index with the indices of the current selection.
+    The annotation arrays and the coordinates of the selected atoms are
+    only created, when they are accessed, and the complete
+    :class:`AtomArray` or :class:`AtomArrayStack` is only created by
+    :meth:`materialize()`.
+    Hence, chains of filters, that access only a few annotation
+    categories, are much faster for large structures.
+
+    The annotation arrays and coordinates are accessed in the same way
+    as for an :class:`AtomArray`, so that all ``filter_xxx()``
+    functions and the residue and chain functions, i.e.
+    ``get_residue_xxx()``, ``get_chain_xxx()``, :func:`get_residues()`,
+    :func:`get_chains()`, :func:`residue_iter()`, :func:`chain_iter()`,
+    :func:`apply_residue_wise()`, :func:`apply_chain_wise()`,
+    :func:`spread_residue_wise()` and :func:`spread_chain_wise()`,
+    accept a :class:`SelectionView` as well.
+    The segment cache of the underlying atoms is not used for the view.
+    The view is read-only: The accessed arrays cannot be modified.
+
+    Parameters
+    ----------
+    atoms : AtomArray or AtomArrayStack
+        The atoms to select from.
+        Initially, all atoms are selected.
+
+    Attributes
+    ----------
+    {annot} : ndarray
+        The annotation arrays of the selected atoms.
+    coord : ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
+        The coordinates of the selected atoms.
+    bonds : BondList or None
+        The bonds between the selected atoms.
+    box : ndarray, dtype=float, shape=(3,3) or shape=(m,3,3) or None
+        The box of the underlying atoms.
+    indices : ndarray, dtype=int
+        The indices of the selected atoms in the underlying atoms.
+
+    Notes
+    -----
+    The underlying :class:`AtomArray` or :class:`AtomArrayStack` must
+    not be modified, while the view is used.
+
+    Examples
+    --------
+
+    >>> view = SelectionView(atom_array)
+    >>> view = view[filter_amino_acids(view)]
+    >>> view = view[view.res_id < 3]
+    >>> print(view.array_length())
+    35
+    >>> sub_array = view.materialize()
+    >>> print(sub_array.res_name[sub_array.atom_name == "CA"])
+    ['ASN' 'LEU']
+    """
+
+    def __init__(self, atoms, indices=None):
+        if not isinstance(atoms, _AtomArrayBase):
+            raise TypeError(
+                f"Expected 'AtomArray' or 'AtomArrayStack', "
+                f"but got '{type(atoms).__name__}'"
+            )
+        if indices is None:
+            indices = np.arange(atoms.array_length())
+        self._atoms = atoms
+        self._indices = indices
+        self._columns = {}
+
+    @property
+    def indices(self):
+        return self._indices
+
+    @property
+    def shape(self):
+        if isinstance(self._atoms, AtomArrayStack):
+            return self._atoms.stack_depth(), self.array_length()
+        else:
+            return self.array_length(),
+
+    def array_length(self):
+        """
+        Get the number of selected atoms.
+
+        Returns
+        -------
+        length : int
+            Number of selected atoms.
+        """
+        return len(self._indices)
+
+    def get_annotation_categories(self):
+        """
+        Return a list containing all annotation array categories.
+
+        Returns
+        -------
+        categories : list
+            The list containing the names of each annotation array.
+        """
+        return self._atoms.get_annotation_categories()
+
+    def get_annotation(self, category):
+        """
+        Return the annotation array for the selected atoms.
+
+        The array is created on the first access.
+
+        Parameters
+        ----------
+        category : str
+            The annotation category to be returned.
+
+        Returns
+        -------
+        array : ndarray
+            The read-only annotation array.
+        """
+        if category not in self._columns:
+            column = self._atoms.get_annotation(category)[self._indices]
+            column.setflags(write=False)
+            self._columns[category] = column
+        return self._columns[category]
+
+    def materialize(self):
+        """
+        Create the selected atoms.
+
+        Returns
+        -------
+        atoms : AtomArray or AtomArrayStack
+            A new :class:`AtomArray` or :class:`AtomArrayStack`
+            containing the selected atoms.
+        """
+        return self._atoms[..., self._indices]
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            # Private attributes are not annotations
+            # and may not be set yet, e.g. during unpickling
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr}'"
+            )
+        if attr == "coord":
+            if "coord" not in self._columns:
+                coord = self._atoms.coord[..., self._indices, :]
+                coord.setflags(write=False)
+                self._columns["coord"] = coord
+            return self._columns["coord"]
+        if attr == "bonds":
+            if self._atoms.bonds is None:
+                return None
+            if "bonds" not in self._columns:
+                self._columns["bonds"] = self._atoms.bonds[self._indices]
+            return self._columns["bonds"]
+        if attr == "box":
+            return self._atoms.box
+        if attr in self._atoms.get_annotation_categories():
+            return self.get_annotation(attr)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{attr}'"
+        )
+
+    def __getitem__(self, index):
+        """
+        Select a subset of the currently selected atoms.
+
+        Parameters
+        ----------
+        index : slice or ndarray, dtype=bool or ndarray, dtype=int
+            A slice, boolean mask or index array, relative to the
+            currently selected atoms.
+            For consistency with :class:`AtomArrayStack`, the index may
+            be preceded by an *Ellipsis*.
+
+        Returns
+        -------
+        view : SelectionView
+            A view on the new selection.
+        """
+        if isinstance(index, tuple):
+            if len(index) == 2 and index[0] is Ellipsis:
+                index = index[1]
+            else:
+                raise IndexError(
+                    "'SelectionView' only accepts indices for the atom "
+                    "dimension"
+                )
+        if isinstance(index, numbers.Integral):
+            raise IndexError(
+                "'SelectionView' does not accept single integer indices, "
+                "use 'materialize()' to access single atoms"
+            )
+        return SelectionView(self._atoms, self._indices[index])
+
+    def __len__(self):
+        if isinstance(self._atoms, AtomArrayStack):
+            return self._atoms.stack_depth()
+        else:
+            return self.array_length()
+
+
 def array(atoms):
     """
     Create an :class:`AtomArray` from a list of :class:`Atom`.
@@ -15,14 +15,14 @@ import numpy as np
 import warnings
 from enum import IntEnum
 from .atoms import Atom, array
-from .superimpose import superimpose, superimpose_apply
+from .superimpose import superimpose
 from .filter import filter_nucleotides
 from .celllist import CellList
 from .hbond import hbond
 from .error import IncompleteStructureWarning, UnexpectedStructureWarning, \
     BadStructureError
-from .util import distance, norm_vector
-from .residues import get_residue_starts_for, get_residue_masks
+from .util import distance
+from .residues import get_residue_starts, get_residue_starts_for
 from .info.standardize import standardize_order
 from .compare import rmsd
 
@@ -280,6 +280,52 @@ _SUGAR_EDGE = {
 _EDGES = [_WATSON_CRICK_EDGE, _HOOGSTEEN_EDGE, _SUGAR_EDGE]
 
 
+def _get_std_base_tables():
+    """
+    Get the standard bases as padded arrays for batched
+    superimposition.
+
+    Returns
+    -------
+    atom_names : list of ndarray, dtype=str
+        The atom names of each standard base.
+    coord : ndarray, dtype=float, shape=(5,k,3)
+        The coordinates of each standard base.
+        The trailing coordinates of smaller bases are filled with zeros.
+    vectors : ndarray, dtype=float, shape=(5,5,3)
+        The standard vectors of each base:
+        The origin, the tip of the base normal vector, the SCHNAaP
+        origin and the aromatic ring centers.
+        The coordinates of the missing second ring center of
+        pyrimidines are *NaN*.
+    """
+    std_bases = [
+        (_STD_ADENINE, _STD_ADENINE_RING_CENTERS),
+        (_STD_THYMINE, _STD_THYMINE_RING_CENTERS),
+        (_STD_CYTOSINE, _STD_CYTOSINE_RING_CENTERS),
+        (_STD_GUANINE, _STD_GUANINE_RING_CENTERS),
+        (_STD_URACIL, _STD_URACIL_RING_CENTERS),
+    ]
+    max_length = max(base.array_length() for base, _ in std_bases)
+    atom_names = []
+    coord = np.zeros((len(std_bases), max_length, 3))
+    vectors = np.full((len(std_bases), 5, 3), np.nan)
+    for i, (base, ring_centers) in enumerate(std_bases):
+        atom_names.append(base.atom_name)
+        coord[i, :base.array_length()] = base.coord
+        vectors[i, 0] = [0, 0, 0]
+        vectors[i, 1] = [0, 0, 1]
+        vectors[i, 2 : 2 + len(ring_centers)] = ring_centers
+    return atom_names, coord, vectors
+
+
+# The order of the standard bases is the same as the order of the
+# one-letter codes
+_STD_BASE_CODES = "ATCGU"
+_STD_BASE_ATOM_NAMES, _STD_BASE_COORD, _STD_BASE_VECTORS \
+    = _get_std_base_tables()
+
+
 class Edge(IntEnum):
     """
     This enum type represents the interacting edge for a given base.
@@ -389,27 +435,15 @@ def base_pairs_edge(atom_array, base_pairs):
     
     .. footbibliography::
     """
-    # Result-``ndarray`` matches the dimensions of the input array
-    results = np.zeros_like(base_pairs, dtype='uint8')
-
-    # Get the residue masks for each residue
-    base_pairs_masks = get_residue_masks(atom_array, base_pairs.flatten())
-
-    # Group every two masks together for easy iteration (each 'row' is
-    # respective to a row in ``base_pairs``)
-    base_pairs_masks = base_pairs_masks.reshape(
-        (base_pairs.shape[0], 2, atom_array.shape[0])
-    )
-
-    for i, base_masks in enumerate(base_pairs_masks):
-        # Get the absolute atom count for each edge
-        base_edges = _get_edge_matrix(atom_array, base_masks)
-
-        # Classify the base edges based on the highest number of
-        # matching hydrogen bonded atoms
-        for j, base in enumerate(base_edges):
-            if np.max(base) != 0:
-                results[i, j] = np.argmax(base) + 1
+    # The number of hydrogen bonded atoms for each edge of each base
+    edge_matrices = _get_edge_matrices(atom_array, base_pairs)
+    # Classify the base edges based on the highest number of
+    # matching hydrogen bonded atoms
+    results = np.where(
+        np.max(edge_matrices, axis=-1) != 0,
+        np.argmax(edge_matrices, axis=-1) + 1,
+        0
+    ).astype(np.uint8)
     return results
 
 
@@ -431,39 +465,132 @@ def _get_edge_matrix(atom_array, base_masks):
     matrix : ndarray, dtype=int, shape=(2,3)
         The edge matrix.
     """
-    # Get the hydrogen bonds between the residues
-    hbonds = hbond(atom_array, base_masks[0], base_masks[1])
-    if len(hbonds) == 0:
+    base_pair = np.argmax(base_masks, axis=-1)
+    return _get_edge_matrices(atom_array, base_pair[np.newaxis, :])[0]
+
+
+def _get_edge_matrices(atom_array, base_pairs):
+    """
+    Get the edge matrix (see :func:`_get_edge_matrix()`) for each of
+    the given base pairs.
+
+    The hydrogen bonds between all bases are computed in a single
+    :func:`hbond()` call.
+
+    Parameters
+    ----------
+    atom_array : AtomArray
+        The :class:`AtomArray` containing the bases.
+    base_pairs : ndarray, dtype=int, shape=(p,2)
+        The first indices of the residues corresponding to each base.
+
+    Returns
+    -------
+    matrices : ndarray, dtype=int, shape=(p,2,3)
+        The edge matrices.
+    """
+    base_pairs = np.asarray(base_pairs)
+    matrices = np.zeros((len(base_pairs), 2, 3), dtype="int32")
+    if len(base_pairs) == 0:
+        return matrices
+
+    # The index of the residue each atom belongs to
+    residue_starts = get_residue_starts(atom_array, add_exclusive_stop=True)
+    residue_indices = np.repeat(
+        np.arange(len(residue_starts) - 1), np.diff(residue_starts)
+    )
+    pair_residues = residue_indices[base_pairs]
+
+    # Get the hydrogen bonds between all bases in a single pass
+    selection = np.isin(residue_indices, pair_residues)
+    triplets = hbond(atom_array, selection, selection)
+    donor_residues = residue_indices[triplets[:, 0]]
+    acceptor_residues = residue_indices[triplets[:, 2]]
+    # Each hydrogen bond is assigned to the pair of residues it
+    # connects, irrespective of the direction
+    n_residues = len(residue_starts) - 1
+    is_inter = donor_residues != acceptor_residues
+    triplets = triplets[is_inter]
+    triplet_keys = _pair_keys(
+        donor_residues[is_inter], acceptor_residues[is_inter], n_residues
+    )
+    order = np.argsort(triplet_keys, kind="stable")
+    triplets = triplets[order]
+    triplet_keys = triplet_keys[order]
+    pair_keys = _pair_keys(pair_residues[:, 0], pair_residues[:, 1], n_residues)
+    first = np.searchsorted(triplet_keys, pair_keys, side="left")
+    last = np.searchsorted(triplet_keys, pair_keys, side="right")
+    counts = last - first
+
+    no_hbond = np.where(counts == 0)[0]
+    if len(no_hbond) > 0:
         raise BadStructureError(
             f"No hydrogen bonds between nucleotides with residue start "
-            f"indices {np.argmax(base_masks[0])} and "
-            f"{np.argmax(base_masks[1])}"
+            f"indices {base_pairs[no_hbond[0], 0]} and "
+            f"{base_pairs[no_hbond[0], 1]}"
+        )
+
+    # Expand the hydrogen bonds for each base pair
+    pair_indices = np.repeat(np.arange(len(base_pairs)), counts)
+    triplet_indices = (
+        np.arange(len(pair_indices))
+        - np.repeat(np.cumsum(counts) - counts, counts)
+        + np.repeat(first, counts)
+    )
+    # Tally the donor/acceptor heteroatoms that are part of an edge
+    edge_membership = _get_edge_membership(atom_array)
+    for atom_indices in (
+        triplets[triplet_indices, 0], triplets[triplet_indices, 2]
+    ):
+        # Index of the base in the pair, the atom belongs to
+        base_indices = (
+            residue_indices[atom_indices] != pair_residues[pair_indices, 0]
+        ).astype(int)
+        np.add.at(
+            matrices,
+            (pair_indices, base_indices),
+            edge_membership[atom_indices]
         )
-    # filter out donor/acceptor heteroatoms and flatten for easy
-    # iteration
-    hbonds = hbonds[:, (0,2)].flatten()
+    return matrices
 
-    # ``ndarray`` with one row for each base and the number of
-    # bonded edge heteroatoms as in ``_edge`` as columns
-    matrix = np.zeros((2, 3), dtype='int32')
 
-    # Iterate through the atoms and corresponding atoms indices
-    # that are part of the hydrogen bonds
-    for atom, atom_index in zip(atom_array[hbonds], hbonds):
+def _get_edge_membership(atom_array):
+    """
+    Get for each atom, whether it is part of the Watson-Crick-,
+    Hoogsteen- or Sugar-edge, respectively.
 
-        if atom.res_name not in _REFERENCE_NUCLEOTIDE_NAMES:
-            continue
+    Returns
+    -------
+    membership : ndarray, dtype=int, shape=(n,3)
+        The edge membership.
+    """
+    membership = np.zeros((atom_array.array_length(), len(_EDGES)), dtype=int)
+    for res_names in (
+        _ADENINE_CONTAINING_NUCLEOTIDES,
+        _THYMINE_CONTAINING_NUCLEOTIDES,
+        _CYTOSINE_CONTAINING_NUCLEOTIDES,
+        _GUANINE_CONTAINING_NUCLEOTIDES,
+        _URACIL_CONTAINING_NUCLEOTIDES,
+    ):
+        residue_mask = np.isin(atom_array.res_name, res_names)
+        one_letter_code = res_names[0][-1]
+        for edge_index, edge in enumerate(_EDGES):
+            membership[:, edge_index] |= (
+                residue_mask
+                & np.isin(atom_array.atom_name, edge[one_letter_code])
+            )
+    return membership
 
-        # Iterate over the edge types
-        for edge_type_index, edge_type in enumerate(_EDGES):
-            # Iterate over the two base masks
-            for base_index, base_mask in enumerate(base_masks):
-                # If a donor/acceptor atom name matches a name in
-                # the corresponding edge list increase the tally
-                if (base_mask[atom_index] and
-                    atom.atom_name in edge_type[atom.res_name[-1]]):
-                    matrix[base_index, edge_type_index] += 1
-    return matrix
+
+def _pair_keys(residue_indices1, residue_indices2, n_residues):
+    """
+    Get a unique integer for each unordered pair of residue indices.
+    """
+    return (
+        np.minimum(residue_indices1, residue_indices2).astype(np.int64)
+        * n_residues
+        + np.maximum(residue_indices1, residue_indices2)
+    )
 
 
 def base_pairs_glycosidic_bond(atom_array, base_pairs):
@@ -540,74 +667,100 @@ def base_pairs_glycosidic_bond(atom_array, base_pairs):
     
     .. footbibliography::
     """
-    results = np.zeros(len(base_pairs), dtype='uint8')
-
-    # Get the residue masks for each residue
-    base_pairs_masks = get_residue_masks(atom_array, base_pairs.flatten())
+    base_pairs = np.asarray(base_pairs)
+    if len(base_pairs) == 0:
+        return np.zeros(0, dtype='uint8')
+
+    # Match all bases to the standard bases at once
+    unique_starts, inverse = np.unique(base_pairs, return_inverse=True)
+    vectors = _match_bases(atom_array, unique_starts, 3)[
+        inverse.reshape(base_pairs.shape)
+    ]
+    ring_centers = vectors[:, :, 3:]
 
-    # Group every two masks together for easy iteration (each 'row' is
-    # respective to a row in ``base_pairs``)
-    base_pairs_masks = base_pairs_masks.reshape(
-        (base_pairs.shape[0], 2, atom_array.shape[0])
+    res_names = atom_array.res_name[base_pairs]
+    is_purine = np.isin(
+        res_names,
+        _ADENINE_CONTAINING_NUCLEOTIDES + _GUANINE_CONTAINING_NUCLEOTIDES
+    )
+    is_pyrimidine = np.isin(
+        res_names,
+        _THYMINE_CONTAINING_NUCLEOTIDES + _URACIL_CONTAINING_NUCLEOTIDES
+        + _CYTOSINE_CONTAINING_NUCLEOTIDES
+    )
+    # Position vectors of each bases geometric center
+    geometric_centers = np.where(
+        is_purine[..., np.newaxis],
+        (ring_centers[:, :, 0] + ring_centers[:, :, 1]) / 2,
+        ring_centers[:, :, 0]
+    )
+    # For Purines the glycosidic bond is between the C1' and the
+    # N9 atoms, for pyrimidines it is between the C1' atom and
+    # the N1 atom
+    base_atom_indices = np.where(
+        is_purine,
+        _first_atom_in_residue(atom_array, base_pairs, "N9"),
+        _first_atom_in_residue(atom_array, base_pairs, "N1")
+    )
+    sugar_atom_indices = _first_atom_in_residue(atom_array, base_pairs, "C1'")
+    is_valid = np.all(
+        (is_purine | is_pyrimidine)
+        & (base_atom_indices != -1)
+        & (sugar_atom_indices != -1)
+        & ~np.isnan(geometric_centers).any(axis=-1),
+        axis=-1
+    )
+    # Direction vectors of the glycosidic bonds
+    glycosidic_bonds = (
+        atom_array.coord[sugar_atom_indices]
+        - atom_array.coord[base_atom_indices]
     )
 
-    for i, pair_masks in enumerate(base_pairs_masks):
-
-        # position vectors of each bases geometric center
-        geometric_centers = np.zeros((2, 3))
-        # direction vectors of the glycosidic bonds
-        glycosidic_bonds = np.zeros((2, 3))
-
-        for base_index, base_mask in enumerate(pair_masks):
-            base = atom_array[base_mask]
-            ring_center = _match_base(base, 3)[3:]
-
-            # For Purines the glycosidic bond is between the C1' and the
-            # N9 atoms, for pyrimidines it is between the C1' atom and
-            # the N1 atom
-            if (base.res_name[0] in _ADENINE_CONTAINING_NUCLEOTIDES or
-                base.res_name[0] in _GUANINE_CONTAINING_NUCLEOTIDES):
-
-                geometric_centers[base_index] = (
-                    (ring_center[0] + ring_center[1]) / 2
-                )
-                base_atom = base[base.atom_name == "N9"][0]
-
-            elif (base.res_name[0] in _THYMINE_CONTAINING_NUCLEOTIDES or
-                base.res_name[0] in _URACIL_CONTAINING_NUCLEOTIDES or
-                base.res_name[0] in _CYTOSINE_CONTAINING_NUCLEOTIDES):
-
-                geometric_centers[base_index] = ring_center[0]
-                base_atom = base[base.atom_name == "N1"][0]
-
-            else:
-
-                results[i] = GlycosidicBond.INVALID
-                break
-
-            sugar_atom = base[base.atom_name == "C1'"][0]
-
-            # Calculate the glycosidic bond direction vector
-            glycosidic_bonds[base_index] = sugar_atom.coord - base_atom.coord
-
-        # if the bond is not invalid compute the orientation
-        else:
-            # Calculate the direction vector between the geometric centers
-            geometric_centers_dir = geometric_centers[1] - geometric_centers[0]
-
-            # Check the orientation of the glycosidic bonds
-            if np.dot(
-                np.cross(geometric_centers_dir, glycosidic_bonds[0]),
-                np.cross(geometric_centers_dir, glycosidic_bonds[1])
-            ) < 0:
+    # Calculate the direction vector between the geometric centers
+    geometric_centers_dir = geometric_centers[:, 1] - geometric_centers[:, 0]
+    # Check the orientation of the glycosidic bonds
+    orientation = np.sum(
+        np.cross(geometric_centers_dir, glycosidic_bonds[:, 0])
+        * np.cross(geometric_centers_dir, glycosidic_bonds[:, 1]),
+        axis=-1
+    )
+    results = np.where(
+        orientation < 0, GlycosidicBond.TRANS, GlycosidicBond.CIS
+    ).astype('uint8')
+    results[~is_valid] = GlycosidicBond.INVALID
+    return results
 
-                results[i] = GlycosidicBond.TRANS
 
-            else:
+def _first_atom_in_residue(atom_array, residue_starts, atom_name):
+    """
+    Get the index of the first atom with the given name in each of the
+    given residues.
 
-                results[i] = GlycosidicBond.CIS
+    Parameters
+    ----------
+    atom_array : AtomArray
+        The atoms.
+    residue_starts : ndarray, dtype=int
+        The start indices of the residues.
+    atom_name : str
+        The name of the atom to find.
 
-    return results
+    Returns
+    -------
+    indices : ndarray, dtype=int
+        The atom indices with the same shape as `residue_starts`.
+        *-1*, if the residue does not contain such atom.
+    """
+    all_starts = get_residue_starts(atom_array, add_exclusive_stop=True)
+    residue_stops = all_starts[
+        np.searchsorted(all_starts, residue_starts, side="right")
+    ]
+    candidates = np.where(atom_array.atom_name == atom_name)[0]
+    # The first candidate at or after the residue start
+    positions = np.searchsorted(candidates, residue_starts)
+    indices = np.append(candidates, -1)[positions]
+    indices[(indices == -1) | (indices >= residue_stops)] = -1
+    return indices
 
 
 def base_stacking(atom_array, min_atoms_per_base=3):
@@ -691,57 +844,23 @@ def base_stacking(atom_array, min_atoms_per_base=3):
     # nucleotides' C1'-atoms was chosen.
     c1_mask = filter_nucleotides(atom_array) & (atom_array.atom_name == "C1'")
     stacking_candidates, _ = _get_proximate_residues(atom_array, c1_mask, 15)
-
-    # Contains the plausible pairs of stacked bases
-    stacked_bases = []
-
-    # Get the residue masks for each residue
-    base_masks = get_residue_masks(atom_array, stacking_candidates.flatten())
-
-    # Group every two masks together for easy iteration (each 'row' is
-    # respective to a row in ``stacking_candidates``)
-    base_masks = base_masks.reshape(
-        (stacking_candidates.shape[0], 2, atom_array.shape[0])
+    if len(stacking_candidates) == 0:
+        return np.zeros((0, 2), dtype=int)
+
+    # Match all bases to the standard bases at once.
+    # For each base the matrix contains the transformed vectors
+    # from the standard base reference frame to the structures'
+    # coordinates (see '_match_bases()')
+    unique_starts, inverse = np.unique(
+        stacking_candidates, return_inverse=True
     )
+    vectors = _match_bases(atom_array, unique_starts, min_atoms_per_base)[
+        inverse.reshape(stacking_candidates.shape)
+    ]
 
-    for (base1_index, base2_index), (base1_mask, base2_mask) in zip(
-        stacking_candidates, base_masks
-    ):
-        bases = (atom_array[base1_mask], atom_array[base2_mask])
-
-        # A list containing ndarray for each base with transformed
-        # vectors from the standard base reference frame to the
-        # structures' coordinates. The layout is as follows:
-        #
-        # [Origin coordinates]
-        # [Base normal vector]
-        # [SCHNAaP origin coordinates]
-        # [Aromatic Ring Center coordinates]
-        transformed_std_vectors = [None] * 2
-
-        # Generate the data necessary for analysis of each base.
-        for i in range(2):
-            base_tuple = _match_base(bases[i], min_atoms_per_base)
-
-            if(base_tuple is None):
-                break
-
-            transformed_std_vectors[i] = base_tuple
-
-        normal_vectors = np.vstack((transformed_std_vectors[0][1],
-                                    transformed_std_vectors[1][1]))
-        aromatic_ring_centers = [transformed_std_vectors[0][3:],
-                                        transformed_std_vectors[1][3:]]
-
-        # Check if the base pairs are stacked.
-        stacked = _check_base_stacking(aromatic_ring_centers, normal_vectors)
-
-        # If a stacking interaction is found, append the first indices
-        # of the bases´'residues to the output.
-        if stacked:
-            stacked_bases.append((base1_index, base2_index))
-
-    return np.array(stacked_bases)
+    # Check if the base pairs are stacked.
+    stacked = _check_base_stacking(vectors[:, 0], vectors[:, 1])
+    return stacking_candidates[stacked]
 
 
 def base_pairs(atom_array, min_atoms_per_base = 3, unique = True):
@@ -867,7 +986,6 @@ def base_pairs(atom_array, min_atoms_per_base = 3, unique = True):
     # Get only nucleosides
     nucleosides = atom_array[boolean_mask]
 
-
     # Get the base pair candidates according to a N/O cutoff distance,
     # where each base is identified as the first index of its respective
     # residue
@@ -875,331 +993,405 @@ def base_pairs(atom_array, min_atoms_per_base = 3, unique = True):
     basepair_candidates, n_o_matches = _get_proximate_residues(
         nucleosides, n_o_mask, 3.6
     )
-
-    # Contains the plausible base pairs
-    basepairs = []
-    # Contains the number of hydrogens for each plausible base pair
-    basepairs_hbonds = []
-
-    # Get the residue masks for each residue
-    base_masks = get_residue_masks(nucleosides, basepair_candidates.flatten())
-
-    # Group every two masks together for easy iteration (each 'row' is
-    # respective to a row in ``basepair_candidates``)
-    base_masks = base_masks.reshape(
-        (basepair_candidates.shape[0], 2, nucleosides.shape[0])
+    if len(basepair_candidates) == 0:
+        return np.zeros((0, 2), dtype=int)
+
+    # Match all candidate bases to the standard bases at once.
+    # For each base the matrix contains the transformed vectors
+    # from the standard base reference frame to the structures'
+    # coordinates (see '_match_bases()')
+    unique_starts, inverse = np.unique(
+        basepair_candidates, return_inverse=True
     )
+    vectors = _match_bases(nucleosides, unique_starts, min_atoms_per_base)[
+        inverse.reshape(basepair_candidates.shape)
+    ]
+    # Criteria 1-4
+    is_basepair = _check_dssr_criteria(vectors[:, 0], vectors[:, 1])
 
-    for (base1_index, base2_index), (base1_mask, base2_mask), n_o_pairs in zip(
-        basepair_candidates, base_masks, n_o_matches
-    ):
-        base1 = nucleosides[base1_mask]
-        base2 = nucleosides[base2_mask]
-
-        hbonds =  _check_dssr_criteria(
-            (base1, base2), min_atoms_per_base, unique
+    # Criterion 5: Presence of at least one hydrogen bond
+    #
+    # If no hydrogens are present use the number N/O pairs to
+    # decide between multiple pairing possibilities.
+    # Each N/O-pair is detected twice. Thus, the number of
+    # matches must be divided by two.
+    hbonds = n_o_matches / 2
+    # For bases that come with hydrogens, check for the presence of
+    # hydrogen bonds directly
+    residue_starts = get_residue_starts(nucleosides, add_exclusive_stop=True)
+    residue_indices = np.repeat(
+        np.arange(len(residue_starts) - 1), np.diff(residue_starts)
+    )
+    has_hydrogen = np.logical_or.reduceat(
+        nucleosides.element == "H", residue_starts[:-1]
+    )
+    candidate_residues = residue_indices[basepair_candidates]
+    check_hbonds = is_basepair & np.all(
+        has_hydrogen[candidate_residues], axis=-1
+    )
+    if np.any(check_hbonds):
+        hbonds[check_hbonds] = _count_hbonds(
+            nucleosides, residue_indices, candidate_residues[check_hbonds]
         )
+        is_basepair &= ~check_hbonds | (hbonds > 0)
 
-        # If no hydrogens are present use the number N/O pairs to
-        # decide between multiple pairing possibilities.
-
-        if hbonds is None:
-            # Each N/O-pair is detected twice. Thus, the number of
-            # matches must be divided by two.
-            hbonds = n_o_pairs/2
-        if hbonds != -1:
-            basepairs.append((base1_index, base2_index))
-            if unique:
-                basepairs_hbonds.append(hbonds)
-
-    basepair_array = np.array(basepairs)
+    basepair_array = basepair_candidates[is_basepair]
+    hbonds = hbonds[is_basepair]
 
     if unique:
-        # Contains all non-unique base pairs that are flagged to be
-        # removed
-        to_remove = []
-
-        # Get all bases that have non-unique pairing interactions
-        base_indices, occurrences = np.unique(basepairs, return_counts=True)
-        for base_index, occurrence in zip(base_indices, occurrences):
-            if(occurrence > 1):
-                # Write the non-unique base pairs to a dictionary as
-                # 'index: number of hydrogen bonds'
-                remove_candidates = {}
-                for i, row in enumerate(
-                    np.asarray(basepair_array == base_index)
-                ):
-                    if(np.any(row)):
-                        remove_candidates[i] = basepairs_hbonds[i]
-                # Flag all non-unique base pairs for removal except the
-                # one that has the most hydrogen bonds
-                del remove_candidates[
-                    max(remove_candidates, key=remove_candidates.get)
-                ]
-                to_remove += list(remove_candidates.keys())
-        # Remove all flagged base pairs from the output `ndarray`
-        basepair_array = np.delete(basepair_array, to_remove, axis=0)
+        # If multiple pairings of a base are plausible, the pairing with
+        # the most hydrogen bonds is selected
+        basepair_array = basepair_array[
+            _select_unique_pairs(basepair_array, hbonds)
+        ]
 
     # Remap values to original atom array
     if len(basepair_array) > 0:
         basepair_array = np.where(boolean_mask)[0][basepair_array]
-        for i, row in enumerate(basepair_array):
-            basepair_array[i] = get_residue_starts_for(atom_array, row)
+        basepair_array = get_residue_starts_for(
+            atom_array, basepair_array.flatten()
+        ).reshape(basepair_array.shape)
     return basepair_array
 
 
-def _check_dssr_criteria(basepair, min_atoms_per_base, unique):
+def _count_hbonds(nucleosides, residue_indices, residue_pairs):
     """
-    Check the DSSR criteria of a potential base pair.
+    Count the hydrogen bonds within each given pair of residues.
+
+    The hydrogen bonds are computed for all involved residues in a
+    single :func:`hbond()` call.
 
     Parameters
     ----------
-    basepair : tuple (AtomArray, AtomArray)
-        The two bases to check the criteria for as :class:`AtomArray`.
-    min_atoms_per_base : int
-        The number of atoms a nucleotides' base must have to be
-        considered a candidate for a base pair.
-    unique : bool
-        If ``True``, the shortest hydrogen bond length between the bases
-        is calculated for plausible base pairs.
+    nucleosides : AtomArray
+        The nucleosides.
+    residue_indices : ndarray, dtype=int, shape=(n,)
+        The index of the residue each atom belongs to.
+    residue_pairs : ndarray, dtype=int, shape=(p,2)
+        The residue indices of each pair.
 
     Returns
     -------
-    satisfied : int
-        `> 0` if the base pair satisfies the criteria and `-1`,
-        if it does not.
-        If unique is ``True``, the number of hydrogen bonds is
-        returned for plausible base pairs.
+    count : ndarray, dtype=int, shape=(p,)
+        The number of hydrogen bonds between any two atoms of each
+        residue pair, including the hydrogen bonds within each residue.
+    """
+    selection = np.isin(residue_indices, residue_pairs)
+    triplets = hbond(nucleosides, selection, selection)
+    donor_residues = residue_indices[triplets[:, 0]]
+    acceptor_residues = residue_indices[triplets[:, 2]]
+
+    n_residues = residue_indices[-1] + 1
+    is_intra = donor_residues == acceptor_residues
+    intra_counts = np.bincount(
+        donor_residues[is_intra], minlength=n_residues
+    )
+    inter_keys, inter_counts = np.unique(
+        _pair_keys(
+            donor_residues[~is_intra], acceptor_residues[~is_intra],
+            n_residues
+        ),
+        return_counts=True
+    )
+    pair_keys = _pair_keys(residue_pairs[:, 0], residue_pairs[:, 1], n_residues)
+    positions = np.searchsorted(inter_keys, pair_keys)
+    # Append a zero count for keys that are not found
+    inter_counts = np.append(inter_counts, 0)
+    positions[
+        np.append(inter_keys, -1)[positions] != pair_keys
+    ] = len(inter_keys)
+    return (
+        intra_counts[residue_pairs[:, 0]]
+        + intra_counts[residue_pairs[:, 1]]
+        + inter_counts[positions]
+    )
+
+
+def _select_unique_pairs(basepairs, hbonds):
     """
+    Select the base pairs that have the most hydrogen bonds for all of
+    their bases.
 
-    # A list containing ndarray for each base with transformed
-    # vectors from the standard base reference frame to the structures'
-    # coordinates. The layout is as follows:
-    #
-    # [Origin coordinates]
-    # [Base normal vector]
-    # [SCHNAaP origin coordinates]
-    # [Aromatic Ring Center coordinates]
-    transformed_std_vectors = [None] * 2
-
-    # Generate the data necessary for analysis of each base.
-    for i in range(2):
-        transformed_std_vectors[i] = _match_base(
-            basepair[i], min_atoms_per_base
-        )
+    Parameters
+    ----------
+    basepairs : ndarray, dtype=int, shape=(p,2)
+        The base pairs.
+    hbonds : ndarray, shape=(p,)
+        The number of hydrogen bonds for each base pair.
+
+    Returns
+    -------
+    selection : ndarray, dtype=bool, shape=(p,)
+        True for base pairs, that are selected.
+    """
+    if len(basepairs) == 0:
+        return np.zeros(0, dtype=bool)
+    pair_indices = np.repeat(np.arange(len(basepairs)), 2)
+    bases = basepairs.flatten()
+    # Sort by base, then by descending number of hydrogen bonds and
+    # finally by the position of the pair, so that the first pair for
+    # each base is the one with the most hydrogen bonds
+    order = np.lexsort((pair_indices, -hbonds[pair_indices], bases))
+    bases = bases[order]
+    pair_indices = pair_indices[order]
+    is_first = np.ones(len(bases), dtype=bool)
+    is_first[1:] = bases[1:] != bases[:-1]
+    # A base pair is kept, if it is the best pair for both of its bases
+    best_count = np.bincount(
+        pair_indices[is_first], minlength=len(basepairs)
+    )
+    return best_count == 2
+
+
+def _check_dssr_criteria(vectors1, vectors2):
+    """
+    Check the DSSR criteria (i)-(iv) of potential base pairs.
 
-        if(transformed_std_vectors[i] is None):
-            return -1
+    The presence of hydrogen bonds (criterion (v)) is not checked.
 
-    origins = np.vstack((transformed_std_vectors[0][0],
-                         transformed_std_vectors[1][0]))
-    normal_vectors = np.vstack((transformed_std_vectors[0][1],
-                                transformed_std_vectors[1][1]))
-    schnaap_origins = np.vstack((transformed_std_vectors[0][2],
-                                 transformed_std_vectors[1][2]))
-    aromatic_ring_centers = [transformed_std_vectors[0][3:],
-                                       transformed_std_vectors[1][3:]]
+    Parameters
+    ----------
+    vectors1, vectors2 : ndarray, dtype=float, shape=(p,5,3)
+        The transformed standard vectors of the first and second base
+        of each potential base pair, as returned by
+        :func:`_match_bases()`.
+
+    Returns
+    -------
+    satisfied : ndarray, dtype=bool, shape=(p,)
+        True for potential base pairs, that satisfy the criteria.
+    """
+    origins = np.stack((vectors1[:, 0], vectors2[:, 0]), axis=1)
+    normal_vectors = np.stack((vectors1[:, 1], vectors2[:, 1]), axis=1)
+    schnaap_origins = np.stack((vectors1[:, 2], vectors2[:, 2]), axis=1)
+    normal_dot = np.sum(normal_vectors[:, 0] * normal_vectors[:, 1], axis=-1)
 
     # Criterion 1: Distance between orgins <=15 Å
-    if not (distance(origins[0], origins[1]) <= 15):
-        return -1
+    satisfied = distance(origins[:, 0], origins[:, 1]) <= 15
 
     # Criterion 2: Vertical separation <=2.5 Å
     #
     # Average the base normal vectors. If the angle between the vectors
     # is >=90°, flip one vector before averaging
-    mean_normal_vector = (
-        normal_vectors[0] + (normal_vectors[1] * np.sign(np.dot(
-            normal_vectors[0], normal_vectors[1]
-        )))
+    mean_normal_vectors = (
+        normal_vectors[:, 0]
+        + normal_vectors[:, 1] * np.sign(normal_dot)[:, np.newaxis]
     ) / 2
-    norm_vector(mean_normal_vector)
+    mean_normal_vectors /= np.linalg.norm(
+        mean_normal_vectors, axis=-1
+    )[:, np.newaxis]
     # Calculate the distance vector between the two SCHNAaP origins
-    origin_distance_vector = schnaap_origins[1] - schnaap_origins[0]
-
+    origin_distance_vectors = schnaap_origins[:, 1] - schnaap_origins[:, 0]
     # The scalar projection of the distance vector between the two
     # origins onto the averaged normal vectors is the vertical
     # seperation
-    if not abs(np.dot(origin_distance_vector, mean_normal_vector)) <= 2.5:
-        return -1
+    satisfied &= np.abs(np.sum(
+        origin_distance_vectors * mean_normal_vectors, axis=-1
+    )) <= 2.5
 
     # Criterion 3: Angle between normal vectors <=65°
-    if not (np.arccos(np.dot(normal_vectors[0], normal_vectors[1]))
-            >= ((115*np.pi)/180)):
-        return -1
+    satisfied &= np.arccos(normal_dot) >= ((115*np.pi)/180)
 
     # Criterion 4: Absence of stacking
-    if _check_base_stacking(aromatic_ring_centers, normal_vectors):
-        return -1
+    satisfied &= ~_check_base_stacking(vectors1, vectors2)
 
-    # Criterion 5: Presence of at least one hydrogen bond
-    #
-    # Check if both bases came with hydrogens.
-    if (("H" in basepair[0].element)
-        and ("H" in basepair[1].element)):
-        # For Structures that contain hydrogens, check for their
-        # presence directly.
-        #
-        # Generate input atom array for ``hbond``
-        potential_basepair = basepair[0] + basepair[1]
-
-        # Get the number of hydrogen bonds
-        bonds = len(hbond(
-            potential_basepair,
-            np.ones_like(potential_basepair, dtype=bool),
-            np.ones_like(potential_basepair, dtype=bool)
-        ))
-
-        if bonds > 0:
-            return bonds
-        return -1
-
-    else:
-        # If the structure does not contain hydrogens return None
-        return None
-
-
-def _check_base_stacking(aromatic_ring_centers, normal_vectors):
+    return satisfied
+
+
+def _check_base_stacking(vectors1, vectors2):
     """
-    Check for base stacking between two bases.
+    Check for base stacking between pairs of bases.
 
     Parameters
     ----------
-    aromatic_ring_centers : list [ndarray, ndarray]
-        A list with the aromatic ring center coordinates as
-        :class:`ndarray`. Each row represents a ring center.
-    normal_vectors : ndarray shape=(2, 3)
-        The normal vectors of the bases.
+    vectors1, vectors2 : ndarray, dtype=float, shape=(p,5,3)
+        The transformed standard vectors of the first and second base
+        of each pair, as returned by :func:`_match_bases()`.
 
     Returns
     -------
-    base_stacking : bool
+    base_stacking : ndarray, dtype=bool, shape=(p,)
         ``True`` if base stacking is detected and ``False`` if not
     """
+    normal_vectors = np.stack((vectors1[:, 1], vectors2[:, 1]), axis=1)
+    # Distance vectors between each aromatic ring center of the first
+    # base and each ring center of the second base
+    distance_vectors = (
+        vectors2[:, np.newaxis, 3:] - vectors1[:, 3:, np.newaxis]
+    ).reshape(len(vectors1), -1, 3)
+    distances = np.linalg.norm(distance_vectors, axis=-1)
+    with np.errstate(invalid="ignore"):
+        normalized_distance_vectors = (
+            distance_vectors / distances[..., np.newaxis]
+        )
 
-    # Contains the normalized distance vectors between ring centers less
-    # than 4.5 Å apart.
-    normalized_distance_vectors = []
-
-    # Criterion 1: Distance between aromatic ring centers <=4.5 Å
-    wrong_distance = True
-    for ring_center1 in aromatic_ring_centers[0]:
-        for ring_center2 in aromatic_ring_centers[1]:
-            if (distance(ring_center1, ring_center2) <= 4.5):
-                wrong_distance = False
-                normalized_distance_vectors.append(ring_center2 - ring_center1)
-                norm_vector(normalized_distance_vectors[-1])
-    if wrong_distance:
-        return False
-
-    # Criterion 2: Angle between normal vectors or its supplement <=23°
-    normal_vectors_angle = np.rad2deg(
-        np.arccos(np.dot(normal_vectors[0], normal_vectors[1]))
-    )
-    if (normal_vectors_angle >= 23) and (normal_vectors_angle <= 157):
-        return False
-
-    # Criterion 3: Angle between one normalized distance vector and
-    # each of the bases' normal vector or supplement <=40°
-    for normal_vector in normal_vectors:
-        for normalized_dist_vector in normalized_distance_vectors:
-            dist_normal_vector_angle = np.rad2deg(
-                np.arccos(np.dot(normal_vector, normalized_dist_vector))
-            )
-            if ((dist_normal_vector_angle >= 40) and
-                (dist_normal_vector_angle <= 140)):
-                return False
+        # Criterion 1: Distance between aromatic ring centers <=4.5 Å
+        is_close = distances <= 4.5
+        stacked = np.any(is_close, axis=-1)
+
+        # Criterion 2: Angle between normal vectors or its supplement <=23°
+        normal_vectors_angle = np.rad2deg(np.arccos(np.sum(
+            normal_vectors[:, 0] * normal_vectors[:, 1], axis=-1
+        )))
+        stacked &= ~(
+            (normal_vectors_angle >= 23) & (normal_vectors_angle <= 157)
+        )
+
+        # Criterion 3: Angle between one normalized distance vector and
+        # each of the bases' normal vector or supplement <=40°
+        dist_normal_vector_angles = np.rad2deg(np.arccos(np.sum(
+            normal_vectors[:, :, np.newaxis, :]
+            * normalized_distance_vectors[:, np.newaxis, :, :],
+            axis=-1
+        )))
+        is_tilted = (
+            (dist_normal_vector_angles >= 40)
+            & (dist_normal_vector_angles <= 140)
+            & is_close[:, np.newaxis, :]
+        )
+        stacked &= ~np.any(is_tilted, axis=(1, 2))
 
-    return True
+    return stacked
 
 
-def _match_base(nucleotide, min_atoms_per_base):
+def _match_bases(atom_array, residue_starts, min_atoms_per_base):
     """
-    Match the nucleotide to a corresponding standard base reference
-    frame.
+    Match nucleotides to the corresponding standard base reference
+    frames.
+
+    All nucleotides are superimposed onto their standard bases at once.
 
     Parameters
     ----------
-    nucleotide : AtomArray
-        The nucleotide to be matched to a standard base.
+    atom_array : AtomArray
+        The atoms containing the nucleotides.
+    residue_starts : ndarray, dtype=int, shape=(r,)
+        The start indices of the nucleotides to be matched to a
+        standard base.
     min_atoms_per_base : integer
         The number of atoms a base must have to be considered a
         candidate for a base pair.
 
     Returns
     -------
-    vectors : ndarray, dtype=float, shape=(n,3)
-        Transformed standard vectors, origin coordinates, base normal
-        vector, aromatic ring center coordinates.
+    vectors : ndarray, dtype=float, shape=(r,5,3)
+        For each nucleotide the transformed standard vectors:
+        Origin coordinates, base normal vector, SCHNAaP origin
+        coordinates and aromatic ring center coordinates.
+        The second ring center of pyrimidines and all vectors of
+        nucleotides that cannot be matched are *NaN*.
     """
-
-    # Standard vectors containing the origin and the base normal vectors
-    vectors = np.array([[0, 0, 0], [0, 0, 1]], dtype=float)
-
-    # Map the nucleotide to a reference base
-    one_letter_code, _ = map_nucleotide(nucleotide, min_atoms_per_base)
-
-    if one_letter_code is None:
-        return None
-
-    if (one_letter_code == 'A'):
-        std_base = _STD_ADENINE
-        std_ring_centers = _STD_ADENINE_RING_CENTERS
-    elif (one_letter_code == 'T'):
-        std_base = _STD_THYMINE
-        std_ring_centers = _STD_THYMINE_RING_CENTERS
-    elif (one_letter_code == 'C'):
-        std_base = _STD_CYTOSINE
-        std_ring_centers = _STD_CYTOSINE_RING_CENTERS
-    elif (one_letter_code == 'G'):
-        std_base = _STD_GUANINE
-        std_ring_centers = _STD_GUANINE_RING_CENTERS
-    elif (one_letter_code == 'U'):
-        std_base = _STD_URACIL
-        std_ring_centers = _STD_URACIL_RING_CENTERS
-
-    # Add the ring centers to the array of vectors to be transformed.
-    vectors = np.vstack((vectors, std_ring_centers))
-
-    # Select the matching atoms of the nucleotide and the standard base
-    nucleotide_matched = nucleotide[
-        np.isin(nucleotide.atom_name, std_base.atom_name)
+    n_residues = len(residue_starts)
+    vectors = np.full((n_residues, 5, 3), np.nan)
+    if n_residues == 0:
+        return vectors
+    all_starts = get_residue_starts(atom_array, add_exclusive_stop=True)
+    residue_stops = all_starts[
+        np.searchsorted(all_starts, residue_starts, side="right")
     ]
-    std_base_matched = std_base[
-        np.isin(std_base.atom_name, nucleotide.atom_name)
-    ]
-    # Ensure the nucleotide does not contain duplicate atom names
-    _, unique_indices = np.unique(
-        nucleotide_matched.atom_name, return_index=True
+
+    # Map the nucleotides to a reference base
+    base_types = np.full(n_residues, -1, dtype=int)
+    for i, (start, stop) in enumerate(zip(residue_starts, residue_stops)):
+        res_name = atom_array.res_name[start]
+        if res_name in _REFERENCE_NUCLEOTIDE_NAMES:
+            one_letter_code = res_name[-1]
+        else:
+            one_letter_code, _ = map_nucleotide(
+                atom_array[start : stop], min_atoms_per_base
+            )
+        if one_letter_code is not None:
+            base_types[i] = _STD_BASE_CODES.index(one_letter_code)
+
+    # Get the atom indices of each nucleotide
+    lengths = residue_stops - residue_starts
+    atom_residues = np.repeat(np.arange(n_residues), lengths)
+    atom_indices = (
+        np.arange(len(atom_residues))
+        - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        + np.repeat(residue_starts, lengths)
+    )
+    # Find the position of each atom in the matched standard base
+    atom_names = atom_array.atom_name[atom_indices]
+    positions = np.full(len(atom_indices), -1, dtype=int)
+    for base_type, std_names in enumerate(_STD_BASE_ATOM_NAMES):
+        mask = base_types[atom_residues] == base_type
+        order = np.argsort(std_names)
+        sorted_names = std_names[order]
+        pos = np.clip(
+            np.searchsorted(sorted_names, atom_names[mask]),
+            0, len(sorted_names) - 1
+        )
+        positions[mask] = np.where(
+            sorted_names[pos] == atom_names[mask], order[pos], -1
+        )
+    # Ensure the nucleotide does not contain duplicate atom names:
+    # Only the first occurrence of a base atom is used
+    max_length = _STD_BASE_COORD.shape[1]
+    keys = atom_residues * max_length + positions
+    _, first = np.unique(
+        np.where(positions != -1, keys, -1), return_index=True
     )
-    nucleotide_matched = nucleotide_matched[unique_indices]
+    first = first[positions[first] != -1]
+    matched_residues = atom_residues[first]
+    matched_positions = positions[first]
+    matched_counts = np.bincount(matched_residues, minlength=n_residues)
+
     # Only continue if minimum number of matching atoms is reached
-    if len(nucleotide_matched) < min_atoms_per_base:
+    is_incomplete = (base_types != -1) & (matched_counts < min_atoms_per_base)
+    for i in np.where(is_incomplete)[0]:
         warnings.warn(
-            f"Nucleotide with res_id {nucleotide.res_id[0]} and "
-            f"chain_id {nucleotide.chain_id[0]} has less than 3 base "
-            f"atoms, unable to check for base pair.",
+            f"Nucleotide with res_id "
+            f"{atom_array.res_id[residue_starts[i]]} and "
+            f"chain_id {atom_array.chain_id[residue_starts[i]]} has less "
+            f"than 3 base atoms, unable to check for base pair.",
             IncompleteStructureWarning
         )
-        return None
-    # Reorder the atoms of the nucleotide to obtain the standard RCSB
-    # PDB atom order.
-    nucleotide_matched = nucleotide_matched[
-        standardize_order(nucleotide_matched)
-    ]
-
-    # Match the selected std_base to the base.
-    _, transformation = superimpose(nucleotide_matched, std_base_matched)
+    is_valid = (base_types != -1) & ~is_incomplete
+    if not np.any(is_valid):
+        return vectors
+
+    # Padded coordinates of the nucleotides and the standard bases
+    atom_mask = np.zeros((n_residues, max_length), dtype=bool)
+    atom_mask[matched_residues, matched_positions] = True
+    atom_mask = atom_mask[is_valid]
+    fixed = np.zeros((n_residues, max_length, 3))
+    fixed[matched_residues, matched_positions] \
+        = atom_array.coord[atom_indices[first]]
+    fixed = fixed[is_valid]
+    mobile = _STD_BASE_COORD[base_types[is_valid]] * atom_mask[..., np.newaxis]
+
+    # Superimpose the standard bases onto the nucleotides
+    # using the Kabsch algorithm
+    atom_counts = np.count_nonzero(atom_mask, axis=-1)[:, np.newaxis]
+    fix_centroid = np.sum(fixed, axis=1) / atom_counts
+    mob_centroid = np.sum(mobile, axis=1) / atom_counts
+    fix_centered = (
+        (fixed - fix_centroid[:, np.newaxis, :]) * atom_mask[..., np.newaxis]
+    )
+    mob_centered = (
+        (mobile - mob_centroid[:, np.newaxis, :]) * atom_mask[..., np.newaxis]
+    )
+    cov = np.einsum("rai,raj->rij", fix_centered, mob_centered)
+    v, _, w = np.linalg.svd(cov)
+    # Remove possibility of reflected atom coordinates
+    is_reflected = np.linalg.det(v) * np.linalg.det(w) < 0
+    v[is_reflected, :, -1] *= -1
+    rotation = np.matmul(v, w)
 
     # Transform the vectors
-    trans1, rot, trans2 = transformation
-    vectors += trans1
-    vectors  = np.dot(rot, vectors.T).T
-    vectors += trans2
+    valid_vectors = (
+        _STD_BASE_VECTORS[base_types[is_valid]]
+        - mob_centroid[:, np.newaxis, :]
+    )
+    valid_vectors = np.einsum("rij,rvj->rvi", rotation, valid_vectors)
+    valid_vectors += fix_centroid[:, np.newaxis, :]
     # Normalize the base-normal-vector
-    vectors[1,:] = vectors[1,:]-vectors[0,:]
-    norm_vector(vectors[1,:])
-
+    valid_vectors[:, 1] -= valid_vectors[:, 0]
+    valid_vectors[:, 1] /= np.linalg.norm(
+        valid_vectors[:, 1], axis=-1
+    )[:, np.newaxis]
+    vectors[is_valid] = valid_vectors
     return vectors
 
 
@@ -1333,7 +1525,7 @@ def map_nucleotide(residue, min_atoms_per_base=3, rmsd_cutoff=0.28):
             f"Base Type {residue.res_name[0]} not supported. ",
             UnexpectedStructureWarning
         )
-        return None
+        return None, False
 
     return best_base, False
 
@@ -1369,33 +1561,26 @@ def _get_proximate_residues(atom_array, boolean_mask, cutoff):
         atom_array, cutoff, selection=boolean_mask
     ).get_atoms(atom_array.coord[boolean_mask], cutoff)
 
-    # Loop through the indices of potential partners
-    pairs = []
-    for candidate, partners in zip(np.argwhere(boolean_mask)[:, 0], indices):
-        for partner in partners:
-            if partner != -1:
-                pairs.append((candidate, partner))
+    # Pairs of candidate and partner indices, without padding values
+    candidates = np.repeat(np.where(boolean_mask)[0], indices.shape[1])
+    partners = indices.flatten()
+    is_valid = partners != -1
+    pairs = np.stack((candidates[is_valid], partners[is_valid]), axis=-1)
+    if len(pairs) == 0:
+        return np.zeros((0, 2), dtype=int), np.zeros(0, dtype=int)
 
     # Get the residue starts for the indices of the candidate/partner
     # indices.
-    pairs = np.array(pairs)
-    basepair_candidates_shape = pairs.shape
     pairs = get_residue_starts_for(
         atom_array, pairs.flatten()
-    ).reshape(basepair_candidates_shape)
+    ).reshape(pairs.shape)
 
     # Remove candidates where the pairs are from the same residue
-    pairs = np.delete(
-        pairs, np.where(
-            pairs[:,0] == pairs[:,1]
-        ), axis=0
-    )
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
     # Sort the residue starts for each pair
-    for i, candidate in enumerate(pairs):
-        pairs[i] = sorted(candidate)
+    pairs = np.sort(pairs, axis=-1)
     # Make sure each pair is only listed once, count the occurrences
     pairs, count = np.unique(pairs, axis=0, return_counts=True)
-
     return pairs, count
 
 
@@ -20,7 +20,6 @@ from libc.stdlib cimport free, malloc, realloc
 import itertools
 import numbers
 from enum import IntEnum
-import networkx as nx
 import numpy as np
 from .error import BadStructureError
 from ..copyable import Copyable
@@ -422,6 +421,10 @@ class BondList(Copyable):
 
         cdef uint32[:,:] all_bonds_v = self._bonds
 
+        # Importing NetworkX is expensive
+        # -> only import it, when a graph is actually created
+        import networkx as nx
+
         g = nx.Graph()
         cdef list edges = [None] * all_bonds_v.shape[0]
         for i in range(all_bonds_v.shape[0]):
@@ -1570,50 +1573,12 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True):
     Although this includes most molecules one encounters, this will fail
     for exotic molecules, e.g. specialized inhibitors.
     """
-    from .info.bonds import bond_dataset
     from .residues import get_residue_starts
 
-    cdef list bonds = []
     cdef uint8[:] mask = _prepare_mask(atom_mask, atoms.array_length())
-    cdef int i
-    cdef int curr_start_i, next_start_i
-    cdef np.ndarray atom_names = atoms.atom_name
-    cdef np.ndarray atom_names_in_res
-    cdef np.ndarray res_names = atoms.res_name
-    cdef str atom_name1, atom_name2
-    cdef np.ndarray atom_indices1, atom_indices2
-    cdef int atom_index1, atom_index2
-    cdef int bond_order
-    # Obtain dictionary containing bonds for all residues in RCSB
-    cdef dict bond_dict = bond_dataset()
-    cdef dict bond_dict_for_res
 
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    # Omit exclsive stop in 'residue_starts'
-    for i in range(len(residue_starts)-1):
-        curr_start_i = residue_starts[i]
-        next_start_i = residue_starts[i+1]
-
-        bond_dict_for_res = bond_dict.get(res_names[curr_start_i])
-        if bond_dict_for_res is None:
-            # Residue is not in dataset -> skip this residue
-            continue
-        atom_names_in_res = atom_names[curr_start_i : next_start_i]
-        for (atom_name1, atom_name2), bond_type in bond_dict_for_res.items():
-            atom_indices1 = np.where(atom_names_in_res == atom_name1)[0]
-            atom_indices2 = np.where(atom_names_in_res == atom_name2)[0]
-            if len(atom_indices1) == 0 or len(atom_indices2) == 0:
-                # The pair of atoms in this bond from the dataset is not
-                # in the residue of the atom array
-                # -> skip this bond
-                continue
-            bonds.append((
-                curr_start_i + atom_indices1[0],
-                curr_start_i + atom_indices2[0],
-                bond_type
-            ))
-             
-    bond_list = BondList(atoms.array_length(), np.array(bonds))
+    bond_list = _connect_intra_residue(atoms, residue_starts)
     
     if inter_residue:
         inter_bonds = _connect_inter_residue(atoms, residue_starts)
@@ -1637,6 +1602,108 @@ def _prepare_mask(atom_mask, array_length):
 
 
 
+def _connect_intra_residue(atoms, residue_starts):
+    """
+    Create a :class:`BondList` containing the bonds within each residue
+    based on the bonds in the RCSB ``components.cif`` dataset.
+
+    The bonds are matched for all residues with the same name at once.
+    
+    Parameters
+    ----------
+    atoms : AtomArray or AtomArrayStack
+        The structure to create the :class:`BondList` for.
+    residue_starts : ndarray, dtype=int
+        Return value of
+        ``get_residue_starts(atoms, add_exclusive_stop=True)``.
+    
+    Returns
+    -------
+    BondList
+        A bond list containing all intra residue bonds.
+        The bonds are ordered by residue and within a residue by their
+        order in the dataset.
+    """
+    from .info.bonds import _get_bond_template
+
+    atom_names = atoms.atom_name
+    residue_indices = np.repeat(
+        np.arange(len(residue_starts) - 1), np.diff(residue_starts)
+    )
+    unique_res_names, res_name_indices = np.unique(
+        atoms.res_name[residue_starts[:-1]], return_inverse=True
+    )
+    res_name_indices = res_name_indices.flatten()
+    # For each atom the index of its residue name in 'unique_res_names'
+    atom_res_name_indices = res_name_indices[residue_indices]
+
+    bond_arrays = []
+    sort_keys = []
+    for i, res_name in enumerate(unique_res_names):
+        template = _get_bond_template(str(res_name))
+        if template is None:
+            # Residue is not in dataset -> skip this residue
+            continue
+        template_atom_names, template_bonds, template_types = template
+        if len(template_bonds) == 0:
+            continue
+        # The residues with this name and the atoms in these residues
+        residues = np.where(res_name_indices == i)[0]
+        atom_indices = np.where(atom_res_name_indices == i)[0]
+        
+        # Find the position of each atom name in the template
+        template_pos = np.searchsorted(
+            template_atom_names, atom_names[atom_indices]
+        )
+        template_pos[template_pos == len(template_atom_names)] = 0
+        is_in_template = (
+            template_atom_names[template_pos] == atom_names[atom_indices]
+        )
+        atom_indices = atom_indices[is_in_template]
+        template_pos = template_pos[is_in_template]
+
+        # Map each atom of the template in each residue to the index
+        # of the first atom in the residue with the corresponding name
+        # or -1 if the atom is missing
+        local_residues = np.searchsorted(
+            residues, residue_indices[atom_indices]
+        )
+        table = np.full(
+            (len(residues), len(template_atom_names)), -1, dtype=np.int64
+        )
+        keys = local_residues * len(template_atom_names) + template_pos
+        _, first_occurrence = np.unique(keys, return_index=True)
+        table.flat[keys[first_occurrence]] = atom_indices[first_occurrence]
+        
+        atom_indices1 = table[:, template_bonds[:, 0]]
+        atom_indices2 = table[:, template_bonds[:, 1]]
+        # If the pair of atoms in a bond from the dataset is not in the
+        # residue of the atom array, the bond is skipped
+        is_present = (atom_indices1 != -1) & (atom_indices2 != -1)
+        bond_arrays.append(np.stack([
+            atom_indices1[is_present],
+            atom_indices2[is_present],
+            np.broadcast_to(template_types, is_present.shape)[is_present]
+        ], axis=-1))
+        # Keys for restoring the order of bonds in the structure:
+        # First by residue, then by the order in the dataset
+        sort_keys.append(np.stack([
+            np.broadcast_to(residues[:, np.newaxis], is_present.shape)
+            [is_present],
+            np.broadcast_to(
+                np.arange(len(template_bonds)), is_present.shape
+            )[is_present]
+        ], axis=-1))
+    
+    if len(bond_arrays) == 0:
+        return BondList(atoms.array_length())
+    bonds = np.concatenate(bond_arrays)
+    sort_keys = np.concatenate(sort_keys)
+    order = np.lexsort((sort_keys[:, 1], sort_keys[:, 0]))
+    return BondList(atoms.array_length(), bonds[order])
+
+
+
 _PEPTIDE_LINKS = ["PEPTIDE LINKING", "L-PEPTIDE LINKING", "D-PEPTIDE LINKING"]
 _NUCLEIC_LINKS = ["RNA LINKING", "DNA LINKING"]
 
@@ -1865,6 +1932,8 @@ def find_rotatable_bonds(bonds):
     cdef uint32 SINGLE = int(BondType.SINGLE)
     cdef bint in_same_cycle
 
+    import networkx as nx
+
     bond_graph = bonds.as_graph()
     cycles = nx.algorithms.cycles.cycle_basis(bond_graph)
 
@@ -11,7 +11,7 @@ __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
 __all__ = ["vectors_from_unitcell", "unitcell_from_vectors", "box_volume",
            "repeat_box", "repeat_box_coord", "move_inside_box",
-           "remove_pbc", "remove_pbc_from_coord",
+           "remove_pbc", "remove_pbc_from_coord", "TrajectoryUnwrapper",
            "coord_to_fraction", "fraction_to_coord", "is_orthogonal"]
 
 from collections.abc import Iterable
@@ -19,7 +19,8 @@ from numbers import Integral
 import numpy as np
 import numpy.linalg as linalg
 from .util import vector_dot
-from .atoms import repeat
+from .atoms import AtomArray, AtomArrayStack, repeat
+from .bonds import BondList
 from .molecules import get_molecule_masks
 from .chains import get_chain_masks, get_chain_starts
 from .error import BadStructureError
@@ -125,7 +126,7 @@ def box_volume(box):
     return np.abs(linalg.det(box))
 
 
-def repeat_box(atoms, amount=1):
+def repeat_box(atoms, amount=1, cutoff=None):
     r"""
     Repeat the atoms in a box by duplicating and placing them in
     adjacent boxes.
@@ -135,6 +136,11 @@ def repeat_box(atoms, amount=1):
     The coordinates of the duplicate atoms are translated accordingly
     by the box coordinates.
 
+    If only the periodic neighborhood of the central box is of
+    interest, e.g. to find periodic neighbors within a
+    :class:`CellList`, the duplicates can be restricted to the atoms
+    within a `cutoff` distance to the central box.
+
     Parameters
     ----------
     atoms : AtomArray or AtomArrayStack
@@ -148,6 +154,12 @@ def repeat_box(atoms, amount=1):
         :math:`(1 + 2 \cdot \text{amount}) ^ 3`.
         By default, one box is created in each direction, totalling in
         27 boxes.
+    cutoff : float, optional
+        If set, only those duplicate atoms are included, that are within
+        the given distance to the central box.
+        For an :class:`AtomArrayStack` a duplicate atom is included, if
+        this applies to any model.
+        By default, all atoms are duplicated.
 
     Returns
     -------
@@ -155,9 +167,9 @@ def repeat_box(atoms, amount=1):
         The repeated atoms.
         Includes the original atoms (central box) in the beginning of
         the atom array (stack).
-    indices : ndarray, dtype=int, shape=(n,3)
+    indices : ndarray, dtype=int, shape=(p,)
         Indices to the atoms in the original atom array (stack).
-        Equal to
+        If `cutoff` is not set, this is equal to
         ``numpy.tile(np.arange(atoms.array_length()), (1 + 2 * amount) ** 3)``.
     
     See also
@@ -229,11 +241,29 @@ def repeat_box(atoms, amount=1):
     >>> print(indices)
     [0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0
      1 0 1 0 1 0 1 0 1 0 1 0 1 0 1 0 1]
+
+    Only include duplicates within 1.5 Å to the central box:
+
+    >>> repeated, indices = repeat_box(array, cutoff=1.5)
+    >>> print(repeated.coord)
+    [[ 1.  5.  3.]
+     [-1.  2.  5.]
+     [11.  5.  3.]
+     [ 9.  2.  5.]]
+    >>> print(indices)
+    [0 1 0 1]
     """
     if atoms.box is None:
         raise BadStructureError("Structure has no box")
     
-    repeat_coord, indices = repeat_box_coord(atoms.coord, atoms.box)
+    repeat_coord, indices, box_lengths = _repeat_box_coord(
+        atoms.coord, atoms.box, amount, cutoff
+    )
+    if cutoff is not None:
+        repeated = _select_repeated(
+            atoms, repeat_coord, indices, box_lengths
+        )
+        return repeated, indices
     # Unroll repeated coordinates for input to 'repeat()'
     if repeat_coord.ndim == 2:
         repeat_coord = repeat_coord.reshape(-1, atoms.array_length(), 3)
@@ -245,7 +275,34 @@ def repeat_box(atoms, amount=1):
     return repeat(atoms, repeat_coord), indices
 
 
-def repeat_box_coord(coord, box, amount=1):
+def _select_repeated(atoms, repeat_coord, indices, box_lengths):
+    """
+    Create the repeated atoms from the selected atom `indices` of
+    each box, whose coordinates are given by `repeat_coord`.
+    `box_lengths` contains the number of selected atoms in each box.
+    """
+    if isinstance(atoms, AtomArray):
+        repeated = AtomArray(len(indices))
+    else:
+        repeated = AtomArrayStack(atoms.stack_depth(), len(indices))
+    repeated.coord = repeat_coord
+    for category in atoms.get_annotation_categories():
+        repeated.set_annotation(
+            category, atoms.get_annotation(category)[indices]
+        )
+    if atoms.bonds is not None:
+        # Bonds are only created between atoms in the same box
+        box_starts = np.cumsum(box_lengths)[:-1]
+        repeated_bonds = BondList(0)
+        for box_indices in np.split(indices, box_starts):
+            repeated_bonds += atoms.bonds[box_indices]
+        repeated.bonds = repeated_bonds
+    if atoms.box is not None:
+        repeated.box = atoms.box.copy()
+    return repeated
+
+
+def repeat_box_coord(coord, box, amount=1, cutoff=None):
     r"""
     Similar to :func:`repeat_box()`, repeat the coordinates in a box by
     duplicating and placing them in adjacent boxes.
@@ -266,6 +323,12 @@ def repeat_box_coord(coord, box, amount=1):
         :math:`(1 + 2 \cdot \text{amount}) ^ 3`.
         By default, one box is created in each direction, totalling in
         27 boxes.
+    cutoff : float, optional
+        If set, only those duplicate coordinates are included, that are
+        within the given distance to the central box.
+        For multiple models a duplicate coordinate is included, if this
+        applies to any model.
+        By default, all coordinates are duplicated.
 
     Returns
     -------
@@ -274,21 +337,62 @@ def repeat_box_coord(coord, box, amount=1):
         `coord`.
         Includes the original coordinates (central box) in the beginning
         of the array.
-    indices : ndarray, dtype=int, shape=(p,3)
+    indices : ndarray, dtype=int, shape=(p,)
         Indices to the coordinates in the original array.
-        Equal to
+        If `cutoff` is not set, this is equal to
         ``numpy.tile(np.arange(coord.shape[-2]), (1 + 2 * amount) ** 3)``.
+
+    Notes
+    -----
+    For the `cutoff` the distance of a duplicate coordinate to the
+    central box is estimated by its distance to each pair of opposing
+    faces of the central box.
+    Hence, for coordinates near the edges and corners of the box,
+    a few duplicates outside the `cutoff` distance might be included.
+    However, no duplicates within the `cutoff` distance are omitted.
+    """
+    repeat_coord, indices, _ = _repeat_box_coord(coord, box, amount, cutoff)
+    return repeat_coord, indices
+
+
+def _repeat_box_coord(coord, box, amount, cutoff):
+    """
+    Implementation of :func:`repeat_box_coord()`, that additionally
+    returns the number of coordinates in each box, in the order
+    the boxes appear in the repeated coordinates.
     """
     if not isinstance(amount, Integral):
         raise TypeError("The amount must be an integer")
+    if cutoff is not None:
+        fractions = coord_to_fraction(coord, box)
+        # The height of the box perpendicular to each pair of faces
+        heights = box_volume(box)[..., np.newaxis] / linalg.norm(
+            np.cross(box[..., [1,2,0], :], box[..., [2,0,1], :]), axis=-1
+        )
+        # 'newaxis' to apply the cutoff to all atoms for each model
+        frac_cutoff = (cutoff / heights)[..., np.newaxis, :]
     # List of numpy arrays for each box repeat
     coords_for_boxes = [coord]
+    indices_for_boxes = [np.arange(coord.shape[-2])]
     for i in range(-amount, amount+1):
         for j in range(-amount, amount+1):
             for k in range(-amount, amount+1):
                 # Omit the central box
                 if i != 0 or j != 0 or k != 0:
-                    temp_coord = coord.copy()
+                    if cutoff is None:
+                        temp_coord = coord.copy()
+                        indices_for_boxes.append(indices_for_boxes[0])
+                    else:
+                        shifted = fractions + np.array([i,j,k])
+                        # Distance to the central box in fractions
+                        # of the box height
+                        outside = np.maximum(-shifted, shifted - 1)
+                        mask = np.all(outside <= frac_cutoff, axis=-1)
+                        if mask.ndim == 2:
+                            # Multiple models
+                            mask = np.any(mask, axis=0)
+                        temp_coord = coord[..., mask, :]
+                        indices_for_boxes.append(np.where(mask)[0])
                     # Shift coordinates to adjacent box/unit cell
                     translation_vec = np.sum(
                         box * np.array([i,j,k])[:, np.newaxis],
@@ -300,7 +404,8 @@ def repeat_box_coord(coord, box, amount=1):
                     coords_for_boxes.append(temp_coord)
     return (
         np.concatenate(coords_for_boxes, axis=-2),
-        np.tile(np.arange(coord.shape[-2]), (1 + 2 * amount) ** 3)
+        np.concatenate(indices_for_boxes),
+        np.array([len(box_indices) for box_indices in indices_for_boxes])
     )
 
 
@@ -489,6 +594,139 @@ def remove_pbc_from_coord(coord, box):
     return sanitized_coord
 
 
+class TrajectoryUnwrapper:
+    """
+    Remove jumps of atoms over periodic boundaries between consecutive
+    frames of a trajectory, i.e. make the coordinates continuous.
+
+    In contrast to :func:`remove_pbc()`, which operates on each model
+    independently, this class keeps track of the displacements between
+    frames:
+    The displacement of each atom to its position in the preceding frame
+    is reduced to its minimum image and added to the unwrapped position
+    in the preceding frame.
+    Since the state of the last processed frame is stored, the frames
+    can be given chunk by chunk, e.g. from
+    :meth:`TrajectoryFile.read_iter()`, without holding the entire
+    trajectory in memory.
+
+    The first frame given to :meth:`unwrap()` is taken as it is.
+    Hence, if molecules should not be segmented in the unwrapped
+    trajectory, :func:`remove_pbc()` should be applied to the first
+    frame beforehand.
+
+    See also
+    --------
+    remove_pbc
+
+    Notes
+    -----
+    Atoms must not move more than half a box length between two
+    consecutive frames, otherwise the jump cannot be distinguished from
+    an actual displacement.
+    The minimum image of the displacement is calculated in fractional
+    coordinates of the box of the current frame, so that changing boxes
+    (e.g. from *NPT* simulations) are supported
+    :footcite:`Bulow2020`.
+
+    References
+    ----------
+
+    .. footbibliography::
+
+    Examples
+    --------
+
+    >>> box = np.identity(3) * 10
+    >>> # A single atom moves in positive x-direction over the boundary
+    >>> coord = np.array([[[8,5,5]], [[9.5,5,5]], [[1,5,5]], [[2.5,5,5]]])
+    >>> unwrapper = TrajectoryUnwrapper()
+    >>> # Unwrap the trajectory in chunks of two frames
+    >>> print(unwrapper.unwrap(coord[:2], box))
+    [[[8.0 5.0 5.0]]
+    <BLANKLINE>
+     [[9.5 5.0 5.0]]]
+    >>> print(unwrapper.unwrap(coord[2:], box))
+    [[[11.0  5.0  5.0]]
+    <BLANKLINE>
+     [[12.5  5.0  5.0]]]
+    """
+
+    def __init__(self):
+        self._last_coord = None
+        self._last_unwrapped = None
+
+
+    def reset(self):
+        """
+        Discard the state of the last processed frame, so that the next
+        given frame is taken as new start of a trajectory.
+        """
+        self._last_coord = None
+        self._last_unwrapped = None
+
+
+    def unwrap(self, coord, box):
+        """
+        Unwrap the coordinates of the given frame(s), continuing from
+        the frames processed before.
+
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
+            The coordinates of a single frame or of *m* consecutive
+            frames.
+        box : ndarray, dtype=float, shape=(3,3) or shape=(m,3,3)
+            The box for all given frames or for each frame.
+
+        Returns
+        -------
+        unwrapped_coord : ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
+            The continuous coordinates.
+            Has the same shape as the input `coord`.
+        """
+        if box is None:
+            raise BadStructureError("A box is required for unwrapping")
+        coord = np.asarray(coord)
+        box = np.asarray(box)
+        is_single_frame = (coord.ndim == 2)
+        if is_single_frame:
+            coord = coord[np.newaxis, ...]
+        if box.ndim == 2:
+            box = np.broadcast_to(box, (coord.shape[0], 3, 3))
+        if box.shape[0] != coord.shape[0]:
+            raise IndexError(
+                f"{box.shape[0]} boxes were given for "
+                f"{coord.shape[0]} frames"
+            )
+        if self._last_coord is None:
+            # The first frame is taken as starting point
+            self._last_coord = coord[0]
+            self._last_unwrapped = coord[0]
+        elif self._last_coord.shape != coord.shape[1:]:
+            raise IndexError(
+                f"Expected {self._last_coord.shape[0]} atoms per frame, "
+                f"but got {coord.shape[1]}"
+            )
+
+        # Displacement of each atom to the respective preceding frame
+        disp = np.diff(
+            np.concatenate([self._last_coord[np.newaxis, ...], coord]),
+            axis=0
+        )
+        # Remove jumps over the periodic boundary
+        # by using the minimum image of the displacement
+        fractions = coord_to_fraction(disp, box)
+        fractions -= np.round(fractions)
+        disp = fraction_to_coord(fractions, box)
+        unwrapped = self._last_unwrapped + np.cumsum(disp, axis=0)
+        unwrapped = unwrapped.astype(coord.dtype, copy=False)
+
+        self._last_coord = coord[-1].copy()
+        self._last_unwrapped = unwrapped[-1].copy()
+        return unwrapped[0] if is_single_frame else unwrapped
+
+
 def coord_to_fraction(coord, box):
     """
     Transform coordinates to fractions of box vectors.
@@ -14,9 +14,14 @@ __all__ = ["get_chain_starts", "apply_chain_wise", "spread_chain_wise",
            "chain_iter", "get_chains", "get_chain_count", "chain_iter"]
 
 import numpy as np
+from .atoms import AtomArrayStack
 from .resutil import *
 
 
+# The annotation categories that determine the chain starts
+_CHAIN_CATEGORIES = ("chain_id", "res_id")
+
+
 def get_chain_starts(array, add_exclusive_stop=False):
     """
     Get the indices in an atom array, which indicates the beginning of
@@ -43,11 +48,35 @@ def get_chain_starts(array, add_exclusive_stop=False):
     -----
     This method is internally used by all other chain-related
     functions.
+
+    If the segment cache of `array` is enabled via
+    :meth:`AtomArray.enable_segment_cache()`, the chain starts are
+    only computed once and taken from the cache in subsequent calls.
     
     See also
     --------
     get_residue_starts
     """
+    # Objects other than atom arrays and stacks, e.g. a
+    # 'SelectionView', have no segment cache
+    get_cached = getattr(array, "_get_cached_segment_starts", None)
+    chain_starts = None if get_cached is None else get_cached("chain")
+    if chain_starts is None:
+        chain_starts = _compute_chain_starts(array)
+        set_cached = getattr(array, "_set_cached_segment_starts", None)
+        if set_cached is not None:
+            set_cached("chain", _CHAIN_CATEGORIES, chain_starts)
+    
+    if add_exclusive_stop:
+        return chain_starts
+    else:
+        return chain_starts[:-1]
+
+
+def _compute_chain_starts(array):
+    """
+    Compute the chain starts including the exclusive stop.
+    """
     diff = np.diff(array.res_id)
     res_id_decrement = diff < 0
     # This mask is 'true' at indices where the value changes
@@ -59,10 +88,7 @@ def get_chain_starts(array, add_exclusive_stop=False):
     chain_starts = np.where(res_id_decrement | chain_id_changes)[0] + 1
     
     # The first chain is not included yet -> Insert '[0]'
-    if add_exclusive_stop:
-        return np.concatenate(([0], chain_starts, [array.array_length()]))
-    else:
-        return np.concatenate(([0], chain_starts))
+    return np.concatenate(([0], chain_starts, [array.array_length()]))
 
 
 def apply_chain_wise(array, data, function, axis=None):
@@ -86,6 +112,9 @@ def apply_chain_wise(array, data, function, axis=None):
     data : ndarray
         The data, whose intervals are the parameter for `function`. Must
         have same length as `array`.
+        If `array` is an :class:`AtomArrayStack`, `data` may also be
+        given for each model, i.e. with shape *(m,n,...)*, like the
+        coordinates of the stack.
     function : function
         The `function` must have either the form *f(data)* or
         *f(data, axis)* in case `axis` is given. Every `function` call
@@ -99,13 +128,28 @@ def apply_chain_wise(array, data, function, axis=None):
         Chain-wise evaluation of `data` by `function`. The size of the
         first dimension of this array is equal to the amount of
         chains.
+        If `data` is given for each model of an :class:`AtomArrayStack`,
+        an additional first dimension for the models is prepended.
+
+    Notes
+    -----
+    Common reductions are not evaluated chain by chain, but
+    for all chains at once, if `data` is a numeric :class:`ndarray`
+    and `axis` is either ``None`` or ``0``:
+    :func:`numpy.sum()`, :func:`numpy.nansum()`, :func:`numpy.mean()`,
+    :func:`numpy.average()`, :func:`numpy.min()`, :func:`numpy.max()`,
+    :func:`numpy.any()`, :func:`numpy.all()`,
+    :func:`numpy.count_nonzero()`, :func:`len()` and :func:`centroid()`.
+    Hence, these functions should be preferred over equivalent custom
+    functions for large structures.
         
     See also
     --------
     apply_residue_wise
     """
     starts = get_chain_starts(array, add_exclusive_stop=True)
-    return apply_segment_wise(starts, data, function, axis)
+    depth = array.stack_depth() if isinstance(array, AtomArrayStack) else None
+    return apply_segment_wise(starts, data, function, axis, depth)
 
 
 def spread_chain_wise(array, input_data):
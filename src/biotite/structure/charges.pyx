@@ -3,14 +3,14 @@
 # information.
 
 """
-This module provides one function for the computation of the partial
+This module provides functions for the computation of the partial
 charges of the individual atoms of a given AtomArray according to the
 PEOE algorithm of Gasteiger-Marsili.
 """
 
 __name__ = "biotite.structure"
 __author__ = "Jacob Marcel Anter, Patrick Kunzmann"
-__all__ = ["partial_charges"]
+__all__ = ["partial_charges", "partial_charges_batch"]
 
 cimport cython
 cimport numpy as np
@@ -24,7 +24,6 @@ from biotite.structure import AtomArray, BondType
 
 ctypedef np.float32_t float32
 ctypedef np.uint32_t uint32
-ctypedef np.int8_t int8
 ctypedef np.int64_t int64
 
 
@@ -156,14 +155,49 @@ cdef dict EN_PARAM_BPARTNERS = {
 EN_POS_HYDROGEN = 20.02
 
 
+# The nested dictionaries above are converted into lookup tables,
+# so that the parameters of all atoms can be obtained via vectorized
+# indexing instead of dictionary lookups for each atom
+# The first dimension represents the element, the second dimension
+# the bond type or the amount of binding partners, respectively
+# Missing entries are NaN
+_PARAM_ELEMENTS = {
+    element: i for i, element in enumerate(
+        sorted(set(EN_PARAM_BTYPE) | set(EN_PARAM_BPARTNERS))
+    )
+}
+_MAX_BTYPE = max(int(bond_type) for bond_type in BondType)
+_MAX_BPARTNERS = max(
+    max(param_per_element) for param_per_element
+    in EN_PARAM_BPARTNERS.values()
+)
+
+
+def _create_param_table(param_dict, max_key):
+    table = np.full(
+        (len(_PARAM_ELEMENTS), max_key + 1, 3), np.nan, dtype=np.float32
+    )
+    for element, param_per_element in param_dict.items():
+        for key, param in param_per_element.items():
+            table[_PARAM_ELEMENTS[element], key] = param
+    return table
+
+
+_EN_PARAM_BTYPE_TABLE = _create_param_table(EN_PARAM_BTYPE, _MAX_BTYPE)
+_EN_PARAM_BPARTNERS_TABLE = _create_param_table(
+    EN_PARAM_BPARTNERS, _MAX_BPARTNERS
+)
+
+
 def _get_parameters(elements, bond_types, amount_of_binding_partners):
     """
     Gather the parameters required for electronegativity computation of
     all atoms comprised in the input array `elements`.
 
-    By doing so, the function accesses the nested dictionary
-    ``EN_PARAMETERS``. The values originate from a publication of Johann
-    Gasteiger and Mario Marsili.
+    By doing so, the function accesses lookup tables created from the
+    nested dictionaries ``EN_PARAM_BTYPE`` and ``EN_PARAM_BPARTNERS``.
+    The values originate from a publication of Johann Gasteiger and
+    Mario Marsili.
 
     Parameters
     ----------
@@ -184,96 +218,77 @@ def _get_parameters(elements, bond_types, amount_of_binding_partners):
         computation of the electronegativities of all atoms comprised
         in the `elements` array.
     """
-    cdef int i
-    cdef float32 a, b, c
-    cdef int8[:] bond_types_v = bond_types
-    cdef int64[:] amount_of_binding_partners_v = amount_of_binding_partners
-
-    parameters = np.zeros((elements.shape[0], 3), dtype=np.float32)
-    cdef float32[:,:] parameters_v = parameters
-
-    has_atom_key_error = False
-    has_valence_key_error = False
-    # Preparing warning in case of KeyError
-    # It is differentiated between atoms that are not parametrized at
-    # all and specific valence states that are parametrized
-    list_of_unparametrized_elements = []
-    unparametrized_valences = []
+    # Map each element to its row in the lookup tables
+    # or -1, if the element is not parametrized
+    unique_elements, element_codes = np.unique(elements, return_inverse=True)
+    element_rows = np.array(
+        [_PARAM_ELEMENTS.get(element, -1) for element in unique_elements],
+        dtype=np.int64
+    )[element_codes]
+
+    parameters = np.full((elements.shape[0], 3), np.nan, dtype=np.float32)
+    # Ions (atoms without binding partners) are not considered
+    is_bonded = amount_of_binding_partners != 0
+    is_unparametrized_element = is_bonded & (element_rows == -1)
+    # Atoms that are identified via the amount of binding partners
+    # or via the bond type, respectively
+    via_bpartners = is_bonded & (bond_types == ANY) \
+                    & ~is_unparametrized_element
+    via_btype = is_bonded & (bond_types != ANY) \
+                & ~is_unparametrized_element
+
+    mask = via_bpartners & (amount_of_binding_partners <= _MAX_BPARTNERS)
+    parameters[mask] = _EN_PARAM_BPARTNERS_TABLE[
+        element_rows[mask], amount_of_binding_partners[mask]
+    ]
+    mask = via_btype & (bond_types <= _MAX_BTYPE)
+    parameters[mask] = _EN_PARAM_BTYPE_TABLE[
+        element_rows[mask], bond_types[mask]
+    ]
+
+    list_of_unparametrized_elements = elements[is_unparametrized_element]
+    has_atom_key_error = len(list_of_unparametrized_elements) > 0
+    list_of_atoms_without_specified_btype = [
+        str(i) for i in np.where(is_bonded & (bond_types == ANY))[0]
+    ]
+    # Parametrized elements in unparametrized valence states
+    is_unparametrized_valence = np.isnan(parameters[:, 0]) \
+                                & (via_bpartners | via_btype)
+    has_valence_key_error = np.any(is_unparametrized_valence)
+    # The warning message printed in case of unparametrized valence
+    # states contains its main information in a table with three
+    # columns:
+    # The first column represents the element, the second the amount of
+    # binding partners and the third the BondType
+    # The primary way of identifying unparametrized valence states that
+    # is aimed at is via the BondType; if this is possible, the space
+    # beneath the column representing the amount of binding partners is
+    # padded with a respective amount the '-' (hyphen) character
+    # If not, the space beneath the column representing the BondTypes is
+    # padded with a respective amount of hyphens
+    # At either case, an appropriate amount of whitespace is added in
+    # order to ensure that the respective entries appear directly under
+    # the respective columns
     unparam_valence_names = []
-    list_of_atoms_without_specified_btype = []
-
-    for i, element in enumerate(elements):
-        # Considering the special case of ions
-        if amount_of_binding_partners_v[i] == 0:
-            parameters_v[i, :] = np.nan
-            continue
-        if bond_types_v[i] == ANY:
-            list_of_atoms_without_specified_btype.append(str(i))
-            try:
-                a, b, c = EN_PARAM_BPARTNERS[element] \
-                                            [amount_of_binding_partners_v[i]]
-                parameters_v[i, 0] = a
-                parameters_v[i, 1] = b
-                parameters_v[i, 2] = c
-            except KeyError:
-                try:
-                    EN_PARAM_BPARTNERS[element]
-                except KeyError:
-                    list_of_unparametrized_elements.append(element)
-                    has_atom_key_error = True
-                else:
-                    # The warning message printed in case of
-                    # unparametrized valence states contains its main
-                    # information in a table with three columns:
-                    # The first column represents the element, the
-                    # second the amount of binding partners and the
-                    # third the BondType
-                    # The primary way of identifying unparametrized
-                    # valence states that is aimed at is via the
-                    # BondType; if this is possible, the space beneath
-                    # the column representing the amount of binding
-                    # partners is padded with a respective amount the
-                    # '-' (hyphen) character
-                    # If not, the space beneath the column representing
-                    # the BondTypes is padded with a respective amount
-                    # of hyphens
-                    # At either case, an appropriate amount of
-                    # whitespace is added in order to ensure that the
-                    # respective entries appear directly under the
-                    # respective columns
-                    unparam_valence_names.append(element)
-                    unparametrized_valences.append(
-                        str(amount_of_binding_partners_v[i])
-                        +
-                        " " * 31
-                        +
-                        "-" * 10
-                    )
-                    has_valence_key_error = True
-                parameters_v[i, :] = np.nan
+    unparametrized_valences = []
+    for i in np.where(is_unparametrized_valence)[0]:
+        unparam_valence_names.append(elements[i])
+        if via_bpartners[i]:
+            unparametrized_valences.append(
+                str(amount_of_binding_partners[i])
+                +
+                " " * 31
+                +
+                "-" * 10
+            )
         else:
-            try:
-                a, b, c = EN_PARAM_BTYPE[element][bond_types_v[i]]
-                parameters_v[i, 0] = a
-                parameters_v[i, 1] = b
-                parameters_v[i, 2] = c
-            except KeyError:
-                try:
-                    EN_PARAM_BTYPE[element]
-                except KeyError:
-                    list_of_unparametrized_elements.append(element)
-                    has_atom_key_error = True
-                else:
-                    unparam_valence_names.append(element)
-                    unparametrized_valences.append(
-                        "-" * 27
-                        +
-                        " " * 5
-                        +
-                        str(bond_types_v[i])
-                    )
-                    has_valence_key_error = True
-                parameters_v[i, :] = np.nan
+            unparametrized_valences.append(
+                "-" * 27
+                +
+                " " * 5
+                +
+                str(bond_types[i])
+            )
     
 
     # Error and warning handling
@@ -432,25 +447,149 @@ def partial_charges(atom_array, int iteration_step_num=6, charges=None):
                 f"formal charge is assumed to be zero.",
                 UserWarning
             )
+
+    return _partial_charges(
+        atom_array.element, atom_array.bonds.as_array(), charges,
+        iteration_step_num
+    )
+
+
+def partial_charges_batch(atom_arrays, int iteration_step_num=6):
+    """
+    partial_charges_batch(atom_arrays, iteration_step_num=6)
+
+    Compute the partial charges for each of multiple molecules, e.g.
+    the entries of a ligand library.
+
+    The result is equal to calling :func:`partial_charges()` for each
+    molecule, but the computation is performed for all molecules at
+    once, which is much faster for a large number of small molecules.
+
+    Parameters
+    ----------
+    atom_arrays: iterable object of AtomArray
+        The molecules to get the partial charges for.
+        Each :class:`AtomArray` must have an associated `BondList`.
+        The formal charges are taken from the ``charge`` annotation
+        category.
+        If a molecule has no such annotation, the formal charges of its
+        atoms are set to zero.
+    iteration_step_num: int, optional
+        The number of iteration steps (see :func:`partial_charges()`).
+
+    Returns
+    -------
+    charges: list of ndarray, dtype=float32
+        The partial charge values for each molecule in `atom_arrays`.
+
+    Notes
+    -----
+    Atom indices mentioned in warnings refer to the position in the
+    concatenated molecules.
+
+    See also
+    --------
+    partial_charges
+
+    Examples
+    --------
+
+    >>> molecules = [residue("CF0"), residue("MOH")]
+    >>> for charges in partial_charges_batch(molecules):
+    ...     print(charges)
+    [ 0.079 -0.253  0.058  0.058  0.058]
+    [ 0.033 -0.398  0.052  0.052  0.052  0.209]
+    """
+    elements = []
+    bonds = []
+    charges = []
+    lengths = []
+    offset = 0
+    has_charges = True
+    for atom_array in atom_arrays:
+        if atom_array.bonds is None:
+            raise AttributeError(
+                f"The input AtomArray doesn't possess an associated "
+                f"BondList."
+            )
+        length = atom_array.array_length()
+        elements.append(atom_array.element)
+        bond_array = atom_array.bonds.as_array().astype(np.int64)
+        bond_array[:, :2] += offset
+        bonds.append(bond_array)
+        try:
+            charges.append(atom_array.charge.astype(np.float32))
+        except AttributeError:
+            charges.append(np.zeros(length, dtype=np.float32))
+            has_charges = False
+        lengths.append(length)
+        offset += length
+    if len(lengths) == 0:
+        return []
+    if not has_charges:
+        warnings.warn(
+            f"Some of the inserted AtomArrays have no charge "
+            f"annotation. Therefore, the formal charge of their atoms "
+            f"is assumed to be zero.",
+            UserWarning
+        )
+
+    charges = _partial_charges(
+        np.concatenate(elements), np.concatenate(bonds),
+        np.concatenate(charges), iteration_step_num
+    )
+    return np.split(charges, np.cumsum(lengths[:-1]))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _partial_charges(elements, bond_array, charges, int iteration_step_num):
+    """
+    Compute the partial charges from the elements, the bonds in the
+    format of :meth:`BondList.as_array()` and the formal charges.
+    """
+    charges = np.array(charges, dtype=np.float32)
     cdef float32[:] charges_v = charges
+    cdef int64 n_atoms = elements.shape[0]
 
-    elements = atom_array.element
-    bonds, types = atom_array.bonds.get_all_bonds()
-    amount_of_binding_partners = np.count_nonzero(bonds != -1, axis=1) \
-                                 .astype(np.int64, copy=False)
-    # The maximum of a given row of the `types` array must be determined
-    # as this value reveals the hybridisation state
-    # An atom's overall BondType is assumed to be ANY as soon as one
-    # BondType.ANY occurs
-    if types.shape[1] == 0:
+    if len(bond_array) == 0:
         # No bonds between atoms
-        # -> types has shape (n,0)
-        # -> np.amax() raises ValueError
         # This is the case e. g. if AtomArray exclusively contains ions
         # In this case partial charges are equal to formal charges
         return charges
-    bond_types = np.amax(types, axis=1)
-    bond_types[np.any(types == BondType.ANY, axis=1)] = BondType.ANY
+
+    # Convert the bonds into a compressed sparse row (CSR) adjacency
+    # representation:
+    # The binding partners of atom 'i' are
+    # 'partners[partner_ptr[i] : partner_ptr[i+1]]'
+    # Each bond appears twice, once for each bonded atom
+    # Within each atom the partners are sorted by the bond index,
+    # to reproduce the order of charge transfers of a loop over all bonds
+    bond_indices = np.tile(np.arange(len(bond_array)), 2)
+    atoms = np.concatenate([bond_array[:, 0], bond_array[:, 1]]) \
+            .astype(np.int64, copy=False)
+    partners = np.concatenate([bond_array[:, 1], bond_array[:, 0]]) \
+               .astype(np.int64, copy=False)
+    bond_type_per_partner = np.tile(bond_array[:, 2], 2).astype(np.int8)
+    order = np.lexsort((bond_indices, atoms))
+    partners = partners[order]
+    bond_type_per_partner = bond_type_per_partner[order]
+    amount_of_binding_partners = np.bincount(atoms, minlength=n_atoms)
+    partner_ptr = np.zeros(n_atoms + 1, dtype=np.int64)
+    partner_ptr[1:] = np.cumsum(amount_of_binding_partners)
+
+    # The highest bond type of an atom reveals the hybridisation state
+    # An atom's overall BondType is assumed to be ANY as soon as one
+    # BondType.ANY occurs
+    # Atoms without binding partners get '-1'
+    is_bonded = amount_of_binding_partners != 0
+    bond_types = np.full(n_atoms, -1, dtype=np.int8)
+    bond_types[is_bonded] = np.maximum.reduceat(
+        bond_type_per_partner, partner_ptr[:n_atoms][is_bonded]
+    )
+    bond_types[np.bincount(
+        atoms[order][bond_type_per_partner == ANY], minlength=n_atoms
+    ) != 0] = ANY
     parameters = _get_parameters(
         elements, bond_types, amount_of_binding_partners
     )
@@ -459,17 +598,18 @@ def partial_charges(atom_array, int iteration_step_num=6, charges=None):
     # which enter as divisor the equation for charge transfer
     pos_en_values = np.sum(parameters, axis=1)
     # Substituting values for hydrogen with the special value
-    pos_en_values[atom_array.element == "H"] = EN_POS_HYDROGEN
+    pos_en_values[elements == "H"] = EN_POS_HYDROGEN
     cdef float32[:] pos_en_values_v = pos_en_values
 
 
     cdef float32 damping = 1.0
     cdef float32 divisor
     cdef float32 charge_transfer
-    cdef uint32[:,:] bonds_v = atom_array.bonds.as_array()
-    cdef int bond_index
-    # Indices to atoms involved in a bonds
-    cdef uint32 i, j
+    cdef int64[:] partner_ptr_v = partner_ptr
+    cdef int64[:] partners_v = partners
+    cdef int64 k
+    # Indices to atoms involved in a bond
+    cdef int64 i, j
     cdef float32[:] en_values_v
 
     for _ in range(iteration_step_num):
@@ -479,7 +619,7 @@ def partial_charges(atom_array, int iteration_step_num=6, charges=None):
         # Calculate electronegativity via vectorization:
         # X = a + bQ + cQ^2 
         charge_factor = np.stack((
-            np.ones(atom_array.array_length()),
+            np.ones(n_atoms),
             charges,
             charges**2
         ), axis=-1)
@@ -487,36 +627,36 @@ def partial_charges(atom_array, int iteration_step_num=6, charges=None):
             parameters * charge_factor,
             axis=1, dtype=np.float32
         )
-        # Iterate over bonds to transfer charges
-        # based on new electronegativity values
-        for bond_index in range(bonds_v.shape[0]):
-            i = bonds_v[bond_index, 0]
-            j = bonds_v[bond_index, 1]
-            # For atoms that are not available in the dictionary,
-            # but which are incorporated into molecules,
-            # the partial charge is set to NaN
-            if isnan(en_values_v[i]) or isnan(en_values_v[j]):
-                # Determining for which atom exactly no parameters are
-                # available is necessary since the other atom, for which
-                # there indeed are parameters, could be involved in
-                # multiple bonds.
-                # Therefore, setting both charges to NaN would falsify
-                # the result.
-                # The case that both atoms are not parametrized must be
-                # considered as well.
+        # Iterate over the binding partners of each atom to transfer
+        # charges based on new electronegativity values
+        # As the electronegativity values are fixed within an iteration
+        # step, each atom only needs to update its own charge
+        with nogil:
+            for i in range(n_atoms):
+                if partner_ptr_v[i] == partner_ptr_v[i+1]:
+                    # Ions keep their formal charge
+                    continue
+                # For atoms that are not available in the dictionary,
+                # but which are incorporated into molecules,
+                # the partial charge is set to NaN
                 if isnan(en_values_v[i]):
                     charges_v[i] = NAN
-                if isnan(en_values_v[j]):
-                    charges_v[j] = NAN
-            else:
-                if en_values_v[j] > en_values_v[i]:
-                    divisor = pos_en_values_v[i]
-                else:
-                    divisor = pos_en_values_v[j]
-                charge_transfer = (
-                    (en_values_v[j] - en_values_v[i]) / divisor
-                ) * damping
-                charges_v[i] += charge_transfer
-                charges_v[j] -= charge_transfer
-
-    return charges
\ No newline at end of file
+                    continue
+                for k in range(partner_ptr_v[i], partner_ptr_v[i+1]):
+                    j = partners_v[k]
+                    # An unparametrized binding partner does not
+                    # falsify the charge of this atom
+                    if isnan(en_values_v[j]):
+                        continue
+                    # The divisor is the positive electronegativity of
+                    # the less electronegative atom
+                    if en_values_v[i] > en_values_v[j]:
+                        divisor = pos_en_values_v[j]
+                    else:
+                        divisor = pos_en_values_v[i]
+                    charge_transfer = (
+                        (en_values_v[j] - en_values_v[i]) / divisor
+                    ) * damping
+                    charges_v[i] += charge_transfer
+
+    return charges
@@ -8,7 +8,7 @@ This module provides functions to calculate atomistic densities.
 
 __name__ = "biotite.structure"
 __author__ = "Daniel Bauer"
-__all__ = ["density"]
+__all__ = ["density", "DensityAccumulator"]
 
 import numpy as np
 from .atoms import coord
@@ -67,6 +67,10 @@ def density(atoms, selection=None, delta=1.0, bins=None,
         `delta`, or the supplied `bins` input parameter.
     edges : list of ndarray, dtype=float
         A list containing the 3 arrays describing the bin edges.
+
+    See also
+    --------
+    DensityAccumulator
     """
     coords = coord(atoms)
     
@@ -112,3 +116,247 @@ def density(atoms, selection=None, delta=1.0, bins=None,
         coords, bins=bins, density=density, weights=weights
     )
     return hist
+
+
+class DensityAccumulator:
+    r"""
+    Accumulate the density of atoms on a fixed grid, one chunk of
+    coordinates at a time.
+
+    In contrast to :func:`density()`, the coordinates need not to be in
+    memory at once.
+    Hence, this class is suited for computing occupancy maps from long
+    trajectories, e.g. by adding the chunks obtained from
+    :meth:`TrajectoryFile.read_iter()`.
+
+    The grid is defined by its boundaries and the gridspacing `delta`.
+    The bin edges along each dimension are equal to the ones
+    :func:`density()` would create for atoms spanning the same
+    boundaries.
+
+    Parameters
+    ----------
+    grid_min, grid_max : ndarray, dtype=float, shape=(3,)
+        The lower and upper boundary of the grid.
+        Atoms outside the grid are ignored.
+    delta : float, optional
+        Distance between grid points (in Å).
+
+    Attributes
+    ----------
+    edges : list of ndarray, dtype=float
+        A list containing the 3 arrays describing the bin edges.
+    shape : tuple of int
+        The number of bins in each dimension.
+    model_count : int
+        The total number of models, that were added so far.
+
+    See also
+    --------
+    density
+
+    Examples
+    --------
+
+    >>> accumulator = DensityAccumulator(
+    ...     np.min(atom_array_stack.coord, axis=(0, 1)),
+    ...     np.max(atom_array_stack.coord, axis=(0, 1)),
+    ...     delta=5.0
+    ... )
+    >>> print(accumulator.shape)
+    (5, 5, 4)
+    >>> # Add the models in chunks of 10 models
+    >>> for i in range(0, atom_array_stack.stack_depth(), 10):
+    ...     accumulator.add(atom_array_stack[i : i+10])
+    >>> print(accumulator.model_count)
+    38
+    >>> grid = accumulator.get_density()
+    >>> print(int(grid.sum()))
+    11552
+    >>> # Compact representation of the occupied bins only
+    >>> indices, values = accumulator.get_sparse_density(threshold=500)
+    >>> print(indices)
+    [[1 2 1]
+     [2 1 2]
+     [3 1 2]
+     [3 2 1]]
+    >>> print(values)
+    [536. 535. 640. 526.]
+    """
+
+    def __init__(self, grid_min, grid_max, delta=1.0):
+        grid_min = np.asarray(grid_min, dtype=float)
+        grid_max = np.asarray(grid_max, dtype=float)
+        if grid_min.shape != (3,) or grid_max.shape != (3,):
+            raise IndexError(
+                "Expected grid boundaries with shape (3,)"
+            )
+        if delta <= 0:
+            raise ValueError("The gridspacing must be positive")
+        self._delta = delta
+        # Use the same edges as 'density()'
+        self._edges = [
+            np.arange(grid_min[i], grid_max[i]+delta, delta)
+            for i in range(3)
+        ]
+        self._shape = tuple(len(edges) - 1 for edges in self._edges)
+        if any(length < 1 for length in self._shape):
+            raise ValueError("The grid must contain at least one bin")
+        self._grid = np.zeros(self._shape, dtype=float)
+        self._model_count = 0
+
+    @property
+    def edges(self):
+        return [edges.copy() for edges in self._edges]
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def model_count(self):
+        return self._model_count
+
+    def add(self, atoms, selection=None, weights=None):
+        """
+        Add the atoms of one or multiple models to the density.
+
+        Parameters
+        ----------
+        atoms : AtomArray or AtomArrayStack or ndarray, shape=(n,3) or shape=(m,n,3)
+            The atoms to be added.
+            Alternatively, the coordinates can be directly provided as
+            `ndarray`.
+        selection : ndarray, dtype=bool, shape=(n,), optional
+            Boolean mask for `atoms` to add only a set of atoms.
+        weights: ndarray, shape=(n,) or shape=(m,n), optional
+            An array of values to weight the contribution of *n* atoms
+            in *m* models (see :func:`density()`).
+            The weights refer to the selected atoms.
+        """
+        coords = coord(atoms)
+        n_models = coords.shape[0] if coords.ndim == 3 else 1
+        if selection is not None:
+            coords = coords[..., selection, :]
+        n_atoms = coords.shape[-2]
+        coords = coords.reshape(-1, 3)
+
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape[-1] != n_atoms:
+                raise IndexError(
+                    f"{weights.shape[-1]} weights were given, "
+                    f"but {n_atoms} atoms are selected"
+                )
+            weights = np.broadcast_to(
+                weights, (n_models, n_atoms)
+            ).reshape(-1)
+
+        # Find the bin for each coordinate in the same way as
+        # 'np.histogramdd()':
+        # The last bin also includes its right edge
+        bin_indices = np.zeros(coords.shape, dtype=np.int64)
+        inside = np.ones(len(coords), dtype=bool)
+        for dim, edges in enumerate(self._edges):
+            values = coords[:, dim]
+            indices = np.searchsorted(edges, values, side="right") - 1
+            indices[values == edges[-1]] = len(edges) - 2
+            inside &= (indices >= 0) & (indices < len(edges) - 1)
+            bin_indices[:, dim] = indices
+        flat_indices = np.ravel_multi_index(
+            bin_indices[inside].T, self._shape
+        )
+        if weights is not None:
+            weights = weights[inside]
+        self._grid += np.bincount(
+            flat_indices, weights=weights, minlength=self._grid.size
+        ).reshape(self._shape)
+        self._model_count += n_models
+
+    def get_density(self, sigma=None, density=False):
+        """
+        Get the accumulated density.
+
+        Parameters
+        ----------
+        sigma : float, optional
+            If set, each atom is spread over the grid with a Gaussian
+            kernel with the given standard deviation (in Å), i.e.
+            a kernel density estimate is returned.
+            The kernel is truncated at four standard deviations.
+            The density spread outside the grid is lost.
+        density : boolean, optional
+            If False, the number of samples in each bin is returned.
+            Otherwise, returns the probability density function of each
+            bin (see :func:`density()`).
+
+        Returns
+        -------
+        H : ndarray, dtype=float
+            The threedimensional histogram of the added atoms.
+        """
+        grid = self._grid.copy()
+        if sigma is not None:
+            if sigma <= 0:
+                raise ValueError("The standard deviation must be positive")
+            grid = _gaussian_filter(grid, sigma / self._delta)
+        if density:
+            grid /= grid.sum() * self._delta**3
+        return grid
+
+    def get_sparse_density(self, sigma=None, density=False, threshold=0):
+        """
+        Get the accumulated density in a compact format, that contains
+        only the bins with a value above the given threshold.
+
+        Parameters
+        ----------
+        sigma : float, optional
+            The standard deviation of the Gaussian kernel
+            (see :meth:`get_density()`).
+        density : boolean, optional
+            Whether to return the probability density function
+            (see :meth:`get_density()`).
+        threshold : float, optional
+            Only bins with a value greater than this threshold are
+            included.
+
+        Returns
+        -------
+        indices : ndarray, dtype=int, shape=(k,3)
+            The indices of the included bins.
+            The indices are sorted in C order.
+        values : ndarray, dtype=float, shape=(k,)
+            The values of the included bins.
+        """
+        grid = self.get_density(sigma, density)
+        mask = grid > threshold
+        return np.argwhere(mask), grid[mask]
+
+
+def _gaussian_filter(grid, sigma):
+    """
+    Apply a Gaussian filter to the grid, whose standard deviation is
+    given in units of bins.
+
+    The 3D Gaussian kernel is separable, hence it is applied as three
+    1D convolutions, one along each dimension.
+    Values outside the grid are assumed to be zero.
+    """
+    radius = int(np.ceil(4 * sigma))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma)**2)
+    kernel /= kernel.sum()
+
+    for dim in range(grid.ndim):
+        # Convolve along the last dimension
+        grid = np.moveaxis(grid, dim, -1)
+        length = grid.shape[-1]
+        padded = np.zeros(grid.shape[:-1] + (length + 2*radius,))
+        padded[..., radius : radius + length] = grid
+        filtered = np.zeros(grid.shape, dtype=float)
+        for weight, offset in zip(kernel, offsets):
+            start = radius + offset
+            filtered += weight * padded[..., start : start + length]
+        grid = np.moveaxis(filtered, -1, dim)
+    return grid
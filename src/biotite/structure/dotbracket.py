@@ -24,7 +24,8 @@ _CLOSING_BRACKETS_BYTES = _CLOSING_BRACKETS.encode()
 
 
 def dot_bracket_from_structure(
-    nucleic_acid_strand, scores=None, max_pseudoknot_order=None):
+    nucleic_acid_strand, scores=None, max_pseudoknot_order=None,
+    exhaustive=False):
     """
     Represent a nucleic-acid-strand in dot-bracket-letter-notation
     (DBL-notation). :footcite:`Antczak2018`
@@ -40,11 +41,17 @@ def dot_bracket_from_structure(
         The maximum pseudoknot order to be found. If a base pair would
         be of a higher order, it is represented as unpaired. If ``None``
         is given, all base pairs are evaluated.
+    exhaustive : bool (default: False)
+        If set to true, the DBL-notation is created for all optimal
+        solutions from :func:`pseudoknots()`.
+        Otherwise, only a single optimal solution is represented.
 
     Returns
     -------
     notations : list [str, ...]
         The DBL-notation for each solution from :func:`pseudoknots()`.
+        If `exhaustive` is false, the list contains only a single
+        notation.
 
     See Also
     --------
@@ -60,9 +67,11 @@ def dot_bracket_from_structure(
     basepairs = get_residue_positions(nucleic_acid_strand, basepairs)
     length = get_residue_count(nucleic_acid_strand)
     return dot_bracket(basepairs, length, scores=scores,
-                       max_pseudoknot_order=max_pseudoknot_order)
+                       max_pseudoknot_order=max_pseudoknot_order,
+                       exhaustive=exhaustive)
 
-def dot_bracket(basepairs, length, scores=None, max_pseudoknot_order=None):
+def dot_bracket(basepairs, length, scores=None, max_pseudoknot_order=None,
+                exhaustive=False):
     """
     Represent a nucleic acid strand in dot-bracket-letter-notation
     (DBL-notation). :footcite:`Antczak2018`
@@ -84,11 +93,17 @@ def dot_bracket(basepairs, length, scores=None, max_pseudoknot_order=None):
         The maximum pseudoknot order to be found. If a base pair would
         be of a higher order, it is represented as unpaired. If ``None``
         is given, all pseudoknot orders are evaluated.
+    exhaustive : bool (default: False)
+        If set to true, the DBL-notation is created for all optimal
+        solutions from :func:`pseudoknots()`.
+        Otherwise, only a single optimal solution is represented.
 
     Returns
     -------
     notations : list [str, ...]
         The DBL-notation for each solution from :func:`pseudoknots()`.
+        If `exhaustive` is false, the list contains only a single
+        notation.
 
     Examples
     --------
@@ -121,7 +136,8 @@ def dot_bracket(basepairs, length, scores=None, max_pseudoknot_order=None):
 
     # Get pseudoknot order
     pseudoknot_order = pseudoknots(basepairs, scores=scores,
-                                   max_pseudoknot_order=max_pseudoknot_order)
+                                   max_pseudoknot_order=max_pseudoknot_order,
+                                   exhaustive=exhaustive)
 
     # Each optimal pseudoknot order solution is represented in
     # dot-bracket-notation
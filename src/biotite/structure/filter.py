@@ -22,7 +22,7 @@ import warnings
 import numpy as np
 import operator as op
 from functools import partial, reduce
-from .atoms import Atom, AtomArray, AtomArrayStack, array as atom_array
+from .atoms import Atom, AtomArray, AtomArrayStack
 from .residues import get_residue_starts, get_residue_count
 from .info.nucleotides import nucleotide_names
 from .info.amino_acids import amino_acid_names
@@ -34,10 +34,6 @@ _canonical_aa_list = ["ALA","ARG","ASN","ASP","CYS","GLN","GLU","GLY","HIS",
                       "TRP","TYR","VAL", "SEC"]
 _canonical_nucleotide_list = ["A", "DA", "G", "DG", "C", "DC", "U", "DT"]
 
-_nucleotide_list = nucleotide_names()
-_amino_acid_list = amino_acid_names()
-_carbohydrate_list = carbohydrate_names()
-
 _solvent_list = ["HOH","SOL"]
 
 _peptide_backbone_atoms = ['N', 'CA', 'C']
@@ -128,7 +124,7 @@ def filter_nucleotides(array):
     ``RNA LINKING``, ``RNA OH 3 PRIME TERMINUS``,
     ``RNA OH 5 PRIME TERMINUS``
     """
-    return np.isin(array.res_name, _nucleotide_list)
+    return np.isin(array.res_name, nucleotide_names())
 
 
 def filter_canonical_amino_acids(array):
@@ -180,7 +176,7 @@ def filter_amino_acids(array):
     ``L-PEPTIDE COOH CARBOXY TERMINUS``, ``L-PEPTIDE LINKING``, 
     ``L-PEPTIDE NH3 AMINO TERMINUS``, ``PEPTIDE LINKING``
     """
-    return np.isin(array.res_name, _amino_acid_list)
+    return np.isin(array.res_name, amino_acid_names())
 
 
 def filter_carbohydrates(array):
@@ -210,7 +206,7 @@ def filter_carbohydrates(array):
     ``L-SACCHARIDE, ALPHA LINKING``, ``L-SACCHARIDE, BETA LINKING``, 
     ``SACCHARIDE``
     """
-    return np.isin(array.res_name, _carbohydrate_list)
+    return np.isin(array.res_name, carbohydrate_names())
 
 
 def filter_backbone(array):
@@ -375,11 +371,11 @@ def filter_polymer(array, min_size=2, pol_type='peptide'):
     split_idx = check_res_id_continuity(array)
 
     check_pol = partial(_is_polymer, min_size=min_size, pol_type=pol_type)
-    bool_idx = map(
-        lambda a: np.full(len(a), check_pol(atom_array(a)), dtype=bool),
-        np.split(array, split_idx)
-    )
-    return np.concatenate(list(bool_idx))
+    bounds = np.concatenate(([0], split_idx, [array.array_length()]))
+    polymer_mask = np.zeros(array.array_length(), dtype=bool)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        polymer_mask[start:stop] = check_pol(array[..., start:stop])
+    return polymer_mask
 
 
 def filter_intersection(array, intersect):
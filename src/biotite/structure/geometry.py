@@ -11,13 +11,14 @@ __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
 __all__ = ["displacement", "index_displacement", "distance", "index_distance",
            "angle", "index_angle", "dihedral", "index_dihedral",
-           "dihedral_backbone", "centroid"]
+           "dihedral_backbone", "DihedralBackbonePlan",
+           "RamachandranHistogram", "centroid"]
 
 import numpy as np
 from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .util import vector_dot, norm_vector
 from .filter import filter_peptide_backbone
-from .chains import chain_iter
+from .chains import get_chain_positions
 from .box import (coord_to_fraction, fraction_to_coord,
                   move_inside_box, is_orthogonal)
 from .error import BadStructureError
@@ -512,6 +513,7 @@ def dihedral_backbone(atom_array):
     See Also
     --------
     dihedral
+    DihedralBackbonePlan
     
     Examples
     --------
@@ -539,68 +541,239 @@ def dihedral_backbone(atom_array):
      [ -77.264  124.223]
      [ -78.100      nan]]
     """
-    bb_filter = filter_peptide_backbone(atom_array)
-    backbone = atom_array[..., bb_filter]
-    
-    if backbone.array_length() % 3 != 0 \
-        or (backbone.atom_name[0::3] != "N" ).any() \
-        or (backbone.atom_name[1::3] != "CA").any() \
-        or (backbone.atom_name[2::3] != "C" ).any():
-            raise BadStructureError(
-                "The backbone is invalid, must be repeats of (N, CA, C), "
-                "maybe a backbone atom is missing"
+    return DihedralBackbonePlan(atom_array).apply(atom_array)
+
+
+class DihedralBackbonePlan:
+    """
+    The atom indices required to measure the backbone dihedral angles
+    of a protein structure with a fixed topology.
+
+    The backbone is analyzed only once, when the plan is created.
+    Afterwards the plan can be applied to an arbitrary number of
+    coordinate sets of the same topology, e.g. the models of an
+    :class:`AtomArrayStack` or the frames of a trajectory read via
+    :meth:`TrajectoryFile.read_iter()`.
+
+    Parameters
+    ----------
+    atom_array: AtomArray or AtomArrayStack
+        The protein structure, the topology is taken from.
+        The same requirements as in :func:`dihedral_backbone()` apply.
+
+    Attributes
+    ----------
+    residue_count : int
+        The number of residues in the backbone, i.e. the length of the
+        angle arrays.
+
+    Raises
+    ------
+    BadStructureError
+        If the amount of backbone atoms is not equal to amount of
+        residues times 3 (for N, CA and C).
+
+    See Also
+    --------
+    dihedral_backbone
+
+    Examples
+    --------
+
+    >>> plan = DihedralBackbonePlan(atom_array)
+    >>> print(plan.residue_count)
+    20
+    >>> # Apply the plan to the coordinates of each model
+    >>> for coord in atom_array_stack.coord[:3]:
+    ...     phi, psi, omega = plan.apply(coord)
+    ...     print(np.rad2deg(phi[1:4]))
+    [-43.980 -66.466 -65.219]
+    [-62.001 -54.778 -59.675]
+    [-92.033 -57.540 -62.919]
+    """
+
+    def __init__(self, atom_array):
+        bb_indices = np.where(filter_peptide_backbone(atom_array))[0]
+        bb_atom_names = atom_array.atom_name[bb_indices]
+        if len(bb_indices) % 3 != 0 \
+            or (bb_atom_names[0::3] != "N" ).any() \
+            or (bb_atom_names[1::3] != "CA").any() \
+            or (bb_atom_names[2::3] != "C" ).any():
+                raise BadStructureError(
+                    "The backbone is invalid, must be repeats of (N, CA, C), "
+                    "maybe a backbone atom is missing"
+                )
+        n_indices  = bb_indices[0::3]
+        ca_indices = bb_indices[1::3]
+        c_indices  = bb_indices[2::3]
+        self._residue_count = len(ca_indices)
+
+        # Angles are only defined between residues of the same chain
+        chain_pos = get_chain_positions(
+            atom_array[..., ca_indices], np.arange(len(ca_indices))
+        )
+        is_linked = chain_pos[:-1] == chain_pos[1:]
+        # Residue positions whose successor is in the same chain
+        curr = np.where(is_linked)[0]
+        succ = curr + 1
+        phi_indices = np.stack([
+            c_indices[curr],
+            n_indices[succ], ca_indices[succ], c_indices[succ]
+        ], axis=-1)
+        psi_indices = np.stack([
+            n_indices[curr], ca_indices[curr], c_indices[curr],
+            n_indices[succ]
+        ], axis=-1)
+        omega_indices = np.stack([
+            ca_indices[curr], c_indices[curr],
+            n_indices[succ], ca_indices[succ]
+        ], axis=-1)
+        # All angles are computed in a single 'dihedral()' call:
+        # Concatenate the indices of all angle types and remember
+        # the type and residue position for each angle
+        self._indices = np.concatenate(
+            [phi_indices, psi_indices, omega_indices]
+        )
+        self._angle_types = np.repeat(np.arange(3), len(curr))
+        self._positions = np.concatenate([succ, curr, curr])
+        self._atom_count = atom_array.array_length()
+
+    @property
+    def residue_count(self):
+        return self._residue_count
+
+    def apply(self, atoms):
+        """
+        Measure the backbone dihedral angles for the given coordinates.
+
+        Parameters
+        ----------
+        atoms : AtomArray or AtomArrayStack or ndarray, shape=(n,3) or shape=(m,n,3)
+            The structure or coordinates to measure the angles for.
+            The atoms must correspond to the atoms of the structure the
+            plan was created from.
+
+        Returns
+        -------
+        phi, psi, omega : ndarray, shape=(r,) or shape=(m,r)
+            The backbone dihedral angles for every CA, as described in
+            :func:`dihedral_backbone()`.
+        """
+        bb_coord = coord(atoms)
+        if bb_coord.shape[-2] != self._atom_count:
+            raise IndexError(
+                f"The plan was created for {self._atom_count} atoms, "
+                f"but {bb_coord.shape[-2]} atoms were given"
+            )
+        # Dim -3: Angle index
+        # Dim -2: Atoms involved in dihedral angle
+        # Dim -1: X, Y, Z coordinates
+        angle_coord = bb_coord[..., self._indices, :].astype(
+            np.float64, copy=False
+        )
+        values = dihedral(
+            angle_coord[..., 0, :], angle_coord[..., 1, :],
+            angle_coord[..., 2, :], angle_coord[..., 3, :]
+        )
+        angles = np.full(
+            bb_coord.shape[:-2] + (3, self._residue_count), np.nan
+        )
+        angles[..., self._angle_types, self._positions] = values
+        return angles[..., 0, :], angles[..., 1, :], angles[..., 2, :]
+
+
+class RamachandranHistogram:
+    """
+    A 2D histogram of *phi* and *psi* backbone dihedral angles, that
+    is accumulated step by step.
+
+    In contrast to collecting all angles and computing the histogram
+    at the end, the memory requirement is independent of the number of
+    added angles.
+    Hence, this class is suited for the analysis of long trajectories.
+
+    Parameters
+    ----------
+    bins : int, optional
+        The number of bins for each angle.
+        The bins equally divide the range from :math:`-\\pi` to
+        :math:`\\pi`.
+
+    Attributes
+    ----------
+    counts : ndarray, dtype=int, shape=(bins, bins)
+        The number of angle pairs in each bin.
+        The first dimension corresponds to *phi*, the second one to
+        *psi*.
+    bin_edges : ndarray, dtype=float, shape=(bins+1,)
+        The edges of the bins in radians, for both angles.
+
+    See Also
+    --------
+    DihedralBackbonePlan
+
+    Examples
+    --------
+
+    >>> plan = DihedralBackbonePlan(atom_array_stack)
+    >>> histogram = RamachandranHistogram(bins=4)
+    >>> for coord in atom_array_stack.coord:
+    ...     phi, psi, _ = plan.apply(coord)
+    ...     histogram.add(phi, psi)
+    >>> print(histogram.counts)
+    [[  0  12  16  22]
+     [  0 361  31 117]
+     [ 38  28  21   0]
+     [  0   1  37   0]]
+    """
+
+    def __init__(self, bins=36):
+        if bins < 1:
+            raise ValueError("At least one bin is required")
+        self._bins = bins
+        self._bin_edges = np.linspace(-np.pi, np.pi, bins + 1)
+        self._counts = np.zeros((bins, bins), dtype=np.int64)
+
+    @property
+    def counts(self):
+        return self._counts
+
+    @property
+    def bin_edges(self):
+        return self._bin_edges
+
+    def add(self, phi, psi):
+        """
+        Add angle pairs to the histogram.
+
+        Parameters
+        ----------
+        phi, psi : ndarray, dtype=float
+            The *phi* and *psi* angles in radians, e.g. obtained from
+            :meth:`DihedralBackbonePlan.apply()`.
+            Both arrays must have the same shape.
+            Pairs, where any of both angles is *NaN*, are ignored.
+        """
+        phi = np.asarray(phi).flatten()
+        psi = np.asarray(psi).flatten()
+        if phi.shape != psi.shape:
+            raise IndexError(
+                f"{len(phi)} phi angles, but {len(psi)} psi angles "
+                f"were given"
             )
-    phis = []
-    psis = []
-    omegas = []
-    for chain_bb in chain_iter(backbone):
-        phi, psi, omega = _dihedral_backbone(chain_bb)
-        phis.append(phi)
-        psis.append(psi)
-        omegas.append(omega)
-    return np.concatenate(phis, axis=-1), np.concatenate(psis, axis=-1), \
-        np.concatenate(omegas, axis=-1)
-
-
-
-def _dihedral_backbone(chain_bb):
-    bb_coord = chain_bb.coord
-    # Coordinates for dihedral angle calculation
-    # Dim 0: Model index (only for atom array stacks)
-    # Dim 1: Angle index
-    # Dim 2: X, Y, Z coordinates
-    # Dim 3: Atoms involved in dihedral angle
-    if isinstance(chain_bb, AtomArray):
-        angle_coord_shape = (len(bb_coord)//3, 3, 4)
-    elif isinstance(chain_bb, AtomArrayStack):
-        angle_coord_shape = (bb_coord.shape[0], bb_coord.shape[1]//3, 3, 4)
-    phi_coord   = np.full(angle_coord_shape, np.nan)
-    psi_coord   = np.full(angle_coord_shape, np.nan)
-    omega_coord = np.full(angle_coord_shape, np.nan)
-    
-    # Indices for coordinates of CA atoms 
-    ca_i = np.arange(bb_coord.shape[-2]//3) * 3 + 1
-    phi_coord  [..., 1: , :, 0]  = bb_coord[..., ca_i[1: ]-2 ,:]
-    phi_coord  [..., 1: , :, 1]  = bb_coord[..., ca_i[1: ]-1 ,:]
-    phi_coord  [..., 1: , :, 2]  = bb_coord[..., ca_i[1: ]   ,:]
-    phi_coord  [..., 1: , :, 3]  = bb_coord[..., ca_i[1: ]+1 ,:]
-    psi_coord  [..., :-1, :, 0]  = bb_coord[..., ca_i[:-1]-1 ,:]
-    psi_coord  [..., :-1, :, 1]  = bb_coord[..., ca_i[:-1]   ,:]
-    psi_coord  [..., :-1, :, 2]  = bb_coord[..., ca_i[:-1]+1 ,:]
-    psi_coord  [..., :-1, :, 3]  = bb_coord[..., ca_i[:-1]+2 ,:]
-    omega_coord[..., :-1, :, 0]  = bb_coord[..., ca_i[:-1]   ,:]
-    omega_coord[..., :-1, :, 1]  = bb_coord[..., ca_i[:-1]+1 ,:]
-    omega_coord[..., :-1, :, 2]  = bb_coord[..., ca_i[:-1]+2 ,:]
-    omega_coord[..., :-1, :, 3]  = bb_coord[..., ca_i[:-1]+3 ,:]
-    
-    phi = dihedral(phi_coord[...,0], phi_coord[...,1],
-                   phi_coord[...,2], phi_coord[...,3])
-    psi = dihedral(psi_coord[...,0], psi_coord[...,1],
-                   psi_coord[...,2], psi_coord[...,3])
-    omega = dihedral(omega_coord[...,0], omega_coord[...,1],
-                     omega_coord[...,2], omega_coord[...,3])
-    
-    return phi, psi, omega
+        valid = ~(np.isnan(phi) | np.isnan(psi))
+        phi_bins = self._to_bin(phi[valid])
+        psi_bins = self._to_bin(psi[valid])
+        self._counts += np.bincount(
+            phi_bins * self._bins + psi_bins, minlength=self._bins**2
+        ).reshape(self._bins, self._bins)
+
+    def _to_bin(self, angles):
+        bins = np.floor(
+            (angles + np.pi) / (2 * np.pi) * self._bins
+        ).astype(np.int64)
+        # An angle of exactly pi belongs to the last bin
+        return np.clip(bins, 0, self._bins - 1)
 
 
 def centroid(atoms):
@@ -319,15 +319,18 @@ def _get_bonded_h(array, donor_mask, bonds):
     all_bond_indices, _ = bonds.get_all_bonds()
     donor_indices = np.where(donor_mask)[0]
     
-    for donor_i in donor_indices:
-        bonded_indices = all_bond_indices[donor_i]
-        # Remove padding values
-        bonded_indices = bonded_indices[bonded_indices != -1]
-        # Filter hydrogen atoms
-        bonded_indices = bonded_indices[hydrogen_mask[bonded_indices]]
-        donor_hydrogen_mask[bonded_indices] = True
-        associated_donor_indices[bonded_indices] = donor_i
-    
+    bonded_indices = all_bond_indices[donor_indices]
+    # Remove padding values and filter hydrogen atoms
+    is_bonded_h = (bonded_indices != -1) & hydrogen_mask[bonded_indices]
+    donor_indices = np.broadcast_to(
+        donor_indices[:, np.newaxis], bonded_indices.shape
+    )[is_bonded_h]
+    bonded_indices = bonded_indices[is_bonded_h]
+    donor_hydrogen_mask[bonded_indices] = True
+    # If a hydrogen atom is bonded to multiple donors,
+    # the donor with the highest index is associated
+    np.maximum.at(associated_donor_indices, bonded_indices, donor_indices)
+
     return donor_hydrogen_mask, associated_donor_indices
 
 
@@ -348,15 +351,39 @@ def _get_bonded_h_via_distance(array, donor_mask, box):
     associated_donor_indices = np.full(len(array), -1, dtype=int)
 
     donor_indices = np.where(donor_mask)[0]
-    for donor_i in donor_indices:
-        candidate_mask = hydrogen_mask & (res_id == res_id[donor_i])
-        distances = distance(
-            coord[donor_i], coord[candidate_mask], box=box
-        )
-        donor_h_indices = np.where(candidate_mask)[0][distances <= CUTOFF]
-        for i in donor_h_indices:
-            associated_donor_indices[i] = donor_i
-            donor_hydrogen_mask[i] = True
+    hydrogen_indices = np.where(hydrogen_mask)[0]
+    if len(donor_indices) == 0 or len(hydrogen_indices) == 0:
+        return donor_hydrogen_mask, associated_donor_indices
+
+    # Find all hydrogen atoms in proximity to each donor in a single
+    # pass
+    # The cell list is only used for preselection with a slightly
+    # larger radius, the actual criterion is checked below
+    cell_list = CellList(
+        coord[hydrogen_indices], cell_size=CUTOFF,
+        periodic=box is not None, box=box
+    )
+    adjacent = cell_list.get_atoms(coord[donor_indices], CUTOFF + 0.1)
+    donor_indices = np.repeat(donor_indices, adjacent.shape[1])
+    adjacent = adjacent.flatten()
+    is_valid = adjacent != -1
+    donor_indices = donor_indices[is_valid]
+    donor_h_indices = hydrogen_indices[adjacent[is_valid]]
+    # The hydrogen must be in the same residue
+    same_residue = res_id[donor_h_indices] == res_id[donor_indices]
+    donor_indices = donor_indices[same_residue]
+    donor_h_indices = donor_h_indices[same_residue]
+    distances = distance(
+        coord[donor_indices], coord[donor_h_indices], box=box
+    )
+    is_bonded = distances <= CUTOFF
+    donor_indices = donor_indices[is_bonded]
+    donor_h_indices = donor_h_indices[is_bonded]
+
+    donor_hydrogen_mask[donor_h_indices] = True
+    # If a hydrogen atom is in proximity to multiple donors,
+    # the donor with the highest index is associated
+    np.maximum.at(associated_donor_indices, donor_h_indices, donor_indices)
     
     return donor_hydrogen_mask, associated_donor_indices
 
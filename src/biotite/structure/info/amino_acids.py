@@ -11,22 +11,38 @@ import numpy as np
 from os.path import join, dirname, realpath
 
 
-_info_dir = dirname(realpath(__file__))
-# Data is taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2022/09/17)
-# The json-file contains all three-letter-codes of the components where
-# the data item `_chem_comp.type` is equal to one of the following
-# values:
-# D-PEPTIDE LINKING; D-PEPTIDE NH3 AMINO TERMINUS; 
-# D-beta-peptide, C-gamma linking; D-gamma-peptide, C-delta linking; 
-# D-peptide NH3 amino terminus; D-peptide linking; 
-# L-PEPTIDE COOH CARBOXY TERMINUS; L-PEPTIDE LINKING; 
-# L-beta-peptide, C-gamma linking; L-gamma-peptide, C-delta linking; 
-# L-peptide COOH carboxy terminus; L-peptide NH3 amino terminus; 
-# L-peptide linking; PEPTIDE LINKING; peptide linking
-with open(join(_info_dir, "amino_acids.json"), "r") as file:
-    _amino_acids = json.load(file)
+_amino_acids = None
+
+
+def _init_dataset():
+    """
+    Load the amino acid names from file.
+
+    Since loading the data is computationally expensive,
+    this is only done, when the data is actually required.
+    """
+    global _amino_acids
+    if _amino_acids is not None:
+        # Dataset is already initialized
+        return
+
+    _info_dir = dirname(realpath(__file__))
+    # Data is taken from
+    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+    # (2022/09/17)
+    # The json-file contains all three-letter-codes of the components where
+    # the data item `_chem_comp.type` is equal to one of the following
+    # values:
+    # D-PEPTIDE LINKING; D-PEPTIDE NH3 AMINO TERMINUS; 
+    # D-beta-peptide, C-gamma linking; D-gamma-peptide, C-delta linking; 
+    # D-peptide NH3 amino terminus; D-peptide linking; 
+    # L-PEPTIDE COOH CARBOXY TERMINUS; L-PEPTIDE LINKING; 
+    # L-beta-peptide, C-gamma linking; L-gamma-peptide, C-delta linking; 
+    # L-peptide COOH carboxy terminus; L-peptide NH3 amino terminus; 
+    # L-peptide linking; PEPTIDE LINKING; peptide linking
+    with open(join(_info_dir, "amino_acids.json"), "r") as file:
+        _amino_acids = json.load(file)
+
 
 def amino_acid_names():
     """
@@ -39,4 +55,5 @@ def amino_acid_names():
         A list of three-letter-codes containing residues that are
         peptide monomers.
     """
+    _init_dataset()
     return _amino_acids
@@ -6,6 +6,7 @@ __name__ = "biotite.structure.info"
 __author__ = "Patrick Kunzmann"
 __all__ = ["residue"]
 
+import functools
 from os.path import join, dirname, realpath
 import msgpack
 import numpy as np
@@ -14,6 +15,8 @@ from ..bonds import BondList
 
 
 _residues = None
+# The maximum number of residue templates, that are kept in memory
+_TEMPLATE_CACHE_SIZE = 1000
 
 
 def _init_dataset():
@@ -90,6 +93,19 @@ def residue(res_name):
      ['CB' 'HB3']
      ['OXT' 'HXT']]
     """
+    return _get_residue_template(res_name).copy()
+
+
+@functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _get_residue_template(res_name):
+    """
+    Get the :class:`AtomArray` for the residue with the given name.
+
+    The recently used templates are cached, so that repeated lookups
+    of the same residue do not need to create a new
+    :class:`AtomArray`.
+    Hence, the returned object must not be modified.
+    """
     _init_dataset()
     array_dict = _residues[res_name]
 
@@ -116,4 +132,4 @@ def residue(res_name):
         ]).T
     )
 
-    return array
\ No newline at end of file
+    return array
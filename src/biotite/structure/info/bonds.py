@@ -8,12 +8,16 @@ __all__ = ["bond_dataset", "bond_order", "bond_type", "bonds_in_residue"]
 
 import warnings
 import copy
+import functools
 from os.path import join, dirname, realpath
 import msgpack
+import numpy as np
 from ..bonds import BondType
 
 
 _intra_bonds = None
+# The maximum number of residue bond templates, that are kept in memory
+_TEMPLATE_CACHE_SIZE = 1000
 
 
 def _init_dataset():
@@ -196,4 +200,52 @@ def bonds_in_residue(res_name):
     HXT + OXT -> BondType.SINGLE
     """
     _init_dataset()
-    return copy.copy(_intra_bonds.get(res_name.upper()))
\ No newline at end of file
+    return copy.copy(_intra_bonds.get(res_name.upper()))
+
+
+@functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _get_bond_template(res_name):
+    """
+    Get the bonds of the residue with the given name in columnar form.
+
+    The recently used templates are cached, so that repeated lookups
+    of the same residue are cheap.
+    The returned arrays are read-only.
+
+    Parameters
+    ----------
+    res_name : str
+        The up to 3-letter name of the residue to get the bonds for.
+
+    Returns
+    -------
+    atom_names : ndarray, dtype=str
+        The sorted unique names of all atoms that participate in a bond.
+    bond_indices : ndarray, dtype=int, shape=(b,2)
+        The indices of the two bonded atoms pointing to `atom_names`.
+        The bonds are in the same order as in the dataset.
+    bond_types : ndarray, dtype=uint8, shape=(b,)
+        The :class:`BondType` of each bond (represented as integer).
+    
+    If the residue is unknown to the chemical components dictionary,
+    `None` is returned.
+    """
+    _init_dataset()
+    group_bonds = _intra_bonds.get(res_name)
+    if group_bonds is None:
+        return None
+
+    bonded_atom_names = np.array(
+        [atom_name for atom_pair in group_bonds.keys()
+         for atom_name in atom_pair],
+        dtype=str
+    )
+    atom_names, bond_indices = np.unique(
+        bonded_atom_names, return_inverse=True
+    )
+    bond_indices = bond_indices.reshape(-1, 2).astype(np.int64, copy=False)
+    bond_types = np.array(list(group_bonds.values()), dtype=np.uint8)
+
+    for array in (atom_names, bond_indices, bond_types):
+        array.flags.writeable = False
+    return atom_names, bond_indices, bond_types
@@ -11,19 +11,35 @@ import numpy as np
 from os.path import join, dirname, realpath
 
 
-_info_dir = dirname(realpath(__file__))
-# Data is taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2022/09/17)
-# The json-file contains all three-letter-codes of the components where
-# the data item `_chem_comp.type` is equal to one of the following
-# values:
-# D-SACCHARIDE; D-saccharide; D-saccharide, alpha linking; 
-# D-saccharide, beta linking; L-SACCHARIDE; L-saccharide; 
-# L-saccharide, alpha linking; L-saccharide, beta linking; SACCHARIDE; 
-# saccharide
-with open(join(_info_dir, "carbohydrates.json"), "r") as file:
-    _carbohydrates = json.load(file)
+_carbohydrates = None
+
+
+def _init_dataset():
+    """
+    Load the carbohydrate names from file.
+
+    Since loading the data is computationally expensive,
+    this is only done, when the data is actually required.
+    """
+    global _carbohydrates
+    if _carbohydrates is not None:
+        # Dataset is already initialized
+        return
+
+    _info_dir = dirname(realpath(__file__))
+    # Data is taken from
+    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+    # (2022/09/17)
+    # The json-file contains all three-letter-codes of the components where
+    # the data item `_chem_comp.type` is equal to one of the following
+    # values:
+    # D-SACCHARIDE; D-saccharide; D-saccharide, alpha linking; 
+    # D-saccharide, beta linking; L-SACCHARIDE; L-saccharide; 
+    # L-saccharide, alpha linking; L-saccharide, beta linking; SACCHARIDE; 
+    # saccharide
+    with open(join(_info_dir, "carbohydrates.json"), "r") as file:
+        _carbohydrates = json.load(file)
+
 
 def carbohydrate_names():
     """
@@ -36,4 +52,5 @@ def carbohydrate_names():
         A list of three-letter-codes containing residues that are
         saccharide monomers.
     """
+    _init_dataset()
     return _carbohydrates
@@ -4,23 +4,40 @@
 
 __name__ = "biotite.structure.info"
 __author__ = "Patrick Kunzmann"
-__all__ = ["mass"]
+__all__ = ["mass", "mass_array"]
 
 import json
 from os.path import join, dirname, realpath
 import msgpack
+import numpy as np
 from ..atoms import Atom, AtomArray, AtomArrayStack
 
 
-_info_dir = dirname(realpath(__file__))
-# Masses are taken from http://www.sbcs.qmul.ac.uk/iupac/AtWt/ (2018/03/01)
-with open(join(_info_dir, "atom_masses.json"), "r") as file:
-    _atom_masses = json.load(file)
-# Masses are taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2019/01/27)
-with open(join(_info_dir, "residue_masses.msgpack"), "rb") as file:
-    _res_masses = msgpack.load(file, raw=False)
+_atom_masses = None
+_res_masses = None
+
+
+def _init_dataset():
+    """
+    Load the atom and residue masses from file.
+
+    Since loading the data is computationally expensive,
+    this is only done, when the masses are actually required.
+    """
+    global _atom_masses, _res_masses
+    if _atom_masses is not None:
+        # Dataset is already initialized
+        return
+
+    _info_dir = dirname(realpath(__file__))
+    # Masses are taken from http://www.sbcs.qmul.ac.uk/iupac/AtWt/ (2018/03/01)
+    with open(join(_info_dir, "atom_masses.json"), "r") as file:
+        _atom_masses = json.load(file)
+    # Masses are taken from
+    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+    # (2019/01/27)
+    with open(join(_info_dir, "residue_masses.msgpack"), "rb") as file:
+        _res_masses = msgpack.load(file, raw=False)
 
 
 def mass(item, is_residue=None):
@@ -94,6 +111,7 @@ def mass(item, is_residue=None):
     >>> print(mass("N"))
     14.007
     """
+    _init_dataset()
 
     if isinstance(item, str):
         if is_residue is None:
@@ -108,9 +126,7 @@ def mass(item, is_residue=None):
     elif isinstance(item, Atom):
         result_mass = mass(item.element, is_residue=False)
     elif isinstance(item, AtomArray) or isinstance(item, AtomArrayStack):
-        result_mass = sum(
-            (mass(element, is_residue=False) for element in item.element)
-        )
+        result_mass = float(np.sum(mass_array(item.element)))
     
     else:
         raise TypeError(
@@ -119,4 +135,57 @@ def mass(item, is_residue=None):
     
     if result_mass is None:
         raise KeyError(f"{item} is not known")
-    return result_mass
\ No newline at end of file
+    return result_mass
+
+
+def mass_array(element):
+    """
+    Get the atomic masses for an array of chemical elements.
+    :footcite:`Meija2016`
+
+    In contrast to :func:`mass()`, all elements are looked up at once,
+    which makes this function suitable for large structures.
+
+    Parameters
+    ----------
+    element : ndarray, dtype=str
+        The chemical elements to get the masses for, e.g. the
+        ``element`` annotation of an :class:`AtomArray`.
+    
+    Returns
+    -------
+    masses : ndarray, dtype=float
+        The mass of each element in *u*.
+        The array has the same shape as `element`.
+    
+    Raises
+    ------
+    KeyError
+        If the mass of any of the given elements is unknown.
+
+    See also
+    --------
+    mass
+    
+    References
+    ----------
+    
+    .. footbibliography::
+    
+    Examples
+    --------
+
+    >>> print(mass_array(atom_array.element[:5]))
+    [14.007 12.011 12.011 15.999 12.011]
+    """
+    _init_dataset()
+
+    element = np.asarray(element)
+    unique_elements, inverse = np.unique(element, return_inverse=True)
+    unique_masses = np.zeros(len(unique_elements), dtype=float)
+    for i, unique_element in enumerate(unique_elements):
+        element_mass = _atom_masses.get(str(unique_element).upper())
+        if element_mass is None:
+            raise KeyError(f"{unique_element} is not known")
+        unique_masses[i] = element_mass
+    return unique_masses[inverse.flatten()].reshape(element.shape)
@@ -10,14 +10,30 @@ from os.path import join, dirname, realpath
 import msgpack
 
 
-_info_dir = dirname(realpath(__file__))
-# Data is taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2019/01/27)
-with open(join(_info_dir, "residue_names.msgpack"), "rb") as file:
-    _res_names = msgpack.load(file, raw=False)
-with open(join(_info_dir, "link_types.msgpack"), "rb") as file:
-    _link_types = msgpack.load(file, raw=False)
+_res_names = None
+_link_types = None
+
+
+def _init_dataset():
+    """
+    Load the residue names and link types from file.
+
+    Since loading the data is computationally expensive,
+    this is only done, when the data is actually required.
+    """
+    global _res_names, _link_types
+    if _res_names is not None:
+        # Dataset is already initialized
+        return
+
+    _info_dir = dirname(realpath(__file__))
+    # Data is taken from
+    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+    # (2019/01/27)
+    with open(join(_info_dir, "residue_names.msgpack"), "rb") as file:
+        _res_names = msgpack.load(file, raw=False)
+    with open(join(_info_dir, "link_types.msgpack"), "rb") as file:
+        _link_types = msgpack.load(file, raw=False)
 
 
 def all_residues():
@@ -36,7 +52,8 @@ def all_residues():
     >>> print(all_residues()[1000 : 1010])
     ['0Y4', '0Y5', '0Y7', '0Y8', '0Y9', '0YA', '0YB', '0YC', '0YD', '0YE']
     """
-    return list(_res_names.keys()) 
+    _init_dataset()
+    return list(_res_names.keys())
 
 
 def full_name(res_name):
@@ -60,6 +77,7 @@ def full_name(res_name):
     >>> print(full_name("MAN"))
     alpha-D-mannopyranose
     """
+    _init_dataset()
     return _res_names.get(res_name.upper())
 
 
@@ -88,4 +106,5 @@ def link_type(res_name):
     >>> print(link_type("HOH"))
     NON-POLYMER
     """
+    _init_dataset()
     return _link_types.get(res_name.upper())
\ No newline at end of file
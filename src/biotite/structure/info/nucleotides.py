@@ -11,19 +11,35 @@ import numpy as np
 from os.path import join, dirname, realpath
 
 
-_info_dir = dirname(realpath(__file__))
-# Data is taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2022/09/17)
-# The json-file contains all three-letter-codes of the components where
-# the data item `_chem_comp.type` is equal to one of the following
-# values:
-# DNA LINKING; DNA OH 3 PRIME TERMINUS; DNA OH 3 prime terminus; 
-# DNA OH 5 prime terminus; DNA linking; L-DNA LINKING; L-DNA linking; 
-# L-RNA LINKING; L-RNA linking; RNA LINKING; RNA OH 3 prime terminus; 
-# RNA OH 5 prime terminus; RNA linking
-with open(join(_info_dir, "nucleotides.json"), "r") as file:
-    _nucleotides = json.load(file)
+_nucleotides = None
+
+
+def _init_dataset():
+    """
+    Load the nucleotide names from file.
+
+    Since loading the data is computationally expensive,
+    this is only done, when the data is actually required.
+    """
+    global _nucleotides
+    if _nucleotides is not None:
+        # Dataset is already initialized
+        return
+
+    _info_dir = dirname(realpath(__file__))
+    # Data is taken from
+    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+    # (2022/09/17)
+    # The json-file contains all three-letter-codes of the components where
+    # the data item `_chem_comp.type` is equal to one of the following
+    # values:
+    # DNA LINKING; DNA OH 3 PRIME TERMINUS; DNA OH 3 prime terminus; 
+    # DNA OH 5 prime terminus; DNA linking; L-DNA LINKING; L-DNA linking; 
+    # L-RNA LINKING; L-RNA linking; RNA LINKING; RNA OH 3 prime terminus; 
+    # RNA OH 5 prime terminus; RNA linking
+    with open(join(_info_dir, "nucleotides.json"), "r") as file:
+        _nucleotides = json.load(file)
+
 
 def nucleotide_names():
     """
@@ -36,4 +52,5 @@ def nucleotide_names():
         A list of three-letter-codes containing residues that are
         DNA/RNA monomers.
     """
+    _init_dataset()
     return _nucleotides
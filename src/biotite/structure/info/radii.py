@@ -4,9 +4,12 @@
 
 __name__ = "biotite.structure.info"
 __author__ = "Patrick Kunzmann"
-__all__ = ["vdw_radius_protor", "vdw_radius_single"]
+__all__ = ["vdw_radius_protor", "vdw_radius_single",
+           "vdw_radius_protor_array", "vdw_radius_single_array"]
 
-from .bonds import bonds_in_residue
+import functools
+import numpy as np
+from .bonds import _get_bond_template
 
 
 # Contains tuples for the different ProtOr groups:
@@ -58,8 +61,8 @@ _SINGLE_RADII = {
     "XE": 2.16,
 }
 
-# A dictionary that caches radii for each residue
-_protor_radii = {}
+# The maximum number of residue radius templates, that are kept in memory
+_TEMPLATE_CACHE_SIZE = 1000
 
 
 def vdw_radius_protor(res_name, atom_name):
@@ -109,59 +112,153 @@ def vdw_radius_protor(res_name, atom_name):
             f"Calculating the ProtOr radius for the hydrogen atom "
             f"'{atom_name}' is not meaningful"
         )
-    if res_name in _protor_radii:
-        # Use cached radii for the residue, if already calculated
-        if atom_name not in _protor_radii[res_name]:
-            raise KeyError(
-                f"Residue '{res_name}' does not contain an atom named "
-                f"'{atom_name}'"
-            )
-        return _protor_radii[res_name].get(atom_name)
-    else:
-        # Otherwise calculate radii for the given residue and cache
-        _protor_radii[res_name] = _calculate_protor_radii(res_name)
-        # Recursive call, but this time the radii for the given residue
-        # are cached
-        return vdw_radius_protor(res_name, atom_name)
-
-def _calculate_protor_radii(res_name):
+    template = _get_protor_template(res_name)
+    if template is None:
+        raise KeyError(
+            f"Residue '{res_name}' is not in the chemical components "
+            f"dictionary"
+        )
+    atom_names, radii = template
+    i = np.searchsorted(atom_names, atom_name)
+    if i == len(atom_names) or atom_names[i] != atom_name:
+        raise KeyError(
+            f"Residue '{res_name}' does not contain an atom named "
+            f"'{atom_name}'"
+        )
+    radius = radii[i]
+    return None if np.isnan(radius) else float(radius)
+
+
+def vdw_radius_protor_array(res_name, atom_name):
+    """
+    Estimate the ProtOr Van-der-Waals radii for multiple non-hydrogen
+    atoms at once.
+    :footcite:`Tsai1999`
+
+    This is the vectorized counterpart of :func:`vdw_radius_protor()`:
+    All atoms of residues with the same name are handled in a single
+    step.
+
+    Parameters
+    ----------
+    res_name : ndarray, dtype=str, shape=(n,)
+        The up to 3-letter residue names the atoms belong to, e.g.
+        the ``res_name`` annotation of an :class:`AtomArray`.
+    atom_name : ndarray, dtype=str, shape=(n,)
+        The names of the atoms.
+    
+    Returns
+    -------
+    radii : ndarray, dtype=float32, shape=(n,)
+        The Van-der-Waals radii of the given atoms.
+        *NaN* for atoms whose radius cannot be estimated, i.e.
+        hydrogen atoms, atoms that are not part of the residue in the
+        chemical components dictionary and atoms of unknown residues.
+
+    See also
+    --------
+    vdw_radius_protor
+    
+    References
+    ----------
+    
+    .. footbibliography::
+    
+    Examples
+    --------
+
+    >>> radii = vdw_radius_protor_array(
+    ...     atom_array.res_name, atom_array.atom_name
+    ... )
+    >>> print(radii[:8])
+    [1.64 1.88 1.61 1.42 1.88 1.61 1.42 1.64]
+    """
+    res_name = np.asarray(res_name)
+    atom_name = np.asarray(atom_name)
+    if res_name.shape != atom_name.shape:
+        raise IndexError(
+            f"{len(res_name)} residue names were given, "
+            f"but {len(atom_name)} atom names"
+        )
+    radii = np.full(atom_name.shape, np.nan, dtype=np.float32)
+    if len(atom_name) == 0:
+        return radii
+
+    unique_res_names, res_name_indices = np.unique(
+        res_name, return_inverse=True
+    )
+    res_name_indices = res_name_indices.flatten()
+    # Group the atoms by their residue name
+    order = np.argsort(res_name_indices, kind="stable")
+    group_bounds = np.searchsorted(
+        res_name_indices[order], np.arange(len(unique_res_names) + 1)
+    )
+    for i, name in enumerate(unique_res_names):
+        template = _get_protor_template(str(name).upper())
+        if template is None:
+            continue
+        template_atom_names, template_radii = template
+        if len(template_atom_names) == 0:
+            continue
+        atom_indices = order[group_bounds[i] : group_bounds[i+1]]
+        pos = np.searchsorted(template_atom_names, atom_name[atom_indices])
+        pos[pos == len(template_atom_names)] = 0
+        is_in_template = (template_atom_names[pos] == atom_name[atom_indices])
+        radii[atom_indices[is_in_template]] \
+            = template_radii[pos[is_in_template]]
+    return radii
+
+
+@functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _get_protor_template(res_name):
     """
     Calculate the ProtOr VdW radii for all atoms (atom names) in
     a residue.
+
+    Returns
+    -------
+    atom_names : ndarray, dtype=str
+        The sorted names of all non-hydrogen atoms that participate in
+        a bond.
+    radii : ndarray, dtype=float
+        The corresponding radii.
+        *NaN* if the ProtOr group of the atom has no radius.
+    
+    If the residue is unknown to the chemical components dictionary,
+    `None` is returned.
     """
-    bonds = bonds_in_residue(res_name)
-    # Maps atom names to a ProtOr group
-    # -> tuple(element, valency, H count)
-    # Based on the group the radius is chosen from _PROTOR_RADII
-    groups = {}
-    for atom1, atom2 in bonds:
-        # Process each bond two times:
-        # One time the first atom is the one to get valency and H count
-        # for and the other time vice versa
-        for main_atom, bound_atom in ((atom1, atom2), (atom2, atom1)):
-            element = main_atom[0]
-            # Calculating ProtOr radii for hydrogens in not meaningful
-            if element == "H":
-                continue
-            # Only for these elements ProtOr groups exist
-            # Calculation of group for all other elements would be
-            # pointless
-            if element not in ["C", "N", "O", "S"]:
-                # Empty tuple to indicate nonexistent entry
-                groups[main_atom] = ()
-                continue
-            # Update existing entry if already existing
-            group = groups.get(main_atom, [element, 0, 0])
-            # Increase valency by one, since the bond entry exists
-            group[1] += 1
-            # If the atom is bonded to hydrogen, increase H count
-            if bound_atom[0] == "H":
-                group[2] += 1
-            groups[main_atom] = group
-    # Get radii based on ProtOr groups
-    radii = {atom : _PROTOR_RADII.get(tuple(group))
-             for atom, group in groups.items()}
-    return radii
+    bond_template = _get_bond_template(res_name)
+    if bond_template is None:
+        return None
+    atom_names, bond_indices, _ = bond_template
+    # Like in the ProtOr dataset, the element is derived from the
+    # first character of the atom name
+    elements = atom_names.astype("U1")
+    is_hydrogen = (elements == "H")
+    # Process each bond two times:
+    # One time the first atom is the one to get valency and H count
+    # for and the other time vice versa
+    main_atoms = bond_indices.T.flatten()
+    bound_atoms = bond_indices[:, ::-1].T.flatten()
+    valency = np.bincount(main_atoms, minlength=len(atom_names))
+    h_count = np.bincount(
+        main_atoms[is_hydrogen[bound_atoms]], minlength=len(atom_names)
+    )
+
+    # Calculating ProtOr radii for hydrogens in not meaningful
+    mask = ~is_hydrogen
+    atom_names = atom_names[mask]
+    radii = np.array([
+        # Only for C, N, O and S ProtOr groups exist
+        _PROTOR_RADII.get((element, val, h), np.nan)
+        if element in ("C", "N", "O", "S") else np.nan
+        for element, val, h
+        in zip(elements[mask], valency[mask].tolist(), h_count[mask].tolist())
+    ], dtype=float)
+    
+    atom_names.flags.writeable = False
+    radii.flags.writeable = False
+    return atom_names, radii
 
 
 def vdw_radius_single(element):
@@ -194,4 +291,46 @@ def vdw_radius_single(element):
     >>> print(vdw_radius_single("C"))
     1.7
     """
-    return _SINGLE_RADII.get(element.upper())
\ No newline at end of file
+    return _SINGLE_RADII.get(element.upper())
+
+
+def vdw_radius_single_array(element):
+    """
+    Get the Van-der-Waals radii of atoms from the given elements.
+    :footcite:`Bondi1964`
+
+    This is the vectorized counterpart of :func:`vdw_radius_single()`.
+
+    Parameters
+    ----------
+    element : ndarray, dtype=str, shape=(n,)
+        The chemical elements of the atoms.
+    
+    Returns
+    -------
+    radii : ndarray, dtype=float32, shape=(n,)
+        The Van-der-Waals radii of the atoms.
+        *NaN* for atoms whose element has no known radius.
+    
+    See also
+    --------
+    vdw_radius_single
+    
+    References
+    ----------
+    
+    .. footbibliography::
+    
+    Examples
+    --------
+
+    >>> print(vdw_radius_single_array(np.array(["C", "N", "O", "FE"])))
+    [1.70 1.55 1.52  nan]
+    """
+    element = np.asarray(element)
+    unique_elements, inverse = np.unique(element, return_inverse=True)
+    unique_radii = np.array(
+        [_SINGLE_RADII.get(str(e).upper(), np.nan) for e in unique_elements],
+        dtype=np.float32
+    )
+    return unique_radii[inverse.flatten()].reshape(element.shape)
@@ -7,14 +7,11 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["standardize_order"]
 
 import numpy as np
-from .atoms import residue
+from .atoms import _get_residue_template
 from ..residues import get_residue_starts
 from ..error import BadStructureError
 
 
-_atom_name_cache = {}
-
-
 def standardize_order(atoms):
     """
     Get an index array for an input :class:`AtomArray` or
@@ -115,77 +112,66 @@ def standardize_order(atoms):
         A       1  ASN H3     H        -9.877    4.041   -0.293
         A       1  ASN H1     H        -8.330    3.957    0.261
     """
-    reordered_indices = np.zeros(atoms.array_length(), dtype=int)
-
+    n_atoms = atoms.array_length()
+    atom_names = atoms.atom_name
     starts = get_residue_starts(atoms, add_exclusive_stop=True)
-    for i in range(len(starts)-1):
-        start = starts[i]
-        stop = starts[i+1]
-
-        res_name = atoms.res_name[start]
-        standard_atom_names = _atom_name_cache.get(res_name)
-        if standard_atom_names is None:
-            standard_atom_names = residue(res_name).atom_name
-            _atom_name_cache[res_name] = standard_atom_names
-        
-        reordered_indices[start : stop] = _reorder(
-            atoms.atom_name[start : stop], standard_atom_names
-        ) + start
-
-    return reordered_indices
-
-
-def _reorder(origin, target):
-    """
-    Create indices to `origin`, that changes the order of `origin`,
-    so that the order is the same as in `target`.
-
-    Indices for elements of `target` that are not in `origin`
-    are ignored.
-    Indices for elements of `origin` that are not in `target`
-    are appended to the end of the returned array.
-
-
-    Parameters
-    ----------
-    origin : ndarray, dtype=str
-        The atom names to reorder.
-    target : ndarray, dtype=str
-        The atom names in target order.
+    residue_lengths = np.diff(starts)
+    residue_indices = np.repeat(np.arange(len(starts)-1), residue_lengths)
+    unique_res_names, res_name_indices = np.unique(
+        atoms.res_name[starts[:-1]], return_inverse=True
+    )
+    atom_res_name_indices = res_name_indices.flatten()[residue_indices]
+
+    # The rank of each atom in the standard order of its residue
+    # Atoms that are not in the reference residue obtain a rank of -1
+    ranks = np.full(n_atoms, -1, dtype=np.int64)
+    max_reference_length = 0
+    # Group the atoms by their residue name
+    res_name_order = np.argsort(atom_res_name_indices, kind="stable")
+    group_bounds = np.searchsorted(
+        atom_res_name_indices[res_name_order],
+        np.arange(len(unique_res_names) + 1)
+    )
+    for i, res_name in enumerate(unique_res_names):
+        atom_indices = res_name_order[group_bounds[i] : group_bounds[i+1]]
+        reference_names = _get_residue_template(str(res_name)).atom_name
+        max_reference_length = max(
+            max_reference_length, len(reference_names)
+        )
+        # Atom name -> rank table for the reference residue
+        sorted_reference_ranks = np.argsort(reference_names)
+        sorted_reference_names = reference_names[sorted_reference_ranks]
+        pos = np.searchsorted(
+            sorted_reference_names, atom_names[atom_indices]
+        )
+        pos[pos == len(sorted_reference_names)] = 0
+        is_in_reference = (
+            sorted_reference_names[pos] == atom_names[atom_indices]
+        )
+        ranks[atom_indices[is_in_reference]] \
+            = sorted_reference_ranks[pos[is_in_reference]]
     
-    Returns
-    -------
-    indices : ndarray, dtype=int
-        Indices for `origin` that that changes the order of `origin`
-        to the order of `target`.
-    """
-    target_hits, origin_hits = np.where(
-        target[:, np.newaxis] == origin[np.newaxis, :]
+    # Atoms that are not in the reference residue are appended to the
+    # end of the respective residue, keeping their original order
+    is_additional = (ranks == -1)
+    ranks[is_additional] = max_reference_length + (
+        np.arange(n_atoms) - starts[residue_indices]
+    )[is_additional]
+
+    max_rank = max_reference_length + (
+        residue_lengths.max() if len(residue_lengths) > 0 else 0
     )
-
-    counts = np.bincount(target_hits, minlength=len(target))
-    if (counts > 1).any():
-        counts = np.bincount(target_hits, minlength=len(target))
-        # Identify which atom is duplicate
-        duplicate_i = np.where(
-            counts > 1
-        )[0][0]
-        duplicate_name = target[duplicate_i]
+    keys = residue_indices.astype(np.int64) * max_rank + ranks
+    reordered_indices = np.argsort(keys, kind="stable")
+
+    # Atoms with the same name in the same residue obtain the same key
+    sorted_keys = keys[reordered_indices]
+    is_duplicate = (sorted_keys[1:] == sorted_keys[:-1])
+    if is_duplicate.any():
+        duplicate_i = reordered_indices[np.where(is_duplicate)[0][0]]
+        duplicate_name = atom_names[duplicate_i]
         raise BadStructureError(
             f"Input structure has duplicate atom '{duplicate_name}'"
         )
 
-    if len(origin_hits) < len(origin):
-        # The origin structure has additional atoms
-        # to the target structure
-        # -> Identify which atoms are missing in the target structure
-        # and append these to the end of the residue
-        missing_atom_mask = np.bincount(
-            origin_hits, minlength=len(origin)
-        ).astype(bool)
-        return np.concatenate([
-            origin_hits,
-            np.where(~missing_atom_mask)[0]
-        ])
-    else:
-        return origin_hits
\ No newline at end of file
+    return reordered_indices
@@ -0,0 +1,201 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides functions for the detection of contacts at the
+interface between chains.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["interface_contacts"]
+
+import numpy as np
+from .assembly import VirtualAssembly
+from .atoms import AtomArray
+from .celllist import CellList
+from .chains import get_chain_starts
+from .residues import get_residue_starts
+
+
+def interface_contacts(atoms, cutoff=4.0):
+    """
+    Find all pairs of residues from different chains that are in
+    contact with each other.
+
+    Two residues are in contact, if the distance between any of their
+    atoms is at most `cutoff`.
+    All atoms are put into a single :class:`CellList`, which is queried
+    chain by chain, so that the memory requirement scales with the size
+    of the largest chain rather than the size of the entire structure.
+
+    Parameters
+    ----------
+    atoms : AtomArray or VirtualAssembly
+        The structure to find the interface contacts in.
+        If a :class:`VirtualAssembly` is given, each chain of each copy
+        is treated as a separate chain and the assembly is not
+        materialized.
+    cutoff : float, optional
+        The maximum distance between two atoms, that are in contact.
+
+    Returns
+    -------
+    residue_pairs : ndarray, dtype=int, shape=(p,2)
+        Each row contains the indices of the first atom of the two
+        residues in contact.
+        For a :class:`VirtualAssembly` the indices refer to the
+        materialized assembly (see :meth:`VirtualAssembly.materialize()`).
+        The residue in the first column belongs to the chain that
+        appears first in the structure.
+        The pairs are sorted by the first and then by the second
+        column.
+    distances : ndarray, dtype=float32, shape=(p,)
+        The minimum distance between the atoms of the two residues.
+
+    See also
+    --------
+    VirtualAssembly.find_contacts
+
+    Examples
+    --------
+
+    >>> # Divide the Trp-cage into two artificial chains
+    >>> atoms = atom_array.copy()
+    >>> atoms.chain_id[atoms.res_id > 10] = "B"
+    >>> residue_pairs, distances = interface_contacts(atoms, cutoff=3.0)
+    >>> for (i, j), dist in zip(residue_pairs, distances):
+    ...     print(
+    ...         f"{atoms.res_name[i]}{atoms.res_id[i]} "
+    ...         f"{atoms.res_name[j]}{atoms.res_id[j]} "
+    ...         f"{dist:.2f}"
+    ...     )
+    LEU2 PRO19 2.15
+    TYR3 PRO18 2.40
+    TYR3 PRO19 2.47
+    TRP6 GLY11 2.33
+    TRP6 PRO12 2.41
+    TRP6 ARG16 1.87
+    TRP6 PRO17 2.75
+    TRP6 PRO18 2.70
+    TRP6 PRO19 2.59
+    LEU7 GLY11 2.67
+    ASP9 SER14 1.55
+    ASP9 ARG16 2.41
+    GLY10 GLY11 1.34
+    GLY10 SER13 2.16
+    GLY10 SER14 2.96
+    """
+    if isinstance(atoms, VirtualAssembly):
+        coord, chain_indices, residue_indices = _index_assembly(atoms)
+    elif isinstance(atoms, AtomArray):
+        coord = atoms.coord
+        chain_indices = _segment_indices(
+            get_chain_starts(atoms, add_exclusive_stop=True)
+        )
+        residue_indices = _segment_indices(
+            get_residue_starts(atoms, add_exclusive_stop=True)
+        )
+    else:
+        raise TypeError(
+            f"Expected 'AtomArray' or 'VirtualAssembly', "
+            f"but got {type(atoms).__name__}"
+        )
+
+    if len(coord) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    # Enumerate the residues consecutively
+    is_residue_start = np.diff(residue_indices, prepend=-1) != 0
+    residue_starts = np.where(is_residue_start)[0]
+    residue_indices = np.cumsum(is_residue_start) - 1
+
+    cell_list = CellList(coord, max(cutoff, 1.0))
+    first_atoms = []
+    second_atoms = []
+    chain_starts = np.where(np.diff(chain_indices, prepend=-1) != 0)[0]
+    chain_stops = np.append(chain_starts[1:], len(coord))
+    for start, stop in zip(chain_starts, chain_stops):
+        adjacent = cell_list.get_atoms(coord[start:stop], cutoff)
+        first = np.repeat(np.arange(start, stop), adjacent.shape[1])
+        second = adjacent.flatten()
+        # Each chain pair is only handled once:
+        # Only atoms from succeeding chains are taken into account
+        mask = second >= stop
+        first_atoms.append(first[mask])
+        second_atoms.append(second[mask])
+    first_atoms = np.concatenate(first_atoms)
+    second_atoms = np.concatenate(second_atoms)
+
+    distances = np.sqrt(np.sum(
+        (coord[first_atoms] - coord[second_atoms])**2, axis=-1
+    ))
+
+    # Reduce atom contacts to residue contacts
+    # with the minimum distance between the atoms of both residues
+    n_residues = len(residue_starts)
+    keys = (
+        residue_indices[first_atoms].astype(np.int64) * n_residues
+        + residue_indices[second_atoms]
+    )
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    distances = distances[order]
+    unique_keys, key_starts = np.unique(keys, return_index=True)
+    if len(unique_keys) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.float32)
+    min_distances = np.minimum.reduceat(distances, key_starts)
+    residue_pairs = np.stack(
+        [
+            residue_starts[unique_keys // n_residues],
+            residue_starts[unique_keys % n_residues],
+        ],
+        axis=-1,
+    )
+    return residue_pairs, min_distances.astype(np.float32, copy=False)
+
+
+def _segment_indices(starts):
+    """
+    Get the index of the segment each atom belongs to from the segment
+    starts including the exclusive stop.
+    """
+    return np.repeat(np.arange(len(starts) - 1), np.diff(starts))
+
+
+def _index_assembly(assembly):
+    """
+    Get the coordinates and the chain and residue indices of each atom
+    in the materialized assembly, without materializing it.
+    """
+    asym_unit = assembly.atoms
+    asym_chain_starts = get_chain_starts(asym_unit, add_exclusive_stop=True)
+    asym_residue_starts = get_residue_starts(
+        asym_unit, add_exclusive_stop=True
+    )
+    asym_chain_indices = _segment_indices(asym_chain_starts)
+    asym_residue_indices = _segment_indices(asym_residue_starts)
+    n_chains = len(asym_chain_starts) - 1
+    n_residues = len(asym_residue_starts) - 1
+
+    coord = []
+    chain_indices = []
+    residue_indices = []
+    for i in range(assembly.copy_count()):
+        indices = assembly.get_indices(i)
+        coord.append(assembly.get_coord(i))
+        # Each copy of a chain is a distinct chain in the assembly
+        chain_indices.append(asym_chain_indices[indices] + i * n_chains)
+        residue_indices.append(asym_residue_indices[indices] + i * n_residues)
+    if len(coord) == 0:
+        return (
+            np.zeros((0, 3), dtype=np.float32),
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.int64),
+        )
+    return (
+        np.concatenate(coord),
+        np.concatenate(chain_indices),
+        np.concatenate(residue_indices),
+    )
@@ -29,4 +29,22 @@ __author__ = "Patrick Kunzmann"
 
 from .ctab import *
 from .general import *
-from .trajfile import *
\ No newline at end of file
+from .trajfile import *
+
+
+# The subpackages are not imported with the package,
+# but when they are accessed for the first time (PEP 562),
+# as importing them is comparatively expensive
+_SUBPACKAGES = [
+    "dcd", "gro", "mmtf", "mol", "netcdf", "npz",
+    "pdb", "pdbqt", "pdbx", "tng", "trr", "xtc"
+]
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        import importlib
+        return importlib.import_module(f"biotite.structure.io.{name}")
+    raise AttributeError(
+        f"module 'biotite.structure.io' has no attribute '{name}'"
+    )
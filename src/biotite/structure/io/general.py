@@ -88,6 +88,15 @@ def load_structure(file_path, template=None, **kwargs):
             return array[0]
         else:
             return array
+    elif suffix == ".bcif":
+        from .pdbx import BinaryCIFFile, get_structure
+        file = BinaryCIFFile.read(file_path)
+        array = get_structure(file, **kwargs)
+        if isinstance(array, AtomArrayStack) and array.stack_depth() == 1:
+            # Stack containing only one model -> return as atom array
+            return array[0]
+        else:
+            return array
     elif suffix == ".gro":
         from .gro import GROFile
         file = GROFile.read(file_path)
@@ -189,6 +198,11 @@ def save_structure(file_path, array, **kwargs):
         file = PDBxFile()
         set_structure(file, array, data_block="STRUCTURE", **kwargs)
         file.write(file_path)
+    elif suffix == ".bcif":
+        from .pdbx import BinaryCIFFile, set_structure
+        file = BinaryCIFFile()
+        set_structure(file, array, data_block="STRUCTURE", **kwargs)
+        file.write(file_path)
     elif suffix == ".gro":
         from .gro import GROFile
         file = GROFile()
@@ -6,13 +6,14 @@ __name__ = "biotite.structure.io.gro"
 __author__ = "Daniel Bauer, Patrick Kunzmann"
 __all__ = ["GROFile"]
 
+import itertools
 import numpy as np
 from ...atoms import AtomArray, AtomArrayStack
 from ...box import is_orthogonal
-from ....file import TextFile, InvalidFileError
+from ....file import TextFile, InvalidFileError, is_open_compatible, is_text
 from ..general import _guess_element as guess_element
+from ..util import str_len, to_ascii_columns, format_fixed_point
 from ...error import BadStructureError
-import copy
 from datetime import datetime
 
 _atom_records = {"res_id"    : (0, 5),
@@ -38,7 +39,7 @@ class GROFile(TextFile):
     --------
     Load a `\\*.gro` file, modify the structure and save the new
     structure into a new file:
-    
+
     >>> import os.path
     >>> file = GROFile.read(os.path.join(path_to_structures, "1l2y.gro"))
     >>> array_stack = file.get_structure()
@@ -46,7 +47,7 @@ class GROFile(TextFile):
     >>> file = GROFile()
     >>> file.set_structure(array_stack_mod)
     >>> file.write(os.path.join(path_to_directory, "1l2y_mod.gro"))
-    
+
     """
     def get_model_count(self):
         """
@@ -57,18 +58,15 @@ class GROFile(TextFile):
         model_count : int
             The number of models.
         """
-        model_count = 0
-        for line in self.lines:
-            if _is_int(line):
-                model_count += 1
-        return model_count
+        model_start_i, _ = self._get_model_starts()
+        return len(model_start_i)
 
 
     def get_structure(self, model=None):
         """
         Get an :class:`AtomArray` or :class:`AtomArrayStack` from the
         GRO file.
-        
+
         Parameters
         ----------
         model : int, optional
@@ -80,64 +78,22 @@ class GROFile(TextFile):
             If this parameter is omitted, an :class:`AtomArrayStack`
             containing all models will be returned, even if the
             structure contains only one model.
-        
+
         Returns
         -------
         array : AtomArray or AtomArrayStack
             The return type depends on the `model` parameter.
-        """
-        
-        def get_atom_line_i(model_start_i, model_atom_counts):
-            """
-            Helper function to get the indices of all atoms for a model
-            """
-            return np.arange(
-                model_start_i+1, model_start_i+1+model_atom_counts
-            )
-        
-        def set_box_dimen(box_param):
-            """
-            Helper function to create the box vectors from the values
-            in the GRO file
-
-            Parameters
-            ----------
-            box_param : list of float
-                The box dimensions in the GRO file.
-            
-            Returns
-            -------
-            box_vectors : ndarray, dtype=float, shape=(3,3)
-                The atom array compatible box vectors.
-            """
-            if not any(box_param):
-                return None
-            if len(box_param) == 3:
-                x, y, z = box_param
-                return np.array([[x,0,0], [0,y,0], [0,0,z]], dtype=float)
-            elif len(box_param) == 9:
-                x1, y2, z3, x2, x3, y1, y3, z1, z2 = box_param
-                return np.array(
-                    [[x1,x2,x3], [y1,y2,y3], [z1,z2,z3]], dtype=float
-                )
-            else:
-                raise InvalidFileError(
-                    f"Invalid amount of box parameters: {len(box_param)}"
-                )
-
-        # Line indices where a new model starts
-        model_start_i = np.array([i for i in range(len(self.lines))
-                                  if _is_int(self.lines[i])],
-                                 dtype=int)
 
-        # Number of atoms in each model
-        model_atom_counts = np.array(
-            [int(self.lines[i]) for i in model_start_i]
-        )
+        See also
+        --------
+        read_iter_structure
+        """
+        # Line indices of the atom count line of each model
+        model_start_i, model_atom_counts = self._get_model_starts()
 
         if model is None:
             # Check if all models have the same length
-            if np.all(model_atom_counts != model_atom_counts[0]):
+            if np.any(model_atom_counts != model_atom_counts[0]):
                 raise BadStructureError("The models in the file have unequal "
                                         "amount of atoms, give an explicit "
                                         "model instead")
@@ -145,9 +101,27 @@ class GROFile(TextFile):
             length = model_atom_counts[0]
             array = AtomArrayStack(depth, length)
 
-            # Line indices for annotation determination is determined
-            # from model 1
-            annot_i = get_atom_line_i(model_start_i[0], length)
+            # Annotations are determined from model 1
+            start = model_start_i[0] + 1
+            _fill_annotations(array, self.lines[start : start + length])
+
+            # The coordinates of all models are parsed at once
+            array.coord = _parse_coord(list(itertools.chain.from_iterable(
+                self.lines[i + 1 : i + 1 + length] for i in model_start_i
+            ))).reshape(depth, length, 3)
+
+            # Box is stored in last line (after coordinates)
+            boxes = [
+                _parse_box(self.lines[i + 1 + length]) for i in model_start_i
+            ]
+            # Create a box in the stack if any box is not a dummy
+            if any(box is not None for box in boxes):
+                array.box = np.zeros((depth, 3, 3))
+                for m, box in enumerate(boxes):
+                    if box is not None:
+                        array.box[m] = box
+            return array
+
         else:
             if model == 0:
                 raise ValueError("The model index must not be 0")
@@ -160,62 +134,83 @@ class GROFile(TextFile):
                 )
 
             length = model_atom_counts[model-1]
-            array = AtomArray(length)
+            start = model_start_i[model-1] + 1
+            return _parse_model(
+                self.lines[start : start + length],
+                self.lines[start + length]
+            )
 
-            annot_i = get_atom_line_i(model_start_i[model-1], length)
 
-        # Replace empty strings for elements with guessed types
-        # i is index in array, line_i is line index
-        for i, line_i in enumerate(annot_i):
-            line = self.lines[line_i]
-            array.res_id[i] = int(line[0:5])
-            array.res_name[i] = line[5:10].strip()
-            array.atom_name[i] = line[10:15].strip()
-            array.element[i] = guess_element(line[10:15].strip())
+    @staticmethod
+    def read_iter_structure(file, start=None, stop=None, step=None):
+        """
+        Create an iterator over the models of a GRO file.
+
+        In contrast to :meth:`read()` and :meth:`get_structure()`,
+        the lines of the file are not stored in an intermediate
+        :class:`GROFile`, but only the lines of the current model are
+        read from the file.
+        Hence, this static method may save a large amount of memory if
+        a large multi-model file, e.g. a trajectory written by
+        *Gromacs*, should be read.
+        Models outside the selected range are skipped without parsing.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+        start : int, optional
+            The model index, where file parsing is started.
+            If no value is given, parsing starts at the first model.
+            The index starts at 0.
+        stop : int, optional
+            The exclusive model index, where file parsing ends.
+            If no value is given, parsing stops at the end of file.
+            The index starts at 0.
+        step : int, optional
+            If this value is set, the function reads only every n-th
+            model from the file.
+
+        Yields
+        ------
+        array : AtomArray
+            The structure of the current model.
+            As the models of a GRO file may have different numbers of
+            atoms, the annotations are read from each model separately.
+
+        See also
+        --------
+        get_structure
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "1l2y_models.gro")
+        >>> file = GROFile()
+        >>> file.set_structure(atom_array_stack)
+        >>> file.write(file_name)
+        >>> for array in GROFile.read_iter_structure(file_name, stop=3):
+        ...     print(array.array_length())
+        304
+        304
+        304
+        """
+        if is_open_compatible(file):
+            with open(file, "r") as f:
+                yield from _iter_models(f, start, stop, step)
+        else:
+            if not is_text(file):
+                raise TypeError("A file opened in 'text' mode is required")
+            yield from _iter_models(file, start, stop, step)
+
 
-        # Fill in coordinates and boxes
-        if isinstance(array, AtomArray):
-            atom_i = annot_i
-            for i, line_i in enumerate(atom_i):
-                line = self.lines[line_i]
-                # gro files use nm instead of A
-                array.coord[i,0] = float(line[20:28])*10
-                array.coord[i,1] = float(line[28:36])*10
-                array.coord[i,2] = float(line[36:44])*10
-            # Box is stored in last line (after coordinates)
-            box_i = atom_i[-1] + 1
-            box_param = [float(e)*10 for e in self.lines[box_i].split()]
-            array.box = set_box_dimen(box_param)
-        
-        elif isinstance(array, AtomArrayStack):
-            for m in range(len(model_start_i)):
-                atom_i = get_atom_line_i(
-                    model_start_i[m], model_atom_counts[m]
-                )
-                for i, line_i in enumerate(atom_i):
-                    line = self.lines[line_i]
-                    array.coord[m,i,0] = float(line[20:28])*10
-                    array.coord[m,i,1] = float(line[28:36])*10
-                    array.coord[m,i,2] = float(line[36:44])*10
-                # Box is stored in last line (after coordinates)
-                box_i = atom_i[-1] + 1
-                box_param = [float(e)*10 for e in self.lines[box_i].split()]
-                box = set_box_dimen(box_param)
-                # Create a box in the stack if not already existing
-                # and the box is not a dummy
-                if box is not None:
-                    if array.box is None: 
-                        array.box = np.zeros((array.stack_depth(), 3, 3))
-                    array.box[m] = box
-                    
-        return array
-
-            
     def set_structure(self, array):
         """
         Set the :class:`AtomArray` or :class:`AtomArrayStack` for the
         file.
-        
+
         Parameters
         ----------
         array : AtomArray or AtomArrayStack
@@ -223,47 +218,22 @@ class GROFile(TextFile):
             is given, each array in the stack is saved as separate
             model.
         """
-        def get_box_dimen(array):
-            """
-            GRO files have the box dimensions as last line for each
-            model.
-            In case, the `box` attribute of the atom array is
-            `None`, we simply use the min and max coordinates in xyz
-            to get the correct size
-
-            Parameters
-            ----------
-            array : AtomArray
-                The atom array to get the box dimensions from.
-            
-            Returns
-            -------
-            box : str
-                The box, properly formatted for GRO files.
-            """
-            if array.box is None:
-                coord = array.coord
-                bx, by, bz = (coord.max(axis=0) - coord.min(axis=0)) / 10
-                return f"{bx:>8.3f} {by:>8.3f} {bz:>8.3f}"
-            else:
-                box = array.box
-                if is_orthogonal(box):
-                    bx, by, bz = np.diag(box) / 10
-                    return f"{bx:>9.5f} {by:>9.5f} {bz:>9.5f}"
-                else:
-                    box = box / 10
-                    box_elements = (
-                        box[0,0], box[1,1], box[2,2],
-                        box[0,1], box[0,2],
-                        box[1,0], box[1,2],
-                        box[2,0], box[2,1],
-                    )
-                    return " ".join([f"{e:>9.5f}" for e in box_elements])
-        
+        if not isinstance(array, (AtomArray, AtomArrayStack)):
+            raise TypeError("An atom array or stack must be provided")
+        natoms = array.array_length()
+        for annotation, width, description in [
+            (array.res_name,  5, "residue names"),
+            (array.atom_name, 5, "atom names"),
+        ]:
+            if (str_len(annotation) > width).any():
+                raise ValueError(
+                    f"Some {description} exceed {width} characters"
+                )
+
         if "atom_id" in array.get_annotation_categories():
             atom_id = array.atom_id
         else:
-            atom_id = np.arange(1, array.array_length() + 1)
+            atom_id = np.arange(1, natoms + 1)
         # Atom IDs are supported up to 99999,
         # but negative IDs are also possible
         gro_atom_id = np.where(
@@ -271,7 +241,7 @@ class GROFile(TextFile):
             ((atom_id - 1) % 99999) + 1,
             atom_id
         )
-        # Residue IDs are supported up to 9999,
+        # Residue IDs are supported up to 99999,
         # but negative IDs are also possible
         gro_res_id = np.where(
             array.res_id > 0,
@@ -279,65 +249,242 @@ class GROFile(TextFile):
             array.res_id
         )
 
+        # The ASCII codes of all atom lines of a model
+        # including the terminal line break:
+        # All columns except the coordinates are equal for all models
+        records = np.full((natoms, 45), ord(" "), dtype=np.uint8)
+        records[:, 0:5] = format_fixed_point(gro_res_id, 5, 0, "Residue IDs")
+        records[:, 5:10] = to_ascii_columns(array.res_name, 5)
+        records[:, 10:15] = to_ascii_columns(
+            array.atom_name, 5, align_right=True
+        )
+        records[:, 15:20] = format_fixed_point(gro_atom_id, 5, 0, "Atom IDs")
+        records[:, 44] = ord("\n")
+
+        def format_model(coord):
+            # gro format is in nm -> divide coords by 10
+            records[:, 20:44] = format_fixed_point(
+                coord.astype(np.float64) / 10, 8, 3, "Coordinates"
+            ).reshape(natoms, 24)
+            return records.tobytes().decode("ascii").splitlines()
+
         if isinstance(array, AtomArray):
-            self.lines = [None] * (array.array_length() + 3)
-
-            # Write header lines
-            self.lines[0] = f"Generated by Biotite at {datetime.now()}"
-            self.lines[1] = str(array.array_length())
-
-            # Write atom lines
-            fmt = "{:>5d}{:5s}{:>5s}{:>5d}{:>8.3f}{:>8.3f}{:>8.3f}"
-            for i in range(array.array_length()):
-                # gro format is in nm -> multiply coords by 10
-                self.lines[i+2] = fmt.format(
-                    gro_res_id[i], array.res_name[i], array.atom_name[i],
-                    gro_atom_id[i], array.coord[i,0]/10, array.coord[i,1]/10,
-                    array.coord[i,2]/10
-                )
-            # Write box lines
-            self.lines[-1] = get_box_dimen(array)
-        elif isinstance(array, AtomArrayStack):
+            self.lines = [
+                f"Generated by Biotite at {datetime.now()}",
+                str(natoms)
+            ]
+            self.lines += format_model(array.coord)
+            self.lines.append(_format_box(array.coord, array.box))
+        else:
             self.lines = []
-            # The entire information, but the coordinates,
-            # is equal for each model
-            # Therefore template lines are created
-            # which are afterwards applied for each model
-            templines = [None] * array.array_length()
-            fmt = '{:>5d}{:5s}{:>5s}{:5d}'
-            for i in range(array.array_length()):
-                templines[i] = fmt.format(gro_res_id[i], array.res_name[i],
-                                           array.atom_name[i], gro_atom_id[i])
-
             for i in range(array.stack_depth()):
                 self.lines.append(
                     f"Generated by Biotite at {datetime.now()}, model={i+1}"
                 )
-                self.lines.append(str(array.array_length()))
-
-                # Fill in coordinates for each model
-                modellines = copy.copy(templines)
-                for j, line in enumerate(modellines):
-                    # Insert coordinates
-                    line = (line + "{:>8.3f}{:>8.3f}{:>8.3f}".format(
-                                    array.coord[i,j,0]/10,
-                                    array.coord[i,j,1]/10,
-                                    array.coord[i,j,2]/10))
-                    modellines[j] = line
-                self.lines.extend(modellines)
-                self.lines.append(get_box_dimen(array[i]))
-        else:
-            raise TypeError("An atom array or stack must be provided")
+                self.lines.append(str(natoms))
+                self.lines += format_model(array.coord[i])
+                self.lines.append(_format_box(
+                    array.coord[i],
+                    None if array.box is None else array.box[i]
+                ))
         # Add terminal newline, since PyMOL requires it
         self.lines.append("")
 
 
-def _is_int(string):
+    def _get_model_starts(self):
+        """
+        Get the line index of the atom count line and the number of
+        atoms of each model.
+        """
+        # Ignore trailing empty lines
+        n_lines = len(self.lines)
+        while n_lines > 0 and len(self.lines[n_lines-1].strip()) == 0:
+            n_lines -= 1
+
+        model_start_i = []
+        model_atom_counts = []
+        # Each model consists of a title line, the atom count line,
+        # the atom lines and the box line
+        i = 0
+        while i < n_lines:
+            if i + 1 >= n_lines:
+                raise InvalidFileError("The last model is incomplete")
+            atom_count = _parse_atom_count(self.lines[i + 1])
+            model_start_i.append(i + 1)
+            model_atom_counts.append(atom_count)
+            i += atom_count + 3
+        if i > n_lines:
+            raise InvalidFileError("The last model is incomplete")
+        return (
+            np.array(model_start_i, dtype=int),
+            np.array(model_atom_counts, dtype=int)
+        )
+
+
+def _iter_models(file, start, stop, step):
+    """
+    Parse the models from an open GRO file one after another.
+    """
+    start = 0 if start is None else start
+    step = 1 if step is None else step
+    for model_i in itertools.count():
+        if stop is not None and model_i >= stop:
+            return
+        title_line = file.readline()
+        count_line = file.readline()
+        if len(count_line.strip()) == 0:
+            if len(title_line.strip()) == 0:
+                # Reached the end of the file
+                return
+            raise InvalidFileError("The last model is incomplete")
+        atom_count = _parse_atom_count(count_line)
+        # Atom lines and box line
+        lines = list(itertools.islice(file, atom_count + 1))
+        if len(lines) < atom_count + 1:
+            raise InvalidFileError("The last model is incomplete")
+        if model_i >= start and (model_i - start) % step == 0:
+            yield _parse_model(lines[:-1], lines[-1])
+
+
+def _parse_model(atom_lines, box_line):
+    """
+    Create an :class:`AtomArray` from the atom lines and the box line
+    of a model.
+    """
+    array = AtomArray(len(atom_lines))
+    _fill_annotations(array, atom_lines)
+    array.coord = _parse_coord(atom_lines)
+    # Box is stored in last line (after coordinates)
+    array.box = _parse_box(box_line)
+    return array
+
+
+def _fill_annotations(array, atom_lines):
+    """
+    Parse the annotations from the fixed-width columns of the given
+    atom lines.
+    """
+    chars = _to_char_matrix(atom_lines, 20)
+    array.res_id = _get_column(chars, "res_id").astype(int)
+    array.res_name = np.char.strip(_get_column(chars, "res_name"))
+    atom_name = np.char.strip(_get_column(chars, "atom_name"))
+    array.atom_name = atom_name
+    # The element is guessed only once for each unique atom name
+    unique_names, inverse = np.unique(atom_name, return_inverse=True)
+    array.element = np.array(
+        [guess_element(name) for name in unique_names],
+        dtype=array.element.dtype
+    )[inverse]
+
+
+def _parse_coord(atom_lines):
+    """
+    Parse the coordinates from the fixed-width columns of the given
+    atom lines.
+    """
+    chars = _to_char_matrix(atom_lines, 44)
+    # gro files use nm instead of A
+    return np.stack(
+        [_get_column(chars, column).astype(float) * 10
+         for column in ("coord_x", "coord_y", "coord_z")],
+        axis=-1
+    ).astype(np.float32)
+
+
+def _to_char_matrix(lines, min_width):
     """
-    Return ``True`, if the string can be parsed to an int.
+    Convert lines into a matrix of code points with at least
+    `min_width` columns, padded with zeros.
     """
+    if len(lines) == 0:
+        return np.zeros((0, min_width), dtype=np.uint32)
+    lines = np.array(lines)
+    n_chars = max(lines.dtype.itemsize // 4, min_width)
+    lines = lines.astype(f"U{n_chars}")
+    return lines.view(np.uint32).reshape(len(lines), n_chars)
+
+
+def _get_column(chars, name):
+    """
+    Get a fixed-width column from a code point matrix as string array.
+    """
+    start, stop = _atom_records[name]
+    return np.ascontiguousarray(chars[:, start:stop]) \
+           .view(f"U{stop - start}")[:, 0]
+
+
+def _parse_atom_count(line):
     try:
-        int(string)
-        return True
+        return int(line)
     except ValueError:
-        return False
\ No newline at end of file
+        raise InvalidFileError(f"'{line.strip()}' is not a valid atom count")
+
+
+def _parse_box(line):
+    """
+    Create the box vectors from the box line of a model.
+
+    Parameters
+    ----------
+    line : str
+        The box line in the GRO file.
+
+    Returns
+    -------
+    box_vectors : ndarray, dtype=float, shape=(3,3) or None
+        The atom array compatible box vectors.
+        None, if the box is a dummy.
+    """
+    box_param = [float(e)*10 for e in line.split()]
+    if not any(box_param):
+        return None
+    if len(box_param) == 3:
+        x, y, z = box_param
+        return np.array([[x,0,0], [0,y,0], [0,0,z]], dtype=float)
+    elif len(box_param) == 9:
+        x1, y2, z3, x2, x3, y1, y3, z1, z2 = box_param
+        return np.array(
+            [[x1,x2,x3], [y1,y2,y3], [z1,z2,z3]], dtype=float
+        )
+    else:
+        raise InvalidFileError(
+            f"Invalid amount of box parameters: {len(box_param)}"
+        )
+
+
+def _format_box(coord, box):
+    """
+    GRO files have the box dimensions as last line for each
+    model.
+    In case, the `box` attribute of the atom array is
+    `None`, we simply use the min and max coordinates in xyz
+    to get the correct size
+
+    Parameters
+    ----------
+    coord : ndarray, shape=(n,3)
+        The coordinates of the model.
+    box : ndarray, shape=(3,3) or None
+        The box of the model.
+
+    Returns
+    -------
+    box : str
+        The box, properly formatted for GRO files.
+    """
+    if box is None:
+        bx, by, bz = (coord.max(axis=0) - coord.min(axis=0)) / 10
+        return f"{bx:>8.3f} {by:>8.3f} {bz:>8.3f}"
+    else:
+        if is_orthogonal(box):
+            bx, by, bz = np.diag(box) / 10
+            return f"{bx:>9.5f} {by:>9.5f} {bz:>9.5f}"
+        else:
+            box = box / 10
+            box_elements = (
+                box[0,0], box[1,1], box[2,2],
+                box[0,1], box[0,2],
+                box[1,0], box[1,2],
+                box[2,0], box[2,1],
+            )
+            return " ".join([f"{e:>9.5f}" for e in box_elements])
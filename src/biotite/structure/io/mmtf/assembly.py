@@ -9,8 +9,8 @@ __all__ = ["list_assemblies", "get_assembly"]
 
 import numpy as np
 from .convertfile import get_structure
+from ...assembly import VirtualAssembly
 from ...chains import get_chain_starts
-from ...util import matrix_rotate
 from ....file import InvalidFileError
 
 
@@ -44,7 +44,7 @@ def list_assemblies(file):
 
 
 def get_assembly(file, assembly_id=None, model=None, altloc="first",
-                 extra_fields=[], include_bonds=False):
+                 extra_fields=[], include_bonds=False, virtual=False):
     """
     Build the given biological assembly.
 
@@ -91,6 +91,10 @@ def get_assembly(file, assembly_id=None, model=None, altloc="first",
         from the file.
         All bonds have :attr:`BondType.ANY`, since the PDB format
         does not support bond orders.
+    virtual : bool, optional
+        If set to true, the copies of the asymmetric unit are not
+        created, but a :class:`VirtualAssembly` is returned instead,
+        that computes the coordinates of each copy on demand.
     
     Raises
     ------
@@ -111,9 +115,11 @@ def get_assembly(file, assembly_id=None, model=None, altloc="first",
 
     Returns
     -------
-    assembly : AtomArray or AtomArrayStack
+    assembly : AtomArray or AtomArrayStack or VirtualAssembly
         The assembly.
         The return type depends on the `model` parameter.
+        If `virtual` is true, the assembly is a :class:`VirtualAssembly`
+        based on the asymmetric unit.
     
     Examples
     --------
@@ -174,12 +180,12 @@ def get_assembly(file, assembly_id=None, model=None, altloc="first",
                 "detected number of chains"
             )
     
-    # Apply transformations for set of chains (or all chains) and add
-    # the transformed atoms to assembly
-    assembly = None
+    # Add a copy of the set of chains (or all chains) for each
+    # transformation to the assembly
+    assembly = VirtualAssembly(structure)
     for transformation in selected_assembly:
         if apply_to_all:
-            affected_coord = structure.coord
+            affected_mask = None
         else:
             # Mask atoms affected by this transformation
             affected_mask = np.zeros(structure.array_length(), dtype=bool)
@@ -187,28 +193,20 @@ def get_assembly(file, assembly_id=None, model=None, altloc="first",
                 chain_start = chains_starts[chain_i]
                 chain_stop = chains_starts[chain_i+1]
                 affected_mask[chain_start : chain_stop] = True
-            affected_coord = structure.coord[..., affected_mask, :]
-        # Apply the transformation
-        transformed_coord = _apply_transformation(
-            affected_coord, transformation["matrix"]
+        assembly.add_copy(
+            affected_mask, [_get_transformation(transformation["matrix"])]
         )
-        sub_assembly = structure.copy()
-        sub_assembly.coord = transformed_coord
-        # Add transformed coordinates to assembly
-        if assembly is None:
-            assembly = sub_assembly
-        else:
-            assembly += sub_assembly
     
-    return assembly
+    if virtual:
+        return assembly
+    else:
+        return assembly.materialize()
 
 
-def _apply_transformation(coord, mmtf_matrix):
+def _get_transformation(mmtf_matrix):
     # Obtain matrix from flattened form
     matrix = np.array(mmtf_matrix).reshape(4, 4)
     # Separate rotation and translation part
     rotation = matrix[:3, :3]
     translation = matrix[:3, 3]
-    coord = matrix_rotate(coord, rotation)
-    coord += translation
-    return coord
\ No newline at end of file
+    return rotation, translation
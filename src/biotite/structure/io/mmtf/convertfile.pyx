@@ -113,9 +113,9 @@ def get_structure(file, model=None, altloc="first",
     cdef np.ndarray chain_names = file["chainNameList"]
     cdef int32[:] chains_per_model = np.array(file["chainsPerModel"], np.int32)
     cdef int32[:] res_per_chain = np.array(file["groupsPerChain"], np.int32)
-    cdef int32[:] res_type_i = file["groupTypeList"]
+    cdef const int32[:] res_type_i = file["groupTypeList"]
     cdef np.ndarray index_list = file["groupIdList"]
-    cdef int32[:] res_ids = index_list
+    cdef const int32[:] res_ids = index_list
     cdef np.ndarray x_coord = file["xCoordList"]
     cdef np.ndarray y_coord = file["yCoordList"]
     cdef np.ndarray z_coord = file["zCoordList"]
@@ -313,7 +313,7 @@ def get_structure(file, model=None, altloc="first",
         raise ValueError(f"'{altloc}' is not a valid 'altloc' option")
 
 
-def _get_model_lengths(int32[:] res_type_i,
+def _get_model_lengths(const int32[:] res_type_i,
                        int32[:] chains_per_model,
                        int32[:] res_per_chain,
                        int32[:] atoms_per_res):
@@ -349,8 +349,8 @@ def _fill_annotations(int model, array,
                       np.ndarray chain_names,
                       int32[:] chains_per_model,
                       int32[:] res_per_chain,
-                      int32[:] res_type_i,
-                      int32[:] res_ids,
+                      const int32[:] res_type_i,
+                      const int32[:] res_ids,
                       np.ndarray res_inscodes,
                       np.ndarray atoms_per_res,
                       np.ndarray res_names,
@@ -428,7 +428,7 @@ def _fill_annotations(int model, array,
 
 def _create_bond_list(int model, np.ndarray bonds, np.ndarray bond_types,
                       int model_start, int model_stop, int atom_count,
-                      list group_list, int32[:] res_type_i,
+                      list group_list, const int32[:] res_type_i,
                       int32[:] atoms_per_res,
                       int32[:] res_per_chain, int32[:] chains_per_model):
     cdef int i=0, j=0
@@ -21,8 +21,33 @@ ctypedef np.uint64_t uint64
 ctypedef np.float32_t float32
 
 
-def decode_array(int codec, bytes raw_bytes, int param):
+def decode_array(int codec, raw_bytes, int param):
+    """
+    decode_array(codec, raw_bytes, param)
+
+    Decode the binary data of an MMTF encoded array.
+
+    The codecs involving run-length encoding, delta encoding, integer
+    encoding or integer packing are each decoded by a single compiled
+    pass over the big-endian input bytes.
+
+    Parameters
+    ----------
+    codec : int
+        The MMTF codec ID.
+    raw_bytes : bytes or memoryview
+        The encoded data without the 12-byte header.
+    param : int
+        The parameter of the codec, e.g. the divisor for integer
+        encoding.
+
+    Returns
+    -------
+    array : ndarray
+        The decoded array.
+    """
     cdef np.ndarray array
+    cdef const uint8[:] raw = np.frombuffer(raw_bytes, dtype=np.uint8)
     # Pass-through: 32-bit floating-point number array
     if   codec == 1:
         array = np.frombuffer(raw_bytes, dtype=">f4").astype(np.float32)
@@ -45,108 +70,240 @@ def decode_array(int codec, bytes raw_bytes, int param):
         return array.astype(np.dtype("U" + str(param)))
     # Run-length encoded character array
     elif codec == 6:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return np.frombuffer(_decode_run_length(array), dtype="U1")
+        # A 'U1' character is represented by a 32-bit code point
+        return _decode_run_length(raw).view("U1")
     # Run-length encoded 32-bit signed integer array
     elif codec == 7:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_run_length(array)
+        return _decode_run_length(raw)
     # Delta & run-length encoded 32-bit signed integer array
     elif codec == 8:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_delta(
-               _decode_run_length(array))
+        return _decode_delta_run_length(raw)
     # Integer & run-length encoded 32-bit floating-point number array
     elif codec == 9:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_integer(param, 
-               _decode_run_length(array))
+        return _decode_integer_run_length(raw, param)
     # Integer & delta encoded
     # & two-byte-packed 32-bit floating-point number array
     elif codec == 10:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_integer(param, 
-               _decode_delta(
-               _decode_packed(array)))
+        return _decode_integer_delta_packed(raw, param, 2)
     # Integer encoded 32-bit floating-point number array
     elif codec == 11:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
+        array = np.frombuffer(raw_bytes, dtype=">i2")
         return _decode_integer(param, array)
     # Integer & two-byte-packed 32-bit floating-point number array
     elif codec == 12:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_integer(param, 
-               _decode_packed(array))
+        return _decode_integer_packed(raw, param, 2)
     # Integer & one-byte-packed 32-bit floating-point number array
     elif codec == 13:
-        array = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
-        return _decode_integer(param, 
-               _decode_packed(array))
+        return _decode_integer_packed(raw, param, 1)
     # Two-byte-packed 32-bit signed integer array
     elif codec == 14:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_packed(array)
+        return _decode_packed(raw, 2)
     # One-byte-packed 32-bit signed integer array
     elif codec == 15:
-        array = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
-        return _decode_packed(array)
+        return _decode_packed(raw, 1)
     else:
-        raise ValueError("Unknown codec with ID {codec}")
+        raise ValueError(f"Unknown codec with ID {codec}")
 
 
-def _decode_delta(np.ndarray array):
-    return np.cumsum(array, dtype=np.int32)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int32 _read_int32(const uint8[:] raw, Py_ssize_t i):
+    """
+    Read the big-endian 32-bit integer at the given element position.
+    """
+    i *= 4
+    return <int32> (
+        (<uint32> raw[i  ] << 24) | (<uint32> raw[i+1] << 16) |
+        (<uint32> raw[i+2] <<  8) | (<uint32> raw[i+3]      )
+    )
 
 
-def _decode_run_length(int32[:] array):
-    cdef int length = 0
-    cdef int i, j
-    cdef int value, repeat
-    # Determine length of output array by summing the run lengths
-    for i in range(1, array.shape[0], 2):
-        length += array[i]
-    cdef int32[:] output = np.zeros(length, dtype=np.int32)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int _read_packed(const uint8[:] raw, Py_ssize_t i, int n_bytes):
+    """
+    Read the big-endian 8-bit or 16-bit integer at the given element
+    position.
+    """
+    if n_bytes == 1:
+        return <int8> raw[i]
+    else:
+        i *= 2
+        return <int16> ((<uint16> raw[i] << 8) | <uint16> raw[i+1])
+
+
+cdef Py_ssize_t _run_length_output_length(const uint8[:] raw) except -1:
+    """
+    Determine length of output array by summing the run lengths.
+    """
+    if raw.shape[0] % 8 != 0:
+        raise ValueError(
+            "The length of run-length encoded data must be a multiple of 8"
+        )
+    cdef Py_ssize_t i
+    cdef int32 repeat
+    cdef Py_ssize_t length = 0
+    for i in range(1, raw.shape[0] // 4, 2):
+        repeat = _read_int32(raw, i)
+        if repeat < 0:
+            raise ValueError("Run lengths must not be negative")
+        length += repeat
+    return length
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _decode_run_length(const uint8[:] raw):
+    cdef Py_ssize_t length = _run_length_output_length(raw)
+    cdef np.ndarray output_array = np.empty(length, dtype=np.int32)
+    cdef int32[:] output = output_array
+    cdef Py_ssize_t i, j, k
+    cdef int32 value, repeat
     # Fill output array
     j = 0
-    for i in range(0, array.shape[0], 2):
-        value = array[i]
-        repeat = array[i+1]
-        output[j : j+repeat] = value
-        j += repeat
-    return np.asarray(output)
-
-
-ctypedef fused PackedType:
-    int8
-    int16
-def _decode_packed(PackedType[:] array):
+    for i in range(0, raw.shape[0] // 4, 2):
+        value = _read_int32(raw, i)
+        repeat = _read_int32(raw, i+1)
+        for k in range(repeat):
+            output[j] = value
+            j += 1
+    return output_array
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _decode_delta_run_length(const uint8[:] raw):
+    cdef Py_ssize_t length = _run_length_output_length(raw)
+    cdef np.ndarray output_array = np.empty(length, dtype=np.int32)
+    cdef int32[:] output = output_array
+    cdef Py_ssize_t i, j, k
+    cdef int32 value, repeat
+    # Use unsigned arithmetic for the cumulative sum
+    # to get the defined wrap-around behavior on overflow
+    cdef uint32 cum_sum = 0
+    j = 0
+    for i in range(0, raw.shape[0] // 4, 2):
+        value = _read_int32(raw, i)
+        repeat = _read_int32(raw, i+1)
+        for k in range(repeat):
+            cum_sum += <uint32> value
+            output[j] = <int32> cum_sum
+            j += 1
+    return output_array
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _decode_integer_run_length(const uint8[:] raw, int divisor):
+    cdef Py_ssize_t length = _run_length_output_length(raw)
+    cdef np.ndarray output_array = np.empty(length, dtype=np.float32)
+    cdef float32[:] output = output_array
+    cdef Py_ssize_t i, j, k
+    cdef int32 repeat
+    cdef float32 value
+    cdef float32 float_divisor = <float32> divisor
+    j = 0
+    for i in range(0, raw.shape[0] // 4, 2):
+        value = (<float32> _read_int32(raw, i)) / float_divisor
+        repeat = _read_int32(raw, i+1)
+        for k in range(repeat):
+            output[j] = value
+            j += 1
+    return output_array
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _decode_packed(const uint8[:] raw, int n_bytes):
     cdef int min_val, max_val
-    if PackedType is int8:
+    if n_bytes == 1:
         min_val = np.iinfo(np.int8).min
         max_val = np.iinfo(np.int8).max
     else:
         min_val = np.iinfo(np.int16).min
         max_val = np.iinfo(np.int16).max
-    cdef int i, j
+    cdef Py_ssize_t n_packed = raw.shape[0] // n_bytes
+    cdef Py_ssize_t i, j
     cdef int packed_val, unpacked_val
     # Pessimistic size assumption:
     # The maximum output array length is the input array length
     # in case all values are within the type limits
-    cdef int32[:] output = np.zeros(array.shape[0], dtype=np.int32)
+    cdef np.ndarray output_array = np.empty(n_packed, dtype=np.int32)
+    cdef int32[:] output = output_array
     j = 0
     unpacked_val = 0
-    for i in range(array.shape[0]):
-        packed_val = array[i]
-        if packed_val == max_val or packed_val == min_val:
-            unpacked_val += packed_val
-        else:
-            unpacked_val += packed_val
+    for i in range(n_packed):
+        packed_val = _read_packed(raw, i, n_bytes)
+        unpacked_val += packed_val
+        if packed_val != max_val and packed_val != min_val:
             output[j] = unpacked_val
             unpacked_val = 0
             j += 1
     # Trim to correct size and return
-    return np.asarray(output[:j])
+    return output_array[:j]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _decode_integer_packed(const uint8[:] raw, int divisor, int n_bytes):
+    cdef int min_val, max_val
+    if n_bytes == 1:
+        min_val = np.iinfo(np.int8).min
+        max_val = np.iinfo(np.int8).max
+    else:
+        min_val = np.iinfo(np.int16).min
+        max_val = np.iinfo(np.int16).max
+    cdef Py_ssize_t n_packed = raw.shape[0] // n_bytes
+    cdef Py_ssize_t i, j
+    cdef int packed_val, unpacked_val
+    cdef float32 float_divisor = <float32> divisor
+    cdef np.ndarray output_array = np.empty(n_packed, dtype=np.float32)
+    cdef float32[:] output = output_array
+    j = 0
+    unpacked_val = 0
+    for i in range(n_packed):
+        packed_val = _read_packed(raw, i, n_bytes)
+        unpacked_val += packed_val
+        if packed_val != max_val and packed_val != min_val:
+            output[j] = (<float32> unpacked_val) / float_divisor
+            unpacked_val = 0
+            j += 1
+    return output_array[:j]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _decode_integer_delta_packed(const uint8[:] raw, int divisor,
+                                 int n_bytes):
+    cdef int min_val, max_val
+    if n_bytes == 1:
+        min_val = np.iinfo(np.int8).min
+        max_val = np.iinfo(np.int8).max
+    else:
+        min_val = np.iinfo(np.int16).min
+        max_val = np.iinfo(np.int16).max
+    cdef Py_ssize_t n_packed = raw.shape[0] // n_bytes
+    cdef Py_ssize_t i, j
+    cdef int packed_val, unpacked_val
+    cdef uint32 cum_sum = 0
+    cdef float32 float_divisor = <float32> divisor
+    cdef np.ndarray output_array = np.empty(n_packed, dtype=np.float32)
+    cdef float32[:] output = output_array
+    j = 0
+    unpacked_val = 0
+    for i in range(n_packed):
+        packed_val = _read_packed(raw, i, n_bytes)
+        unpacked_val += packed_val
+        if packed_val != max_val and packed_val != min_val:
+            cum_sum += <uint32> unpacked_val
+            output[j] = (<float32> <int32> cum_sum) / float_divisor
+            unpacked_val = 0
+            j += 1
+    return output_array[:j]
 
 
 def _decode_integer(int divisor, np.ndarray array):
-    return np.divide(array, divisor, dtype=np.float32)
\ No newline at end of file
+    return np.divide(array, divisor, dtype=np.float32)
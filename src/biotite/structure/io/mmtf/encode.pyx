@@ -99,7 +99,7 @@ def encode_array(np.ndarray array, int codec, int param):
         raise ValueError(f"Unknown codec with ID {codec}")
 
 
-def _encode_delta(int32[:] array):
+def _encode_delta(const int32[:] array):
     cdef int32[:] output = np.zeros(array.shape[0], np.int32)
     output[0] = array[0]
     cdef int i = 0
@@ -108,7 +108,7 @@ def _encode_delta(int32[:] array):
     return np.asarray(output)
 
 
-def _encode_run_length(int32[:] array):
+def _encode_run_length(const int32[:] array):
     # Pessimistic allocation of output array
     # -> Run length is 1 for every element
     cdef int32[:] output = np.zeros(array.shape[0] * 2, dtype=np.int32)
@@ -136,7 +136,7 @@ def _encode_run_length(int32[:] array):
 
 
 @cython.cdivision(True)
-def _encode_packed(bint two_byte, int32[:] array):
+def _encode_packed(bint two_byte, const int32[:] array):
     cdef int min_val, max_val
     cdef int i=0, j=0
     if two_byte:
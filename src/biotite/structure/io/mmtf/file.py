@@ -29,6 +29,10 @@ class MMTFFile(File, MutableMapping):
     If the dictionary value is an encoded array, the value automatically
     decoded.
     Decoded arrays are always returned as :class:`ndarray` instances.
+    An array is only decoded, when it is accessed for the first time.
+    The decoded array is cached, so that subsequent accesses do not
+    require decoding again.
+    Each access returns a new copy of the cached array.
     
     Examples
     --------
@@ -46,6 +50,8 @@ class MMTFFile(File, MutableMapping):
     def __init__(self):
         super().__init__()
         self._content = {}
+        # Cache for decoded arrays
+        self._decoded = {}
         self._content["mmtfVersion"] = "1.0.0"
         self._content["mmtfProducer"] = "UNKNOWN"
     
@@ -105,6 +111,7 @@ class MMTFFile(File, MutableMapping):
     def __copy_fill__(self, clone):
         super().__copy_fill__(clone)
         clone._content = copy.deepcopy(self._content)
+        clone._decoded = {}
     
     def get_codec(self, key):
         """
@@ -179,16 +186,23 @@ class MMTFFile(File, MutableMapping):
              + struct.pack(">i", param) \
              + raw_bytes
         self._content[key] = data
+        self._decoded.pop(key, None)
     
     def __getitem__(self, key):
         data = self._content[key]
         if isinstance(data, bytes) and data[0] == 0:
             # MMTF specific format -> requires decoding
-            codec     = struct.unpack(">i", data[0:4 ])[0]
-            length    = struct.unpack(">i", data[4:8 ])[0]
-            param     = struct.unpack(">i", data[8:12])[0]
-            raw_bytes = data[12:]
-            return decode_array(codec, raw_bytes, param)
+            array = self._decoded.get(key)
+            if array is None:
+                codec     = struct.unpack(">i", data[0:4 ])[0]
+                length    = struct.unpack(">i", data[4:8 ])[0]
+                param     = struct.unpack(">i", data[8:12])[0]
+                # Use a memoryview to avoid copying the encoded data
+                raw_bytes = memoryview(data)[12:]
+                array = decode_array(codec, raw_bytes, param)
+                self._decoded[key] = array
+            # Copy to protect the cached array against modification
+            return array.copy()
         else:
             return data
     
@@ -197,9 +211,11 @@ class MMTFFile(File, MutableMapping):
             raise TypeError("Arrays that need to be encoded must be addeed "
                             "via 'set_array()'")
         self._content[key] = item
+        self._decoded.pop(key, None)
     
     def __delitem__(self, key):
         del self._content[key]
+        self._decoded.pop(key, None)
     
     def __iter__(self):
         return self._content.__iter__()
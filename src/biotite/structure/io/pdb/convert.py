@@ -146,7 +146,7 @@ def list_assemblies(pdb_file):
 
 
 def get_assembly(pdb_file, assembly_id=None, model=None, altloc="first",
-                 extra_fields=[], include_bonds=False):
+                 extra_fields=[], include_bonds=False, virtual=False):
     """
     Build the given biological assembly.
 
@@ -193,12 +193,18 @@ def get_assembly(pdb_file, assembly_id=None, model=None, altloc="first",
         from the file.
         All bonds have :attr:`BondType.ANY`, since the PDB format
         does not support bond orders.
+    virtual : bool, optional
+        If set to true, the copies of the asymmetric unit are not
+        created, but a :class:`VirtualAssembly` is returned instead,
+        that computes the coordinates of each copy on demand.
 
     Returns
     -------
-    assembly : AtomArray or AtomArrayStack
+    assembly : AtomArray or AtomArrayStack or VirtualAssembly
         The assembly.
         The return type depends on the `model` parameter.
+        If `virtual` is true, the assembly is a :class:`VirtualAssembly`
+        based on the asymmetric unit.
     
     Examples
     --------
@@ -208,7 +214,7 @@ def get_assembly(pdb_file, assembly_id=None, model=None, altloc="first",
     >>> assembly = get_assembly(file, model=1)
     """
     return pdb_file.get_assembly(
-        assembly_id, model, altloc, extra_fields, include_bonds
+        assembly_id, model, altloc, extra_fields, include_bonds, virtual
     )
 
 
@@ -8,11 +8,13 @@ __all__ = ["PDBFile"]
 
 import warnings
 import numpy as np
+from ...assembly import VirtualAssembly
 from ...atoms import AtomArray, AtomArrayStack, repeat
 from ...bonds import BondList, connect_via_residue_names
 from ...box import vectors_from_unitcell, unitcell_from_vectors
-from ....file import TextFile, InvalidFileError
+from ....file import TextFile, InvalidFileError, is_open_compatible, is_text
 from ..general import _guess_element as guess_element
+from ..util import str_len, to_ascii_columns, format_fixed_point
 from ...error import BadStructureError
 from ...filter import (
     filter_first_altloc,
@@ -20,7 +22,12 @@ from ...filter import (
     filter_solvent,
 )
 from ...util import matrix_rotate
-from .hybrid36 import encode_hybrid36, decode_hybrid36, max_hybrid36_number
+from .hybrid36 import (
+    decode_hybrid36,
+    encode_hybrid36_array,
+    decode_hybrid36_array,
+    max_hybrid36_number,
+)
 
 
 # slice objects for readability
@@ -403,7 +410,7 @@ class PDBFile(TextFile):
         
         # Create mandatory and optional annotation arrays
         chain_id  = np.zeros(array.array_length(), array.chain_id.dtype)
-        res_id    = np.zeros(array.array_length(), array.res_id.dtype)
+        res_id_raw = np.zeros(array.array_length(), "U4")
         ins_code  = np.zeros(array.array_length(), array.ins_code.dtype)
         res_name  = np.zeros(array.array_length(), array.res_name.dtype)
         hetero    = np.zeros(array.array_length(), array.hetero.dtype)
@@ -420,7 +427,7 @@ class PDBFile(TextFile):
         for i, line_i in enumerate(annot_i):
             line = self.lines[line_i]
             chain_id[i] = line[_chain_id].strip()
-            res_id[i] = decode_hybrid36(line[_res_id])
+            res_id_raw[i] = line[_res_id]
             ins_code[i] = line[_ins_code].strip()
             res_name[i] = line[_res_name].strip()
             hetero[i] = line[_record] == "HETATM"
@@ -439,16 +446,13 @@ class PDBFile(TextFile):
         if include_bonds or \
             (extra_fields is not None and "atom_id" in extra_fields):
                 # The atom IDs are only required in these two cases
-                atom_id = np.array(
-                    [decode_hybrid36(raw_id.item()) for raw_id in atom_id_raw],
-                    dtype=int
-                )
+                atom_id = decode_hybrid36_array(atom_id_raw)
         else:
             atom_id = None
         
         # Add annotation arrays to atom array (stack)
         array.chain_id = chain_id
-        array.res_id = res_id
+        array.res_id = decode_hybrid36_array(res_id_raw)
         array.ins_code = ins_code
         array.res_name = res_name
         array.hetero = hetero
@@ -594,144 +598,72 @@ class PDBFile(TextFile):
         If `array` has an associated :class:`BondList`, ``CONECT``
         records are also written for all non-water hetero residues
         and all inter-residue connections.
+
+        See also
+        --------
+        write_iter
         """
-        natoms = array.array_length()
-        annot_categories = array.get_annotation_categories()
-        record = np.char.array(np.where(array.hetero, "HETATM", "ATOM"))
-        # Check for optional annotation categories
-        if "atom_id" in annot_categories:
-            atom_id = array.atom_id
-        else:
-            atom_id = np.arange(1, natoms + 1)
-        if "b_factor" in annot_categories:
-            b_factor = np.char.array([f"{b:>6.2f}" for b in array.b_factor])
-        else:
-            b_factor = np.char.array(np.full(natoms, "  0.00", dtype="U6"))
-        if "occupancy" in annot_categories:
-            occupancy = np.char.array([f"{o:>6.2f}" for o in array.occupancy])
-        else:
-            occupancy = np.char.array(np.full(natoms, "  1.00", dtype="U6"))
-        if "charge" in annot_categories:
-            charge = np.char.array(
-                [str(np.abs(charge)) + "+" if charge > 0 else
-                 (str(np.abs(charge)) + "-" if charge < 0 else "")
-                 for charge in array.get_annotation("charge")]
-            )
-        else:
-            charge = np.char.array(np.full(natoms, "  ", dtype="U2"))
+        self.lines = []
+        for records in _format_structure(array, None, hybrid36):
+            self.lines.extend(records.splitlines())
 
-        # Do checks on atom array (stack)
-        if hybrid36:
-            max_atoms = max_hybrid36_number(5)
-            max_residues = max_hybrid36_number(4)
-        else:
-            max_atoms, max_residues = 99999, 9999
-        if array.array_length() > max_atoms:
-            warnings.warn(f"More then {max_atoms:,} atoms per model")
-        if (array.res_id > max_residues).any():
-            warnings.warn(f"Residue IDs exceed {max_residues:,}")
-        if np.isnan(array.coord).any():
-            raise ValueError("Coordinates contain 'NaN' values")
-        if any([len(name) > 1 for name in array.chain_id]):
-            raise ValueError("Some chain IDs exceed 1 character")
-        if any([len(name) > 3 for name in array.res_name]):
-            raise ValueError("Some residue names exceed 3 characters")
-        if any([len(name) > 4 for name in array.atom_name]):
-            raise ValueError("Some atom names exceed 4 characters")
-
-        if hybrid36:
-            pdb_atom_id = np.char.array(
-                [encode_hybrid36(i, 5) for i in atom_id]
-            )
-            pdb_res_id = np.char.array(
-                [encode_hybrid36(i, 4) for i in array.res_id]
-            )
-        else:
-            # Atom IDs are supported up to 99999,
-            # but negative IDs are also possible
-            pdb_atom_id = np.char.array(np.where(
-                atom_id > 0,
-                ((atom_id - 1) % 99999) + 1,
-                atom_id
-            ).astype(str))
-            # Residue IDs are supported up to 9999,
-            # but negative IDs are also possible
-            pdb_res_id = np.char.array(np.where(
-                array.res_id > 0,
-                ((array.res_id - 1) % 9999) + 1,
-                array.res_id
-            ).astype(str))
-        
-        names = np.char.array(
-            [f" {atm}" if len(elem) == 1 and len(atm) < 4 else atm
-             for atm, elem in zip(array.atom_name, array.element)]
-        )
-        res_names = np.char.array(array.res_name)
-        chain_ids = np.char.array(array.chain_id)
-        ins_codes = np.char.array(array.ins_code)
-        spaces = np.char.array(np.full(natoms, " ", dtype="U1"))
-        elements = np.char.array(array.element)
-
-        first_half = (
-            record.ljust(6) +
-            pdb_atom_id.rjust(5) +
-            spaces +
-            names.ljust(4) +
-            spaces + res_names.rjust(3) + spaces + chain_ids +
-            pdb_res_id.rjust(4) + ins_codes.rjust(1)
-        )
 
-        second_half = (
-            occupancy + b_factor + 10 * spaces +
-            elements.rjust(2) + charge.rjust(2)
-        )
+    @staticmethod
+    def write_iter(file, atoms, coord=None, hybrid36=False):
+        """
+        Write an :class:`AtomArray` or :class:`AtomArrayStack` directly
+        into a PDB file.
 
-        coords = array.coord
-        if coords.ndim == 2:
-            coords = coords[np.newaxis, ...]
-        
-        self.lines = []
-        # Prepend a single CRYST1 record if we have box information
-        if array.box is not None:
-            box = array.box
-            if len(box.shape) == 3:
-                box = box[0]
-            a, b, c, alpha, beta, gamma = unitcell_from_vectors(box)
-            self.lines.append(
-                f"CRYST1{a:>9.3f}{b:>9.3f}{c:>9.3f}"
-                f"{np.rad2deg(alpha):>7.2f}{np.rad2deg(beta):>7.2f}"
-                f"{np.rad2deg(gamma):>7.2f} P 1           1          "
-            )
-        is_stack = coords.shape[0] > 1
-        for model_num, coord_i in enumerate(coords, start=1):
-            # for an ArrayStack, this is run once
-            # only add model lines if is_stack
-            if is_stack:
-                self.lines.append(f"MODEL     {model_num:4}")
-            # Bundle non-coordinate data to simplify iteration
-            self.lines.extend(
-                [f"{start:27}   {x:>8.3f}{y:>8.3f}{z:>8.3f}{end:26}"
-                 for start, (x, y, z), end in
-                 zip(first_half, coord_i, second_half)]
-            )
-            if is_stack:
-                self.lines.append("ENDMDL")
-        
-        # Add CONECT records if bonds are present
-        if array.bonds is not None:
-            # Only non-water hetero records and connections between
-            # residues are added to the records
-            hetero_indices = np.where(array.hetero & ~filter_solvent(array))[0]
-            bond_array = array.bonds.as_array()
-            bond_array = bond_array[
-                np.isin(bond_array[:,0], hetero_indices) |
-                np.isin(bond_array[:,1], hetero_indices) |
-                (array.res_id  [bond_array[:,0]] != array.res_id  [bond_array[:,1]]) |
-                (array.chain_id[bond_array[:,0]] != array.chain_id[bond_array[:,1]])
-            ]
-            self._set_bonds(
-                BondList(array.array_length(), bond_array), pdb_atom_id
-            )
+        In contrast to :meth:`set_structure()` and :meth:`write()`,
+        the records are not stored in an intermediate :class:`PDBFile`,
+        but each model is formatted and written to the file separately.
+        Hence, this static method may save a large amount of memory if
+        a large number of models should be written, especially if the
+        `coord` are provided as generator.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively a file path can be supplied.
+        atoms : AtomArray or AtomArrayStack
+            The structure to be written.
+            The annotations, the box and bonds of this structure are
+            used for each model.
+        coord : generator or array-like of ndarray, shape=(n,3), dtype=float, optional
+            The coordinates of each model.
+            If given, the coordinates of `atoms` are ignored and each
+            element is written as separate model, enclosed by *MODEL*
+            and *ENDMDL* records.
+            By default, the coordinates of `atoms` are written in the
+            same way as in :meth:`set_structure()`.
+        hybrid36: bool, optional
+            Defines wether the file should be written in hybrid-36
+            format.
+
+        See also
+        --------
+        set_structure
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "1l2y_models.pdb")
+        >>> PDBFile.write_iter(file_name, atom_array_stack)
+        >>> print(PDBFile.read(file_name).get_model_count())
+        38
+        """
+        records = _format_structure(atoms, coord, hybrid36)
+        if is_open_compatible(file):
+            with open(file, "w") as f:
+                for record_block in records:
+                    f.write(record_block)
+        else:
+            if not is_text(file):
+                raise TypeError("A file opened in 'text' mode is required")
+            for record_block in records:
+                file.write(record_block)
     
 
     def list_assemblies(self):
@@ -768,7 +700,7 @@ class PDBFile(TextFile):
         
     
     def get_assembly(self, assembly_id=None, model=None, altloc="first",
-                     extra_fields=[], include_bonds=False):
+                     extra_fields=[], include_bonds=False, virtual=False):
         """
         Build the given biological assembly.
 
@@ -813,12 +745,19 @@ class PDBFile(TextFile):
             from the file.
             All bonds have :attr:`BondType.ANY`, since the PDB format
             does not support bond orders.
+        virtual : bool, optional
+            If set to true, the copies of the asymmetric unit are not
+            created, but a :class:`VirtualAssembly` is returned
+            instead, that computes the coordinates of each copy on
+            demand.
 
         Returns
         -------
-        assembly : AtomArray or AtomArrayStack
+        assembly : AtomArray or AtomArrayStack or VirtualAssembly
             The assembly.
             The return type depends on the `model` parameter.
+            If `virtual` is true, the assembly is a
+            :class:`VirtualAssembly` based on the asymmetric unit.
         
         Examples
         --------
@@ -876,7 +815,7 @@ class PDBFile(TextFile):
         ]
         # Add exclusive stop at end of records
         chain_set_start_indices.append(len(assembly_lines))
-        assembly = None
+        assembly = VirtualAssembly(structure)
         for i in range(len(chain_set_start_indices) - 1):
             start = chain_set_start_indices[i]
             stop = chain_set_start_indices[i+1]
@@ -904,20 +843,14 @@ class PDBFile(TextFile):
                 assembly_lines[transform_start : stop]
             )
             # Filter affected chains
-            sub_structure = structure[
-                ..., np.isin(structure.chain_id, affected_chain_ids)
-            ]
-            sub_assembly = _apply_transformations(
-                sub_structure, rotations, translations
-            )
-            # Merge the chains with IDs for this transformation
-            # with chains from other transformations
-            if assembly is None:
-                assembly = sub_assembly
-            else:
-                assembly += sub_assembly
+            affected = np.isin(structure.chain_id, affected_chain_ids)
+            for rotation, translation in zip(rotations, translations):
+                assembly.add_copy(affected, [(rotation, translation)])
 
-        return assembly
+        if virtual:
+            return assembly
+        else:
+            return assembly.materialize()
     
 
     def get_symmetry_mates(self, model=None, altloc="first",
@@ -1065,29 +998,215 @@ class PDBFile(TextFile):
         return BondList(len(atom_ids), np.array(bonds, dtype=np.uint32))
 
 
-    def _set_bonds(self, bond_list, atom_ids):
-        # Bond type is unused since PDB does not support bond orders
-        bonds, _ = bond_list.get_all_bonds()
+def _format_structure(array, coord, hybrid36):
+    """
+    Create a generator over blocks of PDB records for the given
+    structure.
+
+    The annotations are checked and formatted immediately, so that
+    invalid input is reported before any record is yielded.
+    Each yielded block is a string of newline-terminated records:
+    The *CRYST1* record, then each model and finally the *CONECT*
+    records.
+    If `coord` is ``None``, the coordinates of `array` are used and
+    *MODEL* records are only written for multiple models.
+    """
+    natoms = array.array_length()
+    annot_categories = array.get_annotation_categories()
+    # Check for optional annotation categories
+    if "atom_id" in annot_categories:
+        atom_id = array.atom_id
+    else:
+        atom_id = np.arange(1, natoms + 1)
+
+    # Do checks on atom array (stack)
+    if hybrid36:
+        max_atoms = max_hybrid36_number(5)
+        max_residues = max_hybrid36_number(4)
+    else:
+        max_atoms, max_residues = 99999, 9999
+    if array.array_length() > max_atoms:
+        warnings.warn(f"More then {max_atoms:,} atoms per model")
+    if (array.res_id > max_residues).any():
+        warnings.warn(f"Residue IDs exceed {max_residues:,}")
+    if coord is None and np.isnan(array.coord).any():
+        raise ValueError("Coordinates contain 'NaN' values")
+    for annotation, width, description in [
+        (array.chain_id,  1, "chain IDs"),
+        (array.res_name,  3, "residue names"),
+        (array.atom_name, 4, "atom names"),
+        (array.ins_code,  1, "insertion codes"),
+        (array.element,   2, "elements"),
+    ]:
+        if (str_len(annotation) > width).any():
+            raise ValueError(
+                f"Some {description} exceed {width} "
+                f"character{'s' if width > 1 else ''}"
+            )
 
-        for center_i, bonded_indices in enumerate(bonds):
-            n_added = 0
-            for bonded_i in bonded_indices:
-                if bonded_i == -1:
-                    # Reached padding values
-                    break
-                if n_added == 0:
-                    # Add new record
-                    line = f"CONECT{atom_ids[center_i]:>5}"
-                line += f"{atom_ids[bonded_i]:>5}"
-                n_added += 1
-                if n_added == 4:
-                    # Only a maximum of 4 bond partners can be put
-                    # into a single line
-                    # If there are more, use an extra record
-                    n_added = 0
-                    self.lines.append(line)
-            if n_added > 0:
-                self.lines.append(line)
+    # The ASCII codes of all atom records of a model
+    # including the terminal line break:
+    # All columns except the coordinates are equal for all models
+    records = np.full((natoms, 81), ord(" "), dtype=np.uint8)
+    records[:, :6] = np.where(
+        array.hetero[:, np.newaxis],
+        np.frombuffer(b"HETATM", dtype=np.uint8),
+        np.frombuffer(b"ATOM  ", dtype=np.uint8)
+    )
+    if hybrid36:
+        records[:, 6:11] = to_ascii_columns(
+            encode_hybrid36_array(atom_id, 5), 5, align_right=True
+        )
+        records[:, 22:26] = to_ascii_columns(
+            encode_hybrid36_array(array.res_id, 4), 4, align_right=True
+        )
+    else:
+        # Atom IDs are supported up to 99999,
+        # but negative IDs are also possible
+        records[:, 6:11] = format_fixed_point(
+            np.where(atom_id > 0, ((atom_id - 1) % 99999) + 1, atom_id),
+            5, 0, "Atom IDs"
+        )
+        # Residue IDs are supported up to 9999,
+        # but negative IDs are also possible
+        records[:, 22:26] = format_fixed_point(
+            np.where(
+                array.res_id > 0, ((array.res_id - 1) % 9999) + 1,
+                array.res_id
+            ),
+            4, 0, "Residue IDs"
+        )
+    atom_names = to_ascii_columns(array.atom_name, 4)
+    # Atom names of elements with a single character are
+    # shifted by one column
+    is_shifted = (str_len(array.element) == 1) \
+                 & (str_len(array.atom_name) < 4)
+    records[is_shifted, 13:16] = atom_names[is_shifted, :3]
+    records[~is_shifted, 12:16] = atom_names[~is_shifted]
+    records[:, 17:20] = to_ascii_columns(
+        array.res_name, 3, align_right=True
+    )
+    records[:, 21:22] = to_ascii_columns(array.chain_id, 1)
+    records[:, 26:27] = to_ascii_columns(array.ins_code, 1)
+    if "occupancy" in annot_categories:
+        records[:, 54:60] = format_fixed_point(
+            array.occupancy, 6, 2, "Occupancy values"
+        )
+    else:
+        records[:, 54:60] = np.frombuffer(b"  1.00", dtype=np.uint8)
+    if "b_factor" in annot_categories:
+        records[:, 60:66] = format_fixed_point(
+            array.b_factor, 6, 2, "B-factors"
+        )
+    else:
+        records[:, 60:66] = np.frombuffer(b"  0.00", dtype=np.uint8)
+    records[:, 76:78] = to_ascii_columns(
+        array.element, 2, align_right=True
+    )
+    if "charge" in annot_categories:
+        charge = array.charge
+        if (np.abs(charge) > 9).any():
+            raise ValueError("Some charges exceed 1 digit")
+        # Charges are written as e.g. '2+' or '1-',
+        # neutral atoms have no charge entry
+        is_charged = charge != 0
+        records[is_charged, 78] = ord("0") + np.abs(charge[is_charged])
+        records[is_charged, 79] = np.where(
+            charge[is_charged] > 0, ord("+"), ord("-")
+        )
+    records[:, 80] = ord("\n")
+
+    if coord is None:
+        coord = array.coord
+        if coord.ndim == 2:
+            coord = coord[np.newaxis, ...]
+        write_model_records = coord.shape[0] > 1
+    else:
+        write_model_records = True
+
+    bond_records = None
+    if array.bonds is not None:
+        # Only non-water hetero records and connections between
+        # residues are added to the records
+        hetero_indices = np.where(array.hetero & ~filter_solvent(array))[0]
+        bond_array = array.bonds.as_array()
+        bond_array = bond_array[
+            np.isin(bond_array[:,0], hetero_indices) |
+            np.isin(bond_array[:,1], hetero_indices) |
+            (array.res_id  [bond_array[:,0]] != array.res_id  [bond_array[:,1]]) |
+            (array.chain_id[bond_array[:,0]] != array.chain_id[bond_array[:,1]])
+        ]
+        # The atom IDs as they appear in the atom records
+        pdb_atom_id = np.ascontiguousarray(records[:, 6:11]) \
+                      .view("S5")[:, 0].astype("U5")
+        bond_records = _format_bonds(
+            BondList(array.array_length(), bond_array), pdb_atom_id
+        )
+
+    def record_blocks():
+        # Prepend a single CRYST1 record if we have box information
+        if array.box is not None:
+            box = array.box
+            if len(box.shape) == 3:
+                box = box[0]
+            a, b, c, alpha, beta, gamma = unitcell_from_vectors(box)
+            yield (
+                f"CRYST1{a:>9.3f}{b:>9.3f}{c:>9.3f}"
+                f"{np.rad2deg(alpha):>7.2f}{np.rad2deg(beta):>7.2f}"
+                f"{np.rad2deg(gamma):>7.2f} P 1           1          \n"
+            )
+        for model_num, model_coord in enumerate(coord, start=1):
+            model_coord = np.asarray(model_coord)
+            if model_coord.shape != (natoms, 3):
+                raise IndexError(
+                    f"Expected coordinates with shape ({natoms}, 3), "
+                    f"but got {model_coord.shape}"
+                )
+            if np.isnan(model_coord).any():
+                raise ValueError("Coordinates contain 'NaN' values")
+            records[:, 30:54] = format_fixed_point(
+                model_coord, 8, 3, "Coordinates"
+            ).reshape(natoms, 24)
+            atom_records = records.tobytes().decode("ascii")
+            if write_model_records:
+                yield f"MODEL     {model_num:4}\n{atom_records}ENDMDL\n"
+            else:
+                yield atom_records
+        # Add CONECT records if bonds are present
+        if bond_records is not None and len(bond_records) > 0:
+            yield "\n".join(bond_records) + "\n"
+
+    return record_blocks()
+
+
+def _format_bonds(bond_list, atom_ids):
+    """
+    Create the *CONECT* records for the given bonds.
+    """
+    # Bond type is unused since PDB does not support bond orders
+    bonds, _ = bond_list.get_all_bonds()
+
+    lines = []
+    for center_i, bonded_indices in enumerate(bonds):
+        n_added = 0
+        for bonded_i in bonded_indices:
+            if bonded_i == -1:
+                # Reached padding values
+                break
+            if n_added == 0:
+                # Add new record
+                line = f"CONECT{atom_ids[center_i]:>5}"
+            line += f"{atom_ids[bonded_i]:>5}"
+            n_added += 1
+            if n_added == 4:
+                # Only a maximum of 4 bond partners can be put
+                # into a single line
+                # If there are more, use an extra record
+                n_added = 0
+                lines.append(line)
+        if n_added > 0:
+            lines.append(line)
+    return lines
 
 
 def _parse_transformations(lines):
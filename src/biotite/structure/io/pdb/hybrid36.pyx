@@ -4,9 +4,17 @@
 
 __name__ = "biotite.structure.io.pdb"
 __author__ = "Patrick Kunzmann"
-__all__ = ["encode_hybrid36", "decode_hybrid36", "max_hybrid36_number"]
+__all__ = ["encode_hybrid36", "decode_hybrid36",
+           "encode_hybrid36_array", "decode_hybrid36_array",
+           "max_hybrid36_number"]
 
 cimport cython
+cimport numpy as np
+
+import numpy as np
+
+ctypedef np.uint8_t uint8
+ctypedef np.int64_t int64
 
 
 cdef int _ASCII_FIRST_NUMBER = 48
@@ -15,6 +23,9 @@ cdef int _ASCII_FIRST_LETTER_LOWER = 97
 cdef int _ASCII_LAST_NUMBER = 57
 cdef int _ASCII_LAST_LETTER_UPPER = 90
 cdef int _ASCII_LAST_LETTER_LOWER = 122
+cdef int _ASCII_SPACE = 32
+cdef int _ASCII_PLUS = 43
+cdef int _ASCII_MINUS = 45
 
 
 def encode_hybrid36(int number, int length):
@@ -235,4 +246,217 @@ def max_hybrid36_number(length):
         string of the given `length`.
     """
     #      |-- Decimal -|     |--- lo + up base-36 ---|
-    return 10**length - 1  +  2 * (26 * 36**(length-1))
\ No newline at end of file
+    return 10**length - 1  +  2 * (26 * 36**(length-1))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def encode_hybrid36_array(numbers, int length):
+    """
+    Encode an array of integer values into hybrid-36 string
+    representations.
+
+    This is the vectorized variant of :func:`encode_hybrid36()`.
+    
+    Parameters
+    ----------
+    numbers : ndarray, dtype=int
+        Positive integers to be converted into strings.
+    length : int
+        The desired length of the string representations.
+    
+    Returns
+    -------
+    hybrid36 : ndarray, dtype=str
+        The hybrid-36 string representations.
+        The shape is equal to the shape of `numbers`.
+    """
+    if length < 1:
+        raise ValueError(
+            "String length must be at least 1"
+        )
+    numbers = np.asarray(numbers, dtype=np.int64)
+    if (numbers < 0).any():
+        raise ValueError(
+            "Only positive integers can be converted into hybrid-36 notation"
+        )
+    if (numbers > max_hybrid36_number(length)).any():
+        raise ValueError(
+            f"Value {np.max(numbers)} is too large for hybrid-36 encoding "
+            f"at a string length of {length}"
+        )
+
+    cdef int64[:] numbers_v = np.ascontiguousarray(numbers.flatten())
+    # Each string is left-aligned in its row,
+    # the remaining characters are NULL bytes
+    chars = np.zeros((numbers_v.shape[0], length), dtype=np.uint8)
+    cdef uint8[:,:] chars_v = chars
+
+    cdef int64 decimal_limit = 10**length
+    cdef int64 base36_block = 26 * 36**(length-1)
+    cdef int64 base36_offset = 10 * 36**(length-1)
+    cdef int64 i, num
+    cdef int n_digits
+    for i in range(numbers_v.shape[0]):
+        num = numbers_v[i]
+        if num < decimal_limit:
+            # Normal decimal representation
+            n_digits = 1
+            while n_digits < length and num >= 10**n_digits:
+                n_digits += 1
+            _write_digits(
+                chars_v, i, num, 10, n_digits, _ASCII_FIRST_LETTER_UPPER
+            )
+            continue
+        # For the transformation into the base-36 value
+        # see 'encode_hybrid36()'
+        num -= decimal_limit
+        if num < base36_block:
+            _write_digits(
+                chars_v, i, num + base36_offset, 36, length,
+                _ASCII_FIRST_LETTER_UPPER
+            )
+        else:
+            _write_digits(
+                chars_v, i, num - base36_block + base36_offset, 36, length,
+                _ASCII_FIRST_LETTER_LOWER
+            )
+
+    # Trailing NULL bytes are removed by interpreting each row as
+    # byte string
+    return chars.view(f"S{length}")[:, 0].astype(f"U{length}") \
+           .reshape(numbers.shape)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline void _write_digits(uint8[:,:] chars_v, int64 row, int64 number,
+                               int base, int n_digits,
+                               int ascii_letter_offset):
+    """
+    Write the given number of digits of a number in the given base into
+    the first characters of a row.
+    """
+    cdef int64 remaining
+    cdef int64 last
+    cdef int i = n_digits - 1
+    while i >= 0:
+        remaining = number // base
+        last = number - remaining * base
+        if last < 10:
+            chars_v[row, i] = last + _ASCII_FIRST_NUMBER
+        else:
+            chars_v[row, i] = last + ascii_letter_offset - 10
+        number = remaining
+        i -= 1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode_hybrid36_array(strings):
+    """
+    Convert an array of hybrid-36 strings into integer values.
+
+    This is the vectorized variant of :func:`decode_hybrid36()`.
+    Leading and trailing whitespace is ignored.
+    
+    Parameters
+    ----------
+    strings : ndarray, dtype=str
+        Hybrid-36 strings representing integers.
+    
+    Returns
+    -------
+    numbers : ndarray, dtype=int
+        The integer values represented by the hybrid-36 strings.
+        The shape is equal to the shape of `strings`.
+    """
+    strings = np.asarray(strings)
+    if strings.dtype.kind not in ("U", "S"):
+        raise TypeError(
+            f"Expected an array of strings, but got dtype '{strings.dtype}'"
+        )
+    byte_strings = np.ascontiguousarray(strings.astype("S").flatten())
+    cdef int64 n_strings = byte_strings.shape[0]
+    cdef int width = byte_strings.dtype.itemsize
+    if width == 0:
+        if n_strings > 0:
+            raise ValueError("Cannot parse empty string into integer")
+        return np.zeros(strings.shape, dtype=np.int64)
+    cdef const uint8[:,:] chars_v = byte_strings.view(np.uint8) \
+                                    .reshape(n_strings, width)
+
+    numbers = np.zeros(n_strings, dtype=np.int64)
+    cdef int64[:] numbers_v = numbers
+
+    cdef int64 i
+    cdef int j, start, stop, length
+    cdef int64 number
+    cdef int64 sign
+    cdef uint8 first, code
+    cdef int ascii_first_letter, ascii_last_letter
+    for i in range(n_strings):
+        # Ignore surrounding whitespace and NULL padding
+        start = 0
+        stop = width
+        while stop > start and (
+            chars_v[i, stop-1] == 0 or chars_v[i, stop-1] == _ASCII_SPACE
+        ):
+            stop -= 1
+        while start < stop and chars_v[i, start] == _ASCII_SPACE:
+            start += 1
+        length = stop - start
+        if length == 0:
+            raise ValueError("Cannot parse empty string into integer")
+        first = chars_v[i, start]
+
+        if first >= _ASCII_FIRST_LETTER_UPPER \
+            and first <= _ASCII_LAST_LETTER_UPPER:
+                ascii_first_letter = _ASCII_FIRST_LETTER_UPPER
+                ascii_last_letter = _ASCII_LAST_LETTER_UPPER
+        elif first >= _ASCII_FIRST_LETTER_LOWER \
+            and first <= _ASCII_LAST_LETTER_LOWER:
+                ascii_first_letter = _ASCII_FIRST_LETTER_LOWER
+                ascii_last_letter = _ASCII_LAST_LETTER_LOWER
+        else:
+            # Normal decimal representation with optional sign
+            sign = 1
+            if first == _ASCII_MINUS or first == _ASCII_PLUS:
+                if first == _ASCII_MINUS:
+                    sign = -1
+                start += 1
+                if start == stop:
+                    _raise_illegal(byte_strings[i])
+            number = 0
+            for j in range(start, stop):
+                code = chars_v[i, j]
+                if code < _ASCII_FIRST_NUMBER or code > _ASCII_LAST_NUMBER:
+                    _raise_illegal(byte_strings[i])
+                number = number * 10 + code - _ASCII_FIRST_NUMBER
+            numbers_v[i] = sign * number
+            continue
+
+        number = 0
+        for j in range(start, stop):
+            code = chars_v[i, j]
+            number *= 36
+            if code >= _ASCII_FIRST_NUMBER and code <= _ASCII_LAST_NUMBER:
+                number += code - _ASCII_FIRST_NUMBER
+            elif code >= ascii_first_letter and code <= ascii_last_letter:
+                number += code - ascii_first_letter + 10
+            else:
+                _raise_illegal(byte_strings[i])
+        # For the transformation into the integer value
+        # see 'decode_hybrid36()'
+        if ascii_first_letter == _ASCII_FIRST_LETTER_UPPER:
+            numbers_v[i] = number - 10 * 36**(length-1) + 10**length
+        else:
+            numbers_v[i] = number + (26-10) * 36**(length-1) + 10**length
+
+    return numbers.reshape(strings.shape)
+
+
+def _raise_illegal(string):
+    raise ValueError(
+        f"Illegal hybrid-36 string '{string.decode('ascii').strip()}'"
+    )
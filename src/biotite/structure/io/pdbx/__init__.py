@@ -8,10 +8,15 @@ format. The :class:`PDBxFile` class provides dictionary-like access to
 every field in PDBx/mmCIF files.
 Additional utility functions allow conversion of these dictionaries to
 :class:`AtomArray` and :class:`AtomArrayStack` objects and vice versa.
+The :class:`BinaryCIFFile` class provides the same interface for the
+BinaryCIF format, a compact binary representation of PDBx/mmCIF files.
+Large structures can be written without keeping the entire file in
+memory via :class:`PDBxWriter`.
 """
 
 __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
 
+from .bcif import *
 from .convert import *
 from .file import *
\ No newline at end of file
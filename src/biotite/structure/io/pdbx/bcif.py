@@ -0,0 +1,854 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = ["BinaryCIFFile"]
+
+import copy
+from collections.abc import MutableMapping
+import numpy as np
+import msgpack
+from ....file import File, InvalidFileError, is_binary, is_open_compatible
+
+
+# Data type codes used by the 'ByteArray' encoding
+_BYTE_ARRAY_TYPES = {
+    1: np.dtype("<i1"),
+    2: np.dtype("<i2"),
+    3: np.dtype("<i4"),
+    4: np.dtype("<u1"),
+    5: np.dtype("<u2"),
+    6: np.dtype("<u4"),
+    32: np.dtype("<f4"),
+    33: np.dtype("<f8"),
+}
+_TYPE_CODES = {
+    dtype.newbyteorder("="): code for code, dtype in _BYTE_ARRAY_TYPES.items()
+}
+_INT32_CODE = 3
+_FLOAT64_CODE = 33
+
+# Mask values of columns
+_PRESENT = 0
+_NOT_SPECIFIED = 1
+_UNKNOWN = 2
+
+# The maximum number of decimals that is stored as fixed point number
+_MAX_DECIMALS = 6
+# The allowed characters in numeric values
+_NUMERIC_CHARS = np.array(
+    [ord(c) for c in "0123456789+-."] + [0], dtype=np.uint32
+)
+
+
+class BinaryCIFFile(File, MutableMapping):
+    """
+    This class represents a BinaryCIF file.
+    :footcite:`Sehnal2020`
+
+    BinaryCIF contains the same information as a PDBx/mmCIF file, but
+    the content is stored in a binary *MessagePack* container.
+    The columns of each category are compressed using a chain of
+    encodings (e.g. delta encoding, run-length encoding and integer
+    packing), which makes BinaryCIF files much smaller and faster to
+    parse than text-based PDBx/mmCIF files.
+
+    The interface of this class is equivalent to :class:`PDBxFile`:
+    The categories of the file can be accessed using the
+    :meth:`get_category()`/:meth:`set_category()` methods or using
+    dictionary-like indexing.
+    Hence, the functions that accept a :class:`PDBxFile`, like
+    :func:`get_structure()` or :func:`set_structure()`, accept a
+    :class:`BinaryCIFFile` as well.
+
+    In contrast to :class:`PDBxFile`, the columns of a category are
+    returned as arrays with the data type of the column in the file,
+    i.e. integer columns are returned as integer arrays and
+    floating point columns as float arrays.
+    However, if a column contains masked values, i.e. ``'.'`` or
+    ``'?'``, the column is returned as string array.
+    Categories that contain only a single row are returned as
+    dictionary of strings, like *non-looped* categories in
+    :class:`PDBxFile`.
+
+    When a category is set, the values are converted into the most
+    compact representation:
+    String columns whose values represent integers or decimal numbers
+    with a fixed number of decimals are stored as integer and fixed
+    point numbers, respectively.
+
+    Notes
+    -----
+    The columns of a category are decoded, when :meth:`get_category()`
+    is called.
+    The encoded content of categories that are not accessed is kept
+    as is, when the file is written.
+
+    References
+    ----------
+
+    .. footbibliography::
+
+    Examples
+    --------
+    Convert a PDBx/mmCIF file into a BinaryCIF file:
+
+    >>> import os.path
+    >>> pdbx_file = PDBxFile.read(os.path.join(path_to_structures, "1l2y.cif"))
+    >>> bcif_file = BinaryCIFFile()
+    >>> for block, category in pdbx_file:
+    ...     bcif_file.set_category(
+    ...         category, pdbx_file.get_category(category, block), block
+    ...     )
+    >>> print(bcif_file["citation_author"]["name"])
+    ['Neidigh, J.W.' 'Fesinmeyer, R.M.' 'Andersen, N.H.']
+    >>> print(bcif_file["atom_site"]["Cartn_x"][:3])
+    [-8.901 -8.608 -7.117]
+    >>> arr = get_structure(bcif_file, model=1)
+    >>> print(type(arr).__name__)
+    AtomArray
+    >>> bcif_file.write(os.path.join(path_to_directory, "1l2y.bcif"))
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._content = {
+            "version": "0.3.0",
+            "encoder": "biotite",
+            "dataBlocks": [],
+        }
+
+    @classmethod
+    def read(cls, file):
+        """
+        Read a BinaryCIF file.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+
+        Returns
+        -------
+        file_object : BinaryCIFFile
+            The parsed file.
+        """
+        bcif_file = cls()
+        # File name
+        if is_open_compatible(file):
+            with open(file, "rb") as f:
+                content = msgpack.unpackb(f.read(), use_list=True, raw=False)
+        # File object
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            content = msgpack.unpackb(file.read(), use_list=True, raw=False)
+        if not isinstance(content, dict) or "dataBlocks" not in content:
+            raise InvalidFileError("The file has no data blocks")
+        bcif_file._content = content
+        return bcif_file
+
+    def write(self, file):
+        """
+        Write contents into a BinaryCIF file.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively, a file path can be supplied.
+        """
+        packed_bytes = msgpack.packb(self._content, use_bin_type=True)
+        if is_open_compatible(file):
+            with open(file, "wb") as f:
+                f.write(packed_bytes)
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            file.write(packed_bytes)
+
+    def get_block_names(self):
+        """
+        Get the names of all data blocks in the file.
+
+        Returns
+        -------
+        blocks : list
+            List of data block names.
+        """
+        return [block["header"] for block in self._content["dataBlocks"]]
+
+    def get_category(self, category, block=None, expect_looped=False,
+                     columns=None):
+        """
+        Get the dictionary for a given category.
+
+        Parameters
+        ----------
+        category : string
+            The name of the category. The leading underscore is omitted.
+        block : string, optional
+            The name of the data block. Default is the first
+            (and most times only) data block of the file.
+        expect_looped : bool, optional
+            If set to true, the returned dictionary will always contain
+            arrays (only if the category exists):
+            If the category contains only a single row, each array will
+            contain only one element.
+        columns : iterable of str, optional
+            If given, only these columns of the category are decoded
+            and returned.
+            Columns that do not exist in the category are ignored.
+            By default, all columns are returned.
+
+        Returns
+        -------
+        category_dict : dict of (str or ndarray) or None
+            A entry keyed dictionary.
+            The corresponding values are strings, if the category
+            contains a single row and `expect_looped` is false.
+            Otherwise, the values are arrays, whose data type depends
+            on the type of the column.
+            Returns None, if the data block does not contain the given
+            category.
+        """
+        if block is None:
+            block = self.get_block_names()[0]
+        category_content = self._find_category(block, category)
+        if category_content is None:
+            return None
+
+        if columns is not None:
+            columns = set(columns)
+        category_dict = {
+            column["name"]: _decode_column(column)
+            for column in category_content["columns"]
+            if columns is None or column["name"] in columns
+        }
+        if category_content["rowCount"] == 1 and not expect_looped:
+            category_dict = {
+                key: str(array[0]) for key, array in category_dict.items()
+            }
+        return category_dict
+
+    def set_category(self, category, category_dict, block=None):
+        """
+        Set the content of a category.
+
+        If the category is already exisiting, its content is replaced.
+        Otherwise a new category is appended at the end of the data
+        block.
+
+        Parameters
+        ----------
+        category : string
+            The name of the category. The leading underscore is omitted.
+        category_dict : dict
+            The category content. The dictionary must have strings
+            (subcategories) as keys and strings or :class:`ndarray`
+            objects as values.
+            String arrays are stored as integer or floating point
+            columns, if all their values represent numbers that can be
+            restored to the same strings.
+        block : string, optional
+            The name of the data block. Default is the first
+            (and most times only) data block of the file. If the
+            block is not contained in the file yet, a new block is
+            appended at the end of the file.
+        """
+        if block is None:
+            block = self.get_block_names()[0]
+
+        # Determine whether the category is a looped category
+        sample_category_value = list(category_dict.values())[0]
+        if isinstance(sample_category_value, (np.ndarray, list)):
+            # Check whether all arrays have the same length
+            row_count = len(sample_category_value)
+            for subcat, array in category_dict.items():
+                if len(array) != row_count:
+                    raise ValueError(
+                        f"Length of Subcategory '{subcat}' is {len(array)}, "
+                        f" but {row_count} was expected"
+                    )
+            arrays = {
+                key: np.asarray(value) for key, value in category_dict.items()
+            }
+        else:
+            row_count = 1
+            arrays = {
+                key: np.array([str(value)])
+                for key, value in category_dict.items()
+            }
+
+        category_content = {
+            "name": "_" + category,
+            "columns": [
+                # Single values, e.g. version strings, are not parsed,
+                # as they would be returned as strings anyway
+                _encode_column(key, array, parse_numbers=row_count > 1)
+                for key, array in arrays.items()
+            ],
+            "rowCount": row_count,
+        }
+
+        block_content = self._find_block(block)
+        if block_content is None:
+            block_content = {"header": block, "categories": []}
+            self._content["dataBlocks"].append(block_content)
+        categories = block_content["categories"]
+        for i, old_category_content in enumerate(categories):
+            if _category_name(old_category_content) == category:
+                categories[i] = category_content
+                break
+        else:
+            categories.append(category_content)
+
+    def __copy_fill__(self, clone):
+        super().__copy_fill__(clone)
+        clone._content = copy.deepcopy(self._content)
+
+    def __setitem__(self, index, item):
+        block, category_name = self._full_index(index)
+        self.set_category(category_name, item, block=block)
+
+    def __getitem__(self, index):
+        block, category_name = self._full_index(index)
+        return self.get_category(category_name, block=block)
+
+    def __delitem__(self, index):
+        block, category_name = self._full_index(index)
+        block_content = self._find_block(block)
+        if block_content is not None:
+            categories = block_content["categories"]
+            for i, category_content in enumerate(categories):
+                if _category_name(category_content) == category_name:
+                    del categories[i]
+                    return
+        raise KeyError(index)
+
+    def __contains__(self, index):
+        block, category_name = self._full_index(index)
+        return self._find_category(block, category_name) is not None
+
+    def __iter__(self):
+        return iter(
+            [
+                (block["header"], _category_name(category_content))
+                for block in self._content["dataBlocks"]
+                for category_content in block["categories"]
+            ]
+        )
+
+    def __len__(self):
+        return sum(
+            len(block["categories"]) for block in self._content["dataBlocks"]
+        )
+
+    def _full_index(self, index):
+        """
+        Converts a an integer or tuple index into a block and a category
+        name.
+        """
+        if isinstance(index, tuple):
+            return index[0], index[1]
+        elif isinstance(index, str):
+            return self.get_block_names()[0], index
+        else:
+            raise TypeError(
+                f"'{type(index).__name__}' is an invalid index type"
+            )
+
+    def _find_block(self, block):
+        for block_content in self._content["dataBlocks"]:
+            if block_content["header"] == block:
+                return block_content
+        return None
+
+    def _find_category(self, block, category):
+        block_content = self._find_block(block)
+        if block_content is None:
+            return None
+        for category_content in block_content["categories"]:
+            if _category_name(category_content) == category:
+                return category_content
+        return None
+
+
+def _category_name(category_content):
+    """
+    Get the category name without the leading underscore.
+    """
+    name = category_content["name"]
+    return name[1:] if name.startswith("_") else name
+
+
+def _decode_column(column):
+    """
+    Decode the data of a column and apply its mask.
+    """
+    array = _decode(column["data"])
+    if column.get("mask") is not None:
+        mask = _decode(column["mask"])
+        if np.any(mask != _PRESENT):
+            # Masked values are represented as in PDBx/mmCIF files
+            array = array.astype(str)
+            array[mask == _NOT_SPECIFIED] = "."
+            array[mask == _UNKNOWN] = "?"
+    if not array.flags.writeable:
+        # Arrays created from the encoded bytes are read-only
+        array = array.copy()
+    return array
+
+
+def _decode(encoded_data):
+    """
+    Decode an encoded data object by applying the encodings in
+    reverse order.
+    """
+    data = encoded_data["data"]
+    for encoding in reversed(encoded_data["encoding"]):
+        data = _decode_step(data, encoding)
+    return data
+
+
+def _decode_step(data, encoding):
+    kind = encoding["kind"]
+    if kind == "ByteArray":
+        dtype = _BYTE_ARRAY_TYPES[encoding["type"]]
+        return np.frombuffer(data, dtype=dtype).astype(
+            dtype.newbyteorder("="), copy=False
+        )
+
+    elif kind == "FixedPoint":
+        src_type = _BYTE_ARRAY_TYPES[encoding["srcType"]]
+        return np.divide(data, encoding["factor"], dtype=src_type)
+
+    elif kind == "IntervalQuantization":
+        src_type = _BYTE_ARRAY_TYPES[encoding["srcType"]]
+        min_val = encoding["min"]
+        step = (encoding["max"] - min_val) / (encoding["numSteps"] - 1)
+        return (min_val + step * data).astype(src_type)
+
+    elif kind == "RunLength":
+        src_type = _BYTE_ARRAY_TYPES[encoding["srcType"]]
+        if len(data) % 2 != 0:
+            raise InvalidFileError(
+                "Run-length encoded data must have an even length"
+            )
+        values = data[0::2]
+        lengths = data[1::2]
+        if np.any(lengths < 0):
+            raise InvalidFileError("Run lengths must not be negative")
+        if np.sum(lengths, dtype=np.int64) != encoding["srcSize"]:
+            raise InvalidFileError(
+                "The run lengths do not match the expected array length"
+            )
+        return np.repeat(values, lengths).astype(src_type, copy=False)
+
+    elif kind == "Delta":
+        src_type = _BYTE_ARRAY_TYPES[encoding["srcType"]]
+        array = np.cumsum(data, dtype=src_type)
+        array += encoding["origin"]
+        return array
+
+    elif kind == "IntegerPacking":
+        return _unpack_integers(data, encoding)
+
+    elif kind == "StringArray":
+        offsets = _decode(
+            {
+                "data": encoding["offsets"],
+                "encoding": encoding["offsetEncoding"],
+            }
+        )
+        indices = _decode(
+            {"data": data, "encoding": encoding["dataEncoding"]}
+        )
+        string_data = encoding["stringData"]
+        # The additional empty string is selected by index -1,
+        # which is used for masked values
+        strings = np.array(
+            [
+                string_data[start:stop]
+                for start, stop in zip(offsets[:-1], offsets[1:])
+            ]
+            + [""],
+            dtype=str,
+        )
+        return strings[indices]
+
+    else:
+        raise InvalidFileError(f"Unknown encoding '{kind}'")
+
+
+def _unpack_integers(data, encoding):
+    """
+    Reverse the 'IntegerPacking' encoding:
+    Values at the limits of the packed data type are summed up with
+    the following values, until a value within the limits is
+    encountered.
+    """
+    info = np.iinfo(data.dtype)
+    if encoding["isUnsigned"]:
+        is_limit = data == info.max
+    else:
+        is_limit = (data == info.max) | (data == info.min)
+    if not np.any(is_limit):
+        array = data.astype(np.int32)
+    else:
+        cum_sum = np.cumsum(data, dtype=np.int64)
+        ends = np.nonzero(~is_limit)[0]
+        sums = cum_sum[ends]
+        sums[1:] -= cum_sum[ends[:-1]]
+        array = sums.astype(np.int32)
+    if len(array) != encoding["srcSize"]:
+        raise InvalidFileError(
+            "The unpacked integers do not match the expected array length"
+        )
+    return array
+
+
+def _encode_column(name, array, parse_numbers):
+    """
+    Encode an array into a column, choosing the encodings based on
+    the data type of the array.
+    If `parse_numbers` is true, string arrays are converted into
+    numeric arrays, where possible.
+    """
+    mask = None
+    if array.dtype.kind in ("U", "S", "O", "b"):
+        array, mask, decimals = _parse_strings(
+            array.astype(str), parse_numbers
+        )
+    elif array.dtype.kind == "f":
+        decimals = None
+    else:
+        decimals = 0
+
+    if array.dtype.kind in "iu" and _fits_int32(array):
+        encoded_data = _encode_integers(array.astype(np.int32))
+    elif array.dtype.kind in "iu":
+        # Too large integers are retained as strings
+        encoded_data = _encode_strings(array.astype(str))
+    elif array.dtype.kind == "f":
+        encoded_data = _encode_floats(array, decimals)
+    else:
+        encoded_data = _encode_strings(array, mask)
+
+    return {
+        "name": name,
+        "data": encoded_data,
+        "mask": (
+            _encode_integers(mask.astype(np.int32))
+            if mask is not None and np.any(mask != _PRESENT)
+            else None
+        ),
+    }
+
+
+def _parse_strings(array, parse_numbers):
+    """
+    Determine the mask for the given string array and convert it into
+    an integer or floating point array, if all unmasked values
+    represent numbers that can be restored to the same strings.
+
+    Returns
+    -------
+    array : ndarray
+        The converted array or the input string array.
+    mask : ndarray, dtype=uint8
+        The mask of the column.
+    decimals : int or None
+        The number of decimals of floating point values.
+    """
+    mask = np.full(len(array), _PRESENT, dtype=np.uint8)
+    mask[(array == ".") | (array == "")] = _NOT_SPECIFIED
+    mask[array == "?"] = _UNKNOWN
+    is_present = mask == _PRESENT
+    values = array[is_present]
+    if not parse_numbers or len(values) == 0:
+        return array, mask, None
+
+    # A 'U' array stores each character as UCS4 code point,
+    # padded with zeros
+    code_points = values.view(np.uint32).reshape(len(values), -1)
+    if not np.isin(code_points, _NUMERIC_CHARS).all():
+        return array, mask, None
+    is_dot = code_points == ord(".")
+    has_dot = is_dot.any(axis=-1)
+
+    if not has_dot.any():
+        try:
+            numbers = values.astype(np.int64)
+        except (ValueError, OverflowError):
+            return array, mask, None
+        # Integers with leading zeros or explicit plus signs
+        # would not be restored as they were
+        if not _fits_int32(numbers) or np.any(numbers.astype(str) != values):
+            return array, mask, None
+        decimals = 0
+        dtype = np.int32
+    elif has_dot.all():
+        # Append a padding column to be able to look at the character
+        # after the first digit
+        code_points = np.pad(code_points, ((0, 0), (0, 1)))
+        row_indices = np.arange(len(values))
+        first_digit = (code_points[:, 0] == ord("-")).astype(int)
+        if (
+            np.any(code_points[:, 0] == ord("+"))
+            or np.any(
+                (code_points[row_indices, first_digit] == ord("0"))
+                & (code_points[row_indices, first_digit + 1] != ord("."))
+            )
+        ):
+            # Leading zeros or explicit plus signs
+            return array, mask, None
+        lengths = np.count_nonzero(code_points, axis=-1)
+        decimals = lengths - np.argmax(is_dot, axis=-1) - 1
+        # The values can only be restored as they were,
+        # if all values have the same number of decimals
+        if np.any(decimals != decimals[0]):
+            return array, mask, None
+        try:
+            numbers = values.astype(np.float64)
+        except ValueError:
+            return array, mask, None
+        decimals = int(decimals[0])
+        dtype = np.float64
+    else:
+        return array, mask, None
+
+    converted = np.zeros(len(array), dtype=dtype)
+    converted[is_present] = numbers
+    return converted, mask, decimals
+
+
+def _fits_int32(array):
+    if len(array) == 0:
+        return True
+    info = np.iinfo(np.int32)
+    return array.min() >= info.min and array.max() <= info.max
+
+
+def _encode_floats(array, decimals):
+    """
+    Encode floating point values as fixed point integers, if the number
+    of decimals is known, otherwise as raw floating point values.
+    """
+    if decimals is not None and decimals <= _MAX_DECIMALS:
+        factor = 10**decimals
+        fixed_point = np.round(array * factor)
+        if len(array) == 0 or np.max(np.abs(fixed_point)) < 2**31:
+            encoded_data = _encode_integers(fixed_point.astype(np.int32))
+            encoded_data["encoding"].insert(
+                0,
+                {
+                    "kind": "FixedPoint",
+                    "factor": factor,
+                    "srcType": _FLOAT64_CODE,
+                },
+            )
+            return encoded_data
+
+    if array.dtype == np.float32:
+        array = array.astype("<f4", copy=False)
+    else:
+        array = array.astype("<f8", copy=False)
+    return {
+        "encoding": [
+            {
+                "kind": "ByteArray",
+                "type": _TYPE_CODES[array.dtype.newbyteorder("=")],
+            }
+        ],
+        "data": array.tobytes(),
+    }
+
+
+def _encode_strings(array, mask=None):
+    """
+    Encode a string array with the 'StringArray' encoding:
+    The unique strings are concatenated and each value is represented by
+    the index of its string.
+    """
+    indices = np.full(len(array), -1, dtype=np.int32)
+    if mask is None:
+        is_present = np.full(len(array), True)
+    else:
+        is_present = mask == _PRESENT
+    unique_strings, unique_indices = np.unique(
+        array[is_present], return_inverse=True
+    )
+    indices[is_present] = unique_indices.flatten()
+    offsets = np.zeros(len(unique_strings) + 1, dtype=np.int32)
+    np.cumsum(np.char.str_len(unique_strings), out=offsets[1:])
+
+    encoded_offsets = _encode_integers(offsets)
+    encoded_indices = _encode_integers(indices)
+    return {
+        "encoding": [
+            {
+                "kind": "StringArray",
+                "dataEncoding": encoded_indices["encoding"],
+                "stringData": "".join(unique_strings.tolist()),
+                "offsetEncoding": encoded_offsets["encoding"],
+                "offsets": encoded_offsets["data"],
+            }
+        ],
+        "data": encoded_indices["data"],
+    }
+
+
+def _encode_integers(array):
+    """
+    Encode an 32-bit integer array with the combination of
+    'Delta', 'RunLength' and 'IntegerPacking' encodings,
+    that results in the smallest size.
+    """
+    candidates = [
+        ([], array),
+        _encode_run_length([], array),
+    ]
+    delta_encodings, delta = _encode_delta([], array)
+    candidates.append((delta_encodings, delta))
+    candidates.append(_encode_run_length(delta_encodings, delta))
+
+    best_size = None
+    for encodings, data in candidates:
+        is_unsigned = len(data) == 0 or bool(np.min(data) >= 0)
+        for byte_count in (1, 2, 4):
+            if byte_count == 4 or _fits_bytes(data, byte_count, is_unsigned):
+                # The values can be stored directly in a smaller type
+                packing_encodings = []
+                size = len(data) * byte_count
+            else:
+                packing_encodings = [
+                    {
+                        "kind": "IntegerPacking",
+                        "byteCount": byte_count,
+                        "isUnsigned": is_unsigned,
+                        "srcSize": len(data),
+                    }
+                ]
+                size = _packed_length(data, byte_count) * byte_count
+            if best_size is not None and size >= best_size:
+                continue
+            # For small arrays the size of the encoding parameters
+            # is not negligible
+            size += len(msgpack.packb(encodings + packing_encodings))
+            if best_size is None or size < best_size:
+                best_size = size
+                best = (
+                    encodings + packing_encodings,
+                    data,
+                    byte_count,
+                    is_unsigned,
+                )
+
+    encodings, data, byte_count, is_unsigned = best
+    if len(encodings) > 0 and encodings[-1]["kind"] == "IntegerPacking":
+        data = _pack_integers(data, byte_count, is_unsigned)
+    else:
+        data = data.astype(_integer_type(byte_count, is_unsigned))
+    data = data.astype(data.dtype.newbyteorder("<"), copy=False)
+    encodings.append(
+        {
+            "kind": "ByteArray",
+            "type": _TYPE_CODES[data.dtype.newbyteorder("=")],
+        }
+    )
+    return {"encoding": encodings, "data": data.tobytes()}
+
+
+def _encode_delta(encodings, array):
+    origin = int(array[0]) if len(array) > 0 else 0
+    delta = np.zeros(len(array), dtype=np.int32)
+    # Integer overflow is reverted by the overflow of the cumulative sum
+    # in the decoding step
+    np.subtract(array[1:], array[:-1], out=delta[1:])
+    return (
+        encodings
+        + [{"kind": "Delta", "origin": origin, "srcType": _INT32_CODE}],
+        delta,
+    )
+
+
+def _encode_run_length(encodings, array):
+    if len(array) == 0:
+        run_length = np.zeros(0, dtype=np.int32)
+    else:
+        run_starts = np.concatenate(
+            ([0], np.nonzero(array[1:] != array[:-1])[0] + 1)
+        )
+        run_length = np.zeros(len(run_starts) * 2, dtype=np.int32)
+        run_length[0::2] = array[run_starts]
+        run_length[1::2] = np.diff(np.append(run_starts, len(array)))
+    return (
+        encodings
+        + [
+            {
+                "kind": "RunLength",
+                "srcType": _INT32_CODE,
+                "srcSize": len(array),
+            }
+        ],
+        run_length,
+    )
+
+
+def _integer_type(byte_count, is_unsigned):
+    return np.dtype(f"{'u' if is_unsigned else 'i'}{byte_count}")
+
+
+def _fits_bytes(array, byte_count, is_unsigned):
+    if len(array) == 0:
+        return True
+    info = np.iinfo(_integer_type(byte_count, is_unsigned))
+    return np.min(array) >= info.min and np.max(array) <= info.max
+
+
+def _packing_limits(byte_count, is_unsigned):
+    if is_unsigned:
+        return 2 ** (8 * byte_count) - 1, None
+    else:
+        upper = 2 ** (8 * byte_count - 1) - 1
+        return upper, -upper - 1
+
+
+def _limit_counts(array, byte_count, is_unsigned):
+    """
+    Get the number of limit values each value is packed into, in
+    addition to the remainder value.
+    """
+    upper, lower = _packing_limits(byte_count, is_unsigned)
+    array = array.astype(np.int64)
+    if is_unsigned:
+        return array // upper
+    else:
+        return np.where(array >= 0, array // upper, array // lower)
+
+
+def _packed_length(array, byte_count):
+    if len(array) == 0:
+        return 0
+    is_unsigned = bool(np.min(array) >= 0)
+    counts = _limit_counts(array, byte_count, is_unsigned)
+    return len(array) + int(np.sum(counts))
+
+
+def _pack_integers(array, byte_count, is_unsigned):
+    upper, lower = _packing_limits(byte_count, is_unsigned)
+    counts = _limit_counts(array, byte_count, is_unsigned)
+    if is_unsigned:
+        limits = np.full(len(array), upper, dtype=np.int64)
+    else:
+        limits = np.where(array >= 0, upper, lower)
+    remainders = array - counts * limits
+    # Each value is represented by its limit values,
+    # followed by the remainder
+    packed = np.repeat(limits, counts + 1)
+    packed[np.cumsum(counts + 1) - 1] = remainders
+    return packed.astype(_integer_type(byte_count, is_unsigned))
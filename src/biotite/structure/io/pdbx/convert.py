@@ -8,6 +8,7 @@ __all__ = [
     "get_sequence",
     "get_model_count",
     "get_structure",
+    "get_coord",
     "set_structure",
     "list_assemblies",
     "get_assembly",
@@ -19,10 +20,26 @@ from collections import OrderedDict
 import numpy as np
 from ....file import InvalidFileError
 from ....sequence.seqtypes import NucleotideSequence, ProteinSequence
-from ...atoms import AtomArray, AtomArrayStack, repeat
+from ...assembly import VirtualAssembly
+from ...atoms import AtomArray, AtomArrayStack
 from ...box import unitcell_from_vectors, vectors_from_unitcell
 from ...filter import filter_first_altloc, filter_highest_occupancy_altloc
-from ...util import matrix_rotate
+from ..util import format_fixed_point_strings
+
+# The annotations that are read by default
+_STANDARD_ANNOTATIONS = [
+    "chain_id",
+    "res_id",
+    "ins_code",
+    "res_name",
+    "hetero",
+    "atom_name",
+    "element",
+]
+# The annotations that are required to identify the residues,
+# e.g. for altloc filtering
+_RESIDUE_ANNOTATIONS = ["chain_id", "res_id", "ins_code", "res_name"]
+_COORD_COLUMNS = ["Cartn_x", "Cartn_y", "Cartn_z"]
 
 _proteinseq_type_list = ["polypeptide(D)", "polypeptide(L)"]
 _nucleotideseq_type_list = [
@@ -52,7 +69,7 @@ def get_sequence(pdbx_file, data_block=None):
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : string, optional
         The name of the data block. Default is the first
@@ -80,11 +97,12 @@ def get_sequence(pdbx_file, data_block=None):
 
 def get_model_count(file, data_block=None):
     """
-    Get the number of models contained in a :class:`PDBxFile`.
+    Get the number of models contained in a :class:`PDBxFile` or
+    :class:`BinaryCIFFile`.
 
     Parameters
     ----------
-    file : PDBxFile
+    file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : str, optional
         The name of the data block. Default is the first
@@ -95,19 +113,22 @@ def get_model_count(file, data_block=None):
     model_count : int
         The number of models.
     """
-    atom_site_dict = file.get_category("atom_site", data_block)
+    atom_site_dict = file.get_category(
+        "atom_site", data_block, columns=["pdbx_PDB_model_num"]
+    )
     return len(_get_model_starts(atom_site_dict["pdbx_PDB_model_num"]))
 
 
 def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
-                  extra_fields=None, use_author_fields=True):
+                  extra_fields=None, use_author_fields=True, fields=None):
     """
     Create an :class:`AtomArray` or :class:`AtomArrayStack` from the
-    ``atom_site`` category in a :class:`PDBxFile`.
+    ``atom_site`` category in a :class:`PDBxFile` or
+    :class:`BinaryCIFFile`.
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     model : int, optional
         If this parameter is given, the function will return an
@@ -152,12 +173,28 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
         If `use_author_fields` is true, the annotation arrays will be
         read from the ``auth_xxx`` fields (if applicable),
         otherwise from the the ``label_xxx`` fields.
+    fields : list of str, optional
+        The standard annotation arrays (``'chain_id'``, ``'res_id'``,
+        ``'ins_code'``, ``'res_name'``, ``'hetero'``, ``'atom_name'``
+        and ``'element'``) that are read from the file.
+        The other standard annotations keep their default values.
+        Only the columns of the ``atom_site`` category that are
+        required for the given `fields` and `extra_fields` are parsed,
+        which makes reading faster.
+        However, if the file contains *altloc* IDs and `altloc` is not
+        ``'all'``, the annotations that identify residues are always
+        read, as they are required for *altloc* filtering.
+        By default, all standard annotations are read.
 
     Returns
     -------
     array : AtomArray or AtomArrayStack
         The return type depends on the `model` parameter.
 
+    See also
+    --------
+    get_coord
+
     Examples
     --------
 
@@ -167,10 +204,37 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
     >>> print(len(arr))
     304
 
+    Read only the annotations that are actually needed:
+
+    >>> arr = get_structure(file, model=1, fields=["atom_name"])
+    >>> print(arr.atom_name[:3])
+    ['N' 'CA' 'C']
+    >>> print(arr.res_name[:3])
+    ['' '' '']
     """
     extra_fields = [] if extra_fields is None else extra_fields
+    fields = _STANDARD_ANNOTATIONS if fields is None else fields
+    for field in fields:
+        if field not in _STANDARD_ANNOTATIONS:
+            raise ValueError(f"'{field}' is not a standard annotation")
+    annotation_names = list(fields) + list(extra_fields)
+
+    annotation_data = _get_annotation_data(use_author_fields)
+    columns = ["pdbx_PDB_model_num", "label_alt_id"] + _COORD_COLUMNS
+    if altloc == "occupancy":
+        columns.append("occupancy")
+    for annotation_name in annotation_names + _RESIDUE_ANNOTATIONS:
+        if annotation_name in annotation_data:
+            columns += [
+                column for column in annotation_data[annotation_name][:2]
+                if column is not None
+            ]
+        else:
+            columns.append(annotation_name)
 
-    atom_site_dict = pdbx_file.get_category("atom_site", data_block)
+    atom_site_dict = pdbx_file.get_category(
+        "atom_site", data_block, columns=columns
+    )
     models = atom_site_dict["pdbx_PDB_model_num"]
     model_starts = _get_model_starts(models)
     model_count = len(model_starts)
@@ -180,10 +244,14 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
         # For a stack, the annotations are derived from the first model
         model_dict = _get_model_dict(atom_site_dict, model_starts, 1)
         # Any field of the category would work here to get the length
-        model_length = len(model_dict["group_PDB"])
+        model_length = len(model_dict["pdbx_PDB_model_num"])
         stack = AtomArrayStack(model_count, model_length)
 
-        _fill_annotations(stack, model_dict, extra_fields, use_author_fields)
+        _fill_annotations(
+            stack, model_dict,
+            _required_annotations(model_dict, annotation_names, altloc),
+            use_author_fields
+        )
 
         # Check if each model has the same amount of atoms
         # If not, raise exception
@@ -229,15 +297,17 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
 
         model_dict = _get_model_dict(atom_site_dict, model_starts, model)
         # Any field of the category would work here to get the length
-        model_length = len(model_dict["group_PDB"])
+        model_length = len(model_dict["pdbx_PDB_model_num"])
         array = AtomArray(model_length)
 
-        _fill_annotations(array, model_dict, extra_fields, use_author_fields)
+        _fill_annotations(
+            array, model_dict,
+            _required_annotations(model_dict, annotation_names, altloc),
+            use_author_fields
+        )
 
         # Append exclusive stop
-        model_starts = np.append(
-            model_starts, [len(atom_site_dict["group_PDB"])]
-        )
+        model_starts = np.append(model_starts, [atom_count])
         # Indexing starts at 0, but model number starts at 1
         model_index = model - 1
         start, stop = model_starts[model_index], model_starts[model_index + 1]
@@ -259,67 +329,122 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
         return array
 
 
-def _fill_annotations(array, model_dict, extra_fields, use_author_fields):
-    """Fill atom_site annotations in atom array or atom array stack.
+def get_coord(pdbx_file, model=None, data_block=None):
+    """
+    Get only the coordinates from the ``atom_site`` category in a
+    :class:`PDBxFile` or :class:`BinaryCIFFile`.
+
+    Only the coordinate and model number columns are parsed, which
+    makes this function considerably faster than
+    :func:`get_structure()`.
+    This is useful, if the annotations are already known, e.g. when
+    the coordinates of multiple models or files with the same atoms
+    are read repeatedly.
 
     Parameters
     ----------
-    array : AtomArray or AtomArrayStack
-        Atom array or stack which will be annotated.
-    model_dict : dict(str, ndarray)
-        ``atom_site`` dictionary with values for one model.
-    extra_fields : list of str
-        Entry names, that are additionally added as annotation arrays.
-    use_author_fields : bool
-        Define if alternate fields prefixed with ``auth_`` should be used
-        instead of ``label_``.
+    pdbx_file : PDBxFile or BinaryCIFFile
+        The file object.
+    model : int, optional
+        If this parameter is given, the function will return a
+        2D coordinate array from the atoms corresponding to the
+        given model number (starting at 1).
+        Negative values are used to index models starting from the
+        last model instead of the first model.
+        If this parameter is omitted, a 3D coordinate array
+        containing all models will be returned, even if
+        the structure contains only one model.
+    data_block : str, optional
+        The name of the data block. Default is the first
+        (and most times only) data block of the file.
+
+    Returns
+    -------
+    coord : ndarray, shape=(m,n,3) or shape=(n,3), dtype=float32
+        The coordinates read from the ``atom_site`` category.
+
+    Notes
+    -----
+    Note that :func:`get_coord()` may output more coordinates than
+    the atom array (stack) from the corresponding
+    :func:`get_structure()` call has.
+    The reason for this is, that :func:`get_structure()` filters
+    *altloc* IDs, while :func:`get_coord()` does not.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file = PDBxFile.read(os.path.join(path_to_structures, "1l2y.cif"))
+    >>> template = get_structure(file, model=1)
+    >>> stack = from_template(template, get_coord(file))
+    >>> print(stack.stack_depth())
+    38
     """
+    atom_site_dict = pdbx_file.get_category(
+        "atom_site", data_block,
+        columns=["pdbx_PDB_model_num"] + _COORD_COLUMNS
+    )
+    models = atom_site_dict["pdbx_PDB_model_num"]
+    model_starts = _get_model_starts(models)
+    model_count = len(model_starts)
+    atom_count = len(models)
+    coord = np.stack(
+        [atom_site_dict[column].astype(np.float32)
+         for column in _COORD_COLUMNS],
+        axis=-1
+    )
 
-    def get_or_fallback_from_dict(input_dict, key, fallback_key,
-                                  dict_name="input"):
-        """
-        Return value related to key in input dict if it exists,
-        otherwise try to get the value related to fallback key."""
-        if key not in input_dict:
-            warnings.warn(
-                f"Attribute '{key}' not found within '{dict_name}' category. "
-                f"The fallback attribute '{fallback_key}' will be used instead",
-                UserWarning
+    if model is None:
+        if atom_count % model_count != 0 \
+                or np.any(np.diff(model_starts) != atom_count // model_count):
+            raise InvalidFileError(
+                "The models in the file have unequal "
+                "amount of atoms, give an explicit model "
+                "instead"
             )
-            try:
-                return input_dict[fallback_key]
-            except KeyError as key_exc:
-                raise InvalidFileError(
-                    f"Fallback attribute '{fallback_key}' not found in "
-                    "'{dict_name}' category"
-                ) from key_exc
-        return input_dict[key]
+        return coord.reshape(model_count, atom_count // model_count, 3)
 
-    def get_annotation_from_model(
-        model_dict,
-        annotation_name,
-        annotation_fallback=None,
-        as_type=None,
-        formatter=None,
-    ):
-        """Get and format annotation array from model dictionary."""
-        array = (
-            get_or_fallback_from_dict(
-                model_dict, annotation_name, annotation_fallback,
-                dict_name="atom_site"
+    else:
+        if model == 0:
+            raise ValueError("The model index must not be 0")
+        # Negative models mean model indexing starting from last model
+        model = model_count + model + 1 if model < 0 else model
+        if model > model_count:
+            raise ValueError(
+                f"The file has {model_count} models, "
+                f"the given model {model} does not exist"
             )
-            if annotation_fallback is not None
-            else model_dict[annotation_name]
-        )
-        if as_type is not None:
-            array = array.astype(as_type)
-        return formatter(array) if formatter is not None else array
+        # Append exclusive stop
+        model_starts = np.append(model_starts, [atom_count])
+        return coord[model_starts[model - 1] : model_starts[model]]
+
+
+def _required_annotations(model_dict, annotation_names, altloc):
+    """
+    Add the annotations that identify residues to the given annotation
+    names, if they are required for *altloc* filtering.
+    """
+    altloc_ids = model_dict.get("label_alt_id")
+    if altloc == "all" or altloc_ids is None \
+            or np.all(np.isin(altloc_ids, [".", "?"])):
+        return annotation_names
+    return annotation_names + [
+        name for name in _RESIDUE_ANNOTATIONS if name not in annotation_names
+    ]
+
 
+def _get_annotation_data(use_author_fields):
+    """
+    Get the ``atom_site`` column, the fallback column, the data type
+    and the formatter for each annotation that is not taken as
+    string from the column with the same name.
+    """
     prefix, alt_prefix = (
         ("auth", "label") if use_author_fields else ("label", "auth")
     )
 
-    annotation_data = {
+    return {
         "chain_id": (f"{prefix}_asym_id", f"{alt_prefix}_asym_id", "U4", None),
         "res_id": (
             f"{prefix}_seq_id",
@@ -363,18 +488,69 @@ def _fill_annotations(array, model_dict, extra_fields, use_author_fields):
         ),
     }
 
-    mandatory_annotations = [
-        "chain_id",
-        "res_id",
-        "ins_code",
-        "res_name",
-        "hetero",
-        "atom_name",
-        "element",
-    ]
 
-    # Iterate over mandatory annotations and given extra_fields
-    for annotation_name in mandatory_annotations + extra_fields:
+def _fill_annotations(array, model_dict, annotation_names,
+                      use_author_fields):
+    """Fill atom_site annotations in atom array or atom array stack.
+
+    Parameters
+    ----------
+    array : AtomArray or AtomArrayStack
+        Atom array or stack which will be annotated.
+    model_dict : dict(str, ndarray)
+        ``atom_site`` dictionary with values for one model.
+    annotation_names : list of str
+        The names of the annotation arrays to be filled.
+        Names that are not standard or special annotations are taken
+        as string from the column with the same name.
+    use_author_fields : bool
+        Define if alternate fields prefixed with ``auth_`` should be used
+        instead of ``label_``.
+    """
+
+    def get_or_fallback_from_dict(input_dict, key, fallback_key,
+                                  dict_name="input"):
+        """
+        Return value related to key in input dict if it exists,
+        otherwise try to get the value related to fallback key."""
+        if key not in input_dict:
+            warnings.warn(
+                f"Attribute '{key}' not found within '{dict_name}' category. "
+                f"The fallback attribute '{fallback_key}' will be used instead",
+                UserWarning
+            )
+            try:
+                return input_dict[fallback_key]
+            except KeyError as key_exc:
+                raise InvalidFileError(
+                    f"Fallback attribute '{fallback_key}' not found in "
+                    "'{dict_name}' category"
+                ) from key_exc
+        return input_dict[key]
+
+    def get_annotation_from_model(
+        model_dict,
+        annotation_name,
+        annotation_fallback=None,
+        as_type=None,
+        formatter=None,
+    ):
+        """Get and format annotation array from model dictionary."""
+        array = (
+            get_or_fallback_from_dict(
+                model_dict, annotation_name, annotation_fallback,
+                dict_name="atom_site"
+            )
+            if annotation_fallback is not None
+            else model_dict[annotation_name]
+        )
+        if as_type is not None:
+            array = array.astype(as_type)
+        return formatter(array) if formatter is not None else array
+
+    annotation_data = _get_annotation_data(use_author_fields)
+
+    for annotation_name in annotation_names:
         array.set_annotation(
             annotation_name,
             get_annotation_from_model(
@@ -476,7 +652,7 @@ def set_structure(pdbx_file, array, data_block=None):
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     array : AtomArray or AtomArrayStack
         The structure to be written. If a stack is given, each array in
@@ -501,16 +677,14 @@ def set_structure(pdbx_file, array, data_block=None):
     # Save list of annotation categories for checks,
     # if an optional category exists
     annot_categories = array.get_annotation_categories()
-    atom_site_dict["group_PDB"] = np.array(
-        ["ATOM" if e == False else "HETATM" for e in array.hetero]
-    )
+    atom_site_dict["group_PDB"] = np.where(array.hetero, "HETATM", "ATOM")
     atom_site_dict["type_symbol"] = np.copy(array.element)
     atom_site_dict["label_atom_id"] = np.copy(array.atom_name)
     atom_site_dict["label_alt_id"] = np.full(array.array_length(), ".")
     atom_site_dict["label_comp_id"] = np.copy(array.res_name)
     atom_site_dict["label_asym_id"] = np.copy(array.chain_id)
     atom_site_dict["label_entity_id"] = _determine_entity_id(array.chain_id)
-    atom_site_dict["label_seq_id"] = np.array([str(e) for e in array.res_id])
+    atom_site_dict["label_seq_id"] = array.res_id.astype(str)
     atom_site_dict["pdbx_PDB_ins_code"] = array.ins_code
     atom_site_dict["auth_seq_id"] = atom_site_dict["label_seq_id"]
     atom_site_dict["auth_comp_id"] = atom_site_dict["label_comp_id"]
@@ -518,21 +692,24 @@ def set_structure(pdbx_file, array, data_block=None):
     atom_site_dict["auth_atom_id"] = atom_site_dict["label_atom_id"]
 
     if "atom_id" in annot_categories:
-        atom_site_dict["id"] = np.array([str(e) for e in array.atom_id])
+        atom_site_dict["id"] = array.atom_id.astype(str)
     else:
         atom_site_dict["id"] = None
     if "b_factor" in annot_categories:
-        atom_site_dict["B_iso_or_equiv"] = np.array(
-            [f"{b:.2f}" for b in array.b_factor]
+        atom_site_dict["B_iso_or_equiv"] = format_fixed_point_strings(
+            array.b_factor, 2
         )
     if "occupancy" in annot_categories:
-        atom_site_dict["occupancy"] = np.array(
-            [f"{occ:.2f}" for occ in array.occupancy]
+        atom_site_dict["occupancy"] = format_fixed_point_strings(
+            array.occupancy, 2
         )
     if "charge" in annot_categories:
-        atom_site_dict["pdbx_formal_charge"] = np.array(
-            [f"{c:+d}" if c != 0 else "?" for c in array.charge]
+        charge = np.char.add(
+            np.where(array.charge > 0, "+", "-"),
+            np.abs(array.charge).astype(str),
         )
+        charge[array.charge == 0] = "?"
+        atom_site_dict["pdbx_formal_charge"] = charge
 
     # In case of a single model handle each coordinate
     # simply like a flattened array
@@ -541,14 +718,14 @@ def set_structure(pdbx_file, array, data_block=None):
     ):
         # 'ravel' flattens coord without copy
         # in case of stack with stack_depth = 1
-        atom_site_dict["Cartn_x"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[..., 0])]
+        atom_site_dict["Cartn_x"] = format_fixed_point_strings(
+            np.ravel(array.coord[..., 0]), 3
         )
-        atom_site_dict["Cartn_y"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[..., 1])]
+        atom_site_dict["Cartn_y"] = format_fixed_point_strings(
+            np.ravel(array.coord[..., 1]), 3
         )
-        atom_site_dict["Cartn_z"] = np.array(
-            [f"{c:.3f}" for c in np.ravel(array.coord[..., 2])]
+        atom_site_dict["Cartn_z"] = format_fixed_point_strings(
+            np.ravel(array.coord[..., 2]), 3
         )
         atom_site_dict["pdbx_PDB_model_num"] = np.full(
             array.array_length(), "1"
@@ -561,9 +738,15 @@ def set_structure(pdbx_file, array, data_block=None):
         coord = np.reshape(
             array.coord, (array.stack_depth() * array.array_length(), 3)
         )
-        atom_site_dict["Cartn_x"] = np.array([f"{c:.3f}" for c in coord[:, 0]])
-        atom_site_dict["Cartn_y"] = np.array([f"{c:.3f}" for c in coord[:, 1]])
-        atom_site_dict["Cartn_z"] = np.array([f"{c:.3f}" for c in coord[:, 2]])
+        atom_site_dict["Cartn_x"] = format_fixed_point_strings(
+            coord[:, 0], 3
+        )
+        atom_site_dict["Cartn_y"] = format_fixed_point_strings(
+            coord[:, 1], 3
+        )
+        atom_site_dict["Cartn_z"] = format_fixed_point_strings(
+            coord[:, 2], 3
+        )
         models = np.repeat(
             np.arange(1, array.stack_depth() + 1).astype(str),
             repeats=array.array_length(),
@@ -606,19 +789,15 @@ def set_structure(pdbx_file, array, data_block=None):
 
 
 def _determine_entity_id(chain_id):
-    entity_id = np.zeros(len(chain_id), dtype=int)
-    # Dictionary that translates chain_id to entity_id
-    id_translation = {}
-    id = 1
-    for i in range(len(chain_id)):
-        try:
-            entity_id[i] = id_translation[chain_id[i]]
-        except:
-            # chain_id is not in dictionary -> new entry
-            id_translation[chain_id[i]] = id
-            entity_id[i] = id_translation[chain_id[i]]
-            id += 1
-    return entity_id.astype(str)
+    # The entity IDs are assigned in the order of the first appearance
+    # of each chain ID
+    _, first_indices, inverse = np.unique(
+        chain_id, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_indices)
+    id_translation = np.zeros(len(first_indices), dtype=int)
+    id_translation[order] = np.arange(1, len(first_indices) + 1)
+    return id_translation[inverse.flatten()].astype(str)
 
 
 def list_assemblies(pdbx_file, data_block=None):
@@ -632,7 +811,7 @@ def list_assemblies(pdbx_file, data_block=None):
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     data_block : str, optional
         The name of the data block.
@@ -665,7 +844,7 @@ def list_assemblies(pdbx_file, data_block=None):
     if assembly_category is None:
         raise InvalidFileError("File has no 'pdbx_struct_assembly' category")
     return {
-        id: details
+        str(id): str(details)
         for id, details in zip(
             assembly_category["id"], assembly_category["details"]
         )
@@ -673,7 +852,8 @@ def list_assemblies(pdbx_file, data_block=None):
 
 
 def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
-                 altloc="first", extra_fields=None, use_author_fields=True):
+                 altloc="first", extra_fields=None, use_author_fields=True,
+                 virtual=False):
     """
     Build the given biological assembly.
 
@@ -684,7 +864,7 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
 
     Parameters
     ----------
-    pdbx_file : PDBxFile
+    pdbx_file : PDBxFile or BinaryCIFFile
         The file object.
     assembly_id : str
         The assembly to build.
@@ -734,11 +914,17 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
         If `use_author_fields` is true, the annotation arrays will be
         read from the ``auth_xxx`` fields (if applicable),
         otherwise from the the ``label_xxx`` fields.
+    virtual : bool, optional
+        If set to true, the copies of the asymmetric unit are not
+        created, but a :class:`VirtualAssembly` is returned instead,
+        that computes the coordinates of each copy on demand.
 
     Returns
     -------
-    assembly : AtomArray or AtomArrayStack
+    assembly : AtomArray or AtomArrayStack or VirtualAssembly
         The assembly. The return type depends on the `model` parameter.
+        If `virtual` is true, the assembly is a :class:`VirtualAssembly`
+        based on the asymmetric unit.
     
     Examples
     --------
@@ -746,6 +932,11 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
     >>> import os.path
     >>> file = PDBxFile.read(os.path.join(path_to_structures, "1f2n.cif"))
     >>> assembly = get_assembly(file, model=1)
+    >>> virtual_assembly = get_assembly(file, model=1, virtual=True)
+    >>> print(virtual_assembly.copy_count())
+    60
+    >>> print(virtual_assembly.array_length() == assembly.array_length())
+    True
     """
     assembly_gen_category = pdbx_file.get_category(
         "pdbx_struct_assembly_gen", data_block, expect_looped=True
@@ -761,9 +952,11 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
     if struct_oper_category is None:
         raise InvalidFileError("File has no 'pdbx_struct_oper_list' category")
 
+    # The IDs may be integers in a 'BinaryCIFFile'
+    assembly_ids = assembly_gen_category["assembly_id"].astype(str)
     if assembly_id is None:
-        assembly_id = assembly_gen_category["assembly_id"][0]
-    elif assembly_id not in assembly_gen_category["assembly_id"]:
+        assembly_id = assembly_ids[0]
+    elif assembly_id not in assembly_ids:
         raise KeyError(f"File has no Assembly ID '{assembly_id}'")
 
     ### Calculate all possible transformations
@@ -787,61 +980,36 @@ def get_assembly(pdbx_file, assembly_id=None, model=None, data_block=None,
     )
 
     ### Get transformations and apply them to the affected asym IDs
-    assembly = None
+    assembly = VirtualAssembly(structure)
     for id, op_expr, asym_id_expr in zip(
-        assembly_gen_category["assembly_id"],
+        assembly_ids,
         assembly_gen_category["oper_expression"],
         assembly_gen_category["asym_id_list"],
     ):
         # Find the operation expressions for given assembly ID
         # We already asserted that the ID is actually present
         if id == assembly_id:
-            operations = _parse_operation_expression(op_expr)
-            asym_ids = asym_id_expr.split(",")
+            operations = _parse_operation_expression(str(op_expr))
+            asym_ids = str(asym_id_expr).split(",")
             # Filter affected asym IDs
-            sub_structure = structure[
-                ..., np.isin(structure.label_asym_id, asym_ids)
-            ]
-            sub_assembly = _apply_transformations(
-                sub_structure, transformations, operations
-            )
-            # Merge the chains with asym IDs for this operation
-            # with chains from other operations
-            if assembly is None:
-                assembly = sub_assembly
-            else:
-                assembly += sub_assembly
+            affected = np.isin(structure.label_asym_id, asym_ids)
+            # Each operation creates a copy of the affected atoms,
+            # consisting of successive transformation steps
+            for operation in operations:
+                assembly.add_copy(
+                    affected,
+                    [transformations[op_step] for op_step in operation]
+                )
     
     # Remove 'label_asym_id', if it was not included in the original
     # user-supplied 'extra_fields'
     if "label_asym_id" not in extra_fields:
-        assembly.del_annotation("label_asym_id")
+        structure.del_annotation("label_asym_id")
     
-    return assembly
-
-
-def _apply_transformations(structure, transformation_dict, operations):
-    """
-    Get subassembly by applying the given operations to the input
-    structure containing affected asym IDs.
-    """
-    # Additional first dimesion for 'structure.repeat()'
-    assembly_coord = np.zeros((len(operations),) + structure.coord.shape)
-
-    # Apply corresponding transformation for each copy in the assembly
-    for i, operation in enumerate(operations):
-        coord = structure.coord
-        # Execute for each transformation step
-        # in the operation expression
-        for op_step in operation:
-            rotation_matrix, translation_vector = transformation_dict[op_step]
-            # Rotate
-            coord = matrix_rotate(coord, rotation_matrix)
-            # Translate
-            coord += translation_vector
-        assembly_coord[i] = coord
-
-    return repeat(structure, assembly_coord)
+    if virtual:
+        return assembly
+    else:
+        return assembly.materialize()
 
 
 def _get_transformations(struct_oper):
@@ -863,7 +1031,7 @@ def _get_transformations(struct_oper):
         translation_vector = np.array(
             [float(struct_oper[f"vector[{i}]"][index]) for i in (1, 2, 3)]
         )
-        transformation_dict[id] = (rotation_matrix, translation_vector)
+        transformation_dict[str(id)] = (rotation_matrix, translation_vector)
     return transformation_dict
 
 
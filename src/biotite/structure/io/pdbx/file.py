@@ -4,13 +4,23 @@
 
 __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
-__all__ = ["PDBxFile"]
+__all__ = ["PDBxFile", "PDBxWriter"]
 
 import copy
+import itertools
 import shlex
 from collections.abc import MutableMapping
 import numpy as np
-from ....file import TextFile
+from ....file import TextFile, is_open_compatible, is_text
+
+
+# The number of rows of a looped category that are formatted at once
+_CHUNK_SIZE = 10000
+# Code points of the ASCII characters that are removed from the start
+# and end of values by 'str.strip()'
+_ASCII_WHITESPACE = np.array(
+    [c for c in range(128) if chr(c).isspace()], dtype=np.uint32
+)
 
 
 class PDBxFile(TextFile, MutableMapping):
@@ -187,7 +197,8 @@ class PDBxFile(TextFile, MutableMapping):
             blocks.add(block)
         return sorted(blocks)
 
-    def get_category(self, category, block=None, expect_looped=False):
+    def get_category(self, category, block=None, expect_looped=False,
+                     columns=None):
         """
         Get the dictionary for a given category.
 
@@ -203,6 +214,11 @@ class PDBxFile(TextFile, MutableMapping):
             arrays (only if the category exists):
             If the category is *non-looped*, each array will contain
             only one element.
+        columns : iterable of str, optional
+            If given, only these columns of the category are converted
+            into arrays and returned.
+            Columns that do not exist in the category are ignored.
+            By default, all columns are returned.
 
         Returns
         -------
@@ -258,10 +274,12 @@ class PDBxFile(TextFile, MutableMapping):
             lines = [line for line in lines if line is not None]
 
         else:
+            # Same as '_is_empty()' and '_is_loop_start()',
+            # but inlined, as this is evaluated for each atom
             lines = [
                 line.strip()
                 for line in self.lines[start:stop]
-                if not _is_empty(line) and not _is_loop_start(line)
+                if line and line[0] != "#" and not line.startswith("loop_")
             ]
 
         if is_loop:
@@ -273,9 +291,16 @@ class PDBxFile(TextFile, MutableMapping):
                 whitespace_values = False
             else:
                 whitespace_values = True
-            category_dict = _process_looped(lines, whitespace_values)
+            category_dict = _process_looped(
+                lines, whitespace_values, columns
+            )
         else:
             category_dict = _process_singlevalued(lines)
+            if columns is not None:
+                category_dict = {
+                    key: val for key, val in category_dict.items()
+                    if key in columns
+                }
 
         if expect_looped and not is_loop:
             category_dict = {
@@ -310,97 +335,15 @@ class PDBxFile(TextFile, MutableMapping):
         if block is None:
             block = self.get_block_names()[0]
 
-        # Determine whether the category is a looped category
-        sample_category_value = list(category_dict.values())[0]
-        if isinstance(sample_category_value, (np.ndarray, list)):
-            is_looped = True
-            # Check whether all arrays have the same length
-            arr_len = len(list(category_dict.values())[0])
-            for subcat, array in category_dict.items():
-                if len(array) != arr_len:
-                    raise ValueError(
-                        f"Length of Subcategory '{subcat}' is {len(array)}, "
-                        f" but {arr_len} was expected"
-                    )
-        else:
-            is_looped = False
-
-        # Sanitize dictionary
-        # -> convert to string
-        # -> replace empty values with '.'
-        category_dict = copy.deepcopy(category_dict)
+        is_looped = _is_looped(category_dict)
         if is_looped:
-            for subcat, value in category_dict.items():
-                array = np.asarray(value)
-                # Cast array if its data type is not a Unicode string
-                if array.dtype.kind != "U":
-                    array = array.astype(str)
-                array = np.char.strip(array)
-                array[array == ""] = "."
-                category_dict[subcat] = array
-        else:
-            for subcat, value in category_dict.items():
-                value = str(value)
-                value = value if value != "" else "."
-                category_dict[subcat] = str(value)
-
-        # Value arrays (looped categories) can be modified (e.g. quoted)
-        # Hence make a copy to avoid unwanted side effects
-        # due to modification of input values
-        if is_looped:
-            category_dict = {
-                key: val.copy() for key, val in category_dict.items()
-            }
-
-        # Enclose values with quotes if required
-        for key, value in category_dict.items():
-            if is_looped:
-                # Since value is a numpy string array with fixed size,
-                # we need to convert it as a list before using _quote
-                category_dict[key] = np.asarray(
-                    [_quote(item) for item in value.tolist()]
+            newlines = list(
+                itertools.chain.from_iterable(
+                    _format_looped(category, category_dict, _CHUNK_SIZE)
                 )
-            else:
-                category_dict[key] = _quote(value)
-
-        if is_looped:
-            keylines = [
-                "_" + category + "." + key + " "
-                for key in category_dict.keys()
-            ]
-            value_arr = list(category_dict.values())
-            # Array containing the number of characters + whitespace
-            # of each column
-            col_lens = np.zeros(len(value_arr), dtype=int)
-            for i, column in enumerate(value_arr):
-                col_len = 0
-                for value in column:
-                    if len(value) > col_len:
-                        col_len = len(value)
-                # Length of column is max value length
-                # +1 whitespace character as separator
-                col_lens[i] = col_len + 1
-            valuelines = [""] * arr_len
-            for i in range(arr_len):
-                for j, arr in enumerate(value_arr):
-                    valuelines[i] += arr[i] + " " * (col_lens[j] - len(arr[i]))
-            newlines = ["loop_"] + keylines + valuelines
-
+            )
         else:
-            # For better readability, not only one space is inserted
-            # after each key, but as much spaces that every value starts
-            # at the same position in the line
-            max_len = 0
-            for key in category_dict.keys():
-                if len(key) > max_len:
-                    max_len = len(key)
-            # "+3" Because of three whitespace chars after longest key
-            req_len = max_len + 3
-            newlines = [
-                "_" + category + "." + key + " " * (req_len - len(key)) + value
-                for key, value in category_dict.items()
-            ]
-
+            newlines = _format_singlevalued(category, category_dict)
         # A comment line is set after every category
         newlines += ["#"]
 
@@ -540,6 +483,136 @@ class PDBxFile(TextFile, MutableMapping):
             }
 
 
+class PDBxWriter:
+    """
+    This class writes categories directly into a PDBx/mmCIF file.
+
+    In contrast to :class:`PDBxFile`, the lines of the file are not
+    kept in memory:
+    Each category is formatted and written into the file, as soon as it
+    is given to :meth:`set_category()`.
+    The rows of *looped* categories are formatted column-wise in chunks,
+    so that not even the lines of a single category are held in memory
+    at once.
+    Hence, this class may save a large amount of memory if large
+    structures or a large number of models should be written.
+
+    As this class provides the :meth:`set_category()` and
+    :meth:`get_block_names()` methods of :class:`PDBxFile`, it can be
+    given to :func:`set_structure()`.
+    The formatting of the categories is equal to :class:`PDBxFile`.
+    However, the categories cannot be read or changed, after they have
+    been written, and the categories of a data block must be written
+    consecutively.
+
+    Parameters
+    ----------
+    file : file-like object or str
+        The file to be written to.
+        Alternatively a file path can be supplied.
+        In this case the file is closed, when :meth:`close()` is called.
+    chunk_size : int, optional
+        The number of rows of a *looped* category that are formatted
+        at once.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file_name = os.path.join(path_to_directory, "1l2y_stream.cif")
+    >>> with PDBxWriter(file_name) as writer:
+    ...     set_structure(writer, atom_array_stack, data_block="1L2Y")
+    >>> print(get_model_count(PDBxFile.read(file_name)))
+    38
+    """
+
+    def __init__(self, file, chunk_size=_CHUNK_SIZE):
+        if is_open_compatible(file):
+            self._file = open(file, "w")
+            self._owns_file = True
+        else:
+            if not is_text(file):
+                raise TypeError("A file opened in 'text' mode is required")
+            self._file = file
+            self._owns_file = False
+        self._chunk_size = chunk_size
+        self._blocks = []
+        # The categories written into the current data block
+        self._categories = set()
+
+    def get_block_names(self):
+        """
+        Get the names of all data blocks written so far.
+
+        Returns
+        -------
+        blocks : list
+            List of data block names.
+        """
+        return list(self._blocks)
+
+    def set_category(self, category, category_dict, block=None):
+        """
+        Write a category into the file.
+
+        Parameters
+        ----------
+        category : string
+            The name of the category. The leading underscore is omitted.
+        category_dict : dict
+            The category content. The dictionary must have strings
+            (subcategories) as keys and strings or :class:`ndarray`
+            objects as values.
+        block : string, optional
+            The name of the data block.
+            Default is the data block written last.
+            If the block is not the data block written last, a new
+            block is started.
+        """
+        if block is None:
+            if len(self._blocks) == 0:
+                raise TypeError(
+                    "No data block has been written yet, must be specified"
+                )
+            block = self._blocks[-1]
+        if len(self._blocks) == 0 or block != self._blocks[-1]:
+            if block in self._blocks:
+                raise ValueError(f"Data block '{block}' is already written")
+            self._file.write("data_" + block + "\n#\n")
+            self._blocks.append(block)
+            self._categories = set()
+        if category in self._categories:
+            raise ValueError(
+                f"Category '{category}' is already written into data block "
+                f"'{block}'"
+            )
+
+        if _is_looped(category_dict):
+            for lines in _format_looped(
+                category, category_dict, self._chunk_size
+            ):
+                self._file.write("\n".join(lines) + "\n")
+        else:
+            lines = _format_singlevalued(category, category_dict)
+            self._file.write("\n".join(lines) + "\n")
+        # A comment line is set after every category
+        self._file.write("#\n")
+        self._categories.add(category)
+
+    def close(self):
+        """
+        Close the file, if it was opened by this object.
+        """
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def _process_singlevalued(lines):
     category_dict = {}
     i = 0
@@ -558,49 +631,46 @@ def _process_singlevalued(lines):
     return category_dict
 
 
-def _process_looped(lines, whitepace_values):
-    category_dict = {}
+def _process_looped(lines, whitepace_values, columns=None):
     keys = []
-    # Array index
-    i = 0
-    # Dictionary key index
-    j = 0
     for line in lines:
-        if line[0] == "_":
-            # Key line
-            key = line.split(".")[1]
-            keys.append(key)
-            # Pessimistic array allocation
-            # numpy array filled with strings
-            category_dict[key] = np.zeros(len(lines), dtype=object)
-            keys_length = len(keys)
-        else:
-            # If whitespace is expected in quote protected values,
-            # use standard shlex split
-            # Otherwise use much more faster whitespace split
-            # and quote removal if applicable,
-            # bypassing the slow shlex module
-            if whitepace_values:
-                values = shlex.split(line)
-            else:
-                values = line.split()
-                for k in range(len(values)):
-                    # Remove quotes
-                    if (values[k][0] == '"' and values[k][-1] == '"') or (
-                        values[k][0] == "'" and values[k][-1] == "'"
-                    ):
-                        values[k] = values[k][1:-1]
-            for value in values:
-                category_dict[keys[j]][i] = value
-                j += 1
-                if j == keys_length:
-                    # If all keys have been filled with a value,
-                    # restart with first key with incremented index
-                    j = 0
-                    i += 1
-    for key in category_dict.keys():
-        # Trim to correct size
-        category_dict[key] = category_dict[key][:i]
+        if line[0] != "_":
+            break
+        keys.append(line.split(".")[1])
+    value_lines = lines[len(keys):]
+    columns = set(keys) if columns is None else set(columns)
+    # Indices of the requested columns within a row
+    key_indices = {key: i for i, key in enumerate(keys) if key in columns}
+
+    # If whitespace is expected in quote protected values,
+    # use standard shlex split
+    # Otherwise use much more faster whitespace split
+    # and quote removal if applicable,
+    # bypassing the slow shlex module
+    if whitepace_values:
+        values = list(itertools.chain.from_iterable(
+            shlex.split(line) for line in value_lines
+        ))
+    else:
+        text = " ".join(value_lines)
+        values = text.split()
+        has_quotes = "'" in text or '"' in text
+    # Incomplete rows at the end are ignored
+    n_values = len(values) - len(values) % len(keys)
+
+    category_dict = {}
+    for key, i in key_indices.items():
+        # Every n-th value belongs to the same column
+        column = values[i : n_values : len(keys)]
+        if not whitepace_values and has_quotes:
+            # Remove quotes
+            column = [
+                value[1:-1]
+                if value[0] == value[-1] and value[0] in ("'", '"')
+                else value
+                for value in column
+            ]
+        category_dict[key] = np.array(column, dtype=object)
     return category_dict
 
 
@@ -642,3 +712,163 @@ def _quote(value):
         return "'" + value + "'"
     else:
         return value
+
+
+def _is_looped(category_dict):
+    """
+    Determine whether the category is a looped category and check
+    whether all arrays have the same length.
+    """
+    sample_category_value = list(category_dict.values())[0]
+    if not isinstance(sample_category_value, (np.ndarray, list)):
+        return False
+    arr_len = len(sample_category_value)
+    for subcat, array in category_dict.items():
+        if len(array) != arr_len:
+            raise ValueError(
+                f"Length of Subcategory '{subcat}' is {len(array)}, "
+                f" but {arr_len} was expected"
+            )
+    return True
+
+
+def _format_singlevalued(category, category_dict):
+    """
+    Create the lines of a *non-looped* category.
+    """
+    values = {}
+    for key, value in category_dict.items():
+        value = str(value)
+        value = value if value != "" else "."
+        values[key] = _quote(value)
+    # For better readability, not only one space is inserted
+    # after each key, but as much spaces that every value starts
+    # at the same position in the line
+    # "+3" Because of three whitespace chars after longest key
+    req_len = max([len(key) for key in values.keys()]) + 3
+    return [
+        "_" + category + "." + key + " " * (req_len - len(key)) + value
+        for key, value in values.items()
+    ]
+
+
+def _format_looped(category, category_dict, chunk_size):
+    """
+    Create the lines of a *looped* category.
+
+    The first yielded list contains the key lines, the following lists
+    contain the value lines for chunks of `chunk_size` rows.
+    """
+    columns = [_sanitize_column(value) for value in category_dict.values()]
+    # The number of characters + whitespace of each column
+    # -> Length of column is max value length
+    # +1 whitespace character as separator
+    col_lens = [int(_max_length(column)) + 1 for column in columns]
+
+    yield ["loop_"] + [
+        "_" + category + "." + key + " " for key in category_dict.keys()
+    ]
+    arr_len = len(columns[0])
+    for start in range(0, arr_len, chunk_size):
+        stop = min(start + chunk_size, arr_len)
+        # Assemble the lines in a matrix of code points,
+        # where each column occupies a fixed range of characters
+        line_code_points = np.zeros((stop - start, sum(col_lens)), np.uint32)
+        pos = 0
+        for column, col_len in zip(columns, col_lens):
+            code_points = _code_points(column[start:stop])[:, :col_len]
+            line_code_points[:, pos : pos + code_points.shape[1]] \
+                = code_points
+            pos += col_len
+        # Fill the remaining space of each value with whitespace
+        line_code_points[line_code_points == 0] = ord(" ")
+        yield line_code_points.view(f"U{sum(col_lens)}")[:, 0].tolist()
+
+
+def _sanitize_column(value):
+    """
+    Convert the values of a column into a string array, replace empty
+    values with '.' and enclose values with quotes if required.
+    The input array is not modified.
+    """
+    array = np.asarray(value)
+    # Cast array if its data type is not a Unicode string
+    if array.dtype.kind != "U":
+        array = array.astype(str)
+    array = np.ascontiguousarray(array)
+
+    # Strip only those values that may have surrounding whitespace:
+    # Non-ASCII characters are checked by 'np.char.strip()' itself,
+    # which keeps values without Unicode whitespace unchanged
+    code_points = _code_points(array)
+    is_whitespace = np.isin(code_points, _ASCII_WHITESPACE) \
+                    | (code_points > 127)
+    # The last character of a value is followed by padding
+    # or the end of the row
+    is_last = np.ones(code_points.shape, dtype=bool)
+    is_last[:, :-1] = code_points[:, 1:] == 0
+    has_whitespace = is_whitespace[:, 0] | _any_in_rows(
+        is_whitespace & is_last
+    )
+    if has_whitespace.any():
+        array = array.copy()
+        array[has_whitespace] = np.char.strip(array[has_whitespace])
+
+    is_empty = array == ""
+    if is_empty.any():
+        array = array.copy()
+        array[is_empty] = "."
+
+    return _quote_array(array)
+
+
+def _quote_array(array):
+    """
+    Vectorized variant of :func:`_quote()`.
+    """
+    code_points = _code_points(array)
+    needs_quotes = _any_in_rows(
+        (code_points == ord("'"))
+        | (code_points == ord('"'))
+        | (code_points == ord(" "))
+    )
+    if not needs_quotes.any():
+        return array
+    # Same precedence as in '_quote()'
+    has_single_quote = np.any(
+        code_points[needs_quotes] == ord("'"), axis=-1
+    )
+    quotes = np.where(has_single_quote, '"', "'")
+    quoted_values = np.char.add(
+        np.char.add(quotes, array[needs_quotes]), quotes
+    )
+    array = array.astype(f"U{code_points.shape[-1] + 2}")
+    array[needs_quotes] = quoted_values
+    return array
+
+
+def _code_points(array):
+    """
+    Get a view of a Unicode string array as matrix of UCS4 code
+    points, padded with zeros.
+    """
+    array = np.ascontiguousarray(array)
+    return array.view(np.uint32).reshape(len(array), array.itemsize // 4)
+
+
+def _max_length(array):
+    """
+    Get the length of the longest string in a Unicode string array.
+    """
+    occupied = np.nonzero(np.any(_code_points(array) != 0, axis=0))[0]
+    return occupied[-1] + 1 if len(occupied) > 0 else 0
+
+
+def _any_in_rows(mask):
+    """
+    Equivalent to ``np.any(mask, axis=-1)``, but faster for a matrix
+    with only a few true values.
+    """
+    rows = np.zeros(mask.shape[0], dtype=bool)
+    rows[np.nonzero(mask.ravel())[0] // mask.shape[1]] = True
+    return rows
@@ -0,0 +1,173 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+Utility functions for internal use in the file format subpackages of
+`biotite.structure.io`, mainly for vectorized column-wise formatting.
+"""
+
+__name__ = "biotite.structure.io"
+__author__ = "Patrick Kunzmann"
+__all__ = ["str_len", "to_ascii_columns", "format_fixed_point",
+           "format_fixed_point_strings"]
+
+import numpy as np
+
+
+def str_len(strings):
+    """
+    Get the length of each string in an array of unicode strings.
+    """
+    strings = np.ascontiguousarray(strings)
+    n_chars = strings.dtype.itemsize // 4
+    if n_chars == 0:
+        return np.zeros(strings.shape, dtype=np.int64)
+    # Unicode strings are padded with NULL characters
+    return np.count_nonzero(
+        strings.view(np.uint32).reshape(strings.shape + (n_chars,)), axis=-1
+    )
+
+
+def to_ascii_columns(strings, width, align_right=False):
+    """
+    Convert an array of unicode strings into a *(n, width)* matrix of
+    ASCII codes, padded with spaces.
+
+    The strings must not be longer than `width`.
+    """
+    strings = np.ascontiguousarray(strings)
+    n_chars = strings.dtype.itemsize // 4
+    codes = np.zeros((len(strings), width), dtype=np.uint32)
+    if n_chars > 0:
+        n_copied = min(n_chars, width)
+        codes[:, :n_copied] = strings.view(np.uint32) \
+                              .reshape(len(strings), n_chars)[:, :n_copied]
+    if (codes > 127).any():
+        raise ValueError("Only ASCII characters can be written to the file")
+    codes = codes.astype(np.uint8)
+    if align_right:
+        codes = _shift_rows(codes, width - np.count_nonzero(codes, axis=-1))
+    codes[codes == 0] = ord(" ")
+    return codes
+
+
+def format_fixed_point(values, width, precision, description):
+    """
+    Format floating point values into a matrix of ASCII codes with
+    shape *(..., width)*.
+
+    The result is equal to formatting each value with
+    ``f"{value:>{width}.{precision}f}"``.
+    A :class:`ValueError` is raised, if a value does not fit into the
+    given width.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not np.isfinite(values).all():
+        raise ValueError(f"{description} contain non-finite values")
+    scaled = values * 10**precision
+    rounded = np.rint(scaled)
+    # The multiplication may round the exact value onto a tie, which
+    # would be resolved differently by Python's exact formatting
+    # -> use the latter in these rare cases
+    is_tie = np.abs(scaled - rounded) == 0.5
+    if is_tie.any():
+        rounded[is_tie] = [
+            float(f"{value:.{precision}f}") * 10**precision
+            for value in values[is_tie]
+        ]
+        rounded[is_tie] = np.rint(rounded[is_tie])
+    n_int_columns = width - precision - 1 if precision > 0 else width
+    if (np.abs(rounded) >= 10**(n_int_columns + precision)).any():
+        raise ValueError(f"{description} exceed {width} characters")
+    # Take the sign from the rounded value, as e.g. '-0.000' is valid
+    is_negative = np.signbit(rounded)
+    int_part, frac_part = np.divmod(
+        np.abs(rounded).astype(np.int64), 10**precision
+    )
+    n_int_digits = np.ones(values.shape, dtype=np.int64)
+    for i in range(1, n_int_columns + 1):
+        n_int_digits += int_part >= 10**i
+    if (n_int_digits + is_negative > n_int_columns).any():
+        raise ValueError(f"{description} exceed {width} characters")
+
+    chars = np.full(values.shape + (width,), ord(" "), dtype=np.uint8)
+    for i in range(precision):
+        chars[..., width - 1 - i] = ord("0") + frac_part % 10
+        frac_part //= 10
+    if precision > 0:
+        chars[..., n_int_columns] = ord(".")
+    for i in range(n_int_columns):
+        column = n_int_columns - 1 - i
+        chars[..., column] = np.where(
+            i < n_int_digits, ord("0") + int_part % 10, ord(" ")
+        )
+        int_part //= 10
+    # Put the minus sign in front of the first digit
+    negative_indices = np.nonzero(is_negative)
+    chars[negative_indices + (
+        n_int_columns - 1 - n_int_digits[negative_indices],
+    )] = ord("-")
+    return chars
+
+
+def format_fixed_point_strings(values, precision):
+    """
+    Format floating point values into an array of unicode strings.
+
+    The result is equal to formatting each value with
+    ``f"{value:.{precision}f}"``.
+    In contrast to :func:`format_fixed_point()`, the strings have no
+    fixed width and non-finite values are allowed.
+    """
+    values = np.asarray(values)
+    float_values = values.astype(np.float64)
+    # Non-finite and very large values cannot be represented by the
+    # integer arithmetic in 'format_fixed_point()'
+    # -> format them separately
+    with np.errstate(invalid="ignore", over="ignore"):
+        is_regular = np.isfinite(float_values) \
+                     & (np.abs(float_values) * 10**precision < 2**52)
+    regular_values = float_values[is_regular]
+
+    if len(regular_values) > 0:
+        max_value = np.max(np.abs(regular_values))
+        # One additional character for the minus sign
+        width = len(f"{max_value:.{precision}f}") + 1
+        chars = format_fixed_point(regular_values, width, precision, "Values")
+        # Remove the leading spaces
+        chars = _shift_rows(
+            chars, -np.count_nonzero(chars == ord(" "), axis=-1)
+        )
+        chars[chars == ord(" ")] = 0
+        formatted = chars.astype(np.uint32).view(f"U{width}")[:, 0]
+    else:
+        formatted = np.zeros(0, dtype="U1")
+
+    if is_regular.all():
+        return formatted
+    irregular = np.array(
+        [f"{value:.{precision}f}" for value in values[~is_regular]]
+    )
+    strings = np.zeros(
+        len(values), dtype=np.result_type(formatted, irregular)
+    )
+    strings[is_regular] = formatted
+    strings[~is_regular] = irregular
+    return strings
+
+
+def _shift_rows(codes, shifts):
+    """
+    Shift each row of a matrix of character codes by the given number
+    of columns to the right, filling the vacated columns with zeros.
+    Negative shifts move the row to the left.
+    """
+    width = codes.shape[-1]
+    source_columns = np.arange(width) - shifts[:, np.newaxis]
+    is_outside = (source_columns < 0) | (source_columns >= width)
+    shifted = np.take_along_axis(
+        codes, np.clip(source_columns, 0, width - 1), axis=-1
+    )
+    shifted[is_outside] = 0
+    return shifted
@@ -16,7 +16,7 @@ from .atoms import Atom, AtomArray, AtomArrayStack, coord
 from .util import vector_dot, norm_vector
 from .error import BadStructureError
 from .geometry import distance
-from .info.masses import mass
+from .info.masses import mass_array
 
 
 def gyration_radius(array, masses=None):
@@ -43,10 +43,13 @@ def gyration_radius(array, masses=None):
         containing the radii of gyration for every model is returned.
     """
     if masses is None:
-        masses = np.array([mass(element) for element in array.element])
+        masses = mass_array(array.element)
     center = mass_center(array, masses)
-    radii = distance(array, center[..., np.newaxis, :])
-    inertia_moment = np.sum(masses * radii*radii, axis=-1)
+    diff = array.coord - center[..., np.newaxis, :]
+    sq_radii = np.einsum("...i,...i->...", diff, diff)
+    # The weighted sum over the atoms is a matrix-vector product,
+    # which handles all models of a stack at once
+    inertia_moment = np.matmul(sq_radii, masses)
     return np.sqrt(inertia_moment / np.sum(masses))
 
 def mass_center(array, masses=None):
@@ -71,5 +74,8 @@ def mass_center(array, masses=None):
         a (*n x 3*) :class:`ndarray` is returned.
     """
     if masses is None:
-        masses = np.array([mass(element) for element in array.element])
-    return np.sum(masses[:,np.newaxis] * array.coord, axis=-2) / np.sum(masses)
\ No newline at end of file
+        masses = mass_array(array.element)
+    # The weighted sum over the atoms is a vector-matrix product,
+    # which handles all models of a stack at once without creating
+    # a temporary array of weighted coordinates
+    return np.matmul(masses, array.coord) / np.sum(masses)
\ No newline at end of file
@@ -11,10 +11,10 @@ __author__ = "Tom David Müller"
 __all__ = ["pseudoknots"]
 
 import numpy as np
-import networkx as nx
 from itertools import chain, product
 
-def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
+def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None,
+                exhaustive=False):
     """
     Identify the pseudoknot order for each base pair in a given set of
     base pairs.
@@ -28,6 +28,11 @@ def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
     However, an optional score for each individual base pair can be
     provided.
 
+    By default, only a single optimal solution is determined, which
+    requires polynomial time.
+    Optionally, all optimal solutions can be enumerated, which may
+    become very slow for large structures with many crossing base pairs.
+
     Parameters
     ----------
     base_pairs : ndarray, dtype=int, shape=(n,2)
@@ -44,6 +49,9 @@ def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
         be of a higher order, its order is specified as ``-1``.
         By default, the algorithm is run until all base pairs
         have an assigned pseudoknot order.
+    exhaustive : bool, optional
+        If set to true, all optimal solutions are returned.
+        Otherwise, only one optimal solution is returned.
 
     Returns
     -------
@@ -51,7 +59,9 @@ def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
         The pseudoknot order of the input `base_pairs`.
         Multiple solutions that maximize the number of basepairs or
         the given score, respectively, may be possible.
-        Therefore all *m* individual solutions are returned.
+        If `exhaustive` is true, all *m* individual solutions are
+        returned.
+        Otherwise, *m* is ``1``.
 
     Notes
     -----
@@ -61,6 +71,11 @@ def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
     structure.
     However, if it is run iteratively on removed knotted pairs it can be
     used to identify the pseudoknot order.
+    If only a single solution is required, the enumeration of all
+    optimal solutions is omitted:
+    Instead, the maximum-score set of non-crossing paired regions is
+    found via dynamic programming over the region boundaries, which
+    scales quadratically with the number of paired regions.
 
     The pseudoknot order is defined as the minimum number of base pair
     set decompositions resulting in a nested structure
@@ -130,6 +145,13 @@ def pseudoknots(base_pairs, scores=None, max_pseudoknot_order=None):
             "'base_pair' and 'scores' must have the same shape"
         )
 
+    if not exhaustive:
+        regions = _split_regions(base_pairs, scores)
+        result = _get_optimal_result(
+            regions, len(base_pairs), max_pseudoknot_order
+        )
+        return result[np.newaxis, :]
+
     # Split the base pairs in regions
     regions = _find_regions(base_pairs, scores)
 
@@ -218,6 +240,29 @@ def _find_regions(base_pairs, scores):
         The ``_Region`` objects as graph, where the edges represent
         conflicts.
     """
+    regions = _split_regions(base_pairs, scores)
+    # Return the graphical representation of the conflicting regions
+    return _generate_graphical_representation(regions)
+
+
+def _split_regions(base_pairs, scores):
+    """
+    Split a base pair array into regions of consecutively nested base
+    pairs.
+
+    Parameters
+    ----------
+    base_pairs : ndarray, dtype=int, shape=(n, 2)
+        Each row is equivalent to one base pair and contains the first
+        indices of the residues corresponding to each base.
+    scores : ndarray, dtype=int, shape=(n,) (default: None)
+        The score for each base pair.
+
+    Returns
+    -------
+    regions : set {_region, ...}
+        The regions.
+    """
     # Make sure the lower residue is on the left for each row
     sorted_base_pairs = np.sort(base_pairs, axis=1)
 
@@ -266,8 +311,7 @@ def _find_regions(base_pairs, scores):
     # new region.
     regions.add(_Region(base_pairs, np.array(region_pairs), scores))
 
-    # Return the graphical representation of the conflicting regions
-    return _generate_graphical_representation(regions)
+    return regions
 
 
 def _generate_graphical_representation(regions):
@@ -287,6 +331,10 @@ def _generate_graphical_representation(regions):
         conflicts.
     """
 
+    # Importing NetworkX is expensive and the graph is only required
+    # for the exhaustive search
+    import networkx as nx
+
     # Create a graph
     region_graph = nx.Graph()
 
@@ -580,6 +628,8 @@ def _get_results(regions, results, max_pseudoknot_order, order=0):
         The results
     """
 
+    import networkx as nx
+
     # Remove non-conflicting regions
     non_conflicting = [isolate for isolate in nx.isolates(regions)]
     regions.remove_nodes_from(non_conflicting)
@@ -640,3 +690,127 @@ def _get_results(regions, results, max_pseudoknot_order, order=0):
 
     # Flatten the results
     return list(chain(*results_list))
+
+
+def _get_optimal_result(regions, n_base_pairs, max_pseudoknot_order):
+    """
+    Get a single optimal pseudoknot order for each base pair.
+
+    In each iteration the maximum-score set of non-crossing regions
+    is assigned to the current order and removed from the remaining
+    regions, until no regions remain or the maximum order is reached.
+
+    Parameters
+    ----------
+    regions : set {_region, ...}
+        The regions to be considered.
+    n_base_pairs : int
+        The total number of base pairs.
+    max_pseudoknot_order : int
+        The maximum pseudoknot order to be found. If a base pair would
+        be of a higher order, its order is specified as -1. If ``None``
+        is given, all base pairs are evaluated.
+
+    Returns
+    -------
+    result : ndarray, dtype=int32, shape=(n,)
+        The pseudoknot order of each base pair.
+    """
+    result = np.full(n_base_pairs, -1, dtype="int32")
+    # Sort the regions to obtain a deterministic result
+    remaining = sorted(regions, key=lambda region: region.start)
+    order = 0
+    while len(remaining) > 0 and (
+        max_pseudoknot_order is None or order <= max_pseudoknot_order
+    ):
+        selection = _select_non_crossing(
+            np.array([region.start for region in remaining]),
+            np.array([region.stop for region in remaining]),
+            np.array([region.score for region in remaining], dtype=float)
+        )
+        for region, is_selected in zip(remaining, selection):
+            if is_selected:
+                result[region.get_index_array()] = order
+        remaining = [
+            region for region, is_selected in zip(remaining, selection)
+            if not is_selected
+        ]
+        order += 1
+    return result
+
+
+def _select_non_crossing(starts, stops, scores):
+    """
+    Select the maximum-score subset of intervals, where each pair of
+    intervals is either nested or disjoint, i.e. not crossing.
+
+    The dynamic programming matrix contains the maximum score of the
+    intervals within the interval boundaries *i* to *j*.
+    A row of the matrix depends only on rows with higher index, hence
+    each row is computed in a single vectorized step.
+
+    Parameters
+    ----------
+    starts, stops : ndarray, dtype=int, shape=(k,)
+        The start and stop of each interval.
+    scores : ndarray, dtype=float, shape=(k,)
+        The score of each interval.
+
+    Returns
+    -------
+    selection : ndarray, dtype=bool, shape=(k,)
+        The intervals in the optimal subset.
+    """
+    n_intervals = len(starts)
+    n_positions = 2 * n_intervals
+    # Rank the interval boundaries
+    order = np.argsort(np.concatenate([starts, stops]), kind="stable")
+    positions = np.empty(n_positions, dtype=int)
+    positions[order] = np.arange(n_positions)
+    start_positions = positions[:n_intervals]
+    stop_positions = positions[n_intervals:]
+    # The interval starting at each position or -1 if no interval starts
+    # at this position
+    interval_at = np.full(n_positions, -1, dtype=int)
+    interval_at[start_positions] = np.arange(n_intervals)
+
+    # 'dp_matrix[i, j+1]' is the maximum score for all intervals within
+    # the positions 'i' to 'j'
+    # The additional column and row represent empty position ranges
+    dp_matrix = np.zeros((n_positions + 1, n_positions + 1))
+    for i in range(n_positions - 1, -1, -1):
+        # The interval starting at 'i' (if any) is not taken
+        dp_matrix[i] = dp_matrix[i+1]
+        interval = interval_at[i]
+        if interval == -1:
+            continue
+        stop = stop_positions[interval]
+        # The interval is taken:
+        # Add the score of the nested intervals and the score of
+        # intervals after the stop of the interval
+        take_score = scores[interval] + dp_matrix[i+1, stop] \
+                     + dp_matrix[stop+1, stop+1:]
+        dp_matrix[i, stop+1:] = np.maximum(
+            dp_matrix[i+1, stop+1:], take_score
+        )
+
+    # Backtrace the optimal subset
+    selection = np.zeros(n_intervals, dtype=bool)
+    ranges = [(0, n_positions - 1)]
+    while len(ranges) > 0:
+        i, j = ranges.pop()
+        if i > j:
+            continue
+        interval = interval_at[i]
+        if interval != -1:
+            stop = stop_positions[interval]
+            if stop <= j:
+                take_score = scores[interval] + dp_matrix[i+1, stop] \
+                             + dp_matrix[stop+1, j+1]
+                if take_score >= dp_matrix[i+1, j+1]:
+                    selection[interval] = True
+                    ranges.append((i+1, stop-1))
+                    ranges.append((stop+1, j))
+                    continue
+        ranges.append((i+1, j))
+    return selection
@@ -19,6 +19,10 @@ from .atoms import AtomArray, AtomArrayStack
 from .resutil import *
 
 
+# The annotation categories that determine the residue starts
+_RESIDUE_CATEGORIES = ("chain_id", "res_id", "ins_code", "res_name")
+
+
 def get_residue_starts(array, add_exclusive_stop=False):
     """
     Get indices for an atom array, each indicating the beginning of
@@ -46,6 +50,10 @@ def get_residue_starts(array, add_exclusive_stop=False):
     This method is internally used by all other residue-related
     functions.
 
+    If the segment cache of `array` is enabled via
+    :meth:`AtomArray.enable_segment_cache()`, the residue starts are
+    only computed once and taken from the cache in subsequent calls.
+
     Examples
     --------
 
@@ -56,6 +64,26 @@ def get_residue_starts(array, add_exclusive_stop=False):
     [  0  16  35  56  75  92 116 135 157 169 176 183 197 208 219 226 250 264
      278 292 304]
     """
+    # Objects other than atom arrays and stacks, e.g. a
+    # 'SelectionView', have no segment cache
+    get_cached = getattr(array, "_get_cached_segment_starts", None)
+    residue_starts = None if get_cached is None else get_cached("residue")
+    if residue_starts is None:
+        residue_starts = _compute_residue_starts(array)
+        set_cached = getattr(array, "_set_cached_segment_starts", None)
+        if set_cached is not None:
+            set_cached("residue", _RESIDUE_CATEGORIES, residue_starts)
+    
+    if add_exclusive_stop:
+        return residue_starts
+    else:
+        return residue_starts[:-1]
+
+
+def _compute_residue_starts(array):
+    """
+    Compute the residue starts including the exclusive stop.
+    """
     # These mask are 'true' at indices where the value changes
     chain_id_changes = (array.chain_id[1:] != array.chain_id[:-1])
     res_id_changes   = (array.res_id[1:]   != array.res_id[:-1]  )
@@ -76,10 +104,7 @@ def get_residue_starts(array, add_exclusive_stop=False):
     residue_starts = np.where(residue_change_mask)[0] +1
     
     # The first residue is not included yet -> Insert '[0]'
-    if add_exclusive_stop:
-        return np.concatenate(([0], residue_starts, [array.array_length()]))
-    else:
-        return np.concatenate(([0], residue_starts))
+    return np.concatenate(([0], residue_starts, [array.array_length()]))
 
 
 def apply_residue_wise(array, data, function, axis=None):
@@ -103,6 +128,9 @@ def apply_residue_wise(array, data, function, axis=None):
     data : ndarray
         The data, whose intervals are the parameter for `function`. Must
         have same length as `array`.
+        If `array` is an :class:`AtomArrayStack`, `data` may also be
+        given for each model, i.e. with shape *(m,n,...)*, like the
+        coordinates of the stack.
     function : function
         The `function` must have either the form *f(data)* or
         *f(data, axis)* in case `axis` is given. Every `function` call
@@ -116,6 +144,20 @@ def apply_residue_wise(array, data, function, axis=None):
         Residue-wise evaluation of `data` by `function`. The size of the
         first dimension of this array is equal to the amount of
         residues.
+        If `data` is given for each model of an :class:`AtomArrayStack`,
+        an additional first dimension for the models is prepended.
+
+    Notes
+    -----
+    Common reductions are not evaluated residue by residue, but
+    for all residues at once, if `data` is a numeric :class:`ndarray`
+    and `axis` is either ``None`` or ``0``:
+    :func:`numpy.sum()`, :func:`numpy.nansum()`, :func:`numpy.mean()`,
+    :func:`numpy.average()`, :func:`numpy.min()`, :func:`numpy.max()`,
+    :func:`numpy.any()`, :func:`numpy.all()`,
+    :func:`numpy.count_nonzero()`, :func:`len()` and :func:`centroid()`.
+    Hence, these functions should be preferred over equivalent custom
+    functions for large structures.
         
     Examples
     --------
@@ -164,7 +206,8 @@ def apply_residue_wise(array, data, function, axis=None):
      [ 1.194 10.416  1.130]]
     """
     starts = get_residue_starts(array, add_exclusive_stop=True)
-    return apply_segment_wise(starts, data, function, axis)
+    depth = array.stack_depth() if isinstance(array, AtomArrayStack) else None
+    return apply_segment_wise(starts, data, function, axis, depth)
 
 
 def spread_residue_wise(array, input_data):
@@ -10,7 +10,7 @@ __all__ = ["apply_segment_wise", "spread_segment_wise", "get_segment_masks",
 import numpy as np
 
 
-def apply_segment_wise(starts, data, function, axis):
+def apply_segment_wise(starts, data, function, axis, depth=None):
     """
     Generalized version of :func:`apply_residue_wise()` for
     residues and chains.
@@ -21,7 +21,24 @@ def apply_segment_wise(starts, data, function, axis):
         The sorted start indices of segments.
         Includes exclusive stop, i.e. the length of the corresponding
         atom array.
+    depth : int, optional
+        The depth of the corresponding atom array stack.
+        If given and `data` has the shape *(m,n,...)*, the function
+        is applied to each model separately.
     """
+    if depth is not None and _is_stack_data(starts, data, depth):
+        return np.stack([
+            apply_segment_wise(starts, model_data, function, axis)
+            for model_data in data
+        ])
+    
+    # Fast path for common reductions without iteration over segments
+    reduction = _get_segment_reduction(function)
+    if reduction is not None and _is_reducible(starts, data, axis):
+        processed_data = reduction(starts, data, axis)
+        if processed_data is not None:
+            return processed_data
+    
     # The result array
     processed_data = None
     for i in range(len(starts)-1):
@@ -30,7 +47,6 @@ def apply_segment_wise(starts, data, function, axis):
             value = function(segment)
         else:
             value = function(segment, axis=axis)
-        value = function(segment, axis=axis)
         # Identify the shape of the resulting array by evaluation
         # of the function return value for the first segment
         if processed_data is None:
@@ -51,6 +67,150 @@ def apply_segment_wise(starts, data, function, axis):
     return processed_data
 
 
+def _is_stack_data(starts, data, depth):
+    """
+    Check whether the given data contains values for each atom of each
+    model of a stack.
+    """
+    return (
+        isinstance(data, np.ndarray)
+        and data.ndim >= 2
+        and data.shape[0] == depth
+        and data.shape[1] == starts[-1]
+    )
+
+
+def _is_reducible(starts, data, axis):
+    """
+    Check whether the reduction of the given data can be performed via
+    :func:`numpy.ufunc.reduceat()`.
+    """
+    return (
+        isinstance(data, np.ndarray)
+        and data.dtype.kind in "biuf"
+        and (axis is None or axis == 0)
+        and len(data) == starts[-1]
+        # 'reduceat()' does not support empty segments
+        and len(data) > 0
+        and (np.diff(starts) > 0).all()
+    )
+
+
+def _reduce_segments(ufunc, starts, data, axis, dtype=None):
+    """
+    Apply the reduction given by `ufunc` to each segment of `data`.
+    If `axis` is ``None``, all dimensions of each segment are reduced,
+    otherwise only the first dimension.
+    """
+    reduced = ufunc.reduceat(data, starts[:-1], axis=0, dtype=dtype)
+    if axis is None and reduced.ndim > 1:
+        reduced = ufunc.reduce(reduced.reshape(len(reduced), -1), axis=1)
+    return reduced
+
+
+def _segment_sizes(starts, data, axis):
+    """
+    Get the number of values in each segment, that are reduced into a
+    single value.
+    The shape of the result is broadcastable to the reduced segments.
+    """
+    sizes = np.diff(starts)
+    if axis is None:
+        return sizes * int(np.prod(data.shape[1:]))
+    else:
+        return sizes.reshape((-1,) + (1,) * (data.ndim - 1))
+
+
+def _segment_sum(starts, data, axis):
+    # Use the same dtype as 'np.sum()' for the accumulation
+    dtype = np.sum(np.zeros(1, dtype=data.dtype)).dtype
+    return _reduce_segments(np.add, starts, data, axis, dtype)
+
+
+def _segment_nansum(starts, data, axis):
+    if data.dtype.kind == "f":
+        data = np.where(np.isnan(data), 0, data)
+    return _segment_sum(starts, data, axis)
+
+
+def _segment_mean(starts, data, axis):
+    # Use the same dtype as 'np.mean()' for the accumulation
+    dtype = np.mean(np.zeros(1, dtype=data.dtype)).dtype
+    sums = _reduce_segments(np.add, starts, data, axis, dtype)
+    # Divide in the target dtype to obtain the same rounding
+    return sums / _segment_sizes(starts, data, axis).astype(dtype)
+
+
+def _segment_min(starts, data, axis):
+    return _reduce_segments(np.minimum, starts, data, axis)
+
+
+def _segment_max(starts, data, axis):
+    return _reduce_segments(np.maximum, starts, data, axis)
+
+
+def _segment_any(starts, data, axis):
+    return _reduce_segments(
+        np.logical_or, starts, data.astype(bool, copy=False), axis
+    )
+
+
+def _segment_all(starts, data, axis):
+    return _reduce_segments(
+        np.logical_and, starts, data.astype(bool, copy=False), axis
+    )
+
+
+def _segment_count_nonzero(starts, data, axis):
+    return _reduce_segments(
+        np.add, starts, data != 0, axis, dtype=np.int_
+    )
+
+
+def _segment_len(starts, data, axis):
+    return np.diff(starts)
+
+
+def _segment_centroid(starts, data, axis):
+    if data.ndim != 2 or axis is not None:
+        # Not applicable -> use generic implementation
+        return None
+    return _segment_mean(starts, data, 0)
+
+
+_segment_reductions = None
+
+def _get_segment_reduction(function):
+    """
+    Get the segment-wise reduction equivalent to the given function or
+    ``None``, if there is no such reduction.
+    """
+    global _segment_reductions
+    if _segment_reductions is None:
+        # Import in function to avoid circular import
+        from .geometry import centroid
+        _segment_reductions = {
+            np.sum: _segment_sum,
+            np.nansum: _segment_nansum,
+            np.mean: _segment_mean,
+            np.average: _segment_mean,
+            np.min: _segment_min,
+            np.amin: _segment_min,
+            np.max: _segment_max,
+            np.amax: _segment_max,
+            np.any: _segment_any,
+            np.all: _segment_all,
+            np.count_nonzero: _segment_count_nonzero,
+            len: _segment_len,
+            centroid: _segment_centroid,
+        }
+    try:
+        return _segment_reductions.get(function)
+    except TypeError:
+        # Unhashable function object
+        return None
+
+
 def spread_segment_wise(starts, input_data):
     """
     Generalized version of :func:`spread_residue_wise()`
@@ -63,12 +223,7 @@ def spread_segment_wise(starts, input_data):
         Includes exclusive stop, i.e. the length of the corresponding
         atom array.
     """
-    output_data = np.zeros(starts[-1], dtype=input_data.dtype)
-    for i in range(len(starts)-1):
-        start = starts[i]
-        stop = starts[i + 1]
-        output_data[start:stop] = input_data[i]
-    return output_data
+    return np.repeat(np.asarray(input_data), np.diff(starts), axis=0)
 
 
 def get_segment_masks(starts, indices):
@@ -18,7 +18,7 @@ from libc.stdlib cimport malloc, free
 import numpy as np
 from .celllist import CellList
 from .filter import filter_solvent, filter_monoatomic_ions
-from .info.radii import vdw_radius_protor, vdw_radius_single
+from .info.radii import vdw_radius_protor_array, vdw_radius_single_array
 
 ctypedef np.uint8_t np_bool
 ctypedef np.int64_t int64
@@ -144,16 +144,18 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         sasa_filter = sasa_filter & filter
         occl_filter = occl_filter & filter
         radii = np.full(len(array), np.nan, dtype=np.float32)
-        for i in np.arange(len(radii))[occl_filter]:
-            rad = vdw_radius_protor(array.res_name[i], array.atom_name[i])
-            # 1.8 is default radius
-            radii[i] = rad if rad is not None else 1.8
+        radii[occl_filter] = vdw_radius_protor_array(
+            array.res_name[occl_filter], array.atom_name[occl_filter]
+        )
+        # 1.8 is default radius
+        radii[occl_filter & np.isnan(radii)] = 1.8
     elif vdw_radii == "Single":
         radii = np.full(len(array), np.nan, dtype=np.float32)
-        for i in np.arange(len(radii))[occl_filter]:
-            rad = vdw_radius_single(array.element[i])
-            # 1.5 is default radius
-            radii[i] = rad if rad is not None else 1.8
+        radii[occl_filter] = vdw_radius_single_array(
+            array.element[occl_filter]
+        )
+        # 1.8 is default radius
+        radii[occl_filter & np.isnan(radii)] = 1.8
     else:
         raise KeyError(f"'{vdw_radii}' is not a valid radii set")
     # Increase atom radii by probe size ("rolling probe")
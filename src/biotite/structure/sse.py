@@ -13,7 +13,7 @@ __all__ = ["annotate_sse"]
 
 import numpy as np
 from .celllist import CellList
-from .geometry import distance, angle, dihedral
+from .geometry import distance, index_distance, index_angle, index_dihedral
 from .filter import filter_amino_acids
 from .residues import get_residue_starts
 from .integrity import check_res_id_continuity
@@ -45,10 +45,12 @@ def annotate_sse(atom_array, chain_id=None):
     
     Parameters
     ----------
-    atom_array : AtomArray
+    atom_array : AtomArray or AtomArrayStack
         The atom array to annotate for.
         Non-peptide residues are also allowed and obtain a ``''``
         SSE.
+        If an :class:`AtomArrayStack` is given, the SSEs of all models
+        are computed at once.
     chain_id : str, optional
         The peptide atoms belonging to this chain are filtered and
         annotated.
@@ -59,7 +61,7 @@ def annotate_sse(atom_array, chain_id=None):
     
     Returns
     -------
-    sse : ndarray
+    sse : ndarray, shape=(n,) or shape=(m,n)
         An array containing the secondary structure elements,
         where the index corresponds to a residue of  `atom_array`
         (see e.g. :func:`get_residues()`).
@@ -67,6 +69,8 @@ def annotate_sse(atom_array, chain_id=None):
         :math:`{\beta}`-strand/sheet, ``'c'`` means coil.
         ``''`` indicates that a residue is not an amino acid or it
         comprises no ``CA`` atom.
+        If an :class:`AtomArrayStack` is given, the first dimension
+        corresponds to the model.
     
     Notes
     -----
@@ -89,36 +93,53 @@ def annotate_sse(atom_array, chain_id=None):
     >>> print(sse)
     ['c' 'a' 'a' 'a' 'a' 'a' 'a' 'a' 'a' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c' 'c'
      'c' 'c']
+
+    The SSE of all models in a stack are computed in a single pass:
+
+    >>> sse = annotate_sse(atom_array_stack)
+    >>> print(sse.shape)
+    (38, 20)
+    >>> print("".join(sse[-1]))
+    caaaaaaaaccccccccccc
     
     """
     if chain_id is not None:
         # Filter all CA atoms in the relevant chain
         atom_array = atom_array[
+            ...,
             (atom_array.chain_id == chain_id) & filter_amino_acids(atom_array)
         ]
     
+    coord = atom_array.coord
+    is_stack = coord.ndim == 3
+    if not is_stack:
+        # Handle a single model as stack with one model
+        coord = coord[np.newaxis, ...]
+    n_models = coord.shape[0]
 
     residue_starts = get_residue_starts(atom_array)
     # Sort CA coord into the coord array at the respective residue index
     # If a residue has no CA, e.g. because it is not an amino acid,
     # the coordinates for that residue remain NaN
-    ca_coord = np.full((len(residue_starts), 3), np.nan, dtype=np.float32)
+    ca_coord = np.full(
+        (n_models, len(residue_starts), 3), np.nan, dtype=np.float32
+    )
     ca_indices = np.where(
         filter_amino_acids(atom_array) & (atom_array.atom_name == "CA")
     )[0]
     ca_coord[
-        np.searchsorted(residue_starts, ca_indices, "right") - 1
-    ] = atom_array.coord[ca_indices]
+        :, np.searchsorted(residue_starts, ca_indices, "right") - 1
+    ] = coord[:, ca_indices]
 
-    if len(ca_coord) <= 5:
+    if ca_coord.shape[1] <= 5:
         # The number of atoms is too small #
         # to measure the distances/angles
         # -> Return an SSE array where each amino acid is 'coil'
-        sse = np.full(len(ca_coord), "c", dtype="U1")
+        sse = np.full(ca_coord.shape[:2], "c", dtype="U1")
         # Residues where coord are NaN do not belong to amino acids
         # (or at least they have no CA)
         sse[np.isnan(ca_coord).any(axis=-1)] = ""
-        return sse
+        return sse if is_stack else sse[0]
 
     # Add virtual residues w/o CA coord at chain discontinuity indices
     # This ensures that such discontinuities are recognized for the
@@ -128,40 +149,39 @@ def annotate_sse(atom_array, chain_id=None):
     discont_res_indices = np.searchsorted(
         residue_starts, discont_indices, "right"
     ) - 1
-    ca_coord = np.insert(
-        ca_coord, discont_res_indices,
-        np.full((len(discont_res_indices),3), np.nan), axis=0
-    )
+    ca_coord = np.insert(ca_coord, discont_res_indices, np.nan, axis=1)
     # Later the SSE for virtual residues are removed again
     # via this mask
     no_virtual_mask = np.ones(len(residue_starts), dtype=bool)
     no_virtual_mask = np.insert(no_virtual_mask, discont_res_indices, False)
 
-    length = len(ca_coord)
+    length = ca_coord.shape[1]
 
 
     # The distances and angles are not defined for the entire interval,
     # therefore the indices do not have the full range
     # Values that are not defined are NaN
-    d2i = np.full(length, np.nan)
-    d3i = np.full(length, np.nan)
-    d4i = np.full(length, np.nan)
-    ri  = np.full(length, np.nan)
-    ai  = np.full(length, np.nan)
-
-    d2i[1 : length-1] = distance(ca_coord[0 : length-2], ca_coord[2 : length])
-    d3i[1 : length-2] = distance(ca_coord[0 : length-3], ca_coord[3 : length])
-    d4i[1 : length-3] = distance(ca_coord[0 : length-4], ca_coord[4 : length])
-    ri[1 : length-1]  = angle(
-        ca_coord[0 : length-2],
-        ca_coord[1 : length-1],
-        ca_coord[2 : length]
+    # The measurements are performed for all models at once
+    d2i = np.full((n_models, length), np.nan)
+    d3i = np.full((n_models, length), np.nan)
+    d4i = np.full((n_models, length), np.nan)
+    ri  = np.full((n_models, length), np.nan)
+    ai  = np.full((n_models, length), np.nan)
+
+    d2i[:, 1 : length-1] = index_distance(
+        ca_coord, _offset_indices(length, (0, 2))
     )
-    ai[1 : length-2] = dihedral(
-        ca_coord[0 : length-3],
-        ca_coord[1 : length-2],
-        ca_coord[2 : length-1],
-        ca_coord[3 : length-0]
+    d3i[:, 1 : length-2] = index_distance(
+        ca_coord, _offset_indices(length, (0, 3))
+    )
+    d4i[:, 1 : length-3] = index_distance(
+        ca_coord, _offset_indices(length, (0, 4))
+    )
+    ri[:, 1 : length-1] = index_angle(
+        ca_coord, _offset_indices(length, (0, 1, 2))
+    )
+    ai[:, 1 : length-2] = index_dihedral(
+        ca_coord, _offset_indices(length, (0, 1, 2, 3))
     )
     
     # Find CA that meet criteria for potential helices and strands
@@ -197,25 +217,39 @@ def annotate_sse(atom_array, chain_id=None):
     helix_mask = _extend_region(helix_mask, relaxed_helix)
     
     strand_mask = _mask_consecutive(strict_strand, 4)
-    short_strand_mask = _mask_regions_with_contacts(
-        ca_coord,
-        _mask_consecutive(strict_strand, 3),
-        min_contacts=5, min_distance=4.2, max_distance=5.2
-    )
+    short_strand_candidate_mask = _mask_consecutive(strict_strand, 3)
+    short_strand_mask = np.stack([
+        _mask_regions_with_contacts(
+            model_coord, model_candidate_mask,
+            min_contacts=5, min_distance=4.2, max_distance=5.2
+        ) for model_coord, model_candidate_mask
+        in zip(ca_coord, short_strand_candidate_mask)
+    ])
     strand_mask = _extend_region(
         strand_mask | short_strand_mask, relaxed_strand
     )
 
 
-    sse = np.full(length, "c", dtype="U1")
+    sse = np.full((n_models, length), "c", dtype="U1")
     sse[helix_mask] = "a"
     sse[strand_mask] = "b"
     # Residues where coord are NaN do not belong to amino acids
     # (or at least they have no CA)
     sse[np.isnan(ca_coord).any(axis=-1)] = ""
     # Remove SSE for virtual atoms and return
-    return sse[no_virtual_mask]
-            
+    sse = sse[:, no_virtual_mask]
+    return sse if is_stack else sse[0]
+
+
+def _offset_indices(length, offsets):
+    """
+    Create an index array for the `index_xxx()` functions, where the
+    columns are the residue indices shifted by the given `offsets`.
+    Only rows, where all indices are within `length`, are included.
+    """
+    first = np.arange(length - max(offsets))
+    return np.stack([first + offset for offset in offsets], axis=-1)
+
 
 def _mask_consecutive(mask, number):
     """
@@ -223,21 +257,24 @@ def _mask_consecutive(mask, number):
     values.
     Return a mask that is ``True`` for all indices in such a region and
     ``False`` otherwise.
+    The regions are searched along the last dimension.
     """
     # An element is in a consecutive region,
     # if it and the following `number-1` elements are True
     # The elements `mask[-(number-1):]` cannot have the sufficient count
     # by this definition, as they are at the end of the array
-    counts = np.zeros(len(mask) - (number-1), dtype=int)
+    length = mask.shape[-1]
+    n_seeds = length - (number-1)
+    counts = np.zeros(mask.shape[:-1] + (n_seeds,), dtype=int)
     for i in range(number):
-        counts[mask[i : i + len(counts)]] += 1
+        counts += mask[..., i : i + n_seeds]
     consecutive_seed = (counts == number)
     
     # Not only that element, but also the
     # following `number-1` elements are in a consecutive region
-    consecutive_mask = np.zeros(len(mask), dtype=bool)
+    consecutive_mask = np.zeros(mask.shape, dtype=bool)
     for i in range(number):
-        consecutive_mask[i : i + len(consecutive_seed)] |= consecutive_seed
+        consecutive_mask[..., i : i + n_seeds] |= consecutive_seed
     
     return consecutive_mask
 
@@ -247,19 +284,23 @@ def _extend_region(base_condition_mask, extension_condition_mask):
     Extend a ``True`` region in `base_condition_mask` by at maximum of
     one element at each side, if such element fulfills
     `extension_condition_mask.`
+    The regions are extended along the last dimension.
     """
     # This mask always marks the start
     # of either a 'True' or 'False' region
     # Prepend absent region to the start to capture the event,
     # that the first element is already the start of a region
-    region_change_mask = np.diff(np.append([False], base_condition_mask))
+    absent = np.zeros(base_condition_mask.shape[:-1] + (1,), dtype=bool)
+    region_change_mask = np.diff(
+        np.concatenate([absent, base_condition_mask], axis=-1), axis=-1
+    )
     
     # These masks point to the first `False` element
     # left and right of a 'True' region
     # The left end is the element before the first element of a 'True' region
     left_end_mask = region_change_mask & base_condition_mask
     # Therefore the mask needs to be shifted to the left
-    left_end_mask = np.append(left_end_mask[1:], [False])
+    left_end_mask = np.concatenate([left_end_mask[..., 1:], absent], axis=-1)
     # The right end is first element of a 'False' region
     right_end_mask = region_change_mask & ~base_condition_mask
     
@@ -277,7 +318,7 @@ def _mask_regions_with_contacts(coord, candidate_mask,
     contacts with `coord` in the range `min_distance` to `max_distance`.
     """
     potential_contact_coord = coord[~np.isnan(coord).any(axis=-1)]
-    if len(potential_contact_coord) == 0:
+    if len(potential_contact_coord) == 0 or not candidate_mask.any():
         # No potential contacts -> no contacts
         # -> no residue can satisfy 'min_contacts'
         return np.zeros(len(candidate_mask), dtype=bool)
@@ -287,25 +328,21 @@ def _mask_regions_with_contacts(coord, candidate_mask,
     )
     # For each candidate position,
     # get all contacts within maximum distance
-    all_within_max_dist_indices = cell_list.get_atoms(
-        coord[candidate_mask], max_distance
+    candidate_indices = np.where(candidate_mask)[0]
+    within_max_dist_indices = cell_list.get_atoms(
+        coord[candidate_indices], max_distance
+    )
+    # Now count all contacts within maximum distance
+    # that also satisfy the minimum distance,
+    # padding values are ignored
+    is_contact = (within_max_dist_indices != -1) & (
+        distance(
+            coord[candidate_indices, np.newaxis, :],
+            potential_contact_coord[within_max_dist_indices]
+        ) > min_distance
     )
-   
     contacts = np.zeros(len(coord), dtype=int)
-    for i, atom_index in enumerate(np.where(candidate_mask)[0]):
-        within_max_dist_indices = all_within_max_dist_indices[i]
-        # Remove padding values
-        within_max_dist_indices = within_max_dist_indices[
-            within_max_dist_indices != -1
-        ]
-        # Now count all contacts within maximum distance 
-        # that also satisfy the minimum distance
-        contacts[atom_index] = np.count_nonzero(
-            distance(
-                coord[atom_index],
-                potential_contact_coord[within_max_dist_indices]
-            ) > min_distance
-        )
+    contacts[candidate_indices] = np.count_nonzero(is_contact, axis=-1)
     
     # Count the number of contacts per region
     # These indices mark the start of either a 'True' or 'False' region
@@ -314,14 +351,11 @@ def _mask_regions_with_contacts(coord, candidate_mask,
     region_change_indices = np.where(
         np.diff(np.append([False], candidate_mask))
     )[0]
-    # Add exclusive stop
-    region_change_indices = np.append(region_change_indices, [len(coord)])
+    total_contacts = np.add.reduceat(contacts, region_change_indices)
+    region_lengths = np.diff(np.append(region_change_indices, len(coord)))
     output_mask = np.zeros(len(candidate_mask), dtype=bool)
-    for i in range(len(region_change_indices) - 1):
-        start = region_change_indices[i]
-        stop = region_change_indices[i+1]
-        total_contacts = np.sum(contacts[start : stop])
-        if total_contacts >= min_contacts:
-            output_mask[start : stop] = True
+    output_mask[region_change_indices[0]:] = np.repeat(
+        total_contacts >= min_contacts, region_lengths
+    )
     
-    return output_mask
\ No newline at end of file
+    return output_mask
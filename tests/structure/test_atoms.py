@@ -3,9 +3,12 @@
 # information.
 
 import pickle
+from os.path import join
 import numpy as np
 import pytest
 import biotite.structure as struc
+import biotite.structure.io as strucio
+from ..util import data_dir
 
 
 @pytest.fixture
@@ -102,6 +105,144 @@ def test_stack_indexing(stack):
     assert filtered_stack.array_length() == 1
     
 
+@pytest.mark.parametrize("use_stack", [False, True])
+def test_selection_view(array, stack, use_stack):
+    """
+    Chained indexing of a :class:`SelectionView` should give the same
+    result as chained indexing of the atom array (stack) itself.
+    """
+    atoms = stack if use_stack else array
+    atoms.bonds = struc.BondList(
+        atoms.array_length(), np.array([[0,1], [1,2], [3,4]])
+    )
+    ref_atoms = atoms[..., atoms.chain_id == "B"]
+    ref_atoms = ref_atoms[..., ref_atoms.res_name == "PRO"]
+    ref_atoms = ref_atoms[..., ::-1]
+
+    view = struc.SelectionView(atoms)
+    view = view[view.chain_id == "B"]
+    view = view[..., view.res_name == "PRO"]
+    view = view[::-1]
+    assert view.indices.tolist() == [3, 2]
+    assert view.array_length() == ref_atoms.array_length()
+    assert view.shape == ref_atoms.shape
+    # Annotations are only created on access
+    assert "atom_name" not in view._columns
+    assert view.atom_name.tolist() == ref_atoms.atom_name.tolist()
+    assert "atom_name" in view._columns
+    assert np.array_equal(view.coord, ref_atoms.coord)
+    assert view.bonds == ref_atoms.bonds
+    with pytest.raises(ValueError):
+        # The view is read-only
+        view.res_id[0] = 42
+    with pytest.raises(AttributeError):
+        view.foo
+    assert view.materialize() == ref_atoms
+
+
+_INDICES = np.array([0, 20, 100])
+
+
+@pytest.mark.parametrize(
+    "function, args",
+    [
+        (struc.filter_amino_acids, ()),
+        (struc.filter_canonical_amino_acids, ()),
+        (struc.filter_nucleotides, ()),
+        (struc.filter_canonical_nucleotides, ()),
+        (struc.filter_carbohydrates, ()),
+        (struc.filter_backbone, ()),
+        (struc.filter_peptide_backbone, ()),
+        (struc.filter_phosphate_backbone, ()),
+        (struc.filter_linear_bond_continuity, ()),
+        (struc.filter_monoatomic_ions, ()),
+        (struc.filter_solvent, ()),
+        (struc.filter_polymer, ()),
+        (struc.filter_first_altloc, (np.array(["A"] * 200 + ["B"] * 104),)),
+        (
+            struc.filter_highest_occupancy_altloc,
+            (np.array(["A"] * 200 + ["B"] * 104), np.ones(304))
+        ),
+        (struc.get_residue_starts, ()),
+        (struc.get_residue_starts, (True,)),
+        (struc.get_residue_masks, (_INDICES,)),
+        (struc.get_residue_starts_for, (_INDICES,)),
+        (struc.get_residue_positions, (_INDICES,)),
+        (struc.get_residues, ()),
+        (struc.get_residue_count, ()),
+        (struc.apply_residue_wise, (np.ones(304), np.sum)),
+        (struc.spread_residue_wise, (np.arange(20),)),
+        (struc.get_chain_starts, ()),
+        (struc.get_chain_starts, (True,)),
+        (struc.get_chain_masks, (_INDICES,)),
+        (struc.get_chain_starts_for, (_INDICES,)),
+        (struc.get_chain_positions, (_INDICES,)),
+        (struc.get_chains, ()),
+        (struc.get_chain_count, ()),
+        (struc.apply_chain_wise, (np.ones(304), np.sum)),
+        (struc.spread_chain_wise, (np.arange(1),)),
+    ]
+)
+def test_selection_view_functions(function, args):
+    """
+    The functions that are documented to accept a
+    :class:`SelectionView` should give the same result as for the
+    corresponding atom array.
+    """
+    array = strucio.load_structure(
+        join(data_dir("structure"), "1l2y.mmtf")
+    )[0]
+    # The view contains all atoms to be able to use the same arguments
+    view = struc.SelectionView(array)[np.arange(array.array_length())]
+
+    ref_result = function(array, *args)
+    test_result = function(view, *args)
+
+    if isinstance(ref_result, tuple):
+        assert len(test_result) == len(ref_result)
+        for test_item, ref_item in zip(test_result, ref_result):
+            assert np.array_equal(test_item, ref_item)
+    else:
+        assert np.array_equal(test_result, ref_result)
+
+
+def test_selection_view_intersection():
+    """
+    :func:`filter_intersection()` should give the same result for a
+    :class:`SelectionView` as for the corresponding atom array.
+    """
+    array = strucio.load_structure(
+        join(data_dir("structure"), "1l2y.mmtf")
+    )[0]
+    view = struc.SelectionView(array)[:200]
+
+    assert np.array_equal(
+        struc.filter_intersection(view, array[100:]),
+        struc.filter_intersection(array[:200], array[100:])
+    )
+
+
+@pytest.mark.parametrize(
+    "iter_function", [struc.residue_iter, struc.chain_iter]
+)
+def test_selection_view_iter(iter_function):
+    """
+    Iterating over the residues or chains of a :class:`SelectionView`
+    should give views on the same atoms as iterating over the
+    corresponding atom array.
+    """
+    array = strucio.load_structure(
+        join(data_dir("structure"), "1l2y.mmtf")
+    )[0]
+    view = struc.SelectionView(array)[array.res_id > 5]
+
+    ref_segments = list(iter_function(array[array.res_id > 5]))
+    test_segments = list(iter_function(view))
+    assert len(test_segments) == len(ref_segments)
+    for test_segment, ref_segment in zip(test_segments, ref_segments):
+        assert test_segment.materialize() == ref_segment
+
+
 def test_concatenation(array, stack):
     concat_array = array[2:] + array[:2]
     assert concat_array.chain_id.tolist() == ["B","B","B","A","A"]
@@ -249,4 +249,122 @@ def test_remove_pbc_selection(multi_model):
         # A warning due to a zero-division (centroid of empty list of
         # atoms) is raised here
         warnings.simplefilter("ignore")
-        assert struc.remove_pbc(array, select_none) == array
\ No newline at end of file
+        assert struc.remove_pbc(array, select_none) == array
+
+
+@pytest.mark.parametrize(
+    "chunk_size, seed", itertools.product([1, 7, 100], range(3))
+)
+def test_trajectory_unwrapper(chunk_size, seed):
+    """
+    Create a continuous random walk, wrap it into a box and check
+    whether :class:`TrajectoryUnwrapper` restores the original
+    trajectory, when the frames are given in chunks of different sizes.
+    """
+    N_FRAMES = 100
+    N_ATOMS = 50
+
+    np.random.seed(seed)
+    box = struc.vectors_from_unitcell(
+        10, 12, 14, np.deg2rad(80), np.deg2rad(90), np.deg2rad(100)
+    )
+    steps = np.random.uniform(-1, 1, size=(N_FRAMES, N_ATOMS, 3))
+    steps[0] = np.random.uniform(0, 10, size=(N_ATOMS, 3))
+    ref_coord = np.cumsum(steps, axis=0)
+    wrapped_coord = struc.move_inside_box(ref_coord, box)
+    # Expect that the atoms traveled over the periodic boundary
+    assert not np.allclose(wrapped_coord, ref_coord)
+
+    unwrapper = struc.TrajectoryUnwrapper()
+    # Start from the unwrapped first frame
+    unwrapper.unwrap(ref_coord[0], box)
+    test_chunks = [
+        unwrapper.unwrap(wrapped_coord[i : i+chunk_size], box)
+        for i in range(1, N_FRAMES, chunk_size)
+    ]
+    test_coord = np.concatenate([ref_coord[:1]] + test_chunks)
+
+    assert np.allclose(test_coord, ref_coord, atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "multi_model, amount, cutoff",
+    itertools.product([False, True], [1, 2], [2, 5, 10])
+)
+def test_repeat_box_cutoff(multi_model, amount, cutoff):
+    """
+    Check whether the sparse repetition via the `cutoff` parameter
+    contains all duplicate atoms within the cutoff distance to the
+    central box and is a subset of the full repetition.
+    """
+    model = None if multi_model else 1
+    array = mmtf.get_structure(
+        mmtf.MMTFFile.read(join(data_dir("structure"), "3o5r.mmtf")),
+        model=model, include_bonds=True
+    )
+    array.coord = struc.move_inside_box(array.coord, array.box)
+
+    ref_repeated, ref_indices = struc.repeat_box(array, amount)
+    test_repeated, test_indices = struc.repeat_box(array, amount, cutoff)
+
+    assert test_repeated[..., :array.array_length()] == array
+    assert test_repeated.array_length() < ref_repeated.array_length()
+    assert np.all(
+        test_repeated.atom_name == array.atom_name[test_indices]
+    )
+
+    # Each atom of the sparse repetition must be in the full repetition
+    ref_coord = ref_repeated.coord.reshape(-1, ref_repeated.array_length(), 3)
+    test_coord = test_repeated.coord.reshape(
+        -1, test_repeated.array_length(), 3
+    )
+    ref_keys = set(
+        (i, tuple(c)) for i, c in zip(ref_indices, np.round(ref_coord[0], 2))
+    )
+    test_keys = set(
+        (i, tuple(c)) for i, c in zip(test_indices, np.round(test_coord[0], 2))
+    )
+    assert test_keys.issubset(ref_keys)
+
+    # All duplicates within the cutoff distance to the central box
+    # must be included
+    # As the box is orthogonal, the distance can be simply computed
+    box_diag = np.diag(array.box) if not multi_model \
+               else np.diag(array.box[0])
+    outside = np.maximum(-ref_coord[0], ref_coord[0] - box_diag)
+    dist = np.sqrt(np.sum(np.maximum(outside, 0)**2, axis=-1))
+    expected_keys = set(
+        (i, tuple(c)) for i, c, d
+        in zip(ref_indices, np.round(ref_coord[0], 2), dist)
+        if d < cutoff
+    )
+    assert expected_keys.issubset(test_keys)
+
+    # Each bond in the repetition must correspond to an original bond
+    ref_bonds = set(tuple(b) for b in array.bonds.as_array()[:, :2])
+    test_bonds = test_repeated.bonds.as_array()[:, :2]
+    assert test_repeated.bonds.get_bond_count() > 0
+    assert set(
+        tuple(sorted(b)) for b in test_indices[test_bonds]
+    ).issubset(ref_bonds)
+
+
+def test_repeat_box_cutoff_bonds():
+    """
+    Check that the sparse repetition via the `cutoff` parameter does
+    not create bonds between atoms in different boxes, even if the
+    selected atom indices are ascending across box boundaries.
+    """
+    array = struc.AtomArray(2)
+    array.coord = np.array([[9.5, 5, 5], [0.5, 5, 5]])
+    array.box = np.identity(3) * 10
+    array.bonds = struc.BondList(2, np.array([[0, 1]]))
+
+    repeated, indices = struc.repeat_box(array, cutoff=1.0)
+
+    # Only the atom at x=9.5 is repeated into the box at -x and
+    # only the atom at x=0.5 is repeated into the box at +x
+    assert indices.tolist() == [0, 1, 0, 1]
+    assert repeated.coord[:, 0].tolist() == [9.5, 0.5, -0.5, 10.5]
+    # Only the bond in the central box remains
+    assert repeated.bonds.as_array()[:, :2].tolist() == [[0, 1]]
@@ -8,7 +8,7 @@ import numpy as np
 from biotite.structure import Atom
 from biotite.structure import array
 from biotite.structure import BondList
-from biotite.structure import partial_charges
+from biotite.structure import partial_charges, partial_charges_batch
 
 
 # Test the partial charge of carbon in the molecules given in table
@@ -291,6 +291,23 @@ def test_total_charge_zero(molecule):
     assert total_charge == pytest.approx(0, abs=1e-6)
 
 
+def test_partial_charges_batch():
+    """
+    Check if the partial charges computed for multiple molecules at
+    once are equal to the partial charges computed for each molecule
+    individually.
+    """
+    molecules = [
+        methane, ethane, ethylene, acetylene, fluoromethane, methanole,
+        formaldehyde, acetone, hydrogen_cyanide, acetonitrile
+    ]
+    ref_charges = [partial_charges(molecule) for molecule in molecules]
+    test_charges = partial_charges_batch(molecules)
+    assert len(test_charges) == len(ref_charges)
+    for test, ref in zip(test_charges, ref_charges):
+        assert test.tolist() == ref.tolist()
+
+
 def test_pos_formal_charge():
     """
     Test whether the partial charge of carbon in methane behaves as
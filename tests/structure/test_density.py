@@ -86,3 +86,54 @@ def test_density_weights(array, stack):
     assert density[1,0] == density2[1,0]
     assert density[1,1] == density2[1,1]
     
+
+
+def test_density_accumulator(stack):
+    """
+    Check if adding the models one after another to a
+    :class:`DensityAccumulator` gives the same result as
+    :func:`density()` for the entire stack.
+    """
+    atomic_weights = np.arange(0.1, 0.7, 0.1)
+    ref_density, ref_edges = struc.density(stack, weights=atomic_weights)
+
+    accumulator = struc.DensityAccumulator(
+        np.min(stack.coord, axis=(0, 1)), np.max(stack.coord, axis=(0, 1))
+    )
+    for model in stack:
+        accumulator.add(model, weights=atomic_weights)
+    test_density = accumulator.get_density()
+
+    assert accumulator.model_count == stack.stack_depth()
+    for test_edges, ref_edges in zip(accumulator.edges, ref_edges):
+        assert np.array_equal(test_edges, ref_edges)
+    assert np.allclose(test_density, ref_density)
+
+    indices, values = accumulator.get_sparse_density()
+    assert values.tolist() == \
+        pytest.approx(ref_density[ref_density > 0].tolist())
+    assert indices.tolist() == np.argwhere(ref_density > 0).tolist()
+
+
+def test_density_accumulator_gaussian():
+    """
+    Check if the Gaussian spreading of a single atom in the center of
+    the grid conserves its total weight and creates a symmetric,
+    separable density.
+    """
+    accumulator = struc.DensityAccumulator(
+        np.zeros(3), np.full(3, 21.0), delta=1.0
+    )
+    accumulator.add(np.array([[10.5, 10.5, 10.5]]))
+    test_density = accumulator.get_density(sigma=1.5)
+
+    assert test_density.sum() == pytest.approx(1.0)
+    assert np.unravel_index(np.argmax(test_density), test_density.shape) \
+        == (10, 10, 10)
+    assert np.allclose(test_density, test_density[::-1, ::-1, ::-1])
+    # The 3D kernel is the outer product of the 1D kernels
+    profile = test_density[:, 10, 10] / test_density[10, 10, 10]
+    assert test_density[10, 10, :] / test_density[10, 10, 10] \
+        == pytest.approx(profile)
+    assert test_density[3, 4, 10] / test_density[10, 10, 10] \
+        == pytest.approx(profile[3] * profile[4])
@@ -82,21 +82,32 @@ def verify_dot_bracket_notation(output, expected_output):
     unique_solutions = set(output)
     assert len(output) == len(unique_solutions)
 
-def test_dot_bracket_from_structure(nuc_sample_array, expected_output):
+@pytest.mark.parametrize("exhaustive", [False, True])
+def test_dot_bracket_from_structure(
+    nuc_sample_array, expected_output, exhaustive
+):
     """
     Check the output of ``dot_bracket_from_structure()``.
+    Without `exhaustive`, only a single solution is expected.
     """
-    output = struc.dot_bracket_from_structure(nuc_sample_array)
+    output = struc.dot_bracket_from_structure(
+        nuc_sample_array, exhaustive=exhaustive
+    )
     verify_dot_bracket_notation(output, expected_output)
+    assert len(output) == (len(expected_output) if exhaustive else 1)
 
-def test_dot_bracket(basepair_residue_positions, expected_output):
+@pytest.mark.parametrize("exhaustive", [False, True])
+def test_dot_bracket(basepair_residue_positions, expected_output, exhaustive):
     """
     Check the output of ``dot_bracket()``.
+    Without `exhaustive`, only a single solution is expected.
     """
     output = struc.dot_bracket(
-        basepair_residue_positions, len(expected_output[0])
+        basepair_residue_positions, len(expected_output[0]),
+        exhaustive=exhaustive
     )
     verify_dot_bracket_notation(output, expected_output)
+    assert len(output) == (len(expected_output) if exhaustive else 1)
 
 def test_base_pairs_from_dot_bracket(
     basepair_residue_positions, expected_output
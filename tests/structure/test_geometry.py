@@ -119,6 +119,42 @@ def test_dihedral_backbone_result(file_name):
 
 
 
+def test_dihedral_backbone_plan():
+    """
+    Check if applying a :class:`DihedralBackbonePlan` to the coordinates
+    of each model gives the same result as :func:`dihedral_backbone()`
+    for the entire stack.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    ref_angles = struc.dihedral_backbone(stack)
+
+    plan = struc.DihedralBackbonePlan(stack[0])
+    for i, coord in enumerate(stack.coord):
+        test_angles = plan.apply(coord)
+        for test, ref in zip(test_angles, ref_angles):
+            assert np.array_equal(test, ref[i], equal_nan=True)
+
+
+@pytest.mark.parametrize("bins", [2, 7, 36])
+def test_ramachandran_histogram(bins):
+    """
+    Compare the accumulated :class:`RamachandranHistogram` with a
+    histogram computed from all angles at once.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    phi, psi, _ = struc.dihedral_backbone(stack)
+
+    histogram = struc.RamachandranHistogram(bins)
+    for model_phi, model_psi in zip(phi, psi):
+        histogram.add(model_phi, model_psi)
+
+    valid = ~(np.isnan(phi) | np.isnan(psi))
+    ref_counts, _, _ = np.histogram2d(
+        phi[valid], psi[valid], bins=[histogram.bin_edges] * 2
+    )
+    assert histogram.counts.tolist() == ref_counts.astype(int).tolist()
+
+
 def test_index_distance_non_periodic():
     """
     Without PBC the result should be equal to the normal distance
@@ -159,4 +159,85 @@ def test_gro_no_box():
     s = gro_file.get_structure()
 
     # Assert no box with 0 dimension
-    assert s.box is None
\ No newline at end of file
+    assert s.box is None
+
+
+@pytest.mark.parametrize(
+    "start, stop, step, as_file_object", itertools.product(
+        [None, 2], [None, 10], [None, 3], [False, True]
+    )
+)
+def test_read_iter_structure(start, stop, step, as_file_object):
+    """
+    Check whether iterating over the models of a GRO file gives the
+    same models as :meth:`GROFile.get_structure()`.
+    """
+    path = join(data_dir("structure"), "1l2y.gro")
+    gro_file = gro.GROFile.read(path)
+    model_count = gro_file.get_model_count()
+    ref_arrays = [
+        gro_file.get_structure(model=i+1)
+        for i in range(model_count)[start:stop:step]
+    ]
+
+    if as_file_object:
+        with open(path, "r") as file:
+            test_arrays = list(
+                gro.GROFile.read_iter_structure(file, start, stop, step)
+            )
+    else:
+        test_arrays = list(
+            gro.GROFile.read_iter_structure(path, start, stop, step)
+        )
+
+    assert len(test_arrays) == len(ref_arrays)
+    for test_array, ref_array in zip(test_arrays, ref_arrays):
+        assert test_array == ref_array
+        assert test_array.box is None or np.array_equal(
+            test_array.box, ref_array.box
+        )
+
+
+def test_unequal_models():
+    """
+    Models with different numbers of atoms can only be read
+    separately.
+    """
+    atoms = gro.GROFile.read(
+        join(data_dir("structure"), "1l2y.gro")
+    ).get_structure(model=1)
+    gro_file = gro.GROFile()
+    gro_file.set_structure(atoms)
+    lines = gro_file.lines[:-1]
+    gro_file.set_structure(atoms[:10])
+    gro_file.lines = lines + gro_file.lines
+
+    with pytest.raises(biotite.structure.BadStructureError):
+        gro_file.get_structure()
+    assert gro_file.get_model_count() == 2
+    assert gro_file.get_structure(model=2) == atoms[:10]
+
+    temp = TemporaryFile("w+")
+    gro_file.write(temp)
+    temp.seek(0)
+    test_arrays = list(gro.GROFile.read_iter_structure(temp))
+    temp.close()
+    assert [array.array_length() for array in test_arrays] \
+        == [atoms.array_length(), 10]
+
+
+def test_invalid_structure():
+    atom = Atom([1,2,3], atom_name="CA", element="C", res_name="X", res_id=1)
+    atoms = array([atom])
+    gro_file = gro.GROFile()
+
+    atoms.atom_name[0] = "ABCDEF"
+    # Atom name does not fit into the column
+    with pytest.raises(ValueError):
+        gro_file.set_structure(atoms)
+
+    atoms.atom_name[0] = "CA"
+    atoms.coord[0] = [100000, 0, 0]
+    # Coordinate does not fit into the column
+    with pytest.raises(ValueError):
+        gro_file.set_structure(atoms)
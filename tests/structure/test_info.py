@@ -36,6 +36,19 @@ def test_mass():
     assert np.allclose((mass_diff % strucinfo.mass("H")), 0, atol=5e-3)
 
 
+def test_mass_array():
+    """
+    Test whether the vectorized masses are equal to the masses obtained
+    from the scalar function.
+    """
+    array = load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    test_masses = strucinfo.mass_array(array.element)
+    ref_masses = [strucinfo.mass(element) for element in array.element]
+    assert test_masses.tolist() == ref_masses
+    with pytest.raises(KeyError):
+        strucinfo.mass_array(np.array(["C", "XY"]))
+
+
 @pytest.mark.parametrize(
     "path", glob.glob(join(data_dir("structure"), "*.mmtf"))
 )
@@ -96,6 +109,64 @@ def test_protor_radii_invalid():
     assert strucinfo.vdw_radius_protor("HOH", "O") == None
 
 
+def test_protor_radii_array():
+    """
+    Test whether the vectorized ProtOr radii are equal to the radii
+    obtained from the scalar function.
+    Radii that cannot be estimated are expected to be *NaN*.
+    """
+    array = load_structure(join(data_dir("structure"), "1gya.mmtf"))
+    # Shuffle the atoms to ensure atom grouping does not depend on order
+    array = array[..., np.random.default_rng(0).permutation(array.shape[-1])]
+
+    test_radii = strucinfo.vdw_radius_protor_array(
+        array.res_name, array.atom_name
+    )
+
+    assert test_radii.shape == (array.array_length(),)
+    for res_name, atom_name, test_radius in zip(
+        array.res_name, array.atom_name, test_radii
+    ):
+        try:
+            ref_radius = strucinfo.vdw_radius_protor(res_name, atom_name)
+        except (KeyError, ValueError):
+            ref_radius = None
+        if ref_radius is None:
+            assert np.isnan(test_radius)
+        else:
+            assert test_radius == pytest.approx(ref_radius)
+
+
+def test_single_radii_array():
+    """
+    Test whether the vectorized single radii are equal to the radii
+    obtained from the scalar function.
+    """
+    elements = np.array(["C", "n", "O", "FE", "H", "Cl"])
+    test_radii = strucinfo.vdw_radius_single_array(elements)
+    for element, test_radius in zip(elements, test_radii):
+        ref_radius = strucinfo.vdw_radius_single(element)
+        if ref_radius is None:
+            assert np.isnan(test_radius)
+        else:
+            assert test_radius == pytest.approx(ref_radius)
+
+
+def test_residue_cache():
+    """
+    Test whether modifications of a residue returned by
+    :func:`residue()` do not leak into subsequent calls, as the
+    templates are cached internally.
+    """
+    ref_residue = strucinfo.residue("ALA")
+    test_residue = strucinfo.residue("ALA")
+    assert test_residue is not ref_residue
+    test_residue.coord[:] = 0
+    test_residue.atom_name[:] = "X"
+    test_residue.bonds.remove_bonds(test_residue.bonds)
+    assert strucinfo.residue("ALA") == ref_residue
+
+
 def test_single_radii():
     assert strucinfo.vdw_radius_single("N") == 1.55
 
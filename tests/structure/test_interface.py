@@ -0,0 +1,73 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+from os.path import join
+import numpy as np
+import pytest
+import biotite.structure as struc
+import biotite.structure.io as strucio
+import biotite.structure.io.pdbx as pdbx
+from ..util import data_dir
+
+
+@pytest.mark.parametrize("cutoff", [3.0, 5.0])
+def test_interface_contacts(cutoff):
+    """
+    Compare the residue contacts found by :func:`interface_contacts()`
+    with contacts found via a brute force distance calculation.
+    """
+    atoms = strucio.load_structure(
+        join(data_dir("structure"), "1igy.mmtf"), model=1
+    )
+    atoms = atoms[atoms.element != "H"]
+
+    test_pairs, test_distances = struc.interface_contacts(atoms, cutoff)
+
+    chain_indices = struc.get_chain_positions(
+        atoms, np.arange(atoms.array_length())
+    )
+    residue_starts = struc.get_residue_starts_for(
+        atoms, np.arange(atoms.array_length())
+    )
+    chain_starts = struc.get_chain_starts(atoms, add_exclusive_stop=True)
+    ref_distances = {}
+    for chain_start, chain_stop in zip(chain_starts[:-1], chain_starts[1:]):
+        # Compute distances chain-wise to limit memory consumption
+        distances = struc.distance(
+            atoms.coord[chain_start : chain_stop, np.newaxis, :],
+            atoms.coord[np.newaxis, :, :]
+        )
+        for i, j in zip(*np.where(distances <= cutoff)):
+            dist = distances[i, j]
+            i += chain_start
+            if chain_indices[i] < chain_indices[j]:
+                pair = (residue_starts[i], residue_starts[j])
+                ref_distances[pair] = min(ref_distances.get(pair, np.inf), dist)
+
+    assert len(ref_distances) > 0
+    assert [tuple(pair) for pair in test_pairs] \
+        == sorted(ref_distances.keys())
+    assert test_distances.tolist() == pytest.approx(
+        [ref_distances[tuple(pair)] for pair in test_pairs], abs=1e-4
+    )
+
+
+def test_interface_contacts_assembly():
+    """
+    Check whether :func:`interface_contacts()` gives the same result for
+    a :class:`VirtualAssembly` as for its materialized counterpart.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1f2n.cif"))
+    # Pentamer
+    virtual_assembly = pdbx.get_assembly(
+        pdbx_file, assembly_id="3", model=1, virtual=True
+    )
+    assembly = virtual_assembly.materialize()
+
+    ref_pairs, ref_distances = struc.interface_contacts(assembly)
+    test_pairs, test_distances = struc.interface_contacts(virtual_assembly)
+
+    assert len(ref_pairs) > 0
+    assert test_pairs.tolist() == ref_pairs.tolist()
+    assert test_distances.tolist() == ref_distances.tolist()
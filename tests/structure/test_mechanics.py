@@ -1,5 +1,6 @@
 import biotite.structure as struc
 import biotite.structure.io as strucio
+import biotite.structure.info as strucinfo
 import numpy as np
 from os.path import join
 from ..util import data_dir
@@ -22,4 +23,23 @@ def test_gyration_radius():
     # Same for atom array instead of stack
     array = stack[0]
     radius = struc.gyration_radius(array)
-    assert radius == pytest.approx(exp_radii[0], abs=2e-2)
\ No newline at end of file
+    assert radius == pytest.approx(exp_radii[0], abs=2e-2)
+
+
+def test_mass_center():
+    """
+    Compare the centers of mass of a stack with the centers of mass
+    calculated from the mass of each single atom.
+    """
+    stack = strucio.load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+    masses = np.array([strucinfo.mass(element) for element in stack.element])
+    ref_centers = np.sum(
+        masses[:, np.newaxis] * stack.coord, axis=-2
+    ) / np.sum(masses)
+
+    test_centers = struc.mass_center(stack)
+    assert test_centers.shape == (stack.stack_depth(), 3)
+    assert test_centers == pytest.approx(ref_centers)
+
+    # Same for atom array instead of stack
+    assert struc.mass_center(stack[0]) == pytest.approx(ref_centers[0])
@@ -46,6 +46,86 @@ def test_codecs(path):
                 assert (array1 == array2).all()
 
 
+@pytest.mark.parametrize(
+    "codec, dtype, param",
+    [
+        ( 1, np.float32,   0),
+        ( 2, np.int8,      0),
+        ( 3, np.int16,     0),
+        ( 4, np.int32,     0),
+        ( 5, "U4",         4),
+        ( 6, "U1",         0),
+        ( 7, np.int32,     0),
+        ( 8, np.int32,     0),
+        ( 9, np.float32,  10),
+        (10, np.float32, 1000),
+        (11, np.float32, 100),
+        (12, np.float32, 1000),
+        (13, np.float32,  10),
+        (14, np.int32,     0),
+        (15, np.int32,     0),
+    ]
+)
+def test_codec_roundtrip(codec, dtype, param):
+    """
+    Check whether each codec restores randomly generated input arrays,
+    that contain runs of equal values and values exceeding the limits
+    of packed integers.
+    """
+    LENGTH = 1000
+
+    np.random.seed(0)
+    values = np.repeat(
+        np.random.randint(-300, 300, LENGTH), np.random.randint(0, 5, LENGTH)
+    )
+    if dtype == "U1":
+        ref_array = np.array(
+            [chr(ord("A") + v % 26) for v in values], dtype=dtype
+        )
+    elif dtype == "U4":
+        ref_array = values.astype(dtype)
+    elif dtype == np.float32:
+        ref_array = (values / (param if param != 0 else 7)).astype(dtype)
+    else:
+        ref_array = values.astype(dtype)
+
+    mmtf_file = mmtf.MMTFFile()
+    mmtf_file.set_array("key", ref_array, codec, param)
+    test_array = mmtf_file["key"]
+
+    assert test_array.dtype == ref_array.dtype
+    if dtype == np.float32 and param != 0:
+        assert test_array == approx(ref_array, abs=1/param)
+    else:
+        assert test_array.tolist() == ref_array.tolist()
+
+
+def test_decode_cache():
+    """
+    Check whether decoded arrays are cached, whether modifications of
+    the returned arrays do not affect the cache and whether the cache
+    is updated, if the field is changed.
+    """
+    mmtf_file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    array = mmtf_file["groupIdList"]
+    assert "groupIdList" in mmtf_file._decoded
+    ref_ids = array.tolist()
+    # Returned arrays are writable copies
+    array += 1
+    assert mmtf_file["groupIdList"] is not array
+    assert mmtf_file["groupIdList"].tolist() == ref_ids
+    array -= 1
+
+    new_array = array + 1
+    mmtf_file.set_array("groupIdList", new_array, codec=8)
+    assert mmtf_file["groupIdList"].tolist() == new_array.tolist()
+
+    # The copy has its own cache
+    clone = mmtf_file.copy()
+    assert clone["groupIdList"] is not mmtf_file["groupIdList"]
+    assert clone["groupIdList"].tolist() == new_array.tolist()
+
+
 @pytest.mark.parametrize(
     "path, model",
     itertools.product(
@@ -181,6 +261,34 @@ def test_pdbx_consistency_assembly(path, model):
            approx(ref_assembly.coord.flatten().tolist(), abs=1e-3)
 
 
+@pytest.mark.parametrize("model", [None, 1])
+def test_get_virtual_assembly(model):
+    """
+    Test whether a materialized :class:`VirtualAssembly` is equal to
+    the assembly built by :func:`get_assembly()` and whether each copy
+    can be obtained separately.
+    """
+    path = join(data_dir("structure"), "1f2n.mmtf")
+    mmtf_file = mmtf.MMTFFile.read(path)
+
+    ref_assembly = mmtf.get_assembly(mmtf_file, model=model)
+    virtual_assembly = mmtf.get_assembly(
+        mmtf_file, model=model, virtual=True
+    )
+    assert isinstance(virtual_assembly, struc.VirtualAssembly)
+    assert virtual_assembly.array_length() == ref_assembly.array_length()
+
+    test_assembly = virtual_assembly.materialize()
+    assert test_assembly == ref_assembly
+
+    start = 0
+    for i in range(virtual_assembly.copy_count()):
+        copy = virtual_assembly.get_copy(i)
+        stop = start + copy.array_length()
+        assert copy == ref_assembly[..., start : stop]
+        start = stop
+
+
 def test_extra_fields():
     path = join(data_dir("structure"), "1l2y.mmtf")
     mmtf_file = mmtf.MMTFFile.read(path)
@@ -148,6 +148,34 @@ def test_pdbx_consistency_assembly(path, model):
            approx(ref_assembly.coord.flatten().tolist(), abs=1e-3)
 
 
+@pytest.mark.parametrize("model", [None, 1])
+def test_get_virtual_assembly(model):
+    """
+    Test whether a materialized :class:`VirtualAssembly` is equal to
+    the assembly built by :func:`get_assembly()` and whether each copy
+    can be obtained separately.
+    """
+    path = join(data_dir("structure"), "1f2n.pdb")
+    pdb_file = pdb.PDBFile.read(path)
+
+    ref_assembly = pdb.get_assembly(pdb_file, model=model)
+    virtual_assembly = pdb.get_assembly(
+        pdb_file, model=model, virtual=True
+    )
+    assert isinstance(virtual_assembly, struc.VirtualAssembly)
+    assert virtual_assembly.array_length() == ref_assembly.array_length()
+
+    test_assembly = virtual_assembly.materialize()
+    assert test_assembly == ref_assembly
+
+    start = 0
+    for i in range(virtual_assembly.copy_count()):
+        copy = virtual_assembly.get_copy(i)
+        stop = start + copy.array_length()
+        assert copy == ref_assembly[..., start : stop]
+        start = stop
+
+
 @pytest.mark.parametrize("hybrid36", [False, True])
 def test_extra_fields(hybrid36):
     path = join(data_dir("structure"), "1l2y.pdb")
@@ -209,6 +237,43 @@ def test_guess_elements():
     assert guessed_stack.element.tolist() == stack.element.tolist()
 
 
+@pytest.mark.parametrize("as_generator", [False, True])
+def test_write_iter(as_generator):
+    """
+    Writing a structure via :meth:`PDBFile.write_iter()` should give
+    the same file as :meth:`PDBFile.set_structure()` and
+    :meth:`PDBFile.write()`.
+    """
+    path = join(data_dir("structure"), "1l2y.pdb")
+    stack = pdb.PDBFile.read(path).get_structure(
+        extra_fields=["b_factor", "occupancy", "charge"]
+    )
+
+    ref_file = TemporaryFile("w+")
+    pdb_file = pdb.PDBFile()
+    pdb_file.set_structure(stack)
+    pdb_file.write(ref_file)
+
+    test_file = TemporaryFile("w+")
+    if as_generator:
+        pdb.PDBFile.write_iter(
+            test_file, stack[0], (model.coord for model in stack)
+        )
+    else:
+        pdb.PDBFile.write_iter(test_file, stack)
+
+    ref_file.seek(0)
+    test_file.seek(0)
+    assert test_file.read() == ref_file.read()
+    test_file.seek(0)
+    test_stack = pdb.PDBFile.read(test_file).get_structure(
+        extra_fields=["b_factor", "occupancy", "charge"]
+    )
+    assert test_stack == stack
+    ref_file.close()
+    test_file.close()
+
+
 @pytest.mark.parametrize(
     "path, model",
     itertools.product(
@@ -351,6 +416,30 @@ def test_hybrid36_codec(number, length):
     assert test_number == number
 
 
+@pytest.mark.parametrize("length", [3, 4, 5])
+def test_hybrid36_array_codec(length):
+    """
+    Test whether the vectorized hybrid-36 encoding and decoding gives
+    the same results as the scalar functions.
+    """
+    np.random.seed(0)
+    max_number = hybrid36.max_hybrid36_number(length)
+    numbers = np.concatenate([
+        # Include the boundaries between the different representations
+        np.arange(0, 100),
+        np.array([10**length - 1, 10**length, max_number]),
+        np.random.randint(0, max_number, 1000)
+    ])
+
+    strings = hybrid36.encode_hybrid36_array(numbers, length)
+    ref_strings = [hybrid36.encode_hybrid36(int(n), length) for n in numbers]
+    assert strings.tolist() == ref_strings
+
+    # Whitespace padding should be ignored in decoding
+    test_numbers = hybrid36.decode_hybrid36_array(np.char.rjust(strings, 6))
+    assert test_numbers.tolist() == numbers.tolist()
+
+
 def test_max_hybrid36_number():
     assert hybrid36.max_hybrid36_number(4) == 2436111
     assert hybrid36.max_hybrid36_number(5) == 87440031
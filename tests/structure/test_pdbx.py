@@ -3,8 +3,10 @@
 # information.
 
 import glob
+import io
 import itertools
 from os.path import join
+import msgpack
 import numpy as np
 import pytest
 from pytest import approx
@@ -12,6 +14,7 @@ import biotite
 import biotite.sequence as seq
 import biotite.structure as struc
 import biotite.structure.io.pdbx as pdbx
+from biotite.structure.io.util import format_fixed_point_strings
 from ..util import data_dir
 
 
@@ -167,6 +170,237 @@ def test_unequal_lengths():
         )
 
 
+@pytest.mark.parametrize("format", ["cif", "bcif"])
+def test_category_columns(format):
+    """
+    Check whether restricting the columns of a category gives the same
+    values as reading the entire category.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1l2y.cif"))
+    if format == "bcif":
+        pdbx_file = _convert_to_bcif(pdbx_file)
+    columns = ["Cartn_y", "auth_atom_id", "non_existent"]
+
+    ref_dict = pdbx_file.get_category("atom_site")
+    test_dict = pdbx_file.get_category("atom_site", columns=columns)
+
+    # The columns are in the order of the file
+    assert list(test_dict.keys()) == ["Cartn_y", "auth_atom_id"]
+    for key, values in test_dict.items():
+        assert values.tolist() == ref_dict[key].tolist()
+
+
+@pytest.mark.parametrize(
+    "path, fields", itertools.product(
+        glob.glob(join(data_dir("structure"), "*.cif")),
+        [[], ["atom_name"], ["res_id", "element", "hetero"]]
+    )
+)
+def test_fields(path, fields):
+    """
+    Check whether only the given standard annotations are read and
+    whether the *altloc* filtering still works, if the annotations
+    required for it are not given.
+    """
+    pdbx_file = pdbx.PDBxFile.read(path)
+    ref_atoms = pdbx.get_structure(
+        pdbx_file, model=1, extra_fields=["b_factor"]
+    )
+    test_atoms = pdbx.get_structure(
+        pdbx_file, model=1, extra_fields=["b_factor"], fields=fields
+    )
+
+    default_atoms = struc.AtomArray(ref_atoms.array_length())
+    assert test_atoms.array_length() == ref_atoms.array_length()
+    assert test_atoms.coord.tolist() == ref_atoms.coord.tolist()
+    assert test_atoms.b_factor.tolist() == ref_atoms.b_factor.tolist()
+    for annot in fields:
+        assert test_atoms.get_annotation(annot).tolist() \
+            == ref_atoms.get_annotation(annot).tolist()
+    for annot in ["hetero", "atom_name", "element"]:
+        if annot not in fields:
+            assert test_atoms.get_annotation(annot).tolist() \
+                == default_atoms.get_annotation(annot).tolist()
+
+
+def test_invalid_fields():
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1l2y.cif"))
+    with pytest.raises(ValueError):
+        pdbx.get_structure(pdbx_file, fields=["b_factor"])
+
+
+@pytest.mark.parametrize(
+    "path, model, format", itertools.product(
+        glob.glob(join(data_dir("structure"), "*.cif")),
+        [None, 1, -1],
+        ["cif", "bcif"]
+    )
+)
+def test_get_coord(path, model, format):
+    """
+    Check whether :func:`get_coord()` gives the same coordinates as
+    :func:`get_structure()` without *altloc* filtering.
+    """
+    pdbx_file = pdbx.PDBxFile.read(path)
+    if format == "bcif":
+        pdbx_file = _convert_to_bcif(pdbx_file)
+    try:
+        ref_coord = pdbx.get_structure(
+            pdbx_file, model=model, altloc="all"
+        ).coord
+    except biotite.InvalidFileError:
+        # The models have different numbers of atoms
+        with pytest.raises(biotite.InvalidFileError):
+            pdbx.get_coord(pdbx_file, model=model)
+        return
+
+    test_coord = pdbx.get_coord(pdbx_file, model=model)
+
+    assert test_coord.dtype == np.float32
+    assert test_coord.tolist() == ref_coord.tolist()
+
+
+@pytest.mark.parametrize(
+    "path, chunk_size", itertools.product(
+        glob.glob(join(data_dir("structure"), "*.cif")),
+        [7, 10000]
+    )
+)
+def test_writer(path, chunk_size):
+    """
+    Check whether :class:`PDBxWriter` writes the same file content as
+    :class:`PDBxFile`, independent of the chunk size.
+    """
+    pdbx_file = pdbx.PDBxFile.read(path)
+    ref_file = pdbx.PDBxFile()
+    stream = io.StringIO()
+    writer = pdbx.PDBxWriter(stream, chunk_size=chunk_size)
+    for block, category in pdbx_file:
+        category_dict = pdbx_file.get_category(category, block)
+        ref_file.set_category(category, category_dict, block)
+        writer.set_category(category, category_dict, block)
+    writer.close()
+
+    assert writer.get_block_names() == pdbx_file.get_block_names()
+    assert stream.getvalue() == str(ref_file) + "\n"
+
+
+def test_writer_structure():
+    """
+    Check whether a structure written via :func:`set_structure()` into
+    a :class:`PDBxWriter` can be read again.
+    """
+    path = join(data_dir("structure"), "1l2y.cif")
+    extra_fields = ["atom_id", "b_factor", "occupancy", "charge"]
+    ref_atoms = pdbx.get_structure(
+        pdbx.PDBxFile.read(path), extra_fields=extra_fields
+    )
+
+    stream = io.StringIO()
+    with pdbx.PDBxWriter(stream, chunk_size=100) as writer:
+        pdbx.set_structure(writer, ref_atoms, data_block="test")
+        stream.seek(0)
+        test_atoms = pdbx.get_structure(
+            pdbx.PDBxFile.read(stream), extra_fields=extra_fields
+        )
+
+    assert test_atoms == ref_atoms
+
+
+def test_writer_errors():
+    writer = pdbx.PDBxWriter(io.StringIO())
+    # No data block was given so far
+    with pytest.raises(TypeError):
+        writer.set_category("test", {"foo": "1"})
+    writer.set_category("test", {"foo": "1"}, block="block1")
+    # Category was already written
+    with pytest.raises(ValueError):
+        writer.set_category("test", {"foo": "1"})
+    # Columns have unequal lengths
+    with pytest.raises(ValueError):
+        writer.set_category(
+            "loop", {"foo": ["1", "2"], "bar": ["1"]}, block="block1"
+        )
+    writer.set_category("test", {"foo": "1"}, block="block2")
+    # Data block was already finished
+    with pytest.raises(ValueError):
+        writer.set_category("other", {"foo": "1"}, block="block1")
+    # Only files opened in text mode are supported
+    with pytest.raises(TypeError):
+        pdbx.PDBxWriter(io.BytesIO())
+
+
+def test_looped_quoting():
+    """
+    Check whether values of a *looped* category, that contain
+    whitespace, quotes or are empty, are written in a way that they
+    are read back equally.
+    """
+    values = np.array(
+        ["A", " B ", "C D", "E'F", "'G'", 'H"I', "", "J\t", "K L'M"]
+    )
+    exp_values = ["A", "B", "C D", "E'F", "'G'", 'H"I', ".", "J", "K L'M"]
+    pdbx_file = pdbx.PDBxFile()
+    pdbx_file.set_category(
+        "test", {"values": values, "index": np.arange(len(values))},
+        block="test_block"
+    )
+    # The input must not be modified
+    assert values[1] == " B "
+
+    pdbx_file = pdbx.PDBxFile.read(io.StringIO(str(pdbx_file)))
+    test_dict = pdbx_file.get_category("test", expect_looped=True)
+    assert test_dict["values"].tolist() == exp_values
+    assert test_dict["index"].tolist() == [
+        str(i) for i in range(len(values))
+    ]
+
+
+def test_unicode_stripping():
+    """
+    Check whether values of a *looped* category are stripped from
+    Unicode whitespace in the same way as by :func:`numpy.char.strip()`.
+    """
+    values = np.array(
+        ["\xa0A", "B\u3000", "\x1cC\x1f", "\u00e9", "D\u00e9 ", "E", " "]
+    )
+    index = np.arange(len(values))
+
+    test_file = pdbx.PDBxFile()
+    test_file.set_category(
+        "test", {"values": values, "index": index}, block="test_block"
+    )
+    ref_file = pdbx.PDBxFile()
+    ref_file.set_category(
+        "test", {"values": np.char.strip(values), "index": index},
+        block="test_block"
+    )
+    assert str(test_file) == str(ref_file)
+
+
+@pytest.mark.parametrize(
+    "dtype, decimals", itertools.product(
+        [np.float32, np.float64], [0, 1, 2, 3]
+    )
+)
+def test_fixed_formatting(dtype, decimals):
+    """
+    The vectorized fixed-point formatting used for writing coordinates
+    and B-factors must give the same strings as Python's formatting.
+    """
+    np.random.seed(0)
+    values = np.concatenate([
+        np.random.uniform(-1000, 1000, 10000),
+        # Values at rounding ties
+        np.arange(-100, 100) / 2 / 10**decimals,
+        [0.0, -0.0, -1e-9, 1e20, np.nan, np.inf, -np.inf],
+    ]).astype(dtype)
+
+    test_strings = format_fixed_point_strings(values, decimals)
+
+    assert test_strings.tolist() == [f"{v:.{decimals}f}" for v in values]
+
+
 def test_list_assemblies():
     """
     Test the :func:`list_assemblies()` function based on a known
@@ -237,6 +471,73 @@ def test_get_assembly(pdb_id, model):
         assert assembly.array_length() % monomer_atom_count == 0
 
 
+@pytest.mark.parametrize("model", [None, 1])
+def test_get_virtual_assembly(model):
+    """
+    Test whether a materialized :class:`VirtualAssembly` is equal to
+    the assembly built by :func:`get_assembly()` and whether each copy
+    can be obtained separately.
+    """
+    path = join(data_dir("structure"), "1f2n.cif")
+    pdbx_file = pdbx.PDBxFile.read(path)
+
+    ref_assembly = pdbx.get_assembly(pdbx_file, model=model)
+    virtual_assembly = pdbx.get_assembly(
+        pdbx_file, model=model, virtual=True
+    )
+    assert isinstance(virtual_assembly, struc.VirtualAssembly)
+    assert virtual_assembly.array_length() == ref_assembly.array_length()
+
+    test_assembly = virtual_assembly.materialize()
+    assert test_assembly == ref_assembly
+
+    start = 0
+    for i in range(virtual_assembly.copy_count()):
+        copy = virtual_assembly.get_copy(i)
+        stop = start + copy.array_length()
+        assert copy == ref_assembly[..., start : stop]
+        start = stop
+
+
+def test_virtual_assembly_contacts():
+    """
+    Test whether :meth:`VirtualAssembly.find_contacts()` finds the same
+    contacts between copies as a :class:`CellList` on the materialized
+    assembly.
+    """
+    CUTOFF = 4.0
+
+    path = join(data_dir("structure"), "1f2n.cif")
+    pdbx_file = pdbx.PDBxFile.read(path)
+    # Pentamer
+    virtual_assembly = pdbx.get_assembly(
+        pdbx_file, assembly_id="3", model=1, virtual=True
+    )
+    test_contacts = virtual_assembly.find_contacts(CUTOFF)
+
+    assembly = virtual_assembly.materialize()
+    copy_indices = np.concatenate([
+        np.full(len(virtual_assembly.get_indices(i)), i)
+        for i in range(virtual_assembly.copy_count())
+    ])
+    atom_indices = np.concatenate([
+        virtual_assembly.get_indices(i)
+        for i in range(virtual_assembly.copy_count())
+    ])
+    cell_list = struc.CellList(assembly, CUTOFF)
+    ref_contacts = set()
+    for i, adjacent in enumerate(cell_list.get_atoms(assembly.coord, CUTOFF)):
+        for j in adjacent[adjacent != -1]:
+            if copy_indices[i] < copy_indices[j]:
+                ref_contacts.add((
+                    copy_indices[i], atom_indices[i],
+                    copy_indices[j], atom_indices[j]
+                ))
+
+    assert len(ref_contacts) > 0
+    assert set(tuple(contact) for contact in test_contacts) == ref_contacts
+
+
 def test_get_sequence():
     file = pdbx.PDBxFile.read(join(data_dir("structure"), "5ugo.cif"))
     sequences = pdbx.get_sequence(file)
@@ -265,3 +566,186 @@ def test_get_sequence():
         "CCGGAGTCAGGAAACCTGCCTGCCGTC"
     )
     assert type(sequences[4]) is seq.NucleotideSequence
+
+
+def _convert_to_bcif(pdbx_file):
+    """
+    Copy all categories of a :class:`PDBxFile` into a
+    :class:`BinaryCIFFile` and write and read it again.
+    """
+    bcif_file = pdbx.BinaryCIFFile()
+    for block, category in pdbx_file:
+        bcif_file.set_category(
+            category, pdbx_file.get_category(category, block), block
+        )
+    file = io.BytesIO()
+    bcif_file.write(file)
+    file.seek(0)
+    return pdbx.BinaryCIFFile.read(file)
+
+
+@pytest.mark.parametrize(
+    "path, model",
+    itertools.product(
+        glob.glob(join(data_dir("structure"), "*.cif")), [None, 1]
+    ),
+)
+def test_bcif_conversion(path, model):
+    """
+    Check whether :func:`get_structure()` gives the same result for a
+    :class:`BinaryCIFFile` as for the :class:`PDBxFile` it was created
+    from and whether :func:`set_structure()` works for a
+    :class:`BinaryCIFFile` as well.
+    """
+    extra_fields = ["atom_id", "b_factor", "occupancy", "charge"]
+    pdbx_file = pdbx.PDBxFile.read(path)
+    try:
+        ref_atoms = pdbx.get_structure(
+            pdbx_file, model=model, extra_fields=extra_fields
+        )
+    except biotite.InvalidFileError:
+        if model is None:
+            # The models contain different numbers of atoms
+            return
+        else:
+            raise
+
+    bcif_file = _convert_to_bcif(pdbx_file)
+    test_atoms = pdbx.get_structure(
+        bcif_file, model=model, extra_fields=extra_fields
+    )
+    assert test_atoms == ref_atoms
+    if ref_atoms.box is not None:
+        assert np.allclose(test_atoms.box, ref_atoms.box)
+
+    bcif_file = pdbx.BinaryCIFFile()
+    pdbx.set_structure(bcif_file, ref_atoms, data_block="test")
+    file = io.BytesIO()
+    bcif_file.write(file)
+    file.seek(0)
+    bcif_file = pdbx.BinaryCIFFile.read(file)
+    test_atoms = pdbx.get_structure(
+        bcif_file, model=model, extra_fields=extra_fields
+    )
+    assert test_atoms == ref_atoms
+
+
+def test_bcif_categories():
+    """
+    Check whether numeric string columns are stored as numbers and
+    whether all columns are restored as they were set.
+    """
+    category_dict = {
+        "int": np.array(["1", "2", "300000", "-70000"]),
+        "float": np.array(["1.50", "-2.25", "100.00", "0.10"]),
+        "string": np.array(["A", "01", "+1", "1.5"]),
+        "masked": np.array(["1", ".", "?", "4"]),
+        "native_int": np.array([1, 1, 1, 40000]),
+        "native_float": np.array([0.1, 0.2, 0.3, 0.4], dtype=np.float32),
+    }
+    bcif_file = pdbx.BinaryCIFFile()
+    bcif_file.set_category("test", category_dict, block="test_block")
+    bcif_file.set_category("single", {"version": "1.10"}, block="test_block")
+
+    test_dict = bcif_file.get_category("test")
+    assert test_dict["int"].dtype.kind == "i"
+    assert test_dict["float"].dtype.kind == "f"
+    assert test_dict["string"].dtype.kind == "U"
+    assert test_dict["masked"].dtype.kind == "U"
+    assert test_dict["native_float"].dtype == np.float32
+    assert test_dict["int"].tolist() == [1, 2, 300000, -70000]
+    assert test_dict["float"].tolist() == [1.5, -2.25, 100.0, 0.1]
+    assert test_dict["string"].tolist() == ["A", "01", "+1", "1.5"]
+    assert test_dict["masked"].tolist() == ["1", ".", "?", "4"]
+    assert test_dict["native_int"].tolist() == [1, 1, 1, 40000]
+    assert test_dict["native_float"].tolist() \
+        == category_dict["native_float"].tolist()
+    assert bcif_file["single"] == {"version": "1.10"}
+    assert list(bcif_file) == [
+        ("test_block", "test"), ("test_block", "single")
+    ]
+
+
+def test_bcif_decoding():
+    """
+    Test decoding of encodings that are not used by
+    :class:`BinaryCIFFile` for writing, based on known examples.
+    """
+    content = {
+        "dataBlocks": [{
+            "header": "test_block",
+            "categories": [{
+                "name": "_test",
+                "rowCount": 4,
+                "columns": [
+                    {
+                        "name": "quantized",
+                        "data": {
+                            "encoding": [
+                                {
+                                    "kind": "IntervalQuantization",
+                                    "min": 1.0,
+                                    "max": 2.0,
+                                    "numSteps": 5,
+                                    "srcType": 33,
+                                },
+                                {"kind": "ByteArray", "type": 4},
+                            ],
+                            "data": bytes([0, 1, 4, 2]),
+                        },
+                        "mask": None,
+                    },
+                    {
+                        "name": "packed",
+                        "data": {
+                            "encoding": [
+                                {
+                                    "kind": "Delta",
+                                    "origin": 1000,
+                                    "srcType": 3,
+                                },
+                                {
+                                    "kind": "IntegerPacking",
+                                    "byteCount": 1,
+                                    "isUnsigned": False,
+                                    "srcSize": 4,
+                                },
+                                {"kind": "ByteArray", "type": 1},
+                            ],
+                            "data": np.array(
+                                [0, 127, 73, -128, -128, -4, 1],
+                                dtype=np.int8
+                            ).tobytes(),
+                        },
+                        "mask": None,
+                    },
+                ],
+            }],
+        }],
+    }
+    bcif_file = pdbx.BinaryCIFFile.read(
+        io.BytesIO(msgpack.packb(content, use_bin_type=True))
+    )
+    test_dict = bcif_file.get_category("test")
+    assert test_dict["quantized"].tolist() == [1.0, 1.25, 2.0, 1.5]
+    assert test_dict["packed"].tolist() == [1000, 1200, 940, 941]
+
+
+def test_bcif_assembly():
+    """
+    Check whether :func:`list_assemblies()` and :func:`get_assembly()`
+    work for a :class:`BinaryCIFFile`, although the assembly and
+    operation IDs are stored as integers.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1f2n.cif"))
+    bcif_file = _convert_to_bcif(pdbx_file)
+
+    assert pdbx.list_assemblies(bcif_file) == pdbx.list_assemblies(pdbx_file)
+    for assembly_id in ["1", "3"]:
+        ref_assembly = pdbx.get_assembly(
+            pdbx_file, assembly_id=assembly_id, model=1
+        )
+        test_assembly = pdbx.get_assembly(
+            bcif_file, assembly_id=assembly_id, model=1
+        )
+        assert test_assembly == ref_assembly
@@ -33,7 +33,7 @@ def test_pseudoknots(nuc_sample_array):
     order_two_count = len(pseudoknot_order_one_or_two)/2
 
     base_pairs = struc.base_pairs(nuc_sample_array)
-    pseudoknot_order = struc.pseudoknots(base_pairs)
+    pseudoknot_order = struc.pseudoknots(base_pairs, exhaustive=True)
 
     # Sample structure should have two optimal solutions with default
     # scoring parameters
@@ -98,7 +98,9 @@ def test_pseudoknot_removal(name):
     basepairs, reference_solutions = load_test(name)
 
     # Calculate solutions from the base pairs
-    raw_solutions = struc.pseudoknots(basepairs, max_pseudoknot_order=0)
+    raw_solutions = struc.pseudoknots(
+        basepairs, max_pseudoknot_order=0, exhaustive=True
+    )
 
     # The number of solutions calculated
     solutions_count = 0
@@ -116,6 +118,48 @@ def test_pseudoknot_removal(name):
     # Verify that the number of solutions matches the reference
     assert len(reference_solutions) == solutions_count
 
+@pytest.mark.parametrize("name", [f"test{x}" for x in range(21)])
+def test_pseudoknot_removal_single_solution(name):
+    """
+    Check if the single solution found by the dynamic programming
+    algorithm over the paired regions is one of the reference
+    solutions.
+    """
+    basepairs, reference_solutions = load_test(name)
+
+    raw_solutions = struc.pseudoknots(basepairs, max_pseudoknot_order=0)
+
+    assert raw_solutions.shape == (1, len(basepairs))
+    solution = set(
+        tuple(sorted(basepair))
+        for basepair, order in zip(basepairs, raw_solutions[0])
+        if order != -1
+    )
+    assert solution in reference_solutions
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pseudoknots_single_solution(seed):
+    """
+    Check if the single solution is one of the solutions found by
+    the exhaustive enumeration.
+    """
+    np.random.seed(seed)
+    basepairs = np.random.choice(range(40), size=(10, 2), replace=False)
+    scores = np.random.randint(1, 4, size=10)
+
+    ref_solutions = struc.pseudoknots(
+        basepairs, scores, max_pseudoknot_order=1, exhaustive=True
+    )
+    test_solution = struc.pseudoknots(
+        basepairs, scores, max_pseudoknot_order=1
+    )[0]
+
+    assert any(
+        test_solution.tolist() == ref_solution.tolist()
+        for ref_solution in ref_solutions
+    )
+
 @pytest.mark.parametrize("seed", range(10))
 def test_pseudoknot_orders(seed):
     """
@@ -5,6 +5,7 @@
 import biotite.structure as struc
 import biotite.structure.io as strucio
 import numpy as np
+import pickle
 from os.path import join
 from ..util import data_dir
 import pytest
@@ -20,6 +21,75 @@ def test_apply_residue_wise(array):
     assert data.tolist() == [len(array[array.res_id == i])
                              for i in range(1, 21)]
 
+
+@pytest.mark.parametrize(
+    "function, axis, data_type",
+    [
+        (np.sum,           None, "float"),
+        (np.sum,           0,    "coord"),
+        (np.sum,           None, "bool"),
+        (np.nansum,        None, "nan"),
+        (np.mean,          None, "coord"),
+        (np.mean,          0,    "coord"),
+        (np.average,       0,    "int"),
+        (np.min,           None, "float"),
+        (np.max,           0,    "coord"),
+        (np.any,           None, "bool"),
+        (np.all,           None, "bool"),
+        (np.count_nonzero, None, "bool"),
+        (len,              None, "float"),
+        (struc.centroid,   None, "coord"),
+    ]
+)
+def test_apply_residue_wise_reduction(array, function, axis, data_type):
+    """
+    Compare the fast path of :func:`apply_residue_wise()` for common
+    reductions with the generic residue-by-residue evaluation.
+    """
+    np.random.seed(0)
+    if data_type == "float":
+        data = np.random.rand(array.array_length())
+    elif data_type == "nan":
+        data = np.random.rand(array.array_length())
+        data[np.random.rand(array.array_length()) < 0.2] = np.nan
+    elif data_type == "int":
+        data = np.random.randint(-100, 100, array.array_length())
+    elif data_type == "bool":
+        data = np.random.rand(array.array_length()) < 0.1
+    elif data_type == "coord":
+        data = array.coord
+
+    # A wrapper function is not recognized by the fast path
+    if axis is None:
+        generic_function = lambda x: function(x)
+    else:
+        generic_function = lambda x, axis: function(x, axis=axis)
+    ref_data = struc.apply_residue_wise(array, data, generic_function, axis)
+    test_data = struc.apply_residue_wise(array, data, function, axis)
+
+    assert test_data.shape == ref_data.shape
+    assert test_data.dtype == ref_data.dtype
+    assert np.allclose(test_data, ref_data, rtol=1e-5)
+
+
+def test_apply_residue_wise_stack(array):
+    """
+    Data for each model of a stack should be evaluated for each model
+    separately.
+    """
+    stack = struc.stack([array, array.copy()])
+    stack.coord[1] += 10
+    test_centroids = struc.apply_residue_wise(
+        stack, stack.coord, np.mean, axis=0
+    )
+    assert test_centroids.shape == (2, 20, 3)
+    for model, test_model_centroids in zip(stack, test_centroids):
+        ref_model_centroids = struc.apply_residue_wise(
+            model, model.coord, np.mean, axis=0
+        )
+        assert np.allclose(test_model_centroids, ref_model_centroids)
+
+
 def test_spread_residue_wise(array):
     input_data = np.arange(1,21)
     output_data = struc.spread_residue_wise(array, input_data)
@@ -63,4 +133,74 @@ def test_residue_iter(array):
     ref_centroid = struc.apply_residue_wise(
         array, array.coord, np.average, axis=0
     )
-    assert centroid == ref_centroid.tolist()
\ No newline at end of file
+    # The segment-wise reduction in 'apply_residue_wise()' may differ
+    # from 'centroid()' due to the summation order
+    assert np.allclose(centroid, ref_centroid, rtol=1e-6)
+
+
+def test_segment_cache(array):
+    """
+    Check whether cached residue and chain starts are reused and
+    whether they are invalidated, when the relevant annotations change.
+    """
+    ref_res_starts = struc.get_residue_starts(array, add_exclusive_stop=True)
+    ref_chain_starts = struc.get_chain_starts(array, add_exclusive_stop=True)
+
+    array.enable_segment_cache()
+    assert struc.get_residue_starts(array).tolist() \
+        == ref_res_starts[:-1].tolist()
+    assert struc.get_chain_starts(array).tolist() \
+        == ref_chain_starts[:-1].tolist()
+    assert "residue" in array._segment_cache
+    assert "chain" in array._segment_cache
+    # Modification of the returned starts must not affect the cache
+    struc.get_residue_starts(array)[:] = -1
+    assert struc.get_residue_starts(array, add_exclusive_stop=True).tolist() \
+        == ref_res_starts.tolist()
+
+    # Copies share the cache content
+    assert "residue" in array.copy()._segment_cache
+    # Subarrays have a new empty cache
+    sub_array = array[array.res_id > 10]
+    assert sub_array._segment_cache == {}
+    assert struc.get_residue_count(sub_array) == 10
+
+    # Changing an unrelated annotation keeps the cache
+    array.set_annotation("b_factor", np.zeros(array.array_length()))
+    assert "residue" in array._segment_cache
+    # Changing residue IDs invalidates the cache
+    array.res_id = np.ones(array.array_length(), dtype=int)
+    assert "residue" not in array._segment_cache
+    assert "chain" not in array._segment_cache
+    uncached_array = array.copy()
+    uncached_array.disable_segment_cache()
+    assert struc.get_residue_starts(array).tolist() \
+        == struc.get_residue_starts(uncached_array).tolist()
+    array.res_name = np.full(array.array_length(), "ALA")
+    assert struc.get_residue_count(array) == 1
+    
+    array.disable_segment_cache()
+    assert array._segment_cache is None
+
+
+def test_segment_cache_missing(array):
+    """
+    Check whether the segment functions work on atom arrays without
+    the segment cache attribute, e.g. arrays pickled before the
+    segment cache was introduced.
+    """
+    ref_res_starts = struc.get_residue_starts(array)
+    ref_chain_starts = struc.get_chain_starts(array)
+
+    unpickled = pickle.loads(pickle.dumps(array))
+    # Emulate an array pickled without segment cache
+    del unpickled.__dict__["_segment_cache"]
+
+    assert struc.get_residue_starts(unpickled).tolist() \
+        == ref_res_starts.tolist()
+    assert struc.get_chain_starts(unpickled).tolist() \
+        == ref_chain_starts.tolist()
+    # Indexing and copying must work as well
+    assert struc.get_residue_count(unpickled[unpickled.res_id > 10]) == 10
+    assert struc.get_residue_count(unpickled.copy()) \
+        == len(ref_res_starts)
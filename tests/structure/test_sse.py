@@ -66,6 +66,25 @@ def test_sse():
     assert matches / total >= THRESHOLD
 
 
+def test_sse_stack():
+    """
+    Check if the SSE computed for an :class:`AtomArrayStack` are equal
+    to the SSE computed for each model separately.
+    """
+    stack = mmtf.get_structure(
+        mmtf.MMTFFile.read(join(data_dir("structure"), "1gya.mmtf"))
+    )
+
+    test_sse = struc.annotate_sse(stack)
+
+    assert test_sse.shape == (
+        stack.stack_depth(), struc.get_residue_count(stack)
+    )
+    for model, model_test_sse in zip(stack, test_sse):
+        ref_sse = struc.annotate_sse(model)
+        assert model_test_sse.tolist() == ref_sse.tolist()
+
+
 np.random.seed(0)
 @pytest.mark.parametrize(
     "discont_pos", np.random.randint(2, 105, size=100)
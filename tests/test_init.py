@@ -4,10 +4,84 @@
 
 __author__ = "Daniel Bauer"
 
+import re
+import subprocess
+import sys
 import biotite
 import pytest
 
 
 def test_version_number():
     version = biotite.__version__
-    assert hasattr(biotite, "__version__")
\ No newline at end of file
+    assert hasattr(biotite, "__version__")
+
+
+def test_lazy_import():
+    """
+    Importing :mod:`biotite.structure` should neither import its
+    subpackages and expensive dependencies nor load the datasets of
+    :mod:`biotite.structure.info`.
+    Accessing a subpackage as attribute should import it.
+    """
+    code = "\n".join([
+        "import sys",
+        "import biotite.structure as struc",
+        "import biotite.structure.info.masses as masses",
+        "import biotite.structure.info.misc as misc",
+        "import biotite.structure.info.amino_acids as amino_acids",
+        "import biotite.structure.info.nucleotides as nucleotides",
+        "import biotite.structure.info.carbohydrates as carbohydrates",
+        "assert 'networkx' not in sys.modules",
+        "assert 'biotite.structure.io' not in sys.modules",
+        "assert 'biotite.structure.graphics' not in sys.modules",
+        "assert masses._atom_masses is None",
+        "assert misc._res_names is None",
+        "assert amino_acids._amino_acids is None",
+        "assert nucleotides._nucleotides is None",
+        "assert carbohydrates._carbohydrates is None",
+        "assert struc.io.pdb.PDBFile is not None",
+        "assert 'biotite.structure.io.pdb' in sys.modules",
+    ])
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_time():
+    """
+    Guard against regressions of the time required for importing
+    :mod:`biotite.structure`, by checking that no expensive modules
+    are imported.
+    Instead of measuring the import time itself, the modules reported
+    by ``-X importtime`` are checked, as timings are not reproducible.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import biotite.structure"],
+        check=True, capture_output=True, text=True
+    ).stderr
+    # The lines have the format
+    # 'import time: <self [us]> | <cumulative [us]> | <module>'
+    imported = set()
+    for line in output.splitlines():
+        match = re.match(
+            r"import time:\s*\d+\s*\|\s*\d+\s*\|\s*(.+)$", line
+        )
+        if match:
+            imported.add(match.group(1).strip())
+    assert "biotite.structure" in imported
+
+    # Expensive subpackages and dependencies, that must be imported
+    # only on demand
+    lazy_packages = [
+        "networkx",
+        "requests",
+        "biotite.sequence",
+        "biotite.database",
+        "biotite.application",
+        "biotite.structure.io",
+        "biotite.structure.graphics",
+    ]
+    for module in imported:
+        for package in lazy_packages:
+            is_lazy = module == package or module.startswith(package + ".")
+            assert not is_lazy, \
+                f"'{module}' is imported with 'biotite.structure'"